@@ -743,6 +743,17 @@ def update_progress_display(progress_container, status_container, metrics_contai
 # Workflow Execution
 # =============================================================================
 
+@st.cache_resource
+def configure_shared_resources():
+    """Build the process-wide rate limiter and executor from settings, once per server."""
+    from config.settings import settings
+    from src.agents import configure_rate_limiter
+    from src.tools import configure_executor
+    
+    configure_executor(**settings.get_executor_config())
+    return configure_rate_limiter(**settings.get_rate_limit_config())
+
+
 def run_workflow(query: str, max_iterations: int):
     """Run the multi-agent workflow."""
     try:
@@ -753,10 +764,13 @@ def run_workflow(query: str, max_iterations: int):
             st.error("Configuration error. Please check your .env file has valid API keys.")
             return None
         
+        configure_shared_resources()
+        
         # Create runner
         runner = create_runner(
             api_key=settings.groq_api_key,
             tavily_api_key=settings.tavily_api_key,
+            agent_options=settings.get_agent_options(),
             max_iterations=max_iterations,
             enable_checkpointing=False,
         )
@@ -777,12 +791,15 @@ def run_enhanced_workflow_with_progress(query: str, max_iterations: int,
     try:
         from config.settings import settings
         from src.graph import WorkflowRunner, get_state_summary
+        from src.graph.events import summarize_node_timings
         from src.graph.nodes import AgentRegistry
         
         if settings is None:
             st.error("⚠️ Configuration error. Please check your .env file has valid API keys.")
             return None
         
+        configure_shared_resources()
+        
         # Initialize timing
         st.session_state.workflow_start_time = time.time()
         
@@ -799,6 +816,7 @@ def run_enhanced_workflow_with_progress(query: str, max_iterations: int,
             runner = WorkflowRunner(
                 api_key=settings.groq_api_key,
                 tavily_api_key=settings.tavily_api_key,
+                agent_options=settings.get_agent_options(),
                 max_iterations=max_iterations,
                 enable_checkpointing=False,
             )
@@ -807,42 +825,73 @@ def run_enhanced_workflow_with_progress(query: str, max_iterations: int,
                                    0.0, f"Setup Error: {str(e)}")
             return None
         
-        # Phase 1: Research
-        st.session_state.agent_status["researcher"] = "running"
-        elapsed = time.time() - st.session_state.workflow_start_time
-        update_progress_display(progress_container, status_container, metrics_container,
-                               0.15, "🔍 Researcher gathering comprehensive information...", elapsed)
+        # Progress reached when each agent finishes
+        node_progress = {"researcher": 0.35, "analyst": 0.55, "critic": 0.75, "writer": 0.95}
+        node_status = {
+            "researcher": "🔍 Researcher gathering comprehensive information...",
+            "analyst": "📊 Analyst synthesizing research findings...",
+            "critic": "⚖️ Critic reviewing quality and accuracy...",
+            "writer": "✍️ Writer crafting polished final report...",
+        }
+        report_preview = st.empty()
+        streamed_report = []
+        st.session_state.stage_timings = []
         
-        # Phase 2: Analysis  
-        st.session_state.agent_status["analyst"] = "running"
-        elapsed = time.time() - st.session_state.workflow_start_time
-        update_progress_display(progress_container, status_container, metrics_container,
-                               0.35, "📊 Analyst synthesizing research findings...", elapsed)
+        def on_event(event):
+            elapsed = time.time() - st.session_state.workflow_start_time
+            
+            if event.is_token:
+                streamed_report.append(event.text)
+                report_preview.markdown("".join(streamed_report))
+                return
+            
+            if event.node not in node_progress:
+                return
+            
+            if event.type == "node_started":
+                st.session_state.agent_status[event.node] = "running"
+                update_progress_display(progress_container, status_container, metrics_container,
+                                       node_progress[event.node] - 0.2, node_status[event.node], elapsed)
+            
+            elif event.type == "node_finished":
+                st.session_state.agent_status[event.node] = "complete"
+                st.session_state.stage_timings.append(event)
+                
+                details = f"{event.metrics.get('tokens', 0)} tokens"
+                if event.metrics.get("sources_found"):
+                    details += f", {event.metrics['sources_found']} sources"
+                st.session_state.agent_completion_times[event.node] = (
+                    f"Completed in {event.duration:.1f}s ({details})"
+                )
+                update_progress_display(progress_container, status_container, metrics_container,
+                                       node_progress[event.node],
+                                       f"{event.node.title()} finished in {event.duration:.1f}s",
+                                       elapsed)
         
-        # Run the complete workflow
-        result = runner.run(query)
+        # Run the workflow, rendering progress and the report as they happen
+        result = runner.run_with_events(query, on_event)
         
-        # Phase 3: Critique (simulated progress updates)
-        st.session_state.agent_status["researcher"] = "complete"
-        st.session_state.agent_completion_times["researcher"] = f"Completed in {elapsed:.1f}s"
-        st.session_state.agent_status["critic"] = "running"
+        # The full report is rendered below once the run completes
+        report_preview.empty()
         elapsed = time.time() - st.session_state.workflow_start_time
-        update_progress_display(progress_container, status_container, metrics_container,
-                               0.65, "⚖️ Critic reviewing quality and accuracy...", elapsed)
         
-        # Phase 4: Writing
-        st.session_state.agent_status["analyst"] = "complete"
-        st.session_state.agent_completion_times["analyst"] = f"Completed in {elapsed:.1f}s"
-        st.session_state.agent_status["writer"] = "running"
-        elapsed = time.time() - st.session_state.workflow_start_time
-        update_progress_display(progress_container, status_container, metrics_container,
-                               0.85, "✍️ Writer crafting polished final report...", elapsed)
+        # Actual per-agent latency, slowest first
+        stages = summarize_node_timings(st.session_state.stage_timings)
+        if stages:
+            with st.expander("⏱️ Stage latencies", expanded=False):
+                for stage in stages:
+                    share = stage["seconds"] / elapsed * 100 if elapsed > 0 else 0.0
+                    st.markdown(
+                        f"**{stage['node'].title()}** — {stage['seconds']:.1f}s "
+                        f"({share:.0f}% of run, {stage['tokens']} tokens"
+                        + (f", {stage['sources_found']} sources" if stage["sources_found"] else "")
+                        + ")"
+                    )
         
-        # Completion
+        # Completion times come from real node events; only settle statuses here
         for agent in ["researcher", "analyst", "critic", "writer"]:
-            st.session_state.agent_status[agent] = "complete"
-            if agent not in st.session_state.agent_completion_times:
-                st.session_state.agent_completion_times[agent] = f"Completed in {elapsed:.1f}s"
+            if st.session_state.agent_status[agent] == "running":
+                st.session_state.agent_status[agent] = "complete"
         
         elapsed = time.time() - st.session_state.workflow_start_time
         
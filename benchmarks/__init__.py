@@ -0,0 +1,36 @@
+"""
+Offline benchmarks for the Multi-Agent Virtual Company.
+
+Groq and Tavily are replaced with in-process fakes that simulate
+latency, token throughput and error rates, so end-to-end workflow
+performance can be measured without network access or API keys:
+
+    python -m benchmarks.workflow_bench --concurrency 1 4 8 --runs 16
+
+and micro-benchmarks (pytest-benchmark) for CPU-bound helpers:
+
+    python -m pytest benchmarks/bench_text_analyzer.py
+    python -m pytest benchmarks/bench_html_extract.py
+"""
+
+from .fakes import (
+    LLMProfile,
+    TavilyProfile,
+    FakeChatModel,
+    FakeTavilyClient,
+    FakeAsyncTavilyClient,
+    install_fakes,
+)
+from .workflow_bench import run_benchmark, run_level, print_benchmark_table
+
+__all__ = [
+    "LLMProfile",
+    "TavilyProfile",
+    "FakeChatModel",
+    "FakeTavilyClient",
+    "FakeAsyncTavilyClient",
+    "install_fakes",
+    "run_benchmark",
+    "run_level",
+    "print_benchmark_table",
+]
@@ -0,0 +1,157 @@
+"""
+Micro-benchmarks for TextAnalyzer hot paths.
+
+Covers tokenization, the lexicon sentiment scan, the per-statistic methods, the single-pass
+analyze_text pipeline and batched preparation on each executor mode, on synthetic
+research corpora from 10 KB to 5 MB.
+The file is not collected by a plain `pytest` run; invoke it directly:
+
+    python -m pytest benchmarks/bench_text_analyzer.py --benchmark-group-by=param:corpus
+"""
+
+import sys
+import random
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("pytest_benchmark")
+
+from src.tools.analysis import ResearchDataProcessor, TextAnalyzer
+
+
+# Corpus sizes in bytes
+CORPUS_SIZES = {
+    "10KB": 10 * 1024,
+    "100KB": 100 * 1024,
+    "1MB": 1024 * 1024,
+    "5MB": 5 * 1024 * 1024,
+}
+
+_VOCABULARY = (
+    list(TextAnalyzer.POSITIVE_WORDS)
+    + list(TextAnalyzer.NEGATIVE_WORDS)
+    + list(TextAnalyzer.STOP_WORDS)
+    + [
+        "nvidia", "semiconductor", "revenue", "quarter", "guidance", "datacenter",
+        "inference", "margin", "supply", "demand", "analyst", "market", "shares",
+        "3.5%", "$12", "billion", "https://example.com/news", "ir@example.com",
+    ]
+)
+_PUNCTUATION = ["", "", "", ",", ".", "!", ":", "\n"]
+
+
+def make_corpus(size: int, seed: int = 42) -> str:
+    """
+    Build a deterministic pseudo-article of roughly `size` bytes.
+
+    Args:
+        size: Target size in bytes
+        seed: Random seed
+
+    Returns:
+        Corpus text
+    """
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(_VOCABULARY) + rng.choice(_PUNCTUATION)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+@pytest.fixture(scope="module", params=list(CORPUS_SIZES), ids=list(CORPUS_SIZES))
+def corpus(request):
+    """Corpus text for one size."""
+    return make_corpus(CORPUS_SIZES[request.param])
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    """Shared TextAnalyzer."""
+    return TextAnalyzer()
+
+
+def test_tokenize(benchmark, analyzer, corpus):
+    """Clean + tokenize once."""
+    benchmark(analyzer.tokenize, corpus)
+
+
+def test_extract_keywords(benchmark, analyzer, corpus):
+    """Keyword extraction on its own."""
+    benchmark(analyzer.extract_keywords, corpus)
+
+
+def test_calculate_sentiment_score(benchmark, analyzer, corpus):
+    """Sentiment scoring on its own."""
+    benchmark(analyzer.calculate_sentiment_score, corpus)
+
+
+def test_sentiment_engine_scan(benchmark, corpus):
+    """Raw lexicon scan (all default lexicons) without noise stripping."""
+    from src.tools.sentiment import get_sentiment_engine
+
+    benchmark(get_sentiment_engine().count, corpus)
+
+
+def test_separate_statistics(benchmark, analyzer, corpus):
+    """Keywords, topics, sentiment and word count computed separately."""
+
+    def run():
+        analyzer.extract_keywords(corpus)
+        analyzer.identify_key_topics(corpus)
+        analyzer.calculate_sentiment_score(corpus)
+        analyzer.calculate_word_count(corpus)
+
+    benchmark(run)
+
+
+def test_analyze_text(benchmark, analyzer, corpus):
+    """The same statistics from one shared token stream."""
+    benchmark(analyzer.analyze_text, corpus)
+
+
+def test_prepare_for_analysis(benchmark, corpus):
+    """Full preliminary analysis of research data whose content is the corpus."""
+    from src.schemas.models import ResearchData
+
+    research_data = ResearchData(topic="Benchmark", raw_content=corpus, researcher_notes=corpus)
+    processor = ResearchDataProcessor()
+    processor.cache = None
+
+    benchmark(processor.prepare_for_analysis, research_data)
+
+
+def test_prepare_for_analysis_memoized(benchmark, corpus):
+    """Repeat preparation (e.g. a revision) served from the prepared-analysis cache."""
+    from src.schemas.models import ResearchData
+    from src.tools.analysis import PreparedAnalysisCache
+
+    research_data = ResearchData(topic="Benchmark", raw_content=corpus, researcher_notes=corpus)
+    processor = ResearchDataProcessor(cache=PreparedAnalysisCache())
+    processor.prepare_for_analysis(research_data)
+
+    benchmark(processor.prepare_for_analysis, research_data)
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+def test_prepare_many(benchmark, corpus, mode):
+    """Preliminary analysis of 8 research data sets on each executor mode."""
+    from src.schemas.models import ResearchData
+    from src.tools.executor import TaskExecutor
+
+    items = [
+        ResearchData(topic=f"Benchmark {i}", raw_content=corpus, researcher_notes=corpus)
+        for i in range(8)
+    ]
+
+    with TaskExecutor(mode) as executor:
+        processor = ResearchDataProcessor(executor=executor)
+        processor.cache = None
+        processor.prepare_many(items[:1])  # start the pool outside the timing
+        benchmark(processor.prepare_many, items)
@@ -0,0 +1,463 @@
+"""
+In-process stand-ins for Groq and Tavily used by the benchmarks.
+
+FakeChatModel is a LangChain chat model that recognises which agent is
+calling from its system prompt and answers with a plausible response
+in the format that agent parses (search queries, analysis JSON,
+critique JSON, report JSON). Latency is simulated as a fixed time to
+first token plus output tokens at a configurable generation rate, and
+a configurable fraction of calls fail with a 429 so the shared rate
+limiter's retry path is exercised.
+
+FakeTavilyClient / FakeAsyncTavilyClient mimic the Tavily SDK's
+`search` call with configurable latency, result count and error rate.
+
+`install_fakes` wires both into the application through its existing
+extension points (the LLM client pool factory and the Tavily client
+classes used by TavilySearchTool), so agent and graph code run
+unmodified.
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import contextlib
+import functools
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict, PrivateAttr
+
+
+# Characters per token used to turn text lengths into token counts
+CHARS_PER_TOKEN = 4
+
+# Number of streamed chunks a fake response is split into
+STREAM_CHUNKS = 16
+
+
+# =============================================================================
+# Profiles
+# =============================================================================
+
+@dataclass
+class LLMProfile:
+    """
+    Simulated behaviour of the LLM API.
+
+    Attributes:
+        latency: Seconds before the first token of each response
+        tokens_per_second: Output generation rate (0 for instant)
+        error_rate: Fraction of calls rejected with a 429
+        retry_after: Retry-After sent with simulated 429s (seconds)
+        approval_rate: Fraction of critiques that approve the analysis
+        report_words: Approximate length of generated reports
+        seed: Seed for the error/approval dice (None for random)
+    """
+
+    latency: float = 0.3
+    tokens_per_second: float = 250.0
+    error_rate: float = 0.0
+    retry_after: float = 0.2
+    approval_rate: float = 1.0
+    report_words: int = 600
+    seed: Optional[int] = None
+
+
+@dataclass
+class TavilyProfile:
+    """
+    Simulated behaviour of the Tavily API.
+
+    Attributes:
+        latency: Seconds per search call
+        error_rate: Fraction of searches that raise an error
+        results: Results returned per search
+        content_words: Approximate words of content per result
+        seed: Seed for the error dice (None for random)
+    """
+
+    latency: float = 0.5
+    error_rate: float = 0.0
+    results: int = 5
+    content_words: int = 120
+    seed: Optional[int] = None
+
+
+# =============================================================================
+# Fake Responses
+# =============================================================================
+
+_FILLER = (
+    "Revenue growth accelerated as demand for AI accelerators outpaced supply "
+    "while margins improved on pricing power and operating leverage across segments "
+    "analysts expect continued investment in data center capacity despite regulatory risk"
+).split()
+
+
+def _words(count: int, offset: int = 0) -> str:
+    """Deterministic filler text of roughly `count` words."""
+    return " ".join(_FILLER[(offset + i) % len(_FILLER)] for i in range(max(1, count)))
+
+
+def _search_queries(user_message: str) -> str:
+    """Researcher query generation: one query per line."""
+    topic = user_message.split('"')[1] if user_message.count('"') >= 2 else "the topic"
+    return "\n".join([
+        f"1. {topic} latest news",
+        f"2. {topic} market analysis",
+        f"3. {topic} outlook and risks",
+    ])
+
+
+def _analysis() -> str:
+    """Analyst response in the JSON layout AnalystAgent parses."""
+    return json.dumps({
+        "executive_summary": _words(60),
+        "key_insights": [
+            {"insight": _words(20, i), "confidence": "high", "supporting_sources": []}
+            for i in range(4)
+        ],
+        "trends_identified": [_words(8, i) for i in range(3)],
+        "sentiment": "bullish",
+        "data_quality_score": 0.8,
+        "risks_identified": [_words(8, i + 3) for i in range(2)],
+        "opportunities_identified": [_words(8, i + 5) for i in range(2)],
+    })
+
+
+def _critique(approved: bool) -> str:
+    """Critic response in the JSON layout CriticAgent parses."""
+    return json.dumps({
+        "is_approved": approved,
+        "quality_score": 0.85 if approved else 0.55,
+        "strengths": [_words(10, i) for i in range(2)],
+        "weaknesses": [] if approved else [_words(10, 4)],
+        "missing_elements": [],
+        "bias_detected": False,
+        "suggestions": [_words(10, 6)],
+        "revision_required": not approved,
+        "revision_instructions": None if approved else _words(20, 2),
+    })
+
+
+def _report(words: int) -> str:
+    """Writer response in the JSON layout WriterAgent parses."""
+    section_words = max(20, words // 4)
+    return json.dumps({
+        "title": "Benchmark Research Report",
+        "executive_summary": _words(60),
+        "sections": [
+            {"title": f"Section {i + 1}", "content": _words(section_words, i)}
+            for i in range(4)
+        ],
+        "key_takeaways": [_words(12, i) for i in range(3)],
+        "recommendations": [_words(12, i + 2) for i in range(3)],
+        "sources": [],
+    })
+
+
+def fake_response(
+    system_prompt: str,
+    user_message: str,
+    profile: LLMProfile,
+    rng: random.Random,
+) -> str:
+    """
+    Produce a response in the format the calling agent expects.
+
+    Args:
+        system_prompt: System prompt of the call (identifies the agent)
+        user_message: User message of the call
+        profile: Simulated LLM behaviour
+        rng: Random source for approval decisions
+
+    Returns:
+        Response text
+    """
+    if "Research Agent" in system_prompt:
+        if "search queries" in user_message:
+            return _search_queries(user_message)
+        return _words(150)
+    if "Analyst Agent" in system_prompt:
+        return _analysis()
+    if "Critic Agent" in system_prompt:
+        return _critique(rng.random() < profile.approval_rate)
+    if "Writer Agent" in system_prompt:
+        return _report(profile.report_words)
+    return json.dumps({"next_agent": "END", "reasoning": "Benchmark routing"})
+
+
+class FakeRateLimitError(Exception):
+    """Simulated 429 carrying a Retry-After header, like groq.RateLimitError."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__("Simulated rate limit")
+        self.response = type("Response", (), {
+            "status_code": 429,
+            "headers": {"retry-after-ms": str(int(retry_after * 1000))},
+        })()
+
+
+# =============================================================================
+# Fake Chat Model
+# =============================================================================
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that simulates Groq latency, throughput and throttling.
+
+    Declares `temperature` and `max_tokens` so LLMClientPool can hand
+    out per-agent views of one instance, as it does for ChatGroq.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model_name: str = "fake-model"
+    temperature: float = 0.7
+    max_tokens: int = 4096
+    profile: LLMProfile = LLMProfile()
+
+    _rng: random.Random = PrivateAttr(default_factory=random.Random)
+
+    def model_post_init(self, __context: Any):
+        """Seed the shared random source."""
+        super().model_post_init(__context)
+        self._rng.seed(self.profile.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-groq"
+
+    def _respond(self, messages: list[BaseMessage]) -> tuple[str, dict, float]:
+        """
+        Decide the outcome of one call.
+
+        Returns:
+            Response text, usage metadata and simulated generation time
+
+        Raises:
+            FakeRateLimitError: For the configured fraction of calls
+        """
+        if self.profile.error_rate and self._rng.random() < self.profile.error_rate:
+            raise FakeRateLimitError(self.profile.retry_after)
+
+        system_prompt = next((str(m.content) for m in messages if m.type == "system"), "")
+        user_message = str(messages[-1].content) if messages else ""
+        text = fake_response(system_prompt, user_message, self.profile, self._rng)
+
+        input_tokens = sum(len(str(m.content)) for m in messages) // CHARS_PER_TOKEN
+        output_tokens = min(len(text) // CHARS_PER_TOKEN, self.max_tokens)
+        usage = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+        rate = self.profile.tokens_per_second
+        generation_time = output_tokens / rate if rate > 0 else 0.0
+        return text, usage, generation_time
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text, usage, generation_time = self._respond(messages)
+        time.sleep(self.profile.latency + generation_time)
+        message = AIMessage(content=text, usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text, usage, generation_time = self._respond(messages)
+        await asyncio.sleep(self.profile.latency + generation_time)
+        message = AIMessage(content=text, usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        text, usage, generation_time = self._respond(messages)
+        time.sleep(self.profile.latency)
+        for piece, last in _split(text):
+            time.sleep(generation_time / STREAM_CHUNKS)
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content=piece, usage_metadata=usage if last else None,
+            ))
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        text, usage, generation_time = self._respond(messages)
+        await asyncio.sleep(self.profile.latency)
+        for piece, last in _split(text):
+            await asyncio.sleep(generation_time / STREAM_CHUNKS)
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content=piece, usage_metadata=usage if last else None,
+            ))
+
+
+def _split(text: str) -> Iterator[tuple[str, bool]]:
+    """Split text into STREAM_CHUNKS pieces, flagging the last one."""
+    size = max(1, -(-len(text) // STREAM_CHUNKS))
+    pieces = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+    for index, piece in enumerate(pieces):
+        yield piece, index == len(pieces) - 1
+
+
+# =============================================================================
+# Fake Tavily Clients
+# =============================================================================
+
+class FakeTavilyClient:
+    """Stand-in for tavily.TavilyClient."""
+
+    def __init__(self, api_key: str = "", profile: Optional[TavilyProfile] = None):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: Ignored
+            profile: Simulated Tavily behaviour
+        """
+        self.profile = profile or TavilyProfile()
+        self.rng = random.Random(self.profile.seed)
+        self.calls = 0
+
+    def _results(self, query: str) -> dict:
+        """Build a Tavily-shaped response, or raise a simulated failure."""
+        self.calls += 1
+        if self.profile.error_rate and self.rng.random() < self.profile.error_rate:
+            raise ConnectionError("Simulated Tavily failure")
+
+        slug = "-".join(query.lower().split())[:60]
+        return {
+            "query": query,
+            "answer": _words(40),
+            "results": [
+                {
+                    "title": f"{query} ({i + 1})",
+                    "url": f"https://example.com/{slug}/{i}",
+                    "content": _words(self.profile.content_words, i),
+                    "score": round(1.0 - i * 0.1, 2),
+                    "published_date": "2025-01-01",
+                }
+                for i in range(self.profile.results)
+            ],
+        }
+
+    def search(self, query: str, **params) -> dict:
+        time.sleep(self.profile.latency)
+        return self._results(query)
+
+
+class FakeAsyncTavilyClient(FakeTavilyClient):
+    """Stand-in for tavily.AsyncTavilyClient."""
+
+    async def search(self, query: str, **params) -> dict:
+        await asyncio.sleep(self.profile.latency)
+        return self._results(query)
+
+
+# =============================================================================
+# Installation
+# =============================================================================
+
+@contextlib.contextmanager
+def install_fakes(
+    llm: Optional[LLMProfile] = None,
+    tavily: Optional[TavilyProfile] = None,
+    llm_concurrency: int = 8,
+    tavily_concurrency: Optional[int] = None,
+    search_cache: bool = False,
+):
+    """
+    Route all Groq and Tavily traffic to the fakes for the enclosed block.
+
+    Agents created inside the block (the agent registry is reset on
+    entry and exit) get FakeChatModel views from the LLM pool and
+    TavilySearchTools whose clients are fakes. The rate limiter is
+    replaced by one without RPM/TPM quotas, so only simulated latency
+    and throttling shape the results.
+
+    Args:
+        llm: Simulated LLM behaviour
+        tavily: Simulated Tavily behaviour
+        llm_concurrency: Ceiling on concurrent LLM calls
+        tavily_concurrency: Maximum concurrent Tavily calls (None = unlimited)
+        search_cache: Keep the shared search cache enabled
+
+    Yields:
+        The (llm, tavily) profiles in effect
+    """
+    from src.agents import configure_llm_pool, configure_rate_limiter
+    from src.graph.nodes import AgentRegistry
+    from src.tools import search as search_module
+
+    llm = llm or LLMProfile()
+    tavily = tavily or TavilyProfile()
+
+    saved_clients = (search_module.TavilyClient, search_module.AsyncTavilyClient)
+    saved_cache_env = os.environ.get("SEARCH_CACHE_ENABLED")
+
+    configure_llm_pool(lambda api_key, model_name: FakeChatModel(model_name=model_name, profile=llm))
+    configure_rate_limiter(
+        requests_per_minute=0,
+        tokens_per_minute=0,
+        max_concurrency=llm_concurrency,
+        base_backoff=0.1,
+    )
+    search_module.TavilyClient = functools.partial(FakeTavilyClient, profile=tavily)
+    search_module.AsyncTavilyClient = functools.partial(FakeAsyncTavilyClient, profile=tavily)
+    search_module.set_search_concurrency(tavily_concurrency)
+    if not search_cache:
+        os.environ["SEARCH_CACHE_ENABLED"] = "false"
+    AgentRegistry.reset()
+
+    try:
+        yield llm, tavily
+    finally:
+        AgentRegistry.reset()
+        search_module.TavilyClient, search_module.AsyncTavilyClient = saved_clients
+        search_module.set_search_concurrency(None)
+        if saved_cache_env is None:
+            os.environ.pop("SEARCH_CACHE_ENABLED", None)
+        else:
+            os.environ["SEARCH_CACHE_ENABLED"] = saved_cache_env
+        configure_llm_pool(None)
+        configure_rate_limiter()
+
+
+__all__ = [
+    "LLMProfile",
+    "TavilyProfile",
+    "FakeChatModel",
+    "FakeRateLimitError",
+    "FakeTavilyClient",
+    "FakeAsyncTavilyClient",
+    "fake_response",
+    "install_fakes",
+]
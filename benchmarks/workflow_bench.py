@@ -0,0 +1,377 @@
+"""
+End-to-end workflow benchmark.
+
+Drives the full WorkflowRunner (async path, as batch mode does) against
+the fakes in benchmarks.fakes at one or more concurrency levels and
+reports, per level:
+
+- p50 / p95 / p99 report latency
+- reports per minute
+- LLM calls, tokens and Tavily calls per report (from each run's trace)
+- research context tokens sent to the analyst per report
+- mean LLM queue wait and 429 retries (from the shared rate limiter)
+- peak RSS of the process
+
+With several --notes-mode values each level is run once per researcher
+notes mode, and the latency saved relative to "llm" notes is reported.
+
+Usage:
+    python -m benchmarks.workflow_bench --concurrency 1 4 8 --runs 16
+    python -m benchmarks.workflow_bench --notes-mode llm deferred heuristic
+    python -m benchmarks.workflow_bench --llm-latency 0.5 --llm-error-rate 0.05 --json out.json
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+# Allow running as a script from the project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fakes import LLMProfile, TavilyProfile, install_fakes
+
+
+# Interval between RSS samples while a level runs (seconds)
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+# =============================================================================
+# Memory Sampling
+# =============================================================================
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Resident set size of this process in MiB.
+
+    Reads /proc on Linux and falls back to the peak reported by
+    getrusage elsewhere.
+
+    Returns:
+        RSS in MiB, or None if it cannot be measured
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        import resource
+        return pages * resource.getpagesize() / 2**20
+    except (OSError, ImportError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+async def _sample_rss(peak: dict, stop: asyncio.Event):
+    """Track the highest RSS seen until `stop` is set."""
+    while True:
+        rss = current_rss_mb()
+        if rss is not None:
+            peak["mb"] = max(peak.get("mb", 0.0), rss)
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_SAMPLE_INTERVAL)
+            return
+        except asyncio.TimeoutError:
+            continue
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def _trace_counts(trace: Optional[dict]) -> dict:
+    """LLM calls, tokens, Tavily calls and analyst context tokens in one run's trace."""
+    counts = {"llm_calls": 0, "tokens": 0, "tavily_calls": 0, "context_tokens": 0}
+    for span in (trace or {}).get("spans", []):
+        attributes = span["attributes"]
+        if span["kind"] == "llm" and not attributes.get("cache_hit"):
+            counts["llm_calls"] += 1
+            counts["tokens"] += attributes.get("total_tokens", 0)
+        elif span["kind"] == "tool":
+            counts["tavily_calls"] += attributes.get("tavily_calls", 0)
+        if span["name"] == "analysis.context":
+            counts["context_tokens"] += attributes.get("context_tokens", 0)
+    return counts
+
+
+async def run_level(runner, queries: list[str], concurrency: int) -> dict:
+    """
+    Run one batch of queries at a fixed concurrency.
+
+    Args:
+        runner: WorkflowRunner wired to the fakes
+        queries: Queries to run (one report each)
+        concurrency: Maximum workflows in flight
+
+    Returns:
+        Aggregate statistics for the level
+    """
+    from src.agents import get_rate_limiter
+    from src.main import _percentile, summarize_batch
+
+    limiter = get_rate_limiter()
+    limiter.reset_metrics()
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(query: str) -> dict:
+        async with semaphore:
+            start = time.perf_counter()
+            result = await runner.arun(query)
+            duration = time.perf_counter() - start
+        return {
+            "status": result.get("workflow_status", "failed"),
+            "duration": duration,
+            **_trace_counts(result.get("trace")),
+        }
+
+    peak = {}
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_rss(peak, stop))
+
+    start = time.perf_counter()
+    records = await asyncio.gather(*(run_one(query) for query in queries))
+    wall_time = time.perf_counter() - start
+
+    stop.set()
+    await sampler
+
+    summary = summarize_batch(records, wall_time)
+    durations = [r["duration"] for r in records]
+    runs = max(1, len(records))
+    llm = limiter.metrics()
+
+    summary.update({
+        "concurrency": concurrency,
+        "latency_p99": _percentile(durations, 99),
+        "llm_calls_per_report": sum(r["llm_calls"] for r in records) / runs,
+        "tokens_per_report": sum(r["tokens"] for r in records) / runs,
+        "tavily_calls_per_report": sum(r["tavily_calls"] for r in records) / runs,
+        "context_tokens_per_report": sum(r["context_tokens"] for r in records) / runs,
+        "llm_mean_wait": llm["mean_wait_seconds"],
+        "llm_retries": llm["retries"],
+        "peak_rss_mb": peak.get("mb"),
+    })
+    return summary
+
+
+def run_benchmark(
+    concurrency_levels: list[int],
+    runs: int,
+    llm: Optional[LLMProfile] = None,
+    tavily: Optional[TavilyProfile] = None,
+    llm_concurrency: int = 8,
+    tavily_concurrency: Optional[int] = None,
+    max_iterations: int = 3,
+    topic: str = "AI accelerator market",
+    notes_mode: Optional[str] = None,
+) -> list[dict]:
+    """
+    Benchmark the full workflow at several concurrency levels.
+
+    Each level runs `runs` reports with distinct queries, so the search
+    and LLM response caches cannot short-circuit the work.
+
+    Args:
+        concurrency_levels: Workflows in flight for each level
+        runs: Reports per level
+        llm: Simulated LLM behaviour
+        tavily: Simulated Tavily behaviour
+        llm_concurrency: Ceiling on concurrent LLM calls
+        tavily_concurrency: Maximum concurrent Tavily calls
+        max_iterations: Maximum revision iterations per report
+        topic: Base research topic
+        notes_mode: Researcher notes mode (llm, deferred or heuristic;
+            None for llm)
+
+    Returns:
+        One summary dict per concurrency level
+    """
+    notes_mode = notes_mode or "llm"
+    results = _run_levels(
+        concurrency_levels, runs, llm, tavily, llm_concurrency,
+        tavily_concurrency, max_iterations, topic, notes_mode,
+    )
+
+    for summary in results:
+        summary["notes_mode"] = notes_mode
+    return results
+
+
+def _run_levels(
+    concurrency_levels: list[int],
+    runs: int,
+    llm: Optional[LLMProfile],
+    tavily: Optional[TavilyProfile],
+    llm_concurrency: int,
+    tavily_concurrency: Optional[int],
+    max_iterations: int,
+    topic: str,
+    notes_mode: str,
+) -> list[dict]:
+    """Run every concurrency level against a fresh fake-backed runner."""
+    from src.graph import create_runner
+
+    results = []
+
+    with install_fakes(llm, tavily, llm_concurrency, tavily_concurrency):
+        runner = create_runner(
+            api_key="benchmark-key",
+            tavily_api_key="benchmark-key",
+            max_iterations=max_iterations,
+            enable_checkpointing=False,
+            agent_options={"researcher": {"notes_mode": notes_mode}},
+        )
+
+        for level, concurrency in enumerate(concurrency_levels):
+            queries = [f"{topic} #{level}.{i}" for i in range(runs)]
+            summary = asyncio.run(run_level(runner, queries, concurrency))
+            logger.info(
+                f"concurrency={concurrency}: p50 {summary['latency_p50']:.2f}s, "
+                f"{summary['runs_per_minute']:.1f} reports/min"
+            )
+            results.append(summary)
+
+    return results
+
+
+def print_benchmark_table(results: list[dict]):
+    """
+    Print benchmark results as a table.
+
+    Args:
+        results: Summaries from run_benchmark
+    """
+    header = (
+        f"{'notes':>9} {'conc':>5} {'ok':>5} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} "
+        f"{'runs/min':>9} {'llm/rep':>8} {'tok/rep':>8} {'ctx/rep':>8} {'tavily/rep':>10} "
+        f"{'wait s':>7} {'429s':>5} {'rss MiB':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "n/a"
+        print(
+            f"{r.get('notes_mode', 'llm'):>9} {r['concurrency']:>5} {r['succeeded']:>2}/{r['total']:<2} "
+            f"{r['latency_p50']:>8.2f} {r['latency_p95']:>8.2f} {r['latency_p99']:>8.2f} "
+            f"{r['runs_per_minute']:>9.1f} {r['llm_calls_per_report']:>8.1f} "
+            f"{r['tokens_per_report']:>8.0f} {r.get('context_tokens_per_report', 0):>8.0f} "
+            f"{r['tavily_calls_per_report']:>10.1f} "
+            f"{r['llm_mean_wait']:>7.2f} {r['llm_retries']:>5} {rss:>8}"
+        )
+
+
+def print_notes_savings(results: list[dict]):
+    """
+    Print the latency saved by each notes mode relative to "llm" notes.
+
+    Args:
+        results: Summaries from run_benchmark for several notes modes
+    """
+    baseline = {
+        r["concurrency"]: r for r in results if r.get("notes_mode") == "llm"
+    }
+    rows = [
+        r for r in results
+        if r.get("notes_mode") != "llm" and r["concurrency"] in baseline
+    ]
+    if not rows:
+        return
+
+    print("\nLatency saved vs llm notes:")
+    for r in rows:
+        base = baseline[r["concurrency"]]
+        p50 = base["latency_p50"] - r["latency_p50"]
+        p95 = base["latency_p95"] - r["latency_p95"]
+        share = f" ({p50 / base['latency_p50']:+.0%})" if base["latency_p50"] else ""
+        print(
+            f"  {r['notes_mode']:>9} @ conc {r['concurrency']}: "
+            f"p50 {p50:+.2f}s{share}, p95 {p95:+.2f}s"
+        )
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Offline end-to-end workflow benchmark (fake Groq and Tavily)",
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8],
+                        help="Workflows in flight, one level per value (default: 1 4 8)")
+    parser.add_argument("--runs", type=int, default=16,
+                        help="Reports per concurrency level (default: 16)")
+    parser.add_argument("--iterations", type=int, default=3,
+                        help="Maximum revision iterations per report (default: 3)")
+    parser.add_argument("--llm-latency", type=float, default=0.3,
+                        help="Seconds to first token per LLM call (default: 0.3)")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=250.0,
+                        help="Simulated output token rate (default: 250)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0,
+                        help="Fraction of LLM calls answered with a 429 (default: 0)")
+    parser.add_argument("--approval-rate", type=float, default=1.0,
+                        help="Fraction of critiques that approve (default: 1.0)")
+    parser.add_argument("--llm-concurrency", type=int, default=8,
+                        help="Ceiling on concurrent LLM calls (default: 8)")
+    parser.add_argument("--tavily-latency", type=float, default=0.5,
+                        help="Seconds per Tavily search (default: 0.5)")
+    parser.add_argument("--tavily-error-rate", type=float, default=0.0,
+                        help="Fraction of Tavily searches that fail (default: 0)")
+    parser.add_argument("--tavily-concurrency", type=int, default=None,
+                        help="Maximum concurrent Tavily calls (default: unlimited)")
+    parser.add_argument("--notes-mode", nargs="+", default=["llm"],
+                        choices=["llm", "deferred", "heuristic"],
+                        help="Researcher notes mode(s) to compare (default: llm)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for simulated errors and approvals")
+    parser.add_argument("--json", type=Path, metavar="FILE",
+                        help="Also write the results to FILE as JSON")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="Show application logs")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="DEBUG" if args.verbose else "WARNING")
+
+    results = []
+    for notes_mode in args.notes_mode:
+        results.extend(run_benchmark(
+            concurrency_levels=args.concurrency,
+            runs=args.runs,
+            llm=LLMProfile(
+                latency=args.llm_latency,
+                tokens_per_second=args.llm_tokens_per_second,
+                error_rate=args.llm_error_rate,
+                approval_rate=args.approval_rate,
+                seed=args.seed,
+            ),
+            tavily=TavilyProfile(
+                latency=args.tavily_latency,
+                error_rate=args.tavily_error_rate,
+                seed=args.seed,
+            ),
+            llm_concurrency=args.llm_concurrency,
+            tavily_concurrency=args.tavily_concurrency,
+            max_iterations=args.iterations,
+            notes_mode=notes_mode,
+        ))
+
+    print_benchmark_table(results)
+    print_notes_savings(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -45,6 +45,59 @@ class Settings:
         default_factory=lambda: int(os.getenv("MAX_TOKENS", "4096"))
     )
     
+    # =============================================================================
+    # Groq Rate Limits (shared by all agents; 0 disables a limit)
+    # =============================================================================
+    groq_rpm: int = field(
+        default_factory=lambda: int(os.getenv("GROQ_RPM", "30"))
+    )
+    groq_tpm: int = field(
+        default_factory=lambda: int(os.getenv("GROQ_TPM", "12000"))
+    )
+    groq_max_concurrency: int = field(
+        default_factory=lambda: int(os.getenv("GROQ_MAX_CONCURRENCY", "8"))
+    )
+    
+    # =============================================================================
+    # Research Enrichment (scrape top result pages; 0 disables)
+    # =============================================================================
+    research_enrich_top_n: int = field(
+        default_factory=lambda: int(os.getenv("RESEARCH_ENRICH_TOP_N", "0"))
+    )
+    research_enrich_timeout: float = field(
+        default_factory=lambda: float(os.getenv("RESEARCH_ENRICH_TIMEOUT", "8"))
+    )
+    research_enrich_max_per_host: int = field(
+        default_factory=lambda: int(os.getenv("RESEARCH_ENRICH_MAX_PER_HOST", "2"))
+    )
+    
+    # =============================================================================
+    # Research Critical Path (pipelined search; notes mode llm/deferred/heuristic)
+    # =============================================================================
+    research_pipelined: bool = field(
+        default_factory=lambda: os.getenv("RESEARCH_PIPELINED", "false").lower() in ("1", "true", "yes")
+    )
+    research_notes_mode: str = field(
+        default_factory=lambda: os.getenv("RESEARCH_NOTES_MODE", "llm").lower()
+    )
+    
+    # =============================================================================
+    # Analyst Context (research tokens per analysis; 0 = per-model default)
+    # =============================================================================
+    analyst_context_tokens: int = field(
+        default_factory=lambda: int(os.getenv("ANALYST_CONTEXT_TOKENS", "0"))
+    )
+    
+    # =============================================================================
+    # CPU-heavy Parsing/Analysis (inline, thread or process; 0 workers = CPU count)
+    # =============================================================================
+    analysis_executor: str = field(
+        default_factory=lambda: os.getenv("ANALYSIS_EXECUTOR", "inline").lower()
+    )
+    analysis_workers: int = field(
+        default_factory=lambda: int(os.getenv("ANALYSIS_WORKERS", "0"))
+    )
+    
     # =============================================================================
     # Application Settings
     # =============================================================================
@@ -60,6 +113,9 @@ class Settings:
     max_critic_iterations: int = field(
         default_factory=lambda: int(os.getenv("MAX_CRITIC_ITERATIONS", "3"))
     )
+    checkpoint_db: str = field(
+        default_factory=lambda: os.getenv("CHECKPOINT_DB", "")
+    )
     
     # =============================================================================
     # Paths
@@ -98,6 +154,39 @@ class Settings:
                 f"Max tokens must be positive, got {self.max_tokens}"
             )
         
+        if self.groq_rpm < 0 or self.groq_tpm < 0:
+            raise ValueError("Groq rate limits must not be negative")
+        
+        if self.groq_max_concurrency <= 0:
+            raise ValueError(
+                f"Groq max concurrency must be positive, got {self.groq_max_concurrency}"
+            )
+        
+        if self.research_enrich_top_n < 0 or self.research_enrich_timeout <= 0:
+            raise ValueError(
+                "Research enrichment needs a non-negative page count and a positive timeout"
+            )
+        
+        if self.research_notes_mode not in ("llm", "deferred", "heuristic"):
+            raise ValueError(
+                f"Research notes mode must be llm, deferred or heuristic, got {self.research_notes_mode}"
+            )
+        
+        if self.analyst_context_tokens < 0:
+            raise ValueError(
+                f"Analyst context tokens must not be negative, got {self.analyst_context_tokens}"
+            )
+        
+        if self.analysis_executor not in ("inline", "thread", "process"):
+            raise ValueError(
+                f"Analysis executor must be inline, thread or process, got {self.analysis_executor}"
+            )
+        
+        if self.analysis_workers < 0:
+            raise ValueError(
+                f"Analysis workers must not be negative, got {self.analysis_workers}"
+            )
+        
         if self.max_critic_iterations <= 0:
             raise ValueError(
                 f"Max critic iterations must be positive, got {self.max_critic_iterations}"
@@ -113,6 +202,42 @@ class Settings:
             "timeout": self.api_timeout,
         }
     
+    def get_rate_limit_config(self) -> dict:
+        """Get shared Groq rate limiter configuration as a dictionary."""
+        return {
+            "requests_per_minute": self.groq_rpm,
+            "tokens_per_minute": self.groq_tpm,
+            "max_concurrency": self.groq_max_concurrency,
+        }
+    
+    def get_enrichment_config(self) -> dict:
+        """Get researcher content enrichment configuration as a dictionary."""
+        return {
+            "enrich_top_n": self.research_enrich_top_n,
+            "enrich_timeout": self.research_enrich_timeout,
+            "enrich_max_per_host": self.research_enrich_max_per_host,
+        }
+    
+    def get_agent_options(self) -> dict:
+        """Get per-agent constructor arguments, keyed by agent type."""
+        return {
+            "researcher": {
+                **self.get_enrichment_config(),
+                "pipelined_search": self.research_pipelined,
+                "notes_mode": self.research_notes_mode,
+            },
+            "analyst": {
+                "context_token_budget": self.analyst_context_tokens or None,
+            },
+        }
+    
+    def get_executor_config(self) -> dict:
+        """Get parsing/analysis executor configuration as a dictionary."""
+        return {
+            "mode": self.analysis_executor,
+            "max_workers": self.analysis_workers or None,
+        }
+    
     def get_tavily_config(self) -> dict:
         """Get Tavily search configuration as a dictionary."""
         return {
@@ -4,6 +4,9 @@ Agent implementations for the Multi-Agent Virtual Company.
 This package provides all agent classes:
 - BaseAgent: Abstract base class for all agents
 - ToolEnabledAgent: Base class for agents with tools
+- LLMClientPool: Shared Groq clients reused across agents and runs
+- LLMResponseCache: Opt-in cache for repeated LLM prompts
+- LLMRateLimiter: Shared Groq rate limiter used by all agents
 - ResearcherAgent: Web research using Tavily
 - AnalystAgent: Data analysis and summarization
 - CriticAgent: Quality review and feedback
@@ -11,7 +14,10 @@ This package provides all agent classes:
 - SupervisorAgent: Workflow orchestration
 """
 
-from .base import BaseAgent, ToolEnabledAgent, create_llm
+from .base import BaseAgent, ToolEnabledAgent, create_llm, set_llm_concurrency
+from .llm_pool import LLMClientPool, get_llm_pool, configure_llm_pool
+from .llm_cache import LLMResponseCache, enable_response_cache, get_response_cache
+from .rate_limit import LLMRateLimiter, configure_rate_limiter, get_rate_limiter
 from .researcher import ResearcherAgent, create_researcher_agent
 from .analyst import AnalystAgent, create_analyst_agent
 from .critic import CriticAgent, create_critic_agent
@@ -22,6 +28,16 @@ __all__ = [
     "BaseAgent",
     "ToolEnabledAgent",
     "create_llm",
+    "set_llm_concurrency",
+    "LLMClientPool",
+    "get_llm_pool",
+    "configure_llm_pool",
+    "LLMResponseCache",
+    "enable_response_cache",
+    "get_response_cache",
+    "LLMRateLimiter",
+    "configure_rate_limiter",
+    "get_rate_limiter",
     "ResearcherAgent",
     "create_researcher_agent",
     "AnalystAgent",
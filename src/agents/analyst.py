@@ -21,6 +21,7 @@ from src.schemas.models import (
     AgentMessage,
 )
 from src.tools.analysis import ResearchDataProcessor, TextAnalyzer
+from src.tools.context_packer import context_budget_for
 from src.prompts.analyst import (
     ANALYST_SYSTEM_PROMPT,
     ANALYST_TASK_PROMPT,
@@ -45,6 +46,7 @@ class AnalystAgent(BaseAgent):
         model_name: str = "llama-3.3-70b-versatile",
         temperature: float = 0.5,  # Balanced for analysis
         max_tokens: int = 4096,
+        context_token_budget: Optional[int] = None,
     ):
         """
         Initialize the Analyst agent.
@@ -54,6 +56,9 @@ class AnalystAgent(BaseAgent):
             model_name: LLM model to use
             temperature: LLM temperature
             max_tokens: Maximum tokens for response
+            context_token_budget: Tokens of research content sent per
+                analysis (defaults to the model's budget, see
+                context_budget_for)
         """
         super().__init__(
             name="analyst",
@@ -66,6 +71,7 @@ class AnalystAgent(BaseAgent):
         # Initialize analysis tools
         self.data_processor = ResearchDataProcessor()
         self.text_analyzer = TextAnalyzer()
+        self.context_token_budget = context_token_budget or context_budget_for(model_name)
         
         logger.info("AnalystAgent initialized")
     
@@ -141,12 +147,15 @@ class AnalystAgent(BaseAgent):
         """
         logger.info(f"Analyzing research data for: {research_data.topic}")
         
-        # Prepare research data for LLM
-        formatted_content = self.data_processor.format_for_llm(research_data)
-        
-        # Get preliminary analysis from text analyzer
+        # Get preliminary analysis from text analyzer (memoized per content)
         preliminary_data = self.data_processor.prepare_for_analysis(research_data)
         
+        # Pack the most relevant content into the token budget for the LLM
+        context = self.data_processor.pack_context(research_data, self.context_token_budget)
+        formatted_content = self.data_processor.format_for_llm(
+            research_data, prepared=preliminary_data, context=context
+        )
+        
         # Create analysis prompt
         task_prompt = ANALYST_TASK_PROMPT.format(
             topic=research_data.topic,
@@ -471,8 +480,11 @@ Opportunities: {', '.join(analysis.opportunities_identified)}
         Returns:
             AnalysisSummary
         """
-        formatted_content = self.data_processor.format_for_llm(research_data)
-        preliminary_data = self.data_processor.prepare_for_analysis(research_data)
+        preliminary_data = await self.data_processor.aprepare_for_analysis(research_data)
+        context = await self.data_processor.apack_context(research_data, self.context_token_budget)
+        formatted_content = self.data_processor.format_for_llm(
+            research_data, prepared=preliminary_data, context=context
+        )
         
         task_prompt = ANALYST_TASK_PROMPT.format(
             topic=research_data.topic,
@@ -519,7 +531,7 @@ Opportunities: {', '.join(analysis.opportunities_identified)}
         )
         
         llm_response = await self.ainvoke_llm(revision_prompt)
-        preliminary_data = self.data_processor.prepare_for_analysis(research_data)
+        preliminary_data = await self.data_processor.aprepare_for_analysis(research_data)
         
         return self._parse_analysis_response(
             llm_response, research_data, preliminary_data
@@ -534,6 +546,7 @@ def create_analyst_agent(
     groq_api_key: str,
     model_name: str = "llama-3.3-70b-versatile",
     temperature: float = 0.5,
+    context_token_budget: Optional[int] = None,
 ) -> AnalystAgent:
     """
     Factory function to create a configured AnalystAgent.
@@ -542,6 +555,8 @@ def create_analyst_agent(
         groq_api_key: Groq API key
         model_name: LLM model name
         temperature: LLM temperature
+        context_token_budget: Tokens of research content per analysis
+            (defaults to the model's budget)
         
     Returns:
         Configured AnalystAgent instance
@@ -550,6 +565,7 @@ def create_analyst_agent(
         api_key=groq_api_key,
         model_name=model_name,
         temperature=temperature,
+        context_token_budget=context_token_budget,
     )
 
 
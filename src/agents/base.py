@@ -6,7 +6,7 @@ ensuring consistent interface and shared functionality.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from datetime import datetime
 from loguru import logger
 
@@ -16,6 +16,24 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
 from src.graph.state import GraphState, AgentType
 from src.schemas.models import AgentMessage
+from src.agents.rate_limit import get_rate_limiter, estimate_tokens
+from src.agents.llm_pool import get_llm_pool
+from src.agents.llm_cache import get_response_cache
+from src.tools.tracing import trace_span
+
+
+def set_llm_concurrency(limit: int):
+    """
+    Set the ceiling on concurrent LLM calls across all agents.
+    
+    The shared rate limiter may run below this ceiling while Groq is
+    throttling, and grows back toward it as calls succeed.
+    
+    Args:
+        limit: Maximum concurrent calls
+    """
+    get_rate_limiter().concurrency.set_max_limit(limit)
+    logger.info(f"LLM concurrency limit set to {limit}")
 
 
 class BaseAgent(ABC):
@@ -74,7 +92,10 @@ class BaseAgent(ABC):
         max_tokens: int,
     ) -> ChatGroq:
         """
-        Create a configured ChatGroq LLM instance.
+        Get a ChatGroq view from the shared client pool.
+        
+        The view has this agent's temperature and max tokens but shares
+        the pooled HTTP connections with every other agent.
         
         Args:
             api_key: Groq API key
@@ -85,12 +106,7 @@ class BaseAgent(ABC):
         Returns:
             Configured ChatGroq instance
         """
-        return ChatGroq(
-            api_key=api_key,
-            model_name=model_name,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
+        return get_llm_pool().get(api_key, model_name, temperature, max_tokens)
     
     @property
     @abstractmethod
@@ -122,6 +138,7 @@ class BaseAgent(ABC):
         self,
         user_message: str,
         system_prompt: Optional[str] = None,
+        allow_cached: bool = False,
     ) -> str:
         """
         Invoke the LLM with a message and return the response.
@@ -129,30 +146,43 @@ class BaseAgent(ABC):
         Args:
             user_message: The user/input message
             system_prompt: Override system prompt (optional)
+            allow_cached: Allow a cached response even though this
+                agent's temperature is above zero
             
         Returns:
             LLM response text
         """
         prompt = system_prompt or self.system_prompt
         
-        messages = [
-            SystemMessage(content=prompt),
-            HumanMessage(content=user_message),
-        ]
-        
-        logger.debug(f"Agent '{self.name}' invoking LLM")
-        
-        try:
-            response = self.llm.invoke(messages)
-            return response.content
-        except Exception as e:
-            logger.error(f"LLM invocation failed for agent '{self.name}': {e}")
-            raise
+        with trace_span("llm.invoke", kind="llm", agent=self.name, model=self.model_name) as span:
+            cached = self._cached_response(prompt, user_message, allow_cached)
+            if cached is not None:
+                span.set("cache_hit", True)
+                return cached
+            
+            messages = [
+                SystemMessage(content=prompt),
+                HumanMessage(content=user_message),
+            ]
+            
+            logger.debug(f"Agent '{self.name}' invoking LLM")
+            
+            try:
+                response = get_rate_limiter().call(
+                    lambda: self.llm.invoke(messages),
+                    self._estimate_tokens(prompt, user_message),
+                )
+                self._store_response(prompt, user_message, response.content, allow_cached)
+                return response.content
+            except Exception as e:
+                logger.error(f"LLM invocation failed for agent '{self.name}': {e}")
+                raise
     
     async def ainvoke_llm(
         self,
         user_message: str,
         system_prompt: Optional[str] = None,
+        allow_cached: bool = False,
     ) -> str:
         """
         Asynchronously invoke the LLM.
@@ -160,25 +190,150 @@ class BaseAgent(ABC):
         Args:
             user_message: The user/input message
             system_prompt: Override system prompt (optional)
+            allow_cached: Allow a cached response even though this
+                agent's temperature is above zero
             
         Returns:
             LLM response text
         """
         prompt = system_prompt or self.system_prompt
         
-        messages = [
-            SystemMessage(content=prompt),
-            HumanMessage(content=user_message),
-        ]
+        with trace_span("llm.ainvoke", kind="llm", agent=self.name, model=self.model_name) as span:
+            cached = self._cached_response(prompt, user_message, allow_cached)
+            if cached is not None:
+                span.set("cache_hit", True)
+                return cached
+            
+            messages = [
+                SystemMessage(content=prompt),
+                HumanMessage(content=user_message),
+            ]
+            
+            logger.debug(f"Agent '{self.name}' async invoking LLM")
+            
+            try:
+                response = await get_rate_limiter().acall(
+                    lambda: self.llm.ainvoke(messages),
+                    self._estimate_tokens(prompt, user_message),
+                )
+                self._store_response(prompt, user_message, response.content, allow_cached)
+                return response.content
+            except Exception as e:
+                logger.error(f"Async LLM invocation failed for agent '{self.name}': {e}")
+                raise
+    
+    async def astream_llm(
+        self,
+        user_message: str,
+        system_prompt: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Asynchronously invoke the LLM, reporting tokens as they arrive.
         
-        logger.debug(f"Agent '{self.name}' async invoking LLM")
+        Failures before the first token are retried by the rate limiter;
+        a stream that fails part-way raises, so on_token never sees
+        text twice.
         
-        try:
-            response = await self.llm.ainvoke(messages)
-            return response.content
-        except Exception as e:
-            logger.error(f"Async LLM invocation failed for agent '{self.name}': {e}")
-            raise
+        Args:
+            user_message: The user/input message
+            system_prompt: Override system prompt (optional)
+            on_token: Called with each chunk of generated text
+            
+        Returns:
+            Complete LLM response text
+        """
+        prompt = system_prompt or self.system_prompt
+        
+        with trace_span("llm.stream", kind="llm", agent=self.name, model=self.model_name):
+            messages = [
+                SystemMessage(content=prompt),
+                HumanMessage(content=user_message),
+            ]
+            
+            logger.debug(f"Agent '{self.name}' streaming LLM response")
+            
+            streamed = False
+            
+            async def stream():
+                nonlocal streamed
+                full = None
+                async for chunk in self.llm.astream(messages):
+                    if chunk.content:
+                        streamed = True
+                        if on_token:
+                            on_token(chunk.content)
+                    full = chunk if full is None else full + chunk
+                return full
+            
+            try:
+                # A retry would replay tokens the caller already has, so
+                # only failures before the first token are retried
+                response = await get_rate_limiter().acall(
+                    stream,
+                    self._estimate_tokens(prompt, user_message),
+                    can_retry=lambda: not streamed,
+                )
+                return response.content if response is not None else ""
+            except Exception as e:
+                logger.error(f"LLM streaming failed for agent '{self.name}': {e}")
+                raise
+    
+    def _cached_response(
+        self,
+        system_prompt: str,
+        user_message: str,
+        allow_cached: bool,
+    ) -> Optional[str]:
+        """
+        Look up a response in the shared LLM response cache.
+        
+        Args:
+            system_prompt: System prompt being sent
+            user_message: User message being sent
+            allow_cached: Allow caching above temperature zero
+            
+        Returns:
+            Cached response text, or None if caching is off or missed
+        """
+        cache = get_response_cache()
+        if cache is None:
+            return None
+        
+        cached = cache.get(
+            self.model_name, self.temperature, system_prompt, user_message, allow_cached
+        )
+        if cached is not None:
+            logger.debug(f"Agent '{self.name}' LLM cache hit")
+        return cached
+    
+    def _store_response(
+        self,
+        system_prompt: str,
+        user_message: str,
+        response: str,
+        allow_cached: bool,
+    ):
+        """Store a fresh response in the shared LLM response cache."""
+        cache = get_response_cache()
+        if cache is not None:
+            cache.set(
+                self.model_name, self.temperature, system_prompt, user_message,
+                response, allow_cached,
+            )
+    
+    def _estimate_tokens(self, system_prompt: str, user_message: str) -> int:
+        """
+        Estimate the rate-limit cost of one call from this agent.
+        
+        Args:
+            system_prompt: System prompt being sent
+            user_message: User message being sent
+            
+        Returns:
+            Estimated prompt plus completion tokens
+        """
+        return estimate_tokens(system_prompt + user_message, self.max_tokens)
     
     def create_message(
         self,
@@ -309,7 +464,11 @@ class ToolEnabledAgent(BaseAgent):
         logger.debug(f"Agent '{self.name}' invoking LLM with tools")
         
         try:
-            response = self.llm_with_tools.invoke(messages)
+            with trace_span("llm.invoke_with_tools", kind="llm", agent=self.name, model=self.model_name):
+                response = get_rate_limiter().call(
+                    lambda: self.llm_with_tools.invoke(messages),
+                    self._estimate_tokens(prompt, user_message),
+                )
             return response
         except Exception as e:
             logger.error(f"Tool invocation failed for agent '{self.name}': {e}")
@@ -329,6 +488,8 @@ def create_llm(
     """
     Factory function to create a configured ChatGroq instance.
     
+    The instance is a view on the shared client pool.
+    
     Args:
         api_key: Groq API key
         model_name: Model name
@@ -338,16 +499,12 @@ def create_llm(
     Returns:
         Configured ChatGroq instance
     """
-    return ChatGroq(
-        api_key=api_key,
-        model_name=model_name,
-        temperature=temperature,
-        max_tokens=max_tokens,
-    )
+    return get_llm_pool().get(api_key, model_name, temperature, max_tokens)
 
 
 __all__ = [
     "BaseAgent",
     "ToolEnabledAgent",
     "create_llm",
+    "set_llm_concurrency",
 ]
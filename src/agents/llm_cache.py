@@ -0,0 +1,344 @@
+"""
+LLM response cache for the Multi-Agent Virtual Company.
+
+Supervisor routing, error fallbacks and query generation frequently send
+byte-identical prompts. This opt-in cache answers repeats instantly:
+
+- Exact tier: LRU keyed on (model, temperature, system hash, user hash)
+  with a TTL
+- Semantic tier (optional): when an embedding function is supplied,
+  prompts whose user message embedding is close enough to a cached one
+  (same model, temperature and system prompt) reuse its response
+
+Calls with temperature > 0 bypass the cache unless the caller or the
+cache explicitly allows it, so sampled output is not frozen by accident.
+"""
+
+import os
+import math
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+from loguru import logger
+
+
+# Maps a text to its embedding vector
+EmbedFunction = Callable[[str], Sequence[float]]
+
+
+def _sha(text: str) -> str:
+    """Hash a prompt component."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors (0 if either is zero)."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+@dataclass
+class _SemanticEntry:
+    """Embedding and exact-tier key of a cached prompt."""
+
+    partition: str
+    embedding: Sequence[float]
+    key: str
+
+
+class LLMResponseCache:
+    """
+    Two-tier (exact + optional semantic) cache of LLM responses.
+
+    Thread-safe; one instance is shared by all agents in the process.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        embed_fn: Optional[EmbedFunction] = None,
+        similarity_threshold: float = 0.95,
+        max_semantic_entries: int = 256,
+        allow_nonzero_temperature: bool = False,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum exact-tier entries before LRU eviction
+            ttl: Seconds an entry stays valid
+            embed_fn: Embedding function enabling the semantic tier
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            max_semantic_entries: Maximum embeddings kept for the semantic tier
+            allow_nonzero_temperature: Cache calls with temperature > 0 too
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_entries = max_semantic_entries
+        self.allow_nonzero_temperature = allow_nonzero_temperature
+
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._semantic: OrderedDict[str, _SemanticEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._semantic_hits = 0
+        self._misses = 0
+        self._bypassed = 0
+
+    @staticmethod
+    def make_key(model: str, temperature: float, system_prompt: str, user_message: str) -> str:
+        """
+        Build the exact-tier key for a prompt.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            system_prompt: System prompt text
+            user_message: User message text
+
+        Returns:
+            Hex digest identifying the prompt
+        """
+        return _sha(
+            f"{LLMResponseCache._partition(model, temperature, system_prompt)}|{_sha(user_message)}"
+        )
+
+    @staticmethod
+    def _partition(model: str, temperature: float, system_prompt: str) -> str:
+        """Prompts are only comparable within the same model/temperature/system."""
+        return f"{model}|{temperature:.4f}|{_sha(system_prompt)}"
+
+    def is_cacheable(self, temperature: float, allow_cached: bool = False) -> bool:
+        """
+        Check whether a call at this temperature may use the cache.
+
+        Args:
+            temperature: Sampling temperature of the call
+            allow_cached: Caller vouches the prompt is deterministic enough
+
+        Returns:
+            True if the cache should be consulted
+        """
+        return temperature <= 0 or allow_cached or self.allow_nonzero_temperature
+
+    def get(
+        self,
+        model: str,
+        temperature: float,
+        system_prompt: str,
+        user_message: str,
+        allow_cached: bool = False,
+    ) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            system_prompt: System prompt text
+            user_message: User message text
+            allow_cached: Permit caching although temperature > 0
+
+        Returns:
+            Cached response text, or None on a miss or bypass
+        """
+        if not self.is_cacheable(temperature, allow_cached):
+            with self._lock:
+                self._bypassed += 1
+            return None
+
+        key = self.make_key(model, temperature, system_prompt, user_message)
+        now = time.time()
+
+        with self._lock:
+            value = self._lookup(key, now)
+            if value is not None:
+                self._hits += 1
+                return value
+
+        if self.embed_fn is not None:
+            value = self._semantic_lookup(
+                self._partition(model, temperature, system_prompt), user_message, now
+            )
+            if value is not None:
+                with self._lock:
+                    self._semantic_hits += 1
+                return value
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def set(
+        self,
+        model: str,
+        temperature: float,
+        system_prompt: str,
+        user_message: str,
+        response: str,
+        allow_cached: bool = False,
+    ):
+        """
+        Store a response.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            system_prompt: System prompt text
+            user_message: User message text
+            response: Response text to cache
+            allow_cached: Permit caching although temperature > 0
+        """
+        if not self.is_cacheable(temperature, allow_cached):
+            return
+
+        key = self.make_key(model, temperature, system_prompt, user_message)
+
+        embedding = None
+        if self.embed_fn is not None:
+            try:
+                embedding = self.embed_fn(user_message)
+            except Exception as e:
+                logger.warning(f"LLM cache embedding failed: {e}")
+
+        with self._lock:
+            self._entries[key] = (response, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._semantic.pop(evicted, None)
+
+            if embedding is not None:
+                self._semantic[key] = _SemanticEntry(
+                    partition=self._partition(model, temperature, system_prompt),
+                    embedding=embedding,
+                    key=key,
+                )
+                self._semantic.move_to_end(key)
+                while len(self._semantic) > self.max_semantic_entries:
+                    self._semantic.popitem(last=False)
+
+    def _lookup(self, key: str, now: float) -> Optional[str]:
+        """Exact-tier lookup. Caller must hold the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at < now:
+            del self._entries[key]
+            self._semantic.pop(key, None)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _semantic_lookup(self, partition: str, user_message: str, now: float) -> Optional[str]:
+        """Find the most similar cached prompt in the same partition."""
+        try:
+            embedding = self.embed_fn(user_message)
+        except Exception as e:
+            logger.warning(f"LLM cache embedding failed: {e}")
+            return None
+
+        with self._lock:
+            candidates = [e for e in self._semantic.values() if e.partition == partition]
+
+        best_key, best_score = None, self.similarity_threshold
+        for entry in candidates:
+            score = _cosine(embedding, entry.embedding)
+            if score >= best_score:
+                best_key, best_score = entry.key, score
+
+        if best_key is None:
+            return None
+
+        with self._lock:
+            return self._lookup(best_key, now)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._semantic.clear()
+
+    def stats(self) -> dict:
+        """Get hit/miss statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "semantic_entries": len(self._semantic),
+                "hits": self._hits,
+                "semantic_hits": self._semantic_hits,
+                "misses": self._misses,
+                "bypassed": self._bypassed,
+            }
+
+
+# =============================================================================
+# Process-wide Cache
+# =============================================================================
+
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_configured = False
+
+
+def enable_response_cache(**kwargs) -> LLMResponseCache:
+    """
+    Turn on the process-wide LLM response cache.
+
+    Args:
+        **kwargs: LLMResponseCache arguments
+
+    Returns:
+        The shared cache
+    """
+    global _response_cache, _response_cache_configured
+    _response_cache = LLMResponseCache(**kwargs)
+    _response_cache_configured = True
+    logger.info("LLM response cache enabled")
+    return _response_cache
+
+
+def disable_response_cache():
+    """Turn off the process-wide LLM response cache."""
+    global _response_cache, _response_cache_configured
+    _response_cache = None
+    _response_cache_configured = True
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache.
+
+    Unless enabled or disabled explicitly, the cache is controlled by
+    environment variables:
+    - LLM_CACHE_ENABLED: set to "true" to enable caching (off by default)
+    - LLM_CACHE_TTL: entry lifetime in seconds (default 3600)
+
+    Returns:
+        Shared cache, or None if caching is disabled
+    """
+    if not _response_cache_configured:
+        if os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true", "yes"):
+            enable_response_cache(ttl=float(os.getenv("LLM_CACHE_TTL", "3600")))
+        else:
+            disable_response_cache()
+    return _response_cache
+
+
+__all__ = [
+    "LLMResponseCache",
+    "enable_response_cache",
+    "disable_response_cache",
+    "get_response_cache",
+]
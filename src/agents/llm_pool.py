@@ -0,0 +1,274 @@
+"""
+Shared LLM client pool for the Multi-Agent Virtual Company.
+
+Agents differ only in temperature and max_tokens, so building a separate
+ChatGroq (and HTTP connection pool) for each one wastes TLS handshakes
+and client construction on every run. The pool keeps one keep-alive
+client per (api_key, model) for the lifetime of the process and hands
+out cheap per-agent views that share its connections.
+
+The pool is module-level, so it survives AgentRegistry.reset().
+
+Async connections are bound to the event loop that opened them, while
+sync entry points (run_with_events, the pipelined researcher, the
+benchmarks) start a fresh loop with asyncio.run on every call. The
+async client therefore keeps one connection pool per running loop.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Callable, Optional
+
+import httpx
+from loguru import logger
+from langchain_core.language_models import BaseChatModel
+from langchain_groq import ChatGroq
+
+
+# Signature of a factory that builds the shared base client for a key/model
+ClientFactory = Callable[[str, str], BaseChatModel]
+
+# Connection pool sizing for the shared HTTP clients
+DEFAULT_HTTP_LIMITS = httpx.Limits(
+    max_connections=32,
+    max_keepalive_connections=16,
+    keepalive_expiry=60.0,
+)
+DEFAULT_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+
+class LoopBoundAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    Async transport with one keep-alive connection pool per event loop.
+
+    A pool whose connections were opened on a loop that has since
+    closed fails with "Event loop is closed" on its next request. Each
+    running loop gets its own pool instead, and pools of closed loops
+    are dropped the next time a pool is looked up.
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits = DEFAULT_HTTP_LIMITS,
+        factory: Optional[Callable[[], httpx.AsyncBaseTransport]] = None,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            limits: Connection limits of each per-loop pool
+            factory: Builds a per-loop transport (defaults to an
+                httpx.AsyncHTTPTransport with the given limits)
+        """
+        self.factory = factory or (lambda: httpx.AsyncHTTPTransport(limits=limits))
+        self._transports: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _for_running_loop(self) -> httpx.AsyncBaseTransport:
+        """Get (or create) the pool of the running loop."""
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            for stale in [other for other in self._transports if other.is_closed()]:
+                del self._transports[stale]
+
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = self.factory()
+                self._transports[loop] = transport
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send the request through the running loop's pool."""
+        return await self._for_running_loop().handle_async_request(request)
+
+    async def aclose(self):
+        """Close the running loop's pool."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.pop(loop, None)
+        if transport is not None:
+            await transport.aclose()
+
+    def __len__(self) -> int:
+        """Number of per-loop pools held."""
+        return len(self._transports)
+
+
+def create_groq_client(api_key: str, model_name: str) -> ChatGroq:
+    """
+    Build a ChatGroq backed by keep-alive HTTP connection pools.
+
+    The async client keeps a separate pool per event loop (see
+    LoopBoundAsyncTransport), so it can be shared across asyncio.run calls.
+
+    Args:
+        api_key: Groq API key
+        model_name: Model name
+
+    Returns:
+        ChatGroq instance whose clients can be shared by many views
+    """
+    return ChatGroq(
+        api_key=api_key,
+        model_name=model_name,
+        http_client=httpx.Client(limits=DEFAULT_HTTP_LIMITS, timeout=DEFAULT_HTTP_TIMEOUT),
+        http_async_client=httpx.AsyncClient(
+            transport=LoopBoundAsyncTransport(DEFAULT_HTTP_LIMITS),
+            timeout=DEFAULT_HTTP_TIMEOUT,
+        ),
+        # Retries are handled by the shared rate limiter
+        max_retries=0,
+    )
+
+
+class LLMClientPool:
+    """
+    Process-wide pool of LLM clients keyed by (api_key, model).
+
+    `get` returns a per-agent view: a shallow copy of the pooled client
+    with its own temperature and max_tokens, sharing the underlying
+    Groq SDK client and HTTP connections.
+    """
+
+    def __init__(self, factory: Optional[ClientFactory] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Builds the base client for a key/model
+                (defaults to create_groq_client)
+        """
+        self.factory = factory or create_groq_client
+        self._clients: dict[tuple[str, str], BaseChatModel] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def get_base(self, api_key: str, model_name: str) -> BaseChatModel:
+        """
+        Get (or create) the shared base client for a key/model.
+
+        Args:
+            api_key: Groq API key
+            model_name: Model name
+
+        Returns:
+            Pooled base client
+        """
+        key = (api_key, model_name)
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self.factory(api_key, model_name)
+                self._clients[key] = client
+                self.created += 1
+                logger.debug(f"LLM pool created client for model '{model_name}'")
+        return client
+
+    def get(
+        self,
+        api_key: str,
+        model_name: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> BaseChatModel:
+        """
+        Get a per-agent view of the pooled client.
+
+        Args:
+            api_key: Groq API key
+            model_name: Model name
+            temperature: Temperature for this view
+            max_tokens: Max tokens for this view
+
+        Returns:
+            Chat model sharing the pooled connections
+        """
+        base = self.get_base(api_key, model_name)
+        fields = type(base).model_fields
+
+        update = {}
+        if "temperature" in fields:
+            # ChatGroq's validator maps 0 to 1e-8; model_copy skips validation
+            update["temperature"] = temperature or 1e-8
+        if "max_tokens" in fields:
+            update["max_tokens"] = max_tokens
+
+        return base.model_copy(update=update)
+
+    def clear(self):
+        """Drop all pooled clients and close their HTTP connections."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+
+        for client in clients:
+            http_client = getattr(client, "http_client", None)
+            if isinstance(http_client, httpx.Client):
+                http_client.close()
+
+    def stats(self) -> dict:
+        """Get pool statistics."""
+        with self._lock:
+            return {"clients": len(self._clients), "created": self.created}
+
+    def __len__(self) -> int:
+        """Number of pooled base clients."""
+        return len(self._clients)
+
+
+# =============================================================================
+# Process-wide Pool
+# =============================================================================
+
+_llm_pool: Optional[LLMClientPool] = None
+_llm_pool_lock = threading.Lock()
+
+
+def get_llm_pool() -> LLMClientPool:
+    """
+    Get the process-wide LLM client pool.
+
+    Returns:
+        Shared LLMClientPool
+    """
+    global _llm_pool
+
+    with _llm_pool_lock:
+        if _llm_pool is None:
+            _llm_pool = LLMClientPool()
+        return _llm_pool
+
+
+def configure_llm_pool(factory: Optional[ClientFactory] = None) -> LLMClientPool:
+    """
+    Replace the process-wide pool, optionally with a custom client factory.
+
+    Benchmarks and tests use this to substitute fake chat models for
+    Groq without touching agent code.
+
+    Args:
+        factory: Builds the base client for a key/model (None for Groq)
+
+    Returns:
+        The new shared pool
+    """
+    global _llm_pool
+
+    with _llm_pool_lock:
+        previous, _llm_pool = _llm_pool, LLMClientPool(factory)
+
+    if previous is not None:
+        previous.clear()
+    return _llm_pool
+
+
+__all__ = [
+    "LLMClientPool",
+    "LoopBoundAsyncTransport",
+    "create_groq_client",
+    "get_llm_pool",
+    "configure_llm_pool",
+]
@@ -0,0 +1,804 @@
+"""
+Process-wide rate limiting for Groq LLM calls.
+
+Every agent owns its own ChatGroq client, but Groq enforces its quotas per
+API key. This module provides one shared limiter that all agents route
+their calls through:
+
+- TokenBucket: request-per-minute and token-per-minute budgets
+- AdaptiveConcurrency: AIMD cap on in-flight calls, halved on 429s and
+  grown back slowly on success
+- LLMRateLimiter: combines both, retries throttled calls honouring
+  Retry-After, reconciles estimated vs. reported token usage and keeps
+  wait-time metrics
+
+The limiter works for both threaded (sync) and asyncio callers.
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+import contextlib
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from loguru import logger
+
+from src.tools.tracing import current_span
+
+
+T = TypeVar("T")
+
+# Rough characters-per-token ratio used to estimate prompt size
+CHARS_PER_TOKEN = 4
+
+# Completion tokens reserved up front, reconciled after the response
+DEFAULT_COMPLETION_RESERVE = 1024
+
+
+# =============================================================================
+# Token Bucket
+# =============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with reservation semantics.
+
+    Callers reserve tokens immediately (the balance may go negative) and
+    are told how long to wait before proceeding. This keeps requests in
+    arrival order and works the same for threads and coroutines.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            capacity: Maximum tokens the bucket can hold (burst size)
+            refill_per_second: Tokens added per second
+        """
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: float) -> "TokenBucket":
+        """Create a bucket that allows `limit` units per minute."""
+        return cls(capacity=limit, refill_per_second=limit / 60.0)
+
+    def _refill(self, now: float):
+        """Add tokens accrued since the last update."""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+            self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Reserve tokens and return the delay before they are available.
+
+        Requests larger than the bucket are clamped to its capacity so
+        they can eventually proceed.
+
+        Args:
+            amount: Tokens to reserve
+
+        Returns:
+            Seconds the caller should wait before proceeding
+        """
+        amount = min(float(amount), self.capacity)
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.refill_per_second
+
+    def adjust(self, delta: float):
+        """
+        Return (positive) or charge (negative) tokens after the fact.
+
+        Args:
+            delta: Tokens to add back to the bucket
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + delta)
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (negative when in debt)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+# =============================================================================
+# Adaptive Concurrency
+# =============================================================================
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on in-flight calls shared by threads and coroutines.
+
+    The limit grows by roughly one slot per limit's worth of successful
+    calls and is halved when the API throttles us. Repeated throttles
+    within the cooldown window only count once, so a burst of 429s from
+    calls already in flight does not collapse the limit to the floor.
+    """
+
+    def __init__(
+        self,
+        max_limit: int = 8,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        cooldown: float = 5.0,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_limit: Ceiling for concurrent calls
+            min_limit: Floor for concurrent calls
+            initial_limit: Starting limit (defaults to max_limit)
+            decrease_factor: Multiplier applied on throttling
+            cooldown: Seconds during which further throttles are ignored
+        """
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+
+        self._limit = float(initial_limit or self.max_limit)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Current number of allowed concurrent calls."""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently holding a slot."""
+        return self._in_flight
+
+    def _wake_waiters(self):
+        """Hand free slots to queued waiters. Caller must hold the lock."""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+
+            if isinstance(waiter, threading.Event):
+                self._in_flight += 1
+                waiter.set()
+                continue
+
+            loop, future, grant = waiter
+            if future.cancelled() or loop.is_closed():
+                continue
+            self._in_flight += 1
+            grant.append(True)
+            loop.call_soon_threadsafe(_resolve_future, future)
+
+    def acquire(self):
+        """Block the current thread until a slot is available."""
+        with self._lock:
+            if self._in_flight < self.limit and not self._waiters:
+                self._in_flight += 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+
+        # The slot is handed over by release() before the event is set
+        event.wait()
+
+    async def aacquire(self):
+        """Wait without blocking the event loop until a slot is available."""
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            if self._in_flight < self.limit and not self._waiters:
+                self._in_flight += 1
+                return
+            future = loop.create_future()
+            grant: list = []
+            self._waiters.append((loop, future, grant))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                future.cancel()
+                if grant:
+                    # Slot was handed over just as we were cancelled
+                    self._in_flight -= 1
+                    self._wake_waiters()
+            raise
+
+    def release(self):
+        """Return a slot and wake the next waiter."""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._wake_waiters()
+
+    def set_max_limit(self, max_limit: int):
+        """
+        Change the concurrency ceiling without disturbing in-flight calls.
+
+        Args:
+            max_limit: New ceiling for concurrent calls
+        """
+        with self._lock:
+            self.max_limit = max(1, int(max_limit))
+            self.min_limit = min(self.min_limit, self.max_limit)
+            self._limit = float(self.max_limit)
+            self._wake_waiters()
+
+    def on_success(self):
+        """Additive increase after a successful call."""
+        with self._lock:
+            if self._limit < self.max_limit:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+                self._wake_waiters()
+
+    def on_throttle(self) -> bool:
+        """
+        Multiplicative decrease after a 429.
+
+        Returns:
+            True if the limit was reduced, False if still cooling down
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_decrease < self.cooldown:
+                return False
+            self._last_decrease = now
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            return True
+
+
+def _resolve_future(future: asyncio.Future):
+    """Complete a waiter future unless it was cancelled meanwhile."""
+    if not future.done():
+        future.set_result(None)
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+@dataclass
+class RateLimiterMetrics:
+    """Counters describing limiter behaviour since the last reset."""
+
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    throttled: int = 0
+    retries: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    estimated_tokens: int = 0
+    actual_tokens: int = 0
+
+    def record_wait(self, seconds: float):
+        """Record time a call spent queued before dispatch."""
+        self.total_wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        """Average queueing delay per dispatched request."""
+        return self.total_wait_seconds / self.requests if self.requests else 0.0
+
+
+@dataclass
+class TokenUsage:
+    """LLM calls and tokens consumed within a tracking scope."""
+
+    calls: int = 0
+    tokens: int = 0
+
+
+# Usage accumulator for the current node/task (None when not tracking)
+_token_usage: ContextVar[Optional[TokenUsage]] = ContextVar("llm_token_usage", default=None)
+
+
+@contextlib.contextmanager
+def track_token_usage():
+    """
+    Count LLM calls and tokens made by the enclosed code.
+
+    Scopes follow contextvars, so calls from asyncio tasks started
+    inside the block are counted too. Cached responses cost nothing
+    and are not counted.
+
+    Yields:
+        TokenUsage updated as calls complete
+    """
+    usage = TokenUsage()
+    token = _token_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _token_usage.reset(token)
+
+
+# =============================================================================
+# Error Classification
+# =============================================================================
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """
+    Extract the HTTP status code from an API exception, if any.
+
+    Args:
+        error: Exception raised by the LLM client
+
+    Returns:
+        Status code or None
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether an exception is a 429 / rate limit response."""
+    return get_status_code(error) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Check whether an exception is a retryable server or connection error."""
+    status = get_status_code(error)
+    if status is not None:
+        return status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def parse_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Read the server-requested delay from a throttling error.
+
+    Supports the `retry-after-ms` and `retry-after` (seconds) headers.
+
+    Args:
+        error: Exception raised by the LLM client
+
+    Returns:
+        Delay in seconds, or None if the server did not specify one
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def estimate_tokens(text: str, max_tokens: int = DEFAULT_COMPLETION_RESERVE) -> int:
+    """
+    Estimate the quota cost of a request before sending it.
+
+    Args:
+        text: Full prompt text (system and user messages)
+        max_tokens: Completion limit configured on the model
+
+    Returns:
+        Estimated prompt tokens plus a completion reserve
+    """
+    prompt_tokens = len(text) // CHARS_PER_TOKEN + 1
+    return prompt_tokens + min(max_tokens, DEFAULT_COMPLETION_RESERVE)
+
+
+def get_total_tokens(response: Any) -> Optional[int]:
+    """
+    Read the reported token usage from an LLM response.
+
+    Args:
+        response: LangChain message returned by the model
+
+    Returns:
+        Total tokens used, or None if the response carries no usage data
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage and usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+
+    metadata = getattr(response, "response_metadata", None) or {}
+    token_usage = metadata.get("token_usage") or {}
+    total = token_usage.get("total_tokens")
+    return int(total) if total else None
+
+
+def get_token_breakdown(response: Any) -> dict:
+    """
+    Read prompt/completion token counts from an LLM response.
+
+    Args:
+        response: LangChain message returned by the model
+
+    Returns:
+        Dict with any of input_tokens, output_tokens, total_tokens
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    return {
+        key: int(usage[key])
+        for key in ("input_tokens", "output_tokens", "total_tokens")
+        if usage.get(key)
+    }
+
+
+# =============================================================================
+# Rate Limiter
+# =============================================================================
+
+class LLMRateLimiter:
+    """
+    Shared RPM/TPM budget and adaptive concurrency for LLM calls.
+
+    Wrap each model call with `call` (sync) or `acall` (async). The
+    limiter queues the call until a concurrency slot and enough request
+    and token budget are available, retries 429s and transient server
+    errors with backoff, and feeds the outcome back into the AIMD limit.
+    A 429 also pauses every caller until its Retry-After has elapsed,
+    so one throttle does not turn into a storm of them.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = 30,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrency: int = 8,
+        max_retries: int = 4,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Request quota (None or 0 for unlimited)
+            tokens_per_minute: Token quota (None or 0 for unlimited)
+            max_concurrency: Ceiling for concurrent in-flight calls
+            max_retries: Retries for throttled or transient failures
+            base_backoff: Initial backoff when no Retry-After is given
+            max_backoff: Upper bound for any single backoff
+        """
+        self.requests_per_minute = requests_per_minute or None
+        self.tokens_per_minute = tokens_per_minute or None
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self.request_bucket = (
+            TokenBucket.per_minute(requests_per_minute) if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket.per_minute(tokens_per_minute) if tokens_per_minute else None
+        )
+        self.concurrency = AdaptiveConcurrency(max_limit=max_concurrency)
+
+        self._metrics = RateLimiterMetrics()
+        self._metrics_lock = threading.Lock()
+        self._paused_until = 0.0
+
+    # -------------------------------------------------------------------------
+    # Budget handling
+    # -------------------------------------------------------------------------
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        """Reserve request and token budget; return the required delay."""
+        delay = max(0.0, self._paused_until - time.monotonic())
+        if self.request_bucket:
+            delay = max(delay, self.request_bucket.reserve(1))
+        if self.token_bucket:
+            delay = max(delay, self.token_bucket.reserve(estimated_tokens))
+        return delay
+
+    def _refund(self, estimated_tokens: int):
+        """Give back a reservation that was never sent."""
+        if self.request_bucket:
+            self.request_bucket.adjust(1)
+        if self.token_bucket:
+            self.token_bucket.adjust(estimated_tokens)
+
+    def _reconcile(self, estimated_tokens: int, response: Any):
+        """Correct the token bucket with the usage the API reported."""
+        actual = get_total_tokens(response)
+
+        with self._metrics_lock:
+            self._metrics.successes += 1
+            self._metrics.estimated_tokens += estimated_tokens
+            self._metrics.actual_tokens += actual or estimated_tokens
+
+        span = current_span()
+        for key, value in get_token_breakdown(response).items():
+            span.set(key, value)
+
+        usage = _token_usage.get()
+        if usage is not None:
+            usage.calls += 1
+            usage.tokens += actual or estimated_tokens
+
+        if actual is not None and self.token_bucket:
+            self.token_bucket.adjust(estimated_tokens - actual)
+
+        self.concurrency.on_success()
+
+    def _backoff_for(self, error: BaseException, attempt: int) -> Optional[float]:
+        """
+        Decide whether and how long to wait before retrying a failure.
+
+        Returns:
+            Delay in seconds, or None if the error should be raised
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if is_rate_limit_error(error):
+            retry_after = parse_retry_after(error)
+            reduced = self.concurrency.on_throttle()
+
+            with self._metrics_lock:
+                self._metrics.throttled += 1
+
+            delay = retry_after if retry_after is not None else self._exponential(attempt)
+            delay = min(delay, self.max_backoff)
+            # Hold back every caller, not just this one
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+            logger.warning(
+                f"LLM rate limited (attempt {attempt + 1}), retrying in {delay:.1f}s"
+                + (f", concurrency now {self.concurrency.limit}" if reduced else "")
+            )
+            return delay
+
+        if is_transient_error(error):
+            delay = self._exponential(attempt)
+            logger.warning(f"Transient LLM error ({error}), retrying in {delay:.1f}s")
+            return delay
+
+        return None
+
+    def _exponential(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def _record_dispatch(self, waited: float, is_retry: bool):
+        """Update counters when a request is actually sent."""
+        with self._metrics_lock:
+            self._metrics.requests += 1
+            if is_retry:
+                self._metrics.retries += 1
+            self._metrics.record_wait(waited)
+
+        span = current_span()
+        span.add("queue_wait_seconds", waited)
+        if is_retry:
+            span.add("retries")
+
+    def _record_failure(self):
+        """Count a call that ultimately failed."""
+        with self._metrics_lock:
+            self._metrics.failures += 1
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def call(self, fn: Callable[[], T], estimated_tokens: int = DEFAULT_COMPLETION_RESERVE) -> T:
+        """
+        Run a blocking LLM call within the shared limits.
+
+        Args:
+            fn: Zero-argument function that performs the call
+            estimated_tokens: Expected quota cost of the call
+
+        Returns:
+            Whatever `fn` returns
+        """
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            self.concurrency.acquire()
+            try:
+                delay = self._reserve(estimated_tokens)
+                if delay > 0:
+                    time.sleep(delay)
+                self._record_dispatch(time.monotonic() - start, attempt > 0)
+
+                try:
+                    response = fn()
+                except Exception as e:
+                    backoff = self._backoff_for(e, attempt)
+                    if backoff is None:
+                        self._record_failure()
+                        raise
+                else:
+                    self._reconcile(estimated_tokens, response)
+                    return response
+            finally:
+                self.concurrency.release()
+
+            time.sleep(backoff)
+            attempt += 1
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        estimated_tokens: int = DEFAULT_COMPLETION_RESERVE,
+        can_retry: Optional[Callable[[], bool]] = None,
+    ) -> T:
+        """
+        Run an async LLM call within the shared limits.
+
+        Args:
+            fn: Zero-argument function returning the call's awaitable
+            estimated_tokens: Expected quota cost of the call
+            can_retry: Checked after a failure; returning False raises
+                the error instead of retrying (e.g. once a stream has
+                delivered output)
+
+        Returns:
+            Whatever the awaitable resolves to
+        """
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            await self.concurrency.aacquire()
+            try:
+                delay = self._reserve(estimated_tokens)
+                try:
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    self._refund(estimated_tokens)
+                    raise
+                self._record_dispatch(time.monotonic() - start, attempt > 0)
+
+                try:
+                    response = await fn()
+                except Exception as e:
+                    retryable = can_retry is None or can_retry()
+                    backoff = self._backoff_for(e, attempt) if retryable else None
+                    if backoff is None:
+                        self._record_failure()
+                        raise
+                else:
+                    self._reconcile(estimated_tokens, response)
+                    return response
+            finally:
+                self.concurrency.release()
+
+            await asyncio.sleep(backoff)
+            attempt += 1
+
+    def metrics(self) -> dict:
+        """
+        Get a snapshot of limiter metrics.
+
+        Returns:
+            Dictionary of counters plus current limit and budget state
+        """
+        with self._metrics_lock:
+            snapshot = asdict(self._metrics)
+            snapshot["mean_wait_seconds"] = self._metrics.mean_wait_seconds
+
+        snapshot.update({
+            "concurrency_limit": self.concurrency.limit,
+            "in_flight": self.concurrency.in_flight,
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+        })
+        return snapshot
+
+    def reset_metrics(self):
+        """Clear all counters."""
+        with self._metrics_lock:
+            self._metrics = RateLimiterMetrics()
+
+
+# =============================================================================
+# Process-wide Limiter
+# =============================================================================
+
+_rate_limiter: Optional[LLMRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def configure_rate_limiter(
+    requests_per_minute: Optional[int] = None,
+    tokens_per_minute: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+    **kwargs,
+) -> LLMRateLimiter:
+    """
+    Replace the process-wide limiter.
+
+    Unspecified limits fall back to the environment:
+    - GROQ_RPM: requests per minute (default 30, 0 for unlimited)
+    - GROQ_TPM: tokens per minute (default 12000, 0 for unlimited)
+    - GROQ_MAX_CONCURRENCY: concurrent call ceiling (default 8)
+
+    Args:
+        requests_per_minute: Request quota
+        tokens_per_minute: Token quota
+        max_concurrency: Concurrent call ceiling
+        **kwargs: Additional LLMRateLimiter arguments
+
+    Returns:
+        The new shared limiter
+    """
+    global _rate_limiter
+
+    if requests_per_minute is None:
+        requests_per_minute = int(os.getenv("GROQ_RPM", "30"))
+    if tokens_per_minute is None:
+        tokens_per_minute = int(os.getenv("GROQ_TPM", "12000"))
+    if max_concurrency is None:
+        max_concurrency = int(os.getenv("GROQ_MAX_CONCURRENCY", "8"))
+
+    limiter = LLMRateLimiter(
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        max_concurrency=max_concurrency,
+        **kwargs,
+    )
+
+    with _rate_limiter_lock:
+        _rate_limiter = limiter
+
+    logger.info(
+        f"LLM rate limiter: {requests_per_minute or 'unlimited'} RPM, "
+        f"{tokens_per_minute or 'unlimited'} TPM, concurrency <= {max_concurrency}"
+    )
+    return limiter
+
+
+def get_rate_limiter() -> LLMRateLimiter:
+    """
+    Get the process-wide limiter, creating it from the environment if needed.
+
+    Returns:
+        Shared LLMRateLimiter
+    """
+    if _rate_limiter is None:
+        configure_rate_limiter()
+    return _rate_limiter
+
+
+__all__ = [
+    "TokenBucket",
+    "AdaptiveConcurrency",
+    "RateLimiterMetrics",
+    "TokenUsage",
+    "track_token_usage",
+    "LLMRateLimiter",
+    "configure_rate_limiter",
+    "get_rate_limiter",
+    "estimate_tokens",
+    "is_rate_limit_error",
+    "parse_retry_after",
+]
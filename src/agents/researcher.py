@@ -5,14 +5,34 @@ The Researcher agent is responsible for gathering information from the web
 using Tavily search API. It's the first agent in the research pipeline.
 """
 
-from typing import Optional
+import asyncio
+import threading
+import contextlib
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, Optional, Union
 from datetime import datetime
+from urllib.parse import urlparse
 from loguru import logger
 
 from src.agents.base import ToolEnabledAgent
 from src.graph.state import GraphState
 from src.schemas.models import ResearchData, SearchResult, AgentMessage
-from src.tools.search import TavilySearchTool, create_tavily_tool
+from src.tools.search import (
+    SearchCache,
+    TavilySearchTool,
+    create_tavily_tool,
+    get_shared_search_cache,
+)
+from src.tools.research_index import (
+    ResearchIndex,
+    topic_signature,
+    signature_similarity,
+    get_shared_research_index,
+)
+from src.tools.scraper import WebScraper, create_scraper
+from src.tools.analysis import TextAnalyzer
+from src.tools.tracing import trace_span
 from src.prompts.researcher import (
     RESEARCHER_SYSTEM_PROMPT,
     RESEARCHER_TASK_PROMPT,
@@ -29,6 +49,18 @@ class ResearcherAgent(ToolEnabledAgent):
     raw research data for the Analyst agent.
     """
     
+    # Generated search queries used per topic
+    MAX_GENERATED_QUERIES = 3
+    
+    # Keyword overlap at which a pipelined query duplicates one in flight
+    DUPLICATE_QUERY_SIMILARITY = 0.8
+    
+    # How research notes are produced (see notes_mode)
+    NOTES_MODES = ("llm", "deferred", "heuristic")
+    
+    # Deferred notes kept waiting for collection before the oldest are dropped
+    MAX_PENDING_NOTES = 64
+    
     def __init__(
         self,
         api_key: str,
@@ -37,6 +69,17 @@ class ResearcherAgent(ToolEnabledAgent):
         temperature: float = 0.3,  # Lower temperature for factual research
         max_tokens: int = 4096,
         max_search_results: int = 5,
+        concurrent_search: bool = True,
+        max_concurrent_searches: int = 3,
+        search_timeout: float = 20.0,
+        search_cache: Optional[SearchCache] = None,
+        enrich_top_n: int = 0,
+        enrich_timeout: float = 8.0,
+        enrich_max_per_host: int = 2,
+        scraper: Optional[WebScraper] = None,
+        research_index: Optional[ResearchIndex] = None,
+        pipelined_search: bool = False,
+        notes_mode: str = "llm",
     ):
         """
         Initialize the Researcher agent.
@@ -48,13 +91,67 @@ class ResearcherAgent(ToolEnabledAgent):
             temperature: LLM temperature (lower for factual output)
             max_tokens: Maximum tokens for LLM response
             max_search_results: Maximum results per search query
+            concurrent_search: Fan out all search queries at once
+            max_concurrent_searches: Maximum searches in flight at a time
+            search_timeout: Per-query deadline in seconds (concurrent mode)
+            search_cache: Search result cache (defaults to the shared cache)
+            enrich_top_n: Scrape the top N result pages to replace their
+                snippets with full text (0 disables)
+            enrich_timeout: Overall time budget in seconds for the
+                enrichment stage
+            enrich_max_per_host: Maximum concurrent scrapes per host
+            scraper: WebScraper used for enrichment (created on first use)
+            research_index: Index of earlier searches to reuse for
+                overlapping queries (defaults to the shared index, which
+                is off unless RESEARCH_INDEX_ENABLED or RESEARCH_INDEX_PATH
+                is set)
+            pipelined_search: Search the raw topic while the search
+                queries are still being generated, and launch each
+                generated query as soon as it is streamed
+            notes_mode: How research notes are produced:
+                - llm: LLM call before research completes
+                - deferred: heuristic notes at once; the LLM notes run
+                  during the analyst phase and replace them when
+                  collected (see collect_research_notes)
+                - heuristic: local summary only, no LLM call
+            
+        Raises:
+            ValueError: If notes_mode is not one of NOTES_MODES
         """
         # Initialize Tavily search tool
         self.search_tool = create_tavily_tool(
             api_key=tavily_api_key,
             max_results=max_search_results,
+            cache=search_cache if search_cache is not None else get_shared_search_cache(),
         )
         self.tavily_api_key = tavily_api_key
+        self.concurrent_search = concurrent_search
+        self.max_concurrent_searches = max(1, max_concurrent_searches)
+        self.search_timeout = search_timeout
+        self.pipelined_search = pipelined_search
+        
+        # Research notes: LLM, deferred LLM or local heuristic
+        self.notes_mode = notes_mode.lower()
+        if self.notes_mode not in self.NOTES_MODES:
+            raise ValueError(
+                f"Unknown notes mode '{self.notes_mode}' "
+                f"(expected one of {', '.join(self.NOTES_MODES)})"
+            )
+        self.analyzer = TextAnalyzer()
+        self._pending_notes: dict[tuple[str, str], Union[Future, asyncio.Task]] = {}
+        self._notes_lock = threading.Lock()
+        self._notes_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Optional deep-content enrichment (off unless enrich_top_n > 0)
+        self.enrich_top_n = max(0, enrich_top_n)
+        self.enrich_timeout = enrich_timeout
+        self.enrich_max_per_host = max(1, enrich_max_per_host)
+        self.scraper = scraper
+        
+        # Reuse of earlier overlapping searches (None disables)
+        self.research_index = (
+            research_index if research_index is not None else get_shared_research_index()
+        )
         
         # Initialize base agent
         super().__init__(
@@ -133,48 +230,777 @@ class ResearcherAgent(ToolEnabledAgent):
         """
         logger.info(f"Conducting research on: {topic}")
         
-        # Generate search queries based on the topic
-        search_queries = self._generate_search_queries(topic)
+        if self.pipelined_search and not self._loop_running():
+            # Search while the queries are generated
+            _, search_batches = asyncio.run(self._pipelined_searches(topic))
+        else:
+            # Generate search queries based on the topic
+            search_queries = self._generate_search_queries(topic)
+            
+            # Reuse fresh overlapping research; only search for the gaps
+            indexed = self._lookup_research(topic, search_queries)
+            pending = [query for query, hit in zip(search_queries, indexed) if hit is None]
+            
+            # Run the searches (concurrently when enabled)
+            if not pending:
+                fetched = []
+            elif self.concurrent_search:
+                fetched = self._run_concurrent_searches(topic, pending)
+            else:
+                fetched = [self._search_for_topic(topic, query) for query in pending]
+            
+            self._remember_research(topic, pending, fetched)
+            search_batches = self._fill_gaps(indexed, fetched)
         
-        # Collect all search results
+        # Collect all unique search results
+        all_results, all_content_parts = self._merge_search_results(search_batches)
+        
+        # Replace the top snippets with full page text (optional)
+        if self.enrich_top_n and all_results:
+            all_results = self._run_enrichment(topic, all_results)
+            all_content_parts = [self._format_content_part(r) for r in all_results]
+        
+        # Compile final research data
+        research_data = ResearchData(
+            topic=topic,
+            search_results=all_results,
+            raw_content="\n---\n".join(all_content_parts),
+            sources_count=len(all_results),
+            timestamp=datetime.now(),
+        )
+        
+        # Add researcher notes (LLM, deferred LLM or heuristic)
+        return self._add_research_notes(research_data)
+    
+    def _search_for_topic(self, topic: str, query: str) -> ResearchData:
+        """
+        Run a single search, routed by topic type.
+        
+        Args:
+            topic: Research topic (used to pick the search type)
+            query: Search query
+            
+        Returns:
+            ResearchData for this query
+        """
+        logger.debug(f"Searching: {query}")
+        
+        if self._is_finance_topic(topic):
+            return self.search_tool.search_finance(query)
+        elif self._is_tech_topic(topic):
+            return self.search_tool.search_tech(query)
+        return self.search_tool.search(query)
+    
+    async def _asearch_for_topic(self, topic: str, query: str) -> ResearchData:
+        """
+        Async version of _search_for_topic.
+        
+        Args:
+            topic: Research topic (used to pick the search type)
+            query: Search query
+            
+        Returns:
+            ResearchData for this query
+        """
+        logger.debug(f"Async searching: {query}")
+        
+        if self._is_finance_topic(topic):
+            return await self.search_tool.asearch_finance(query)
+        elif self._is_tech_topic(topic):
+            return await self.search_tool.asearch_tech(query)
+        return await self.search_tool.asearch(query)
+    
+    def _run_concurrent_searches(
+        self,
+        topic: str,
+        queries: list[str],
+    ) -> list[Optional[ResearchData]]:
+        """
+        Run all queries concurrently from synchronous code.
+        
+        Falls back to sequential searches when already inside a running
+        event loop, since a nested loop cannot be started there.
+        
+        Args:
+            topic: Research topic
+            queries: Search queries to run
+            
+        Returns:
+            Search results per query, in query order
+        """
+        if not self._loop_running():
+            return asyncio.run(self._fan_out_searches(topic, queries))
+        
+        logger.warning("Event loop already running, searching sequentially")
+        return [self._search_for_topic(topic, query) for query in queries]
+    
+    async def _fan_out_searches(
+        self,
+        topic: str,
+        queries: list[str],
+    ) -> list[Optional[ResearchData]]:
+        """
+        Fan out all queries at once with bounded concurrency.
+        
+        Each query gets its own deadline; a query that misses it yields
+        None so the research can continue with partial results.
+        
+        Args:
+            topic: Research topic
+            queries: Search queries to run
+            
+        Returns:
+            Search results per query, in query order (None if timed out)
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_searches)
+        
+        logger.info(f"Fanning out {len(queries)} searches")
+        return await asyncio.gather(*(
+            self._bounded_search(topic, query, semaphore) for query in queries
+        ))
+    
+    async def _bounded_search(
+        self,
+        topic: str,
+        query: str,
+        semaphore: asyncio.Semaphore,
+    ) -> Optional[ResearchData]:
+        """
+        Run one search within the concurrency limit and its deadline.
+        
+        Args:
+            topic: Research topic
+            query: Search query
+            semaphore: Limits the searches in flight
+            
+        Returns:
+            ResearchData for this query, or None if it timed out
+        """
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    self._asearch_for_topic(topic, query),
+                    timeout=self.search_timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Search timed out after {self.search_timeout}s: {query}")
+                return None
+    
+    # =========================================================================
+    # Pipelined Search
+    # =========================================================================
+    
+    async def _pipelined_searches(
+        self,
+        topic: str,
+    ) -> tuple[list[str], list[Optional[ResearchData]]]:
+        """
+        Search the raw topic while the search queries are being generated.
+        
+        The topic itself is searched immediately; each generated query is
+        launched as soon as its line is streamed, unless its keywords
+        overlap a query already in flight by DUPLICATE_QUERY_SIMILARITY.
+        This takes the query-generation LLM call off the critical path.
+        At most MAX_GENERATED_QUERIES searches are launched in total (the
+        topic counts as one), the same as the non-pipelined path, and
+        generation is stopped once that many are in flight.
+        
+        Args:
+            topic: Research topic
+            
+        Returns:
+            Queries searched and their results, in launch order
+            (None if a search timed out)
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_searches)
+        queries: list[str] = []
+        signatures: list[frozenset[str]] = []
+        tasks: list[asyncio.Task] = []
+        
+        async def indexed_or_search(query: str) -> tuple[Optional[ResearchData], bool]:
+            hit = (await self._alookup_research(topic, [query]))[0]
+            if hit is not None:
+                return hit, False
+            return await self._bounded_search(topic, query, semaphore), True
+        
+        def launch(query: str):
+            signature = topic_signature(query)
+            for earlier, earlier_signature in zip(queries, signatures):
+                if query.lower() == earlier.lower() or signature_similarity(
+                    signature, earlier_signature
+                ) >= self.DUPLICATE_QUERY_SIMILARITY:
+                    logger.debug(f"Skipping near-duplicate query '{query}' (of '{earlier}')")
+                    return
+            
+            queries.append(query)
+            signatures.append(signature)
+            tasks.append(asyncio.create_task(indexed_or_search(query)))
+        
+        with trace_span("researcher.pipeline", kind="tool") as span:
+            launch(topic)
+            async with contextlib.aclosing(self._astream_search_queries(topic)) as generated:
+                async for query in generated:
+                    launch(query)
+                    if len(queries) >= self.MAX_GENERATED_QUERIES:
+                        break
+            
+            outcomes = await asyncio.gather(*tasks)
+            slots = [research_data for research_data, _ in outcomes]
+            searched = [index for index, (_, fresh) in enumerate(outcomes) if fresh]
+            
+            span.set("queries", len(queries))
+            span.set("searches", len(searched))
+        
+        await self._aremember_research(
+            topic, [queries[i] for i in searched], [slots[i] for i in searched]
+        )
+        logger.info(f"Pipelined {len(queries)} searches ({len(searched)} run)")
+        return queries, slots
+    
+    async def _astream_search_queries(self, topic: str) -> AsyncIterator[str]:
+        """
+        Generate search queries, yielding each one as soon as it is streamed.
+        
+        A cached response is replayed without an LLM call. Generation
+        errors end the stream early (the raw topic is already searched).
+        
+        Args:
+            topic: Research topic
+            
+        Yields:
+            Up to MAX_GENERATED_QUERIES search queries
+        """
+        prompt = RESEARCHER_SEARCH_PROMPT.format(topic=topic)
+        
+        cached = self._cached_response(self.system_prompt, prompt, allow_cached=True)
+        if cached is not None:
+            for query in self._parse_search_queries(topic, cached):
+                yield query
+            return
+        
+        lines: asyncio.Queue = asyncio.Queue()
+        buffer = ""
+        
+        def on_token(text: str):
+            nonlocal buffer
+            *complete, buffer = (buffer + text).split("\n")
+            for line in complete:
+                lines.put_nowait(line)
+        
+        async def generate():
+            try:
+                response = await self.astream_llm(prompt, on_token=on_token)
+                self._store_response(self.system_prompt, prompt, response, allow_cached=True)
+            except Exception as e:
+                logger.warning(f"Query generation failed, searching the topic only: {e}")
+            finally:
+                lines.put_nowait(buffer)
+                lines.put_nowait(None)
+        
+        task = asyncio.create_task(generate())
+        yielded = 0
+        try:
+            while (line := await lines.get()) is not None:
+                query = self._clean_query_line(line)
+                if query and yielded < self.MAX_GENERATED_QUERIES:
+                    yielded += 1
+                    yield query
+        finally:
+            if not task.done():
+                task.cancel()
+    
+    @staticmethod
+    def _loop_running() -> bool:
+        """Whether this thread is already running an event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+    
+    def _merge_search_results(
+        self,
+        search_batches: list[Optional[ResearchData]],
+    ) -> tuple[list[SearchResult], list[str]]:
+        """
+        Merge per-query results, dropping duplicate URLs.
+        
+        Batches are merged in query order so the output is deterministic
+        regardless of which search finished first.
+        
+        Args:
+            search_batches: Search results per query (None entries skipped)
+            
+        Returns:
+            Tuple of (unique results, formatted content parts)
+        """
         all_results: list[SearchResult] = []
         all_content_parts: list[str] = []
         seen_urls: set[str] = set()
         
-        for query in search_queries:
-            logger.debug(f"Searching: {query}")
-            
-            # Determine search type based on topic
-            if self._is_finance_topic(topic):
-                research_data = self.search_tool.search_finance(query)
-            elif self._is_tech_topic(topic):
-                research_data = self.search_tool.search_tech(query)
-            else:
-                research_data = self.search_tool.search(query)
+        for research_data in search_batches:
+            if research_data is None:
+                continue
             
-            # Add unique results
             for result in research_data.search_results:
                 if result.url not in seen_urls:
                     seen_urls.add(result.url)
                     all_results.append(result)
-                    all_content_parts.append(
-                        f"## {result.title}\n"
-                        f"Source: {result.url}\n"
-                        f"{result.content}\n"
+                    all_content_parts.append(self._format_content_part(result))
+        
+        return all_results, all_content_parts
+    
+    # =========================================================================
+    # Research Reuse
+    # =========================================================================
+    
+    def _topic_kind(self, topic: str) -> str:
+        """Topic type used for search routing and index freshness."""
+        if self._is_finance_topic(topic):
+            return "finance"
+        if self._is_tech_topic(topic):
+            return "tech"
+        return "search"
+    
+    def _lookup_research(
+        self,
+        topic: str,
+        queries: list[str],
+    ) -> list[Optional[ResearchData]]:
+        """
+        Look up fresh overlapping research for each query.
+        
+        Args:
+            topic: Research topic (sets the freshness window)
+            queries: Search queries about to be run
+            
+        Returns:
+            Indexed research per query, in query order (None = search needed)
+        """
+        if self.research_index is None:
+            return [None] * len(queries)
+        
+        kind = self._topic_kind(topic)
+        with trace_span("researcher.index", kind="tool", queries=len(queries)) as span:
+            hits = [self.research_index.lookup(query, kind) for query in queries]
+            reused = sum(hit is not None for hit in hits)
+            span.set("reused", reused)
+        
+        if reused:
+            logger.info(f"Reusing {reused} of {len(queries)} searches from the research index")
+        return hits
+    
+    def _remember_research(
+        self,
+        topic: str,
+        queries: list[str],
+        batches: list[Optional[ResearchData]],
+    ):
+        """
+        Add fresh search results to the research index.
+        
+        Args:
+            topic: Research topic
+            queries: Queries that were searched
+            batches: Their results, in query order
+        """
+        if self.research_index is not None:
+            self.research_index.add_many(zip(queries, batches), self._topic_kind(topic))
+    
+    async def _alookup_research(
+        self,
+        topic: str,
+        queries: list[str],
+    ) -> list[Optional[ResearchData]]:
+        """
+        Async version of _lookup_research (index I/O stays off the loop).
+        
+        Args:
+            topic: Research topic (sets the freshness window)
+            queries: Search queries about to be run
+            
+        Returns:
+            Indexed research per query, in query order (None = search needed)
+        """
+        if self.research_index is None:
+            return [None] * len(queries)
+        
+        kind = self._topic_kind(topic)
+        with trace_span("researcher.index", kind="tool", queries=len(queries)) as span:
+            hits = list(await asyncio.gather(
+                *(self.research_index.alookup(query, kind) for query in queries)
+            ))
+            reused = sum(hit is not None for hit in hits)
+            span.set("reused", reused)
+        
+        if reused:
+            logger.info(f"Reusing {reused} of {len(queries)} searches from the research index")
+        return hits
+    
+    async def _aremember_research(
+        self,
+        topic: str,
+        queries: list[str],
+        batches: list[Optional[ResearchData]],
+    ):
+        """
+        Async version of _remember_research.
+        
+        Args:
+            topic: Research topic
+            queries: Queries that were searched
+            batches: Their results, in query order
+        """
+        if self.research_index is not None:
+            await self.research_index.aadd_many(zip(queries, batches), self._topic_kind(topic))
+    
+    @staticmethod
+    def _fill_gaps(
+        indexed: list[Optional[ResearchData]],
+        fetched: list[Optional[ResearchData]],
+    ) -> list[Optional[ResearchData]]:
+        """
+        Merge indexed and freshly searched batches back into query order.
+        
+        Args:
+            indexed: Indexed research per query (None where a search ran)
+            fetched: Search results for the None entries, in order
+            
+        Returns:
+            One batch per query
+        """
+        fresh = iter(fetched)
+        return [hit if hit is not None else next(fresh, None) for hit in indexed]
+    
+    @staticmethod
+    def _format_content_part(result: SearchResult) -> str:
+        """
+        Format one search result for the raw research content.
+        
+        Args:
+            result: Search result
+            
+        Returns:
+            Markdown section for the result
+        """
+        return (
+            f"## {result.title}\n"
+            f"Source: {result.url}\n"
+            f"{result.content}\n"
+        )
+    
+    # =========================================================================
+    # Content Enrichment
+    # =========================================================================
+    
+    def _run_enrichment(
+        self,
+        topic: str,
+        results: list[SearchResult],
+    ) -> list[SearchResult]:
+        """
+        Run the enrichment stage from synchronous code.
+        
+        Enrichment is skipped when already inside a running event loop,
+        since scraping sequentially would add latency per URL. The
+        scraper's pooled session is closed before the temporary loop
+        exits.
+        
+        Args:
+            topic: Research topic
+            results: Deduplicated search results
+            
+        Returns:
+            Results with enriched content where available
+        """
+        async def enrich() -> list[SearchResult]:
+            try:
+                return await self._enrich_results(topic, results)
+            finally:
+                if self.scraper is not None:
+                    await self.scraper.aclose()
+        
+        if not self._loop_running():
+            return asyncio.run(enrich())
+        
+        logger.warning("Event loop already running, skipping content enrichment")
+        return results
+    
+    async def _enrich_results(
+        self,
+        topic: str,
+        results: list[SearchResult],
+    ) -> list[SearchResult]:
+        """
+        Replace snippets of the top results with scraped page text.
+        
+        The top enrich_top_n results (by relevance score, then search
+        order) are scraped concurrently within enrich_timeout seconds.
+        A snippet is only replaced when the page text is longer and
+        relevant to the topic; pages that fail or miss the deadline
+        keep their snippet.
+        
+        Args:
+            topic: Research topic
+            results: Deduplicated search results
+            
+        Returns:
+            Results in the same order, with enriched content where available
+        """
+        ranked = sorted(
+            range(len(results)),
+            key=lambda i: -(results[i].score or 0.0),
+        )
+        urls = [results[i].url for i in ranked[:self.enrich_top_n]]
+        
+        if self.scraper is None:
+            self.scraper = create_scraper(timeout=max(1, int(self.enrich_timeout)))
+        
+        with trace_span("researcher.enrich", kind="tool", urls=len(urls)) as span:
+            pages = await self.scraper.ascrape_multiple(
+                urls,
+                max_per_host=self.enrich_max_per_host,
+                deadline=self.enrich_timeout,
+            )
+            pages_by_url = {page.url: page for page in pages}
+            
+            enriched = []
+            replaced = 0
+            for result in results:
+                page = pages_by_url.get(result.url)
+                if page is not None and self._is_better_content(topic, result, page):
+                    result = result.model_copy(update={
+                        "content": page.content,
+                        "published_date": result.published_date or page.published_date,
+                    })
+                    replaced += 1
+                enriched.append(result)
+            
+            span.set("fetched", len(pages))
+            span.set("enriched", replaced)
+        
+        logger.info(f"Enriched {replaced} of {len(urls)} results with page content")
+        return enriched
+    
+    @staticmethod
+    def _is_better_content(
+        topic: str,
+        result: SearchResult,
+        page: SearchResult,
+    ) -> bool:
+        """
+        Check whether scraped page text should replace a snippet.
+        
+        The page must be longer than the snippet and mention at least
+        half of the topic's significant terms.
+        
+        Args:
+            topic: Research topic
+            result: Original search result
+            page: Scraped page
+            
+        Returns:
+            True if the page content should be used
+        """
+        if len(page.content) <= len(result.content):
+            return False
+        
+        terms = {
+            word for word in topic.lower().split()
+            if len(word) > 2 and word not in TextAnalyzer.STOP_WORDS
+        }
+        if not terms:
+            return True
+        
+        text = page.content.lower()
+        matched = sum(1 for term in terms if term in text)
+        return matched * 2 >= len(terms)
+    
+    # =========================================================================
+    # Research Notes
+    # =========================================================================
+    
+    @staticmethod
+    def _notes_key(research_data: ResearchData) -> tuple[str, str]:
+        """Key identifying one research run's deferred notes."""
+        return research_data.topic, research_data.timestamp.isoformat()
+    
+    @staticmethod
+    def _with_notes(research_data: ResearchData, notes: str) -> ResearchData:
+        """Copy of research_data with the given researcher notes."""
+        return research_data.model_copy(update={"researcher_notes": notes})
+    
+    def _add_research_notes(self, research_data: ResearchData) -> ResearchData:
+        """
+        Add researcher notes according to notes_mode.
+        
+        In deferred mode the LLM notes are generated on a background
+        thread and the heuristic notes stand in until they are collected.
+        
+        Args:
+            research_data: Compiled research without notes
+            
+        Returns:
+            Research data with (possibly provisional) notes
+        """
+        topic, results = research_data.topic, research_data.search_results
+        
+        with trace_span("researcher.notes", mode=self.notes_mode):
+            if self.notes_mode == "llm":
+                return self._with_notes(
+                    research_data, self._generate_research_notes(topic, results)
+                )
+            
+            heuristic = self._with_notes(
+                research_data, self._heuristic_research_notes(research_data)
+            )
+            if self.notes_mode == "deferred" and results:
+                if self._notes_pool is None:
+                    self._notes_pool = ThreadPoolExecutor(
+                        max_workers=2, thread_name_prefix="research-notes"
                     )
+                self._defer_notes(
+                    research_data,
+                    self._notes_pool.submit(self._generate_research_notes, topic, results),
+                )
+            return heuristic
+    
+    async def _aadd_research_notes(self, research_data: ResearchData) -> ResearchData:
+        """
+        Async version of _add_research_notes.
         
-        # Generate researcher notes using LLM
-        researcher_notes = self._generate_research_notes(topic, all_results)
+        In deferred mode the LLM notes run as a task on the current loop.
         
-        # Compile final research data
-        return ResearchData(
-            topic=topic,
-            search_results=all_results,
-            raw_content="\n---\n".join(all_content_parts),
-            sources_count=len(all_results),
-            timestamp=datetime.now(),
-            researcher_notes=researcher_notes,
+        Args:
+            research_data: Compiled research without notes
+            
+        Returns:
+            Research data with (possibly provisional) notes
+        """
+        topic, results = research_data.topic, research_data.search_results
+        
+        with trace_span("researcher.notes", mode=self.notes_mode):
+            if self.notes_mode == "llm":
+                return self._with_notes(
+                    research_data, await self._agenerate_research_notes(topic, results)
+                )
+            
+            heuristic = self._with_notes(
+                research_data, self._heuristic_research_notes(research_data)
+            )
+            if self.notes_mode == "deferred" and results:
+                self._defer_notes(
+                    research_data,
+                    asyncio.create_task(self._agenerate_research_notes(topic, results)),
+                )
+            return heuristic
+    
+    def _defer_notes(self, research_data: ResearchData, pending: Union[Future, asyncio.Task]):
+        """Register in-flight notes, dropping the oldest uncollected ones."""
+        with self._notes_lock:
+            self._pending_notes[self._notes_key(research_data)] = pending
+            while len(self._pending_notes) > self.MAX_PENDING_NOTES:
+                stale = self._pending_notes.pop(next(iter(self._pending_notes)))
+                stale.cancel()
+    
+    def _take_pending_notes(
+        self,
+        research_data: ResearchData,
+    ) -> Optional[Union[Future, asyncio.Task]]:
+        """Remove and return the in-flight notes for research_data, if any."""
+        with self._notes_lock:
+            return self._pending_notes.pop(self._notes_key(research_data), None)
+    
+    def collect_research_notes(
+        self,
+        research_data: ResearchData,
+        timeout: Optional[float] = None,
+    ) -> ResearchData:
+        """
+        Merge deferred LLM notes into research data (waiting if needed).
+        
+        Args:
+            research_data: Research data returned by this researcher
+            timeout: Seconds to wait for the notes (None waits until done)
+            
+        Returns:
+            Research data with the LLM notes, or unchanged if there are
+            none pending or they failed
+        """
+        pending = self._take_pending_notes(research_data)
+        if pending is None:
+            return research_data
+        if isinstance(pending, asyncio.Task):
+            logger.warning("Deferred research notes belong to an event loop; keeping heuristic notes")
+            pending.cancel()
+            return research_data
+        
+        try:
+            return self._with_notes(research_data, pending.result(timeout=timeout))
+        except Exception as e:
+            logger.warning(f"Deferred research notes failed, keeping heuristic notes: {e}")
+            return research_data
+    
+    async def acollect_research_notes(
+        self,
+        research_data: ResearchData,
+        timeout: Optional[float] = None,
+    ) -> ResearchData:
+        """
+        Async version of collect_research_notes.
+        
+        Args:
+            research_data: Research data returned by this researcher
+            timeout: Seconds to wait for the notes (None waits until done)
+            
+        Returns:
+            Research data with the LLM notes, or unchanged if there are
+            none pending or they failed
+        """
+        pending = self._take_pending_notes(research_data)
+        if pending is None:
+            return research_data
+        if isinstance(pending, Future):
+            pending = asyncio.wrap_future(pending)
+        
+        try:
+            return self._with_notes(research_data, await asyncio.wait_for(pending, timeout))
+        except Exception as e:
+            logger.warning(f"Deferred research notes failed, keeping heuristic notes: {e}")
+            return research_data
+    
+    def _heuristic_research_notes(self, research_data: ResearchData) -> str:
+        """
+        Summarize research quality locally, without an LLM call.
+        
+        Built from TextAnalyzer.assess_data_quality and the spread of
+        sources across domains.
+        
+        Args:
+            research_data: Compiled research
+            
+        Returns:
+            Research notes string
+        """
+        results = research_data.search_results
+        if not results:
+            return "No relevant sources found for this topic."
+        
+        domains = Counter(
+            urlparse(result.url).netloc.lower().removeprefix("www.") for result in results
         )
+        dated = sum(result.published_date is not None for result in results)
+        quality = self.analyzer.assess_data_quality(research_data)
+        top_domains = ", ".join(f"{domain} ({count})" for domain, count in domains.most_common(3))
+        
+        notes = [
+            f"{len(results)} sources from {len(domains)} domains (most cited: {top_domains}).",
+            f"{dated} of {len(results)} sources are dated.",
+            f"Data quality score: {quality:.2f}.",
+        ]
+        if len(domains) < 3:
+            notes.append("Limited source diversity; findings may reflect few outlets.")
+        return " ".join(notes)
     
     def _generate_search_queries(self, topic: str) -> list[str]:
         """
@@ -190,26 +1016,73 @@ class ResearcherAgent(ToolEnabledAgent):
         prompt = RESEARCHER_SEARCH_PROMPT.format(topic=topic)
         
         try:
-            response = self.invoke_llm(prompt)
+            # Query generation is deterministic enough to reuse on repeat topics
+            response = self.invoke_llm(prompt, allow_cached=True)
+            return self._parse_search_queries(topic, response)
             
-            # Parse queries from response (one per line)
-            queries = [
-                q.strip().strip("-").strip("•").strip("1234567890.").strip()
-                for q in response.strip().split("\n")
-                if q.strip() and len(q.strip()) > 5
-            ]
-            
-            # Ensure we have at least the original topic as a query
-            if not queries:
-                queries = [topic]
+        except Exception as e:
+            logger.warning(f"Query generation failed, using topic directly: {e}")
+            return [topic]
+    
+    async def _agenerate_search_queries(self, topic: str) -> list[str]:
+        """
+        Async version of _generate_search_queries.
+        
+        Args:
+            topic: Research topic
             
-            # Limit to 3 queries to avoid too many API calls
-            return queries[:3]
+        Returns:
+            List of search queries
+        """
+        prompt = RESEARCHER_SEARCH_PROMPT.format(topic=topic)
+        
+        try:
+            response = await self.ainvoke_llm(prompt, allow_cached=True)
+            return self._parse_search_queries(topic, response)
             
         except Exception as e:
             logger.warning(f"Query generation failed, using topic directly: {e}")
             return [topic]
     
+    @classmethod
+    def _parse_search_queries(cls, topic: str, response: str) -> list[str]:
+        """
+        Parse search queries from the LLM response (one per line).
+        
+        Args:
+            topic: Research topic (used if no query can be parsed)
+            response: LLM response text
+            
+        Returns:
+            Up to MAX_GENERATED_QUERIES search queries
+        """
+        queries = [
+            query for query in map(cls._clean_query_line, response.strip().split("\n"))
+            if query
+        ]
+        
+        # Ensure we have at least the original topic as a query
+        if not queries:
+            queries = [topic]
+        
+        # Limit the number of queries to avoid too many API calls
+        return queries[:cls.MAX_GENERATED_QUERIES]
+    
+    @staticmethod
+    def _clean_query_line(line: str) -> Optional[str]:
+        """
+        Strip list markers from one response line.
+        
+        Args:
+            line: Line of the query-generation response
+            
+        Returns:
+            The query, or None if the line is too short to be one
+        """
+        if not line.strip() or len(line.strip()) <= 5:
+            return None
+        return line.strip().strip("-").strip("•").strip("1234567890.").strip()
+    
     def _generate_research_notes(
         self,
         topic: str,
@@ -228,13 +1101,56 @@ class ResearcherAgent(ToolEnabledAgent):
         if not results:
             return "No relevant sources found for this topic."
         
-        # Create a summary prompt
+        try:
+            notes = self.invoke_llm(self._research_notes_prompt(topic, results))
+            return notes.strip()
+        except Exception as e:
+            logger.warning(f"Could not generate research notes: {e}")
+            return f"Found {len(results)} sources on topic: {topic}"
+    
+    async def _agenerate_research_notes(
+        self,
+        topic: str,
+        results: list[SearchResult],
+    ) -> str:
+        """
+        Async version of _generate_research_notes.
+        
+        Args:
+            topic: Research topic
+            results: Search results collected
+            
+        Returns:
+            Research notes string
+        """
+        if not results:
+            return "No relevant sources found for this topic."
+        
+        try:
+            notes = await self.ainvoke_llm(self._research_notes_prompt(topic, results))
+            return notes.strip()
+        except Exception as e:
+            logger.warning(f"Could not generate research notes: {e}")
+            return f"Found {len(results)} sources on topic: {topic}"
+    
+    @staticmethod
+    def _research_notes_prompt(topic: str, results: list[SearchResult]) -> str:
+        """
+        Build the research notes prompt.
+        
+        Args:
+            topic: Research topic
+            results: Search results collected
+            
+        Returns:
+            Prompt listing the first 10 sources
+        """
         sources_summary = "\n".join([
             f"- {r.title} ({r.url})"
             for r in results[:10]  # Limit to first 10 for prompt
         ])
         
-        prompt = f"""Based on the following sources found for the topic "{topic}", 
+        return f"""Based on the following sources found for the topic "{topic}", 
 provide brief research notes (2-3 sentences) about:
 1. Overall data quality and source diversity
 2. Any notable gaps or limitations
@@ -244,13 +1160,6 @@ Sources found:
 {sources_summary}
 
 Research Notes:"""
-        
-        try:
-            notes = self.invoke_llm(prompt)
-            return notes.strip()
-        except Exception as e:
-            logger.warning(f"Could not generate research notes: {e}")
-            return f"Found {len(results)} sources on topic: {topic}"
     
     def _is_finance_topic(self, topic: str) -> bool:
         """Check if topic is finance-related."""
@@ -323,6 +1232,9 @@ Research Notes:"""
         """
         Async version of research conductor.
         
+        Every step (query generation, searches, enrichment and notes)
+        is awaited, so many research runs can share one event loop.
+        
         Args:
             topic: Topic to research
             
@@ -331,38 +1243,40 @@ Research Notes:"""
         """
         logger.info(f"Conducting async research on: {topic}")
         
-        search_queries = self._generate_search_queries(topic)
-        
-        all_results: list[SearchResult] = []
-        all_content_parts: list[str] = []
-        seen_urls: set[str] = set()
-        
-        for query in search_queries:
-            logger.debug(f"Async searching: {query}")
+        if self.pipelined_search:
+            _, search_batches = await self._pipelined_searches(topic)
+        else:
+            search_queries = await self._agenerate_search_queries(topic)
             
-            # Use async search
-            research_data = await self.search_tool.asearch(query)
+            # Reuse fresh overlapping research; only search for the gaps
+            indexed = await self._alookup_research(topic, search_queries)
+            pending = [query for query, hit in zip(search_queries, indexed) if hit is None]
             
-            for result in research_data.search_results:
-                if result.url not in seen_urls:
-                    seen_urls.add(result.url)
-                    all_results.append(result)
-                    all_content_parts.append(
-                        f"## {result.title}\n"
-                        f"Source: {result.url}\n"
-                        f"{result.content}\n"
-                    )
+            if not pending:
+                fetched = []
+            elif self.concurrent_search:
+                fetched = await self._fan_out_searches(topic, pending)
+            else:
+                fetched = [await self._asearch_for_topic(topic, query) for query in pending]
+            
+            await self._aremember_research(topic, pending, fetched)
+            search_batches = self._fill_gaps(indexed, fetched)
+        
+        all_results, all_content_parts = self._merge_search_results(search_batches)
         
-        researcher_notes = self._generate_research_notes(topic, all_results)
+        if self.enrich_top_n and all_results:
+            all_results = await self._enrich_results(topic, all_results)
+            all_content_parts = [self._format_content_part(r) for r in all_results]
         
-        return ResearchData(
+        research_data = ResearchData(
             topic=topic,
             search_results=all_results,
             raw_content="\n---\n".join(all_content_parts),
             sources_count=len(all_results),
             timestamp=datetime.now(),
-            researcher_notes=researcher_notes,
         )
+        
+        return await self._aadd_research_notes(research_data)
 
 
 # =============================================================================
@@ -375,6 +1289,10 @@ def create_researcher_agent(
     model_name: str = "llama-3.3-70b-versatile",
     temperature: float = 0.3,
     max_search_results: int = 5,
+    concurrent_search: bool = True,
+    enrich_top_n: int = 0,
+    pipelined_search: bool = False,
+    notes_mode: str = "llm",
 ) -> ResearcherAgent:
     """
     Factory function to create a configured ResearcherAgent.
@@ -385,6 +1303,10 @@ def create_researcher_agent(
         model_name: LLM model name
         temperature: LLM temperature
         max_search_results: Max results per search
+        concurrent_search: Fan out search queries concurrently
+        enrich_top_n: Result pages to scrape for full text (0 disables)
+        pipelined_search: Search the raw topic during query generation
+        notes_mode: "llm", "deferred" or "heuristic" research notes
         
     Returns:
         Configured ResearcherAgent instance
@@ -395,6 +1317,10 @@ def create_researcher_agent(
         model_name=model_name,
         temperature=temperature,
         max_search_results=max_search_results,
+        concurrent_search=concurrent_search,
+        enrich_top_n=enrich_top_n,
+        pipelined_search=pipelined_search,
+        notes_mode=notes_mode,
     )
 
 
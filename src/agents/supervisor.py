@@ -196,7 +196,19 @@ class SupervisorAgent(BaseAgent):
                 "instructions": "Review the analysis for quality and completeness",
             }
         
-        # Rule 5: Critique exists - check if approved
+        # Rule 5: Analysis was revised after a rejection - review it again
+        if (
+            critique_result
+            and not critique_result.is_approved
+            and analysis_summary.timestamp > critique_result.timestamp
+        ):
+            return {
+                "next_agent": "critic",
+                "reasoning": "Revised analysis ready for another review",
+                "instructions": "Review the revised analysis against your previous feedback",
+            }
+        
+        # Rule 6: Critique exists - check if approved
         if critique_result:
             if critique_result.is_approved:
                 return {
@@ -238,7 +250,7 @@ class SupervisorAgent(BaseAgent):
         prompt = self._format_routing_prompt(state)
         
         # Invoke LLM
-        llm_response = self.invoke_llm(prompt)
+        llm_response = self.invoke_llm(prompt, allow_cached=True)
         
         # Parse response
         return self._parse_routing_response(llm_response)
@@ -345,7 +357,7 @@ class SupervisorAgent(BaseAgent):
         )
         
         try:
-            llm_response = self.invoke_llm(error_prompt)
+            llm_response = self.invoke_llm(error_prompt, allow_cached=True)
             decision = self._parse_routing_response(llm_response)
         except Exception:
             # If LLM fails too, just end
@@ -416,7 +428,7 @@ class SupervisorAgent(BaseAgent):
             if state.get("error"):
                 return await self._async_handle_error_state(state)
             
-            routing_decision = self._decide_next_agent(state)
+            routing_decision = await self._async_decide_next_agent(state)
             
             next_agent = routing_decision.get("next_agent", "END")
             reasoning = routing_decision.get("reasoning", "")
@@ -449,6 +461,27 @@ class SupervisorAgent(BaseAgent):
         except Exception as e:
             return self.handle_error(state, e, "Async supervisor routing failed")
     
+    async def _async_decide_next_agent(self, state: GraphState) -> dict:
+        """
+        Async version of _decide_next_agent.
+        
+        Args:
+            state: Current graph state
+            
+        Returns:
+            Dictionary with next_agent, reasoning, instructions
+        """
+        decision = self._rule_based_routing(state)
+        
+        if decision:
+            return decision
+        
+        logger.debug("Using LLM for async routing decision")
+        llm_response = await self.ainvoke_llm(
+            self._format_routing_prompt(state), allow_cached=True
+        )
+        return self._parse_routing_response(llm_response)
+    
     async def _async_handle_error_state(self, state: GraphState) -> GraphState:
         """
         Async error handling.
@@ -7,7 +7,7 @@ the approved analysis.
 
 import json
 import re
-from typing import Optional
+from typing import Callable, Optional
 from datetime import datetime
 from pathlib import Path
 from loguru import logger
@@ -29,6 +29,177 @@ from src.prompts.writer import (
 )
 
 
+# =============================================================================
+# Streaming Report Decoder
+# =============================================================================
+
+class ReportStreamDecoder:
+    """
+    Turn a streamed JSON report into readable markdown as it arrives.
+    
+    The writer prompt asks for a JSON object, which is unreadable while
+    it is still being generated. The decoder walks the token stream
+    character by character, tracks where it is in the JSON structure and
+    emits the text of known string fields (title, executive summary,
+    section titles and content, takeaways, recommendations, sources) as
+    soon as their characters arrive. Output that does not start with a
+    JSON object or code fence is passed through unchanged.
+    """
+    
+    # Field -> (prefix when the string opens, suffix when it closes)
+    FIELD_FORMATS = {
+        "title": ("# ", "\n\n"),
+        "executive_summary": ("## Executive Summary\n\n", "\n\n"),
+        "sections.title": ("## ", "\n\n"),
+        "sections.content": ("", "\n\n"),
+        "key_takeaways[]": ("- ", "\n"),
+        "recommendations[]": ("- ", "\n"),
+        "sources[]": ("- ", "\n"),
+    }
+    
+    # Headings emitted when a list field opens
+    LIST_HEADINGS = {
+        "key_takeaways": "## Key Takeaways\n\n",
+        "recommendations": "## Recommendations\n\n",
+        "sources": "## Sources\n\n",
+    }
+    
+    ESCAPES = {"n": "\n", "t": "\t", "r": "", "b": "", "f": "", '"': '"', "\\": "\\", "/": "/"}
+    
+    def __init__(self):
+        """Initialize the decoder."""
+        self.mode: Optional[str] = None  # None until decided, then "json" or "text"
+        self._frames: list[dict] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._string_field: Optional[str] = None
+        self._key_buffer: list[str] = []
+        self._escape: Optional[str] = None
+    
+    def feed(self, chunk: str) -> str:
+        """
+        Consume a chunk of model output.
+        
+        Args:
+            chunk: Raw text from the LLM stream
+            
+        Returns:
+            Newly decoded report text (may be empty)
+        """
+        if self.mode is None:
+            stripped = chunk.lstrip()
+            if not stripped:
+                return ""
+            self.mode = "json" if stripped[0] in "{`" else "text"
+        
+        if self.mode == "text":
+            return chunk
+        
+        out: list[str] = []
+        for char in chunk:
+            self._consume(char, out)
+        return "".join(out)
+    
+    def _consume(self, char: str, out: list[str]):
+        """Advance the JSON state machine by one character."""
+        if self._in_string:
+            self._consume_string_char(char, out)
+            return
+        
+        if not self._frames:
+            # Skip code fences and preamble until the root object opens
+            if char == "{":
+                self._frames.append({"type": "object", "key": None, "expect_key": True})
+            return
+        
+        frame = self._frames[-1]
+        
+        if char == '"':
+            self._in_string = True
+            self._string_is_key = frame["type"] == "object" and frame["expect_key"]
+            self._key_buffer = []
+            self._string_field = None if self._string_is_key else self._field()
+            if self._string_field:
+                out.append(self.FIELD_FORMATS[self._string_field][0])
+        elif char == ":":
+            frame["expect_key"] = False
+        elif char == ",":
+            if frame["type"] == "object":
+                frame["expect_key"] = True
+        elif char == "{":
+            self._frames.append({
+                "type": "object",
+                "key": None,
+                "expect_key": True,
+                "parent_key": self._container_key(),
+            })
+        elif char == "[":
+            key = self._container_key()
+            self._frames.append({"type": "array", "key": key})
+            if len(self._frames) == 2 and key in self.LIST_HEADINGS:
+                out.append(self.LIST_HEADINGS[key])
+        elif char in "}]":
+            closed = self._frames.pop()
+            if closed["type"] == "array" and len(self._frames) == 1 and closed["key"] in self.LIST_HEADINGS:
+                out.append("\n")
+    
+    def _consume_string_char(self, char: str, out: list[str]):
+        """Handle a character inside a JSON string, decoding escapes."""
+        if self._escape is not None:
+            self._escape += char
+            if self._escape.startswith("u"):
+                if len(self._escape) < 5:
+                    return
+                try:
+                    decoded = chr(int(self._escape[1:], 16))
+                except ValueError:
+                    decoded = ""
+            else:
+                decoded = self.ESCAPES.get(self._escape, self._escape)
+            self._escape = None
+            self._emit_string_text(decoded, out)
+            return
+        
+        if char == "\\":
+            self._escape = ""
+        elif char == '"':
+            self._in_string = False
+            if self._string_is_key:
+                self._frames[-1]["key"] = "".join(self._key_buffer)
+            elif self._string_field:
+                out.append(self.FIELD_FORMATS[self._string_field][1])
+        else:
+            self._emit_string_text(char, out)
+    
+    def _emit_string_text(self, text: str, out: list[str]):
+        """Route decoded string text to the key buffer or the output."""
+        if self._string_is_key:
+            self._key_buffer.append(text)
+        elif self._string_field:
+            out.append(text)
+    
+    def _container_key(self) -> Optional[str]:
+        """Key under which a value opening now is stored."""
+        frame = self._frames[-1]
+        return frame["key"]
+    
+    def _field(self) -> Optional[str]:
+        """Identify the report field of a string value opening now."""
+        depth = len(self._frames)
+        frame = self._frames[-1]
+        
+        if frame["type"] == "object" and depth == 1:
+            field = frame["key"]
+        elif frame["type"] == "array" and depth == 2:
+            field = f"{frame['key']}[]"
+        elif frame["type"] == "object" and depth == 3 and frame.get("parent_key") == "sections":
+            field = f"sections.{frame['key']}"
+        else:
+            return None
+        
+        return field if field in self.FIELD_FORMATS else None
+
+
 class WriterAgent(BaseAgent):
     """
     Writer Agent - Produces the final polished report.
@@ -500,12 +671,21 @@ class WriterAgent(BaseAgent):
         except Exception as e:
             logger.warning(f"Could not save report: {e}")
     
-    async def aprocess(self, state: GraphState) -> GraphState:
+    async def aprocess(
+        self,
+        state: GraphState,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> GraphState:
         """
         Async version of process.
         
+        When `on_token` is given the report is streamed: the callback
+        receives readable report text (decoded from the model's JSON
+        output) as soon as it is generated.
+        
         Args:
             state: Current graph state
+            on_token: Called with each chunk of decoded report text
             
         Returns:
             Updated state with final_report
@@ -521,7 +701,7 @@ class WriterAgent(BaseAgent):
             critique_result = state.get("critique_result")
             
             final_report = await self._async_generate_report(
-                analysis_summary, research_data, critique_result
+                analysis_summary, research_data, critique_result, on_token
             )
             
             if self.output_dir:
@@ -553,6 +733,7 @@ class WriterAgent(BaseAgent):
         analysis_summary: AnalysisSummary,
         research_data: Optional[ResearchData],
         critique_result: Optional[CritiqueResult],
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> FinalReport:
         """
         Async report generation.
@@ -561,6 +742,7 @@ class WriterAgent(BaseAgent):
             analysis_summary: Analysis to convert
             research_data: Research data
             critique_result: Critique feedback
+            on_token: Called with decoded report text while streaming
             
         Returns:
             FinalReport
@@ -569,7 +751,17 @@ class WriterAgent(BaseAgent):
             analysis_summary, research_data, critique_result
         )
         
-        llm_response = await self.ainvoke_llm(task_prompt)
+        if on_token is None:
+            llm_response = await self.ainvoke_llm(task_prompt)
+        else:
+            decoder = ReportStreamDecoder()
+            
+            def emit(chunk: str):
+                text = decoder.feed(chunk)
+                if text:
+                    on_token(text)
+            
+            llm_response = await self.astream_llm(task_prompt, on_token=emit)
         
         return self._parse_report_response(
             llm_response, analysis_summary, research_data
@@ -608,5 +800,6 @@ def create_writer_agent(
 
 __all__ = [
     "WriterAgent",
+    "ReportStreamDecoder",
     "create_writer_agent",
 ]
@@ -6,6 +6,8 @@ This package provides:
 - Nodes: Agent node functions
 - Edges: Conditional routing logic
 - Workflow: StateGraph builder and runner
+- Events: Streaming events emitted while a workflow runs
+- Checkpoint: Durable SQLite checkpointer for resumable runs
 """
 
 from .state import (
@@ -26,7 +28,14 @@ from .nodes import (
     critic_node,
     writer_node,
     end_node,
+    async_supervisor_node,
+    async_researcher_node,
+    async_analyst_node,
+    async_critic_node,
+    async_writer_node,
+    async_end_node,
     NODE_MAPPING,
+    ASYNC_NODE_MAPPING,
     get_node_function,
 )
 from .edges import (
@@ -40,6 +49,8 @@ from .edges import (
     route_on_error,
     EdgeConfig,
 )
+from .events import WorkflowEvent
+from .checkpoint import SQLiteCheckpointer
 from .workflow import (
     WorkflowBuilder,
     WorkflowRunner,
@@ -66,7 +77,14 @@ __all__ = [
     "critic_node",
     "writer_node",
     "end_node",
+    "async_supervisor_node",
+    "async_researcher_node",
+    "async_analyst_node",
+    "async_critic_node",
+    "async_writer_node",
+    "async_end_node",
     "NODE_MAPPING",
+    "ASYNC_NODE_MAPPING",
     "get_node_function",
     # Edges
     "route_from_supervisor",
@@ -84,4 +102,8 @@ __all__ = [
     "create_workflow",
     "create_runner",
     "get_workflow_diagram",
+    # Events
+    "WorkflowEvent",
+    # Checkpointing
+    "SQLiteCheckpointer",
 ]
@@ -0,0 +1,327 @@
+"""
+Durable Checkpointing for the Multi-Agent Virtual Company.
+
+MemorySaver keeps checkpoints in process memory, so a crash or a
+failed writer after minutes of research loses everything.
+SQLiteCheckpointer keeps LangGraph's in-memory checkpoint logic but
+writes every checkpoint, channel value and pending write through to a
+SQLite file. Threads are loaded back lazily the first time they are
+touched, so a new process can resume a run from its last completed
+node (see WorkflowRunner.resume). The async methods used by the async
+graph run the SQLite work in a thread, off the event loop.
+"""
+
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence, Union
+from loguru import logger
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.schemas.models import (
+    SearchResult,
+    ResearchData,
+    KeyInsight,
+    AnalysisSummary,
+    CritiqueResult,
+    ReportSection,
+    FinalReport,
+    AgentMessage,
+)
+
+
+# State types that may be deserialized from a checkpoint file
+CHECKPOINT_TYPES = (
+    SearchResult,
+    ResearchData,
+    KeyInsight,
+    AnalysisSummary,
+    CritiqueResult,
+    ReportSection,
+    FinalReport,
+    AgentMessage,
+)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS checkpoints ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, "
+    "checkpoint_type TEXT NOT NULL, checkpoint BLOB NOT NULL, "
+    "metadata_type TEXT NOT NULL, metadata BLOB NOT NULL, parent_id TEXT, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))",
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, channel TEXT NOT NULL, "
+    "version TEXT NOT NULL, value_type TEXT NOT NULL, value BLOB NOT NULL, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, channel, version))",
+    "CREATE TABLE IF NOT EXISTS writes ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, "
+    "task_id TEXT NOT NULL, idx INTEGER NOT NULL, channel TEXT NOT NULL, "
+    "value_type TEXT NOT NULL, value BLOB NOT NULL, task_path TEXT NOT NULL, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))",
+)
+
+
+class SQLiteCheckpointer(InMemorySaver):
+    """
+    Checkpointer that persists LangGraph checkpoints to a SQLite file.
+
+    Reads are served from memory; writes go to memory and to disk in
+    the same call, so the file is always as current as the last
+    completed node. Safe to share between the sync and async graphs
+    of a runner and between threads.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open (and create if needed) the checkpoint database.
+
+        Args:
+            db_path: SQLite file path
+        """
+        super().__init__(serde=JsonPlusSerializer(allowed_msgpack_modules=CHECKPOINT_TYPES))
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._loaded: set[str] = set()
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+        logger.info(f"SQLiteCheckpointer initialized ({self.db_path})")
+
+    # =========================================================================
+    # Loading
+    # =========================================================================
+
+    def _ensure_loaded(self, thread_id: str):
+        """Load a thread's rows into memory the first time it is used."""
+        with self._lock:
+            if thread_id in self._loaded:
+                return
+            self._loaded.add(thread_id)
+
+            for ns, checkpoint_id, c_type, checkpoint, m_type, metadata, parent_id in self._db.execute(
+                "SELECT checkpoint_ns, checkpoint_id, checkpoint_type, checkpoint, "
+                "metadata_type, metadata, parent_id FROM checkpoints WHERE thread_id = ?",
+                (thread_id,),
+            ):
+                self.storage[thread_id][ns][checkpoint_id] = (
+                    (c_type, checkpoint),
+                    (m_type, metadata),
+                    parent_id,
+                )
+
+            for ns, channel, version, v_type, value in self._db.execute(
+                "SELECT checkpoint_ns, channel, version, value_type, value "
+                "FROM blobs WHERE thread_id = ?",
+                (thread_id,),
+            ):
+                self.blobs[(thread_id, ns, channel, version)] = (v_type, value)
+
+            for ns, checkpoint_id, task_id, idx, channel, v_type, value, task_path in self._db.execute(
+                "SELECT checkpoint_ns, checkpoint_id, task_id, idx, channel, value_type, "
+                "value, task_path FROM writes WHERE thread_id = ?",
+                (thread_id,),
+            ):
+                self.writes[(thread_id, ns, checkpoint_id)][(task_id, idx)] = (
+                    task_id, channel, (v_type, value), task_path,
+                )
+
+    def _ensure_all_loaded(self):
+        """Load every stored thread (used when listing without a thread)."""
+        with self._lock:
+            rows = self._db.execute("SELECT DISTINCT thread_id FROM checkpoints").fetchall()
+        for (thread_id,) in rows:
+            self._ensure_loaded(thread_id)
+
+    def list_threads(self) -> list[str]:
+        """
+        List the thread IDs stored in the database.
+
+        Returns:
+            Thread IDs, most recently checkpointed first
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT thread_id FROM checkpoints GROUP BY thread_id "
+                "ORDER BY MAX(checkpoint_id) DESC"
+            ).fetchall()
+        return [thread_id for (thread_id,) in rows]
+
+    # =========================================================================
+    # Reads
+    # =========================================================================
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get a checkpoint tuple, loading its thread from disk if needed."""
+        self._ensure_loaded(config["configurable"]["thread_id"])
+        return super().get_tuple(config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints, loading the requested thread(s) from disk if needed."""
+        if config:
+            self._ensure_loaded(config["configurable"]["thread_id"])
+        else:
+            self._ensure_all_loaded()
+        return super().list(config, filter=filter, before=before, limit=limit)
+
+    def get_delta_channel_history(self, *, config: RunnableConfig, channels: Sequence[str]):
+        """Delta channel history, loading the thread from disk if needed."""
+        self._ensure_loaded(config["configurable"]["thread_id"])
+        return super().get_delta_channel_history(config=config, channels=channels)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Async get_tuple; loading a thread from disk runs off the event loop."""
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Async list; loading threads from disk runs off the event loop."""
+        if config:
+            await asyncio.to_thread(self._ensure_loaded, config["configurable"]["thread_id"])
+        else:
+            await asyncio.to_thread(self._ensure_all_loaded)
+        for item in super().list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aget_delta_channel_history(self, *, config: RunnableConfig, channels: Sequence[str]):
+        """Async delta channel history; loading from disk runs off the event loop."""
+        return await asyncio.to_thread(
+            self.get_delta_channel_history, config=config, channels=channels
+        )
+
+    # =========================================================================
+    # Writes
+    # =========================================================================
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint in memory and on disk."""
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"]["checkpoint_ns"]
+        self._ensure_loaded(thread_id)
+
+        with self._lock:
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+
+            (c_type, c_value), (m_type, m_value), parent_id = (
+                self.storage[thread_id][ns][checkpoint["id"]]
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO blobs "
+                "(thread_id, checkpoint_ns, channel, version, value_type, value) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (thread_id, ns, channel, str(version),
+                     *self.blobs[(thread_id, ns, channel, version)])
+                    for channel, version in new_versions.items()
+                ],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, "
+                "checkpoint_type, checkpoint, metadata_type, metadata, parent_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, ns, checkpoint["id"], c_type, c_value, m_type, m_value, parent_id),
+            )
+            self._db.commit()
+
+        return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Save a task's pending writes in memory and on disk."""
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        self._ensure_loaded(thread_id)
+
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+
+            stored = self.writes.get((thread_id, ns, checkpoint_id), {})
+            self._db.executemany(
+                "INSERT OR REPLACE INTO writes (thread_id, checkpoint_ns, checkpoint_id, "
+                "task_id, idx, channel, value_type, value, task_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (thread_id, ns, checkpoint_id, key_task, idx, channel, *value, path)
+                    for (key_task, idx), (_, channel, value, path) in stored.items()
+                    if key_task == task_id
+                ],
+            )
+            self._db.commit()
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Async put; the SQLite write runs off the event loop."""
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Async put_writes; the SQLite write runs off the event loop."""
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete a thread's checkpoints from memory and disk."""
+        with self._lock:
+            super().delete_thread(thread_id)
+            for table in ("checkpoints", "blobs", "writes"):
+                self._db.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            self._db.commit()
+            self._loaded.discard(thread_id)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Async delete_thread; the SQLite delete runs off the event loop."""
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+__all__ = [
+    "CHECKPOINT_TYPES",
+    "SQLiteCheckpointer",
+]
@@ -0,0 +1,156 @@
+"""
+Workflow events for the Multi-Agent Virtual Company.
+
+WorkflowRunner.astream_events yields these so that the CLI and the
+Streamlit app can render progress and the report while the workflow is
+still running, instead of waiting for the final state.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Literal, Optional
+
+
+# Event types emitted during a run
+EventType = Literal[
+    "node_started", "node_finished", "node_update", "token", "completed", "failed"
+]
+
+
+@dataclass
+class WorkflowEvent:
+    """
+    A single event from a running workflow.
+
+    Attributes:
+        type: Kind of event
+        node: Node that produced the event (if any)
+        text: Streamed text for token events
+        data: State update for node events, final state for completion
+        duration: Seconds the node took (node_finished only)
+        metrics: Node metrics such as tokens and sources_found
+        timestamp: When the event was produced
+    """
+
+    type: EventType
+    node: Optional[str] = None
+    text: str = ""
+    data: Any = None
+    duration: Optional[float] = None
+    metrics: dict = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    @property
+    def is_token(self) -> bool:
+        """Whether this event carries streamed report text."""
+        return self.type == "token"
+
+    @property
+    def is_final(self) -> bool:
+        """Whether this is the last event of a run."""
+        return self.type in ("completed", "failed")
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> Optional["WorkflowEvent"]:
+        """
+        Convert a custom stream payload emitted by a node into an event.
+
+        Args:
+            payload: Value a node passed to LangGraph's stream writer
+
+        Returns:
+            WorkflowEvent, or None for payloads that are not events
+        """
+        if not isinstance(payload, dict):
+            return None
+
+        event_type = payload.get("type")
+        if event_type == "token":
+            return cls(type="token", node=payload.get("node"), text=payload.get("text", ""))
+        if event_type in ("node_started", "node_finished"):
+            return cls(
+                type=event_type,
+                node=payload.get("node"),
+                duration=payload.get("duration"),
+                metrics=payload.get("metrics", {}),
+            )
+        return None
+
+
+def token_event(node: str, text: str) -> dict:
+    """
+    Build the custom stream payload a node emits for a chunk of text.
+
+    Args:
+        node: Node emitting the text
+        text: Chunk of generated text
+
+    Returns:
+        Payload passed to LangGraph's stream writer
+    """
+    return {"type": "token", "node": node, "text": text}
+
+
+def node_started_event(node: str) -> dict:
+    """
+    Build the custom stream payload emitted when a node starts.
+
+    Args:
+        node: Node name
+
+    Returns:
+        Payload passed to LangGraph's stream writer
+    """
+    return {"type": "node_started", "node": node}
+
+
+def node_finished_event(node: str, duration: float, metrics: dict) -> dict:
+    """
+    Build the custom stream payload emitted when a node finishes.
+
+    Args:
+        node: Node name
+        duration: Seconds the node took
+        metrics: Node metrics (tokens, llm_calls, sources_found)
+
+    Returns:
+        Payload passed to LangGraph's stream writer
+    """
+    return {"type": "node_finished", "node": node, "duration": duration, "metrics": metrics}
+
+
+def summarize_node_timings(events: list[WorkflowEvent]) -> list[dict]:
+    """
+    Aggregate node_finished events into per-node totals.
+
+    Args:
+        events: Events from one run
+
+    Returns:
+        One dict per node (runs, seconds, tokens, sources_found),
+        slowest first
+    """
+    totals: dict[str, dict] = {}
+
+    for event in events:
+        if event.type != "node_finished" or not event.node:
+            continue
+        entry = totals.setdefault(event.node, {
+            "node": event.node, "runs": 0, "seconds": 0.0, "tokens": 0, "sources_found": 0,
+        })
+        entry["runs"] += 1
+        entry["seconds"] += event.duration or 0.0
+        entry["tokens"] += event.metrics.get("tokens", 0)
+        entry["sources_found"] += event.metrics.get("sources_found", 0)
+
+    return sorted(totals.values(), key=lambda entry: entry["seconds"], reverse=True)
+
+
+__all__ = [
+    "EventType",
+    "WorkflowEvent",
+    "token_event",
+    "node_started_event",
+    "node_finished_event",
+    "summarize_node_timings",
+]
@@ -8,13 +8,22 @@ Each node:
 1. Receives the current state
 2. Invokes the corresponding agent
 3. Returns state updates
+
+Every node has a sync variant (calls ``agent.process``) and an async
+variant (awaits ``agent.aprocess``) so the graph can be driven from
+either ``invoke`` or ``ainvoke``.
 """
 
-from typing import Callable, Optional
+import time
+import asyncio
+import functools
+from typing import Awaitable, Callable, Optional
 from datetime import datetime
 from loguru import logger
+from langgraph.config import get_stream_writer
 
 from src.graph.state import GraphState, AgentType
+from src.graph.events import token_event, node_started_event, node_finished_event
 from src.schemas.models import AgentMessage
 from src.agents import (
     ResearcherAgent,
@@ -23,6 +32,9 @@ from src.agents import (
     WriterAgent,
     SupervisorAgent,
 )
+from src.agents.rate_limit import TokenUsage, track_token_usage
+from src.tools.tracing import trace_span
+from src.tools.analysis import release_prepared_analysis
 
 
 # =============================================================================
@@ -30,6 +42,7 @@ from src.agents import (
 # =============================================================================
 
 NodeFunction = Callable[[GraphState], GraphState]
+AsyncNodeFunction = Callable[[GraphState], Awaitable[GraphState]]
 
 
 # =============================================================================
@@ -42,31 +55,49 @@ class AgentRegistry:
     
     Uses lazy initialization to create agents only when needed.
     Supports dependency injection for testing.
+    
+    Agents draw their LLM clients from the process-wide LLMClientPool,
+    so resetting the registry does not discard open connections.
     """
     
     _instance: Optional["AgentRegistry"] = None
     
-    def __init__(self, api_key: str, tavily_api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        tavily_api_key: str,
+        agent_options: Optional[dict[AgentType, dict]] = None,
+    ):
         """
         Initialize the agent registry.
         
         Args:
             api_key: Groq API key for all agents
             tavily_api_key: Tavily API key for researcher
+            agent_options: Extra constructor arguments per agent type
+                (e.g. Settings.get_agent_options())
         """
         self.api_key = api_key
         self.tavily_api_key = tavily_api_key
+        self.agent_options = agent_options or {}
         self._agents: dict[AgentType, object] = {}
         logger.info("AgentRegistry initialized")
     
     @classmethod
-    def get_instance(cls, api_key: Optional[str] = None, tavily_api_key: Optional[str] = None) -> "AgentRegistry":
+    def get_instance(
+        cls,
+        api_key: Optional[str] = None,
+        tavily_api_key: Optional[str] = None,
+        agent_options: Optional[dict[AgentType, dict]] = None,
+    ) -> "AgentRegistry":
         """
         Get the singleton registry instance.
         
         Args:
             api_key: Groq API key (required on first call)
             tavily_api_key: Tavily API key (required on first call)
+            agent_options: Extra constructor arguments per agent type
+                (used on first call)
             
         Returns:
             AgentRegistry instance
@@ -74,7 +105,7 @@ class AgentRegistry:
         if cls._instance is None:
             if api_key is None or tavily_api_key is None:
                 raise ValueError("Both API keys required for first initialization")
-            cls._instance = cls(api_key, tavily_api_key)
+            cls._instance = cls(api_key, tavily_api_key, agent_options)
         return cls._instance
     
     @classmethod
@@ -82,37 +113,54 @@ class AgentRegistry:
         """Reset the singleton instance (useful for testing)."""
         cls._instance = None
     
+    def get_existing(self, agent_type: AgentType) -> Optional[object]:
+        """Get an agent only if it has already been created."""
+        return self._agents.get(agent_type)
+    
     def get_researcher(self) -> ResearcherAgent:
         """Get or create the Researcher agent."""
         if "researcher" not in self._agents:
             self._agents["researcher"] = ResearcherAgent(
                 api_key=self.api_key,
                 tavily_api_key=self.tavily_api_key,
+                **self.agent_options.get("researcher", {}),
             )
         return self._agents["researcher"]
     
     def get_analyst(self) -> AnalystAgent:
         """Get or create the Analyst agent."""
         if "analyst" not in self._agents:
-            self._agents["analyst"] = AnalystAgent(api_key=self.api_key)
+            self._agents["analyst"] = AnalystAgent(
+                api_key=self.api_key,
+                **self.agent_options.get("analyst", {}),
+            )
         return self._agents["analyst"]
     
     def get_critic(self) -> CriticAgent:
         """Get or create the Critic agent."""
         if "critic" not in self._agents:
-            self._agents["critic"] = CriticAgent(api_key=self.api_key)
+            self._agents["critic"] = CriticAgent(
+                api_key=self.api_key,
+                **self.agent_options.get("critic", {}),
+            )
         return self._agents["critic"]
     
     def get_writer(self) -> WriterAgent:
         """Get or create the Writer agent."""
         if "writer" not in self._agents:
-            self._agents["writer"] = WriterAgent(api_key=self.api_key)
+            self._agents["writer"] = WriterAgent(
+                api_key=self.api_key,
+                **self.agent_options.get("writer", {}),
+            )
         return self._agents["writer"]
     
     def get_supervisor(self) -> SupervisorAgent:
         """Get or create the Supervisor agent."""
         if "supervisor" not in self._agents:
-            self._agents["supervisor"] = SupervisorAgent(api_key=self.api_key)
+            self._agents["supervisor"] = SupervisorAgent(
+                api_key=self.api_key,
+                **self.agent_options.get("supervisor", {}),
+            )
         return self._agents["supervisor"]
 
 
@@ -120,7 +168,11 @@ class AgentRegistry:
 # Global Registry Access
 # =============================================================================
 
-def initialize_registry(api_key: str, tavily_api_key: str) -> AgentRegistry:
+def initialize_registry(
+    api_key: str,
+    tavily_api_key: str,
+    agent_options: Optional[dict[AgentType, dict]] = None,
+) -> AgentRegistry:
     """
     Initialize the global agent registry.
     
@@ -129,12 +181,13 @@ def initialize_registry(api_key: str, tavily_api_key: str) -> AgentRegistry:
     Args:
         api_key: Groq API key
         tavily_api_key: Tavily API key for research
+        agent_options: Extra constructor arguments per agent type
         
     Returns:
         Initialized AgentRegistry
     """
     AgentRegistry.reset()  # Clear any existing instance
-    return AgentRegistry.get_instance(api_key, tavily_api_key)
+    return AgentRegistry.get_instance(api_key, tavily_api_key, agent_options)
 
 
 def get_registry() -> AgentRegistry:
@@ -273,6 +326,16 @@ def analyst_node(state: GraphState) -> GraphState:
         # Process analysis
         updated_state = analyst.process(state)
         
+        # Merge research notes deferred during the analysis
+        researcher = registry.get_existing("researcher")
+        research_data = updated_state.get("research_data")
+        if researcher is not None and research_data is not None:
+            merged = researcher.collect_research_notes(research_data)
+            if merged is not research_data:
+                # The analysis was prepared with the provisional notes
+                release_prepared_analysis(research_data)
+            updated_state = {**updated_state, "research_data": merged}
+        
         # Log analysis summary
         if updated_state.get("analysis_summary"):
             summary = updated_state["analysis_summary"]
@@ -405,6 +468,292 @@ def end_node(state: GraphState) -> GraphState:
     }
 
 
+# =============================================================================
+# Async Node Functions
+# =============================================================================
+
+def _node_error_state(state: GraphState, agent: AgentType, error: Exception) -> GraphState:
+    """
+    Build the failed state returned when a node raises.
+    
+    Args:
+        state: Current graph state
+        agent: Agent whose node failed
+        error: The exception raised
+        
+    Returns:
+        State marked as failed
+    """
+    logger.error(f"{agent.capitalize()} node error: {error}")
+    return {
+        **state,
+        "error": str(error),
+        "error_agent": agent,
+        "workflow_status": "failed",
+    }
+
+
+async def async_supervisor_node(state: GraphState) -> GraphState:
+    """
+    Async supervisor node - awaits SupervisorAgent.aprocess.
+    
+    Args:
+        state: Current graph state
+        
+    Returns:
+        Updated state with next_agent set
+    """
+    logger.info("=" * 50)
+    logger.info("SUPERVISOR NODE (async)")
+    logger.info("=" * 50)
+    
+    try:
+        supervisor = get_registry().get_supervisor()
+        state = {**state, "current_agent": "supervisor"}
+        
+        updated_state = await supervisor.aprocess(state)
+        
+        logger.info(f"Supervisor decided next agent: {updated_state.get('next_agent')}")
+        return updated_state
+        
+    except Exception as e:
+        return _node_error_state(state, "supervisor", e)
+
+
+async def async_researcher_node(state: GraphState) -> GraphState:
+    """
+    Async researcher node - awaits ResearcherAgent.aprocess.
+    
+    Args:
+        state: Current graph state
+        
+    Returns:
+        Updated state with research_data
+    """
+    logger.info("=" * 50)
+    logger.info("RESEARCHER NODE (async)")
+    logger.info("=" * 50)
+    
+    try:
+        researcher = get_registry().get_researcher()
+        state = {**state, "current_agent": "researcher"}
+        
+        updated_state = await researcher.aprocess(state)
+        
+        if updated_state.get("research_data"):
+            rd = updated_state["research_data"]
+            logger.info(f"Research completed: {rd.sources_count} sources found")
+        
+        return updated_state
+        
+    except Exception as e:
+        return _node_error_state(state, "researcher", e)
+
+
+async def async_analyst_node(state: GraphState) -> GraphState:
+    """
+    Async analyst node - awaits AnalystAgent.aprocess.
+    
+    Args:
+        state: Current graph state
+        
+    Returns:
+        Updated state with analysis_summary
+    """
+    logger.info("=" * 50)
+    logger.info("ANALYST NODE (async)")
+    logger.info("=" * 50)
+    
+    try:
+        analyst = get_registry().get_analyst()
+        state = {**state, "current_agent": "analyst"}
+        
+        if state.get("critique_result") is not None:
+            logger.info("Analyst performing revision based on critique")
+        
+        updated_state = await analyst.aprocess(state)
+        
+        # Merge research notes deferred during the analysis
+        researcher = get_registry().get_existing("researcher")
+        research_data = updated_state.get("research_data")
+        if researcher is not None and research_data is not None:
+            merged = await researcher.acollect_research_notes(research_data)
+            if merged is not research_data:
+                # The analysis was prepared with the provisional notes
+                release_prepared_analysis(research_data)
+            updated_state = {**updated_state, "research_data": merged}
+        
+        if updated_state.get("analysis_summary"):
+            summary = updated_state["analysis_summary"]
+            logger.info(f"Analysis completed: {len(summary.key_insights)} key insights")
+        
+        return updated_state
+        
+    except Exception as e:
+        return _node_error_state(state, "analyst", e)
+
+
+async def async_critic_node(state: GraphState) -> GraphState:
+    """
+    Async critic node - awaits CriticAgent.aprocess.
+    
+    Args:
+        state: Current graph state
+        
+    Returns:
+        Updated state with critique_result
+    """
+    logger.info("=" * 50)
+    logger.info("CRITIC NODE (async)")
+    logger.info("=" * 50)
+    
+    try:
+        critic = get_registry().get_critic()
+        state = {**state, "current_agent": "critic"}
+        
+        updated_state = await critic.aprocess(state)
+        
+        if updated_state.get("critique_result"):
+            critique = updated_state["critique_result"]
+            status = "APPROVED" if critique.is_approved else "REVISION REQUESTED"
+            logger.info(f"Critique completed: {status} (score: {critique.quality_score:.2f})")
+        
+        return updated_state
+        
+    except Exception as e:
+        return _node_error_state(state, "critic", e)
+
+
+async def async_writer_node(state: GraphState) -> GraphState:
+    """
+    Async writer node - awaits WriterAgent.aprocess.
+    
+    Report text is streamed to LangGraph's custom stream as it is
+    generated, so astream_events consumers can render it incrementally.
+    
+    Args:
+        state: Current graph state
+        
+    Returns:
+        Updated state with final_report
+    """
+    logger.info("=" * 50)
+    logger.info("WRITER NODE (async)")
+    logger.info("=" * 50)
+    
+    try:
+        writer = get_registry().get_writer()
+        state = {**state, "current_agent": "writer"}
+        
+        stream_writer = get_stream_writer()
+        updated_state = await writer.aprocess(
+            state,
+            on_token=lambda text: stream_writer(token_event("writer", text)),
+        )
+        
+        if updated_state.get("final_report"):
+            report = updated_state["final_report"]
+            logger.info(f"Report completed: {len(report.sections)} sections")
+        
+        return updated_state
+        
+    except Exception as e:
+        return _node_error_state(state, "writer", e)
+
+
+async def async_end_node(state: GraphState) -> GraphState:
+    """
+    Async end node - finalizes the workflow.
+    
+    Args:
+        state: Current graph state
+        
+    Returns:
+        Final state with workflow marked complete
+    """
+    return end_node(state)
+
+
+# =============================================================================
+# Node Instrumentation
+# =============================================================================
+
+def _node_metrics(usage: TokenUsage, result: Optional[GraphState]) -> dict:
+    """
+    Collect metrics for a finished node.
+    
+    Args:
+        usage: LLM usage recorded while the node ran
+        result: State returned by the node
+        
+    Returns:
+        Dictionary with tokens, llm_calls and sources_found
+    """
+    metrics = {"tokens": usage.tokens, "llm_calls": usage.calls, "sources_found": 0}
+    
+    research_data = (result or {}).get("research_data")
+    if research_data is not None:
+        metrics["sources_found"] = research_data.sources_count
+    
+    return metrics
+
+
+def instrument_node(name: str, node: Callable) -> Callable:
+    """
+    Wrap a node so it reports node_started/node_finished events.
+    
+    Events go to LangGraph's custom stream (a no-op unless the graph is
+    streamed with the "custom" mode) and carry the node's duration, LLM
+    tokens used and, for the researcher, sources found. The node also
+    runs inside a trace span with the same metrics.
+    
+    Args:
+        name: Node name used in the events
+        node: Sync or async node function
+        
+    Returns:
+        Wrapped node function of the same kind
+    """
+    if asyncio.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def async_wrapper(state: GraphState) -> GraphState:
+            emit = get_stream_writer()
+            emit(node_started_event(name))
+            start = time.perf_counter()
+            result = None
+            
+            with trace_span(f"node.{name}", kind="node") as span, track_token_usage() as usage:
+                try:
+                    result = await node(state)
+                    return result
+                finally:
+                    metrics = _node_metrics(usage, result)
+                    for key, value in metrics.items():
+                        span.set(key, value)
+                    emit(node_finished_event(name, time.perf_counter() - start, metrics))
+        
+        return async_wrapper
+    
+    @functools.wraps(node)
+    def wrapper(state: GraphState) -> GraphState:
+        emit = get_stream_writer()
+        emit(node_started_event(name))
+        start = time.perf_counter()
+        result = None
+        
+        with trace_span(f"node.{name}", kind="node") as span, track_token_usage() as usage:
+            try:
+                result = node(state)
+                return result
+            finally:
+                metrics = _node_metrics(usage, result)
+                for key, value in metrics.items():
+                    span.set(key, value)
+                emit(node_finished_event(name, time.perf_counter() - start, metrics))
+    
+    return wrapper
+
+
 # =============================================================================
 # Node Function Mapping
 # =============================================================================
@@ -418,13 +767,23 @@ NODE_MAPPING: dict[str, NodeFunction] = {
     "end": end_node,
 }
 
+ASYNC_NODE_MAPPING: dict[str, AsyncNodeFunction] = {
+    "supervisor": async_supervisor_node,
+    "researcher": async_researcher_node,
+    "analyst": async_analyst_node,
+    "critic": async_critic_node,
+    "writer": async_writer_node,
+    "end": async_end_node,
+}
+
 
-def get_node_function(agent_type: str) -> NodeFunction:
+def get_node_function(agent_type: str, use_async: bool = False):
     """
     Get the node function for an agent type.
     
     Args:
         agent_type: Agent type string
+        use_async: Return the async variant of the node
         
     Returns:
         Node function
@@ -432,9 +791,10 @@ def get_node_function(agent_type: str) -> NodeFunction:
     Raises:
         KeyError: If agent type not found
     """
-    if agent_type not in NODE_MAPPING:
+    mapping = ASYNC_NODE_MAPPING if use_async else NODE_MAPPING
+    if agent_type not in mapping:
         raise KeyError(f"Unknown agent type: {agent_type}")
-    return NODE_MAPPING[agent_type]
+    return mapping[agent_type]
 
 
 # =============================================================================
@@ -453,9 +813,19 @@ __all__ = [
     "critic_node",
     "writer_node",
     "end_node",
+    # Async node functions
+    "async_supervisor_node",
+    "async_researcher_node",
+    "async_analyst_node",
+    "async_critic_node",
+    "async_writer_node",
+    "async_end_node",
     # Mapping
     "NODE_MAPPING",
+    "ASYNC_NODE_MAPPING",
     "get_node_function",
+    "instrument_node",
     # Type
     "NodeFunction",
+    "AsyncNodeFunction",
 ]
@@ -90,6 +90,7 @@ class GraphState(TypedDict, total=False):
         # Metadata
         started_at: When the workflow started
         completed_at: When the workflow completed
+        trace: Timing/token trace of the run (attached by WorkflowRunner)
     """
     
     # =========================================================================
@@ -130,6 +131,7 @@ class GraphState(TypedDict, total=False):
     # =========================================================================
     started_at: Optional[datetime]
     completed_at: Optional[datetime]
+    trace: Optional[dict]
 
 
 # =============================================================================
@@ -174,6 +176,7 @@ def create_initial_state(user_query: str, max_iterations: int = 3) -> GraphState
         # Metadata
         started_at=datetime.now(),
         completed_at=None,
+        trace=None,
     )
 
 
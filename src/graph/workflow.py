@@ -9,17 +9,33 @@ Workflow Flow:
     
 The supervisor acts as the central router, deciding which agent
 should process next based on the current state.
+
+The graph can be built with sync nodes (``WorkflowRunner.run``) or
+async nodes (``WorkflowRunner.arun`` / ``astream``); the async graph
+lets a single event loop drive many research runs concurrently.
+
+With a checkpoint database (``WorkflowRunner(checkpoint_db=...)``)
+every completed node is persisted, and ``WorkflowRunner.resume``
+continues a crashed or failed run from its last completed node.
 """
 
-from typing import Optional, Callable
+import uuid
+import asyncio
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional, Callable, Union
 from datetime import datetime
 from loguru import logger
 
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.state import CompiledStateGraph
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
 
 from src.graph.state import GraphState, create_initial_state, get_state_summary
+from src.graph.events import WorkflowEvent
+from src.graph.checkpoint import SQLiteCheckpointer
+from src.tools.tracing import Trace, start_trace
+from src.tools.analysis import release_prepared_analysis
 from src.graph.nodes import (
     supervisor_node,
     researcher_node,
@@ -27,6 +43,8 @@ from src.graph.nodes import (
     critic_node,
     writer_node,
     end_node,
+    ASYNC_NODE_MAPPING,
+    instrument_node,
     initialize_registry,
     AgentRegistry,
 )
@@ -51,34 +69,45 @@ class WorkflowBuilder:
     the LangGraph StateGraph.
     """
     
-    def __init__(self, api_key: str, tavily_api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        tavily_api_key: str,
+        agent_options: Optional[dict[str, dict]] = None,
+    ):
         """
         Initialize the workflow builder.
         
         Args:
             api_key: Groq API key for agents
             tavily_api_key: Tavily API key for research
+            agent_options: Extra constructor arguments per agent type
+                (e.g. Settings.get_agent_options())
         """
         self.api_key = api_key
         self.tavily_api_key = tavily_api_key
         self.graph: Optional[StateGraph] = None
-        self.checkpointer: Optional[MemorySaver] = None
+        self.checkpointer: Optional[BaseCheckpointSaver] = None
         
         # Initialize agent registry
-        initialize_registry(api_key, tavily_api_key)
+        initialize_registry(api_key, tavily_api_key, agent_options)
         
         logger.info("WorkflowBuilder initialized")
     
-    def build(self) -> StateGraph:
+    def build(self, use_async: bool = False) -> StateGraph:
         """
         Build the workflow graph.
         
         Creates all nodes and edges for the multi-agent workflow.
         
+        Args:
+            use_async: Use async nodes that await each agent's aprocess
+                (the compiled graph must then be run with ainvoke/astream)
+        
         Returns:
             Configured StateGraph (not yet compiled)
         """
-        logger.info("Building workflow graph...")
+        logger.info(f"Building workflow graph{' (async)' if use_async else ''}...")
         
         # Create StateGraph with our state schema
         self.graph = StateGraph(GraphState)
@@ -88,20 +117,35 @@ class WorkflowBuilder:
         # =================================================================
         logger.debug("Adding nodes...")
         
+        if use_async:
+            nodes = ASYNC_NODE_MAPPING
+        else:
+            nodes = {
+                "supervisor": supervisor_node,
+                "researcher": researcher_node,
+                "analyst": analyst_node,
+                "critic": critic_node,
+                "writer": writer_node,
+                "end": end_node,
+            }
+        
+        # Every node reports node_started/node_finished progress events
+        nodes = {name: instrument_node(name, node) for name, node in nodes.items()}
+        
         # Supervisor node - Central orchestrator
-        self.graph.add_node("supervisor", supervisor_node)
+        self.graph.add_node("supervisor", nodes["supervisor"])
         
         # Worker nodes
-        self.graph.add_node("researcher", researcher_node)
-        self.graph.add_node("analyst", analyst_node)
-        self.graph.add_node("critic", critic_node)
-        self.graph.add_node("writer", writer_node)
+        self.graph.add_node("researcher", nodes["researcher"])
+        self.graph.add_node("analyst", nodes["analyst"])
+        self.graph.add_node("critic", nodes["critic"])
+        self.graph.add_node("writer", nodes["writer"])
         
         # End node
-        self.graph.add_node("end", end_node)
+        self.graph.add_node("end", nodes["end"])
         
         # Error handler node
-        self.graph.add_node("error", self._error_handler_node)
+        self.graph.add_node("error", instrument_node("error", self._error_handler_node))
         
         logger.debug("Nodes added: supervisor, researcher, analyst, critic, writer, end, error")
         
@@ -200,12 +244,16 @@ class WorkflowBuilder:
             "completed_at": datetime.now(),
         }
     
-    def with_checkpointer(self, checkpointer: Optional[MemorySaver] = None) -> "WorkflowBuilder":
+    def with_checkpointer(
+        self,
+        checkpointer: Optional[BaseCheckpointSaver] = None,
+    ) -> "WorkflowBuilder":
         """
         Add checkpointing for state persistence.
         
         Args:
-            checkpointer: Custom checkpointer (default: MemorySaver)
+            checkpointer: Custom checkpointer, e.g. a SQLiteCheckpointer
+                for durable runs (default: MemorySaver)
             
         Returns:
             Self for chaining
@@ -250,12 +298,17 @@ class WorkflowRunner:
     and handling results.
     """
     
+    # LangGraph stream modes consumed by the streaming run methods
+    STREAM_MODES = ["updates", "custom", "values"]
+    
     def __init__(
         self,
         api_key: str,
         tavily_api_key: str,
         max_iterations: int = 3,
         enable_checkpointing: bool = True,
+        checkpoint_db: Optional[Union[str, Path]] = None,
+        agent_options: Optional[dict[str, dict]] = None,
     ):
         """
         Initialize the workflow runner.
@@ -265,21 +318,30 @@ class WorkflowRunner:
             tavily_api_key: Tavily API key for research
             max_iterations: Maximum revision iterations
             enable_checkpointing: Whether to enable state checkpointing
+            checkpoint_db: SQLite file for durable checkpoints, so runs
+                can be resumed from another process (implies checkpointing)
+            agent_options: Extra constructor arguments per agent type
         """
         self.api_key = api_key
         self.tavily_api_key = tavily_api_key
         self.max_iterations = max_iterations
         
         # Build and compile workflow
-        builder = WorkflowBuilder(api_key, tavily_api_key)
+        builder = WorkflowBuilder(api_key, tavily_api_key, agent_options)
         
-        if enable_checkpointing:
+        if checkpoint_db:
+            builder.with_checkpointer(SQLiteCheckpointer(checkpoint_db))
+        elif enable_checkpointing:
             builder.with_checkpointer()
         
         self.workflow = builder.build()
         self.compiled_workflow = builder.compile()
         self.checkpointer = builder.checkpointer
         
+        # The async graph is compiled on first use of arun/astream
+        self._builder = builder
+        self._async_compiled_workflow: Optional[CompiledStateGraph] = None
+        
         logger.info(f"WorkflowRunner initialized (max_iterations={max_iterations})")
     
     def run(
@@ -287,6 +349,7 @@ class WorkflowRunner:
         query: str,
         thread_id: Optional[str] = None,
         stream: bool = False,
+        on_event: Optional[Callable[[WorkflowEvent], None]] = None,
     ) -> GraphState:
         """
         Run the workflow for a query.
@@ -294,7 +357,9 @@ class WorkflowRunner:
         Args:
             query: User's research query
             thread_id: Optional thread ID for checkpointing
-            stream: Whether to stream results (not yet implemented)
+            stream: Whether to stream node progress (implied by on_event)
+            on_event: Called with node_started/node_finished/node_update
+                events as the run progresses
             
         Returns:
             Final graph state
@@ -310,43 +375,379 @@ class WorkflowRunner:
         )
         
         # Configure run
-        config = {}
-        if thread_id and self.checkpointer:
-            config["configurable"] = {"thread_id": thread_id}
+        config = self._build_config(thread_id)
         
         try:
-            # Run the workflow
-            if stream:
-                return self._run_streaming(initial_state, config)
-            else:
-                return self._run_sync(initial_state, config)
+            # Run the workflow, recording a trace of every node, LLM and tool call
+            with start_trace("workflow", query=query) as trace:
+                if stream or on_event is not None:
+                    final_state = self._run_streaming(initial_state, config, on_event)
+                else:
+                    final_state = self._run_sync(initial_state, config)
+            
+            return self._finish_run(final_state, trace, config)
                 
         except Exception as e:
             logger.error(f"Workflow execution error: {e}")
-            return {
+            return self._attach_thread_id({
                 **initial_state,
                 "error": str(e),
                 "workflow_status": "failed",
                 "completed_at": datetime.now(),
-            }
+            }, config)
     
-    def _run_sync(self, initial_state: GraphState, config: dict) -> GraphState:
+    @property
+    def async_compiled_workflow(self) -> CompiledStateGraph:
+        """Lazily build and compile the async variant of the workflow."""
+        if self._async_compiled_workflow is None:
+            self._builder.build(use_async=True)
+            self._async_compiled_workflow = self._builder.compile()
+        return self._async_compiled_workflow
+    
+    def _build_config(self, thread_id: Optional[str]) -> dict:
         """
-        Run workflow synchronously.
+        Build the run configuration.
+        
+        A checkpointed graph requires a thread ID, so one is generated
+        when checkpointing is enabled and none was given.
         
         Args:
-            initial_state: Initial graph state
+            thread_id: Optional thread ID for checkpointing
+            
+        Returns:
+            Run configuration dict
+        """
+        config = {}
+        if self.checkpointer:
+            config["configurable"] = {"thread_id": thread_id or str(uuid.uuid4())}
+        return config
+    
+    def _finish_run(self, final_state: GraphState, trace: Trace, config: dict) -> GraphState:
+        """
+        Complete a finished run's result and release its per-run caches.
+        
+        Args:
+            final_state: Final graph state
+            trace: The run's trace
+            config: Run configuration
+            
+        Returns:
+            Final state with trace and thread ID attached
+        """
+        release_prepared_analysis(final_state.get("research_data"))
+        return self._attach_thread_id(self._attach_trace(final_state, trace), config)
+    
+    @staticmethod
+    def _attach_thread_id(final_state: GraphState, config: dict) -> GraphState:
+        """
+        Record a checkpointed run's thread ID so it can be resumed.
+        
+        Args:
+            final_state: Final graph state
             config: Run configuration
             
+        Returns:
+            Final state with "thread_id" (unchanged without checkpointing)
+        """
+        thread_id = config.get("configurable", {}).get("thread_id")
+        if thread_id is None:
+            return final_state
+        return {**final_state, "thread_id": thread_id}
+    
+    async def arun(
+        self,
+        query: str,
+        thread_id: Optional[str] = None,
+    ) -> GraphState:
+        """
+        Run the workflow for a query on the current event loop.
+        
+        Uses the async graph, so every agent call is awaited rather than
+        blocking a thread; many runs can be gathered concurrently.
+        
+        Args:
+            query: User's research query
+            thread_id: Optional thread ID for checkpointing
+            
         Returns:
             Final graph state
         """
-        logger.info("Running workflow synchronously...")
+        logger.info("=" * 60)
+        logger.info(f"STARTING ASYNC WORKFLOW: {query[:50]}...")
+        logger.info("=" * 60)
         
-        # Invoke the compiled workflow
-        final_state = self.compiled_workflow.invoke(initial_state, config)
+        initial_state = create_initial_state(
+            user_query=query,
+            max_iterations=self.max_iterations,
+        )
+        config = self._build_config(thread_id)
         
-        # Log completion summary
+        try:
+            with start_trace("workflow", query=query) as trace:
+                final_state = await self.async_compiled_workflow.ainvoke(initial_state, config)
+            
+            self._log_completion(final_state)
+            return self._finish_run(final_state, trace, config)
+            
+        except Exception as e:
+            logger.error(f"Async workflow execution error: {e}")
+            return self._attach_thread_id({
+                **initial_state,
+                "error": str(e),
+                "workflow_status": "failed",
+                "completed_at": datetime.now(),
+            }, config)
+    
+    # =========================================================================
+    # Resume
+    # =========================================================================
+    
+    def _resume_point(self, thread_id: str) -> tuple[Optional[dict], GraphState]:
+        """
+        Find the checkpoint a thread should continue from.
+        
+        That is the newest checkpoint with nodes still to run and no
+        error recorded: for a crashed run its latest checkpoint, for a
+        run that failed in a node the checkpoint taken just before it.
+        
+        Args:
+            thread_id: Thread of the earlier run
+            
+        Returns:
+            Tuple of (checkpoint config, or None if the run already
+            completed; latest state)
+            
+        Raises:
+            ValueError: If checkpointing is disabled or the thread is unknown
+        """
+        if not self.checkpointer:
+            raise ValueError("Resuming requires checkpointing to be enabled")
+        
+        config = {"configurable": {"thread_id": thread_id}}
+        latest = self.compiled_workflow.get_state(config)
+        if not latest.values:
+            raise ValueError(f"No checkpoints found for thread '{thread_id}'")
+        
+        if not latest.next and latest.values.get("workflow_status") == "completed":
+            return None, latest.values
+        
+        for snapshot in self.compiled_workflow.get_state_history(config):
+            if snapshot.next and "error" not in snapshot.next and not snapshot.values.get("error"):
+                logger.info(
+                    f"Resuming thread {thread_id} at {', '.join(snapshot.next)} "
+                    f"(checkpoint {snapshot.config['configurable']['checkpoint_id']})"
+                )
+                return snapshot.config, latest.values
+        
+        raise ValueError(f"Thread '{thread_id}' has no checkpoint to resume from")
+    
+    def resume(self, thread_id: str) -> GraphState:
+        """
+        Continue an earlier run from its last completed node.
+        
+        Nodes that already finished (and the Tavily and Groq calls they
+        made) are not repeated. A run that already completed is
+        returned as is.
+        
+        Args:
+            thread_id: Thread ID of the earlier run (its "thread_id")
+            
+        Returns:
+            Final graph state
+        """
+        config, latest = self._resume_point(thread_id)
+        if config is None:
+            logger.info(f"Thread {thread_id} already completed; nothing to resume")
+            return {**latest, "thread_id": thread_id}
+        
+        try:
+            with start_trace("workflow", query=latest.get("user_query", ""), resumed=True) as trace:
+                final_state = self.compiled_workflow.invoke(None, config)
+            
+            self._log_completion(final_state)
+            return self._finish_run(final_state, trace, config)
+            
+        except Exception as e:
+            logger.error(f"Resumed workflow execution error: {e}")
+            return self._attach_thread_id({
+                **latest,
+                "error": str(e),
+                "workflow_status": "failed",
+                "completed_at": datetime.now(),
+            }, config)
+    
+    async def aresume(self, thread_id: str) -> GraphState:
+        """
+        Continue an earlier run from its last completed node, asynchronously.
+        
+        Args:
+            thread_id: Thread ID of the earlier run (its "thread_id")
+            
+        Returns:
+            Final graph state
+        """
+        config, latest = self._resume_point(thread_id)
+        if config is None:
+            logger.info(f"Thread {thread_id} already completed; nothing to resume")
+            return {**latest, "thread_id": thread_id}
+        
+        try:
+            with start_trace("workflow", query=latest.get("user_query", ""), resumed=True) as trace:
+                final_state = await self.async_compiled_workflow.ainvoke(None, config)
+            
+            self._log_completion(final_state)
+            return self._finish_run(final_state, trace, config)
+            
+        except Exception as e:
+            logger.error(f"Async resumed workflow execution error: {e}")
+            return self._attach_thread_id({
+                **latest,
+                "error": str(e),
+                "workflow_status": "failed",
+                "completed_at": datetime.now(),
+            }, config)
+    
+    async def astream(
+        self,
+        query: str,
+        thread_id: Optional[str] = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Run the workflow asynchronously, yielding each node's update.
+        
+        Args:
+            query: User's research query
+            thread_id: Optional thread ID for checkpointing
+            
+        Yields:
+            Dicts mapping the node name to the state update it returned
+        """
+        initial_state = create_initial_state(
+            user_query=query,
+            max_iterations=self.max_iterations,
+        )
+        config = self._build_config(thread_id)
+        
+        async for event in self.async_compiled_workflow.astream(initial_state, config):
+            for node_name in event:
+                logger.info(f"[STREAM] Node '{node_name}' completed")
+            yield event
+    
+    async def astream_events(
+        self,
+        query: str,
+        thread_id: Optional[str] = None,
+    ) -> AsyncIterator[WorkflowEvent]:
+        """
+        Run the workflow asynchronously, yielding node and token events.
+        
+        Node updates arrive as each agent finishes; report text arrives
+        token by token while the writer is generating. The final event
+        is "completed" (or "failed") and carries the final state.
+        
+        Args:
+            query: User's research query
+            thread_id: Optional thread ID for checkpointing
+            
+        Yields:
+            WorkflowEvent instances
+        """
+        initial_state = create_initial_state(
+            user_query=query,
+            max_iterations=self.max_iterations,
+        )
+        config = self._build_config(thread_id)
+        final_state = initial_state
+        
+        trace = None
+        try:
+            with start_trace("workflow", query=query) as trace:
+                async for mode, payload in self.async_compiled_workflow.astream(
+                    initial_state,
+                    config,
+                    stream_mode=self.STREAM_MODES,
+                ):
+                    if mode == "values":
+                        final_state = payload
+                        continue
+                    for event in self._to_events(mode, payload):
+                        yield event
+        
+        except Exception as e:
+            logger.error(f"Async workflow execution error: {e}")
+            final_state = {
+                **final_state,
+                "error": str(e),
+                "workflow_status": "failed",
+                "completed_at": datetime.now(),
+            }
+        
+        self._log_completion(final_state)
+        release_prepared_analysis(final_state.get("research_data"))
+        if trace is not None:
+            final_state = self._attach_trace(final_state, trace)
+        event_type = "failed" if final_state.get("workflow_status") == "failed" else "completed"
+        yield WorkflowEvent(type=event_type, data=final_state)
+    
+    def run_with_events(
+        self,
+        query: str,
+        on_event: Callable[[WorkflowEvent], None],
+        thread_id: Optional[str] = None,
+    ) -> GraphState:
+        """
+        Run the workflow from synchronous code, delivering live events.
+        
+        Drives astream_events on a private event loop and hands each
+        event to `on_event` as it happens (e.g. to update a UI).
+        
+        Args:
+            query: User's research query
+            on_event: Called with every WorkflowEvent
+            thread_id: Optional thread ID for checkpointing
+            
+        Returns:
+            Final graph state
+        """
+        async def consume() -> GraphState:
+            final_state = None
+            async for event in self.astream_events(query, thread_id):
+                on_event(event)
+                if event.is_final:
+                    final_state = event.data
+            return final_state
+        
+        return asyncio.run(consume())
+    
+    @staticmethod
+    def _attach_trace(final_state: GraphState, trace: Trace) -> GraphState:
+        """
+        Attach a run's trace to its final state.
+        
+        Args:
+            final_state: Final graph state
+            trace: Trace recorded during the run
+            
+        Returns:
+            Final state with the exported trace under "trace"
+        """
+        summary = trace.summary()
+        logger.info(
+            f"Trace {trace.trace_id[:8]}: {trace.root.duration:.2f}s, "
+            f"{len(trace.spans) - 1} spans"
+        )
+        for name, totals in sorted(summary.items(), key=lambda item: -item[1]["seconds"]):
+            logger.debug(f"  {name}: {totals['count']}x, {totals['seconds']:.2f}s")
+        
+        return {**final_state, "trace": trace.to_dict()}
+    
+    def _log_completion(self, final_state: GraphState):
+        """
+        Log a completion summary for a finished run.
+        
+        Args:
+            final_state: Final graph state
+        """
         summary = get_state_summary(final_state)
         logger.info("=" * 60)
         logger.info("WORKFLOW COMPLETED")
@@ -356,16 +757,41 @@ class WorkflowRunner:
         if summary['error']:
             logger.error(f"Error: {summary['error']}")
         logger.info("=" * 60)
+    
+    def _run_sync(self, initial_state: GraphState, config: dict) -> GraphState:
+        """
+        Run workflow synchronously.
+        
+        Args:
+            initial_state: Initial graph state
+            config: Run configuration
+            
+        Returns:
+            Final graph state
+        """
+        logger.info("Running workflow synchronously...")
+        
+        # Invoke the compiled workflow
+        final_state = self.compiled_workflow.invoke(initial_state, config)
+        
+        # Log completion summary
+        self._log_completion(final_state)
         
         return final_state
     
-    def _run_streaming(self, initial_state: GraphState, config: dict) -> GraphState:
+    def _run_streaming(
+        self,
+        initial_state: GraphState,
+        config: dict,
+        on_event: Optional[Callable[[WorkflowEvent], None]] = None,
+    ) -> GraphState:
         """
         Run workflow with streaming output.
         
         Args:
             initial_state: Initial graph state
             config: Run configuration
+            on_event: Called with each node progress event
             
         Returns:
             Final graph state
@@ -374,15 +800,52 @@ class WorkflowRunner:
         
         final_state = initial_state
         
-        # Stream through nodes
-        for event in self.compiled_workflow.stream(initial_state, config):
-            # Each event contains node outputs
-            for node_name, node_output in event.items():
-                logger.info(f"[STREAM] Node '{node_name}' completed")
-                final_state = {**final_state, **node_output}
-        
+        # Stream node progress events and state snapshots
+        for mode, payload in self.compiled_workflow.stream(
+            initial_state,
+            config,
+            stream_mode=self.STREAM_MODES,
+        ):
+            if mode == "values":
+                final_state = payload
+                continue
+            for event in self._to_events(mode, payload):
+                if on_event is not None:
+                    on_event(event)
+        
+        self._log_completion(final_state)
         return final_state
     
+    @staticmethod
+    def _to_events(mode: str, payload: Any) -> list[WorkflowEvent]:
+        """
+        Convert one LangGraph stream item into workflow events.
+        
+        Args:
+            mode: Stream mode the item came from ("updates" or "custom")
+            payload: Streamed item
+            
+        Returns:
+            Workflow events (possibly empty)
+        """
+        if mode == "custom":
+            event = WorkflowEvent.from_payload(payload)
+            if event is not None and event.type == "node_finished":
+                metrics = event.metrics
+                logger.info(
+                    f"[STREAM] Node '{event.node}' finished in {event.duration:.2f}s "
+                    f"({metrics.get('tokens', 0)} tokens)"
+                )
+            return [event] if event is not None else []
+        
+        if mode == "updates":
+            return [
+                WorkflowEvent(type="node_update", node=node_name, data=update)
+                for node_name, update in payload.items()
+            ]
+        
+        return []
+    
     def get_state(self, thread_id: str) -> Optional[GraphState]:
         """
         Get the current state for a thread.
@@ -430,6 +893,8 @@ def create_runner(
     tavily_api_key: str,
     max_iterations: int = 3,
     enable_checkpointing: bool = True,
+    checkpoint_db: Optional[Union[str, Path]] = None,
+    agent_options: Optional[dict[str, dict]] = None,
 ) -> WorkflowRunner:
     """
     Create a workflow runner.
@@ -441,6 +906,9 @@ def create_runner(
         tavily_api_key: Tavily API key for research
         max_iterations: Maximum revision iterations
         enable_checkpointing: Enable state checkpointing
+        checkpoint_db: SQLite file for durable, resumable checkpoints
+        agent_options: Extra constructor arguments per agent type
+            (e.g. Settings.get_agent_options())
         
     Returns:
         Configured WorkflowRunner
@@ -450,6 +918,8 @@ def create_runner(
         tavily_api_key=tavily_api_key,
         max_iterations=max_iterations,
         enable_checkpointing=enable_checkpointing,
+        checkpoint_db=checkpoint_db,
+        agent_options=agent_options,
     )
 
 
@@ -6,14 +6,18 @@ research queries through the multi-agent workflow.
 
 Usage:
     python -m src.main "Your research query here"
+    python -m src.main --batch queries.txt --concurrency 8
     python -m src.main --help
 """
 
 import sys
+import json
+import time
+import asyncio
 import argparse
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from loguru import logger
 
@@ -60,26 +64,38 @@ def run_research(
     max_iterations: int = 3,
     output_dir: Optional[Path] = None,
     save_report: bool = True,
+    on_token: Optional[Callable[[str], None]] = None,
+    checkpoint_db: Optional[Path] = None,
+    resume_thread: Optional[str] = None,
 ) -> dict:
     """
     Run a research query through the multi-agent workflow.
     
     Args:
-        query: Research query/topic
+        query: Research query/topic (ignored when resuming)
         max_iterations: Maximum revision iterations
         output_dir: Directory to save reports
         save_report: Whether to save the report to file
+        on_token: If given, the report is streamed to this callback
+            as the writer generates it
+        checkpoint_db: SQLite file for durable checkpoints
+        resume_thread: Thread ID of an earlier run to continue from
+            its last completed node (requires checkpoint_db)
         
     Returns:
         Dictionary with workflow results
     """
     from config.settings import settings
     from src.graph import create_runner, get_state_summary
+    from src.graph.events import summarize_node_timings
     
     logger.info("=" * 60)
     logger.info("MULTI-AGENT VIRTUAL COMPANY")
     logger.info("=" * 60)
-    logger.info(f"Query: {query}")
+    if resume_thread:
+        logger.info(f"Resuming thread: {resume_thread}")
+    else:
+        logger.info(f"Query: {query}")
     logger.info(f"Max Iterations: {max_iterations}")
     logger.info("-" * 60)
     
@@ -87,13 +103,29 @@ def run_research(
     runner = create_runner(
         api_key=settings.groq_api_key,
         tavily_api_key=settings.tavily_api_key,
+        agent_options=settings.get_agent_options(),
         max_iterations=max_iterations,
         enable_checkpointing=True,
+        checkpoint_db=checkpoint_db,
     )
     
     # Run the workflow
+    events = []
+    
+    def on_event(event):
+        if event.is_token:
+            on_token(event.text)
+        else:
+            events.append(event)
+    
     start_time = datetime.now()
-    result = runner.run(query)
+    if resume_thread:
+        result = runner.resume(resume_thread)
+        query = result.get("user_query") or query
+    elif on_token is None:
+        result = runner.run(query, on_event=on_event)
+    else:
+        result = runner.run_with_events(query, on_event)
     end_time = datetime.now()
     
     duration = (end_time - start_time).total_seconds()
@@ -111,6 +143,13 @@ def run_research(
     
     if summary['error']:
         logger.error(f"Error: {summary['error']}")
+        if checkpoint_db and result.get("thread_id"):
+            logger.info(
+                f"Resume with: --resume {result['thread_id']} --checkpoint-db {checkpoint_db}"
+            )
+    
+    stages = summarize_node_timings(events)
+    log_stage_timings(stages, duration)
     
     # Save report if available
     if save_report and result.get("final_report"):
@@ -127,10 +166,37 @@ def run_research(
         "iterations": summary["iteration"],
         "has_report": summary["has_report"],
         "error": summary.get("error"),
+        "stages": stages,
+        "thread_id": result.get("thread_id"),
         "result": result,
     }
 
 
+def log_stage_timings(stages: list[dict], total_duration: float):
+    """
+    Log per-agent latency, slowest first, so bottlenecks stand out.
+    
+    Args:
+        stages: Per-node totals from summarize_node_timings
+        total_duration: Wall-clock duration of the run in seconds
+    """
+    if not stages:
+        return
+    
+    logger.info("-" * 60)
+    logger.info("STAGE LATENCIES")
+    for stage in stages:
+        share = stage["seconds"] / total_duration * 100 if total_duration > 0 else 0.0
+        details = f"{stage['tokens']} tokens"
+        if stage["sources_found"]:
+            details += f", {stage['sources_found']} sources"
+        runs = f" x{stage['runs']}" if stage["runs"] > 1 else ""
+        logger.info(
+            f"  {stage['node']:<11}{runs:<4} {stage['seconds']:7.2f}s ({share:4.1f}%) - {details}"
+        )
+    logger.info("-" * 60)
+
+
 def save_final_report(report, query: str, output_dir: Path) -> Path:
     """
     Save the final report to a file.
@@ -165,6 +231,268 @@ def save_final_report(report, query: str, output_dir: Path) -> Path:
     return output_path
 
 
+def save_trace(trace: dict, path: Path, fmt: str = "json") -> Path:
+    """
+    Write a run's trace to a file.
+    
+    Args:
+        trace: Trace dictionary from the final state
+        path: Destination file
+        fmt: "json" for the native span list, "otel" for OTLP/JSON
+        
+    Returns:
+        Path to the written file
+    """
+    from src.tools.tracing import trace_to_otel
+    
+    payload = trace_to_otel(trace) if fmt == "otel" else trace
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+    
+    return path
+
+
+def load_batch_queries(path: Path) -> list[str]:
+    """
+    Read research queries for batch mode.
+    
+    Accepts plain text (one query per line) or JSONL where each line is
+    an object with a "query" (or "topic") field. Blank lines and lines
+    starting with "#" are skipped.
+    
+    Args:
+        path: File containing the queries
+        
+    Returns:
+        List of queries in file order
+    """
+    queries = []
+    
+    for line_number, line in enumerate(path.read_text(encoding="utf-8").splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        
+        if line.startswith("{"):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e}")
+            query = record.get("query") or record.get("topic")
+            if not query:
+                raise ValueError(f"Line {line_number} has no 'query' field")
+            queries.append(str(query).strip())
+        else:
+            queries.append(line)
+    
+    return queries
+
+
+async def run_batch(
+    queries: list[str],
+    max_iterations: int = 3,
+    output_dir: Optional[Path] = None,
+    save_report: bool = True,
+    concurrency: int = 4,
+    groq_concurrency: Optional[int] = None,
+    tavily_concurrency: int = 8,
+) -> dict:
+    """
+    Run many research queries through a bounded pool of concurrent workflows.
+    
+    All workflows share one runner and one event loop. Groq and Tavily
+    calls are additionally capped process-wide, so the number of
+    workflows in flight can exceed what either API allows at once.
+    
+    Args:
+        queries: Research queries to run
+        max_iterations: Maximum revision iterations per query
+        output_dir: Directory to save reports
+        save_report: Whether to save each report as it finishes
+        concurrency: Maximum workflows in flight
+        groq_concurrency: Ceiling on concurrent Groq calls (adaptive below it;
+            defaults to GROQ_MAX_CONCURRENCY from settings)
+        tavily_concurrency: Maximum concurrent Tavily calls
+        
+    Returns:
+        Dictionary with per-query results and aggregate statistics
+    """
+    from config.settings import settings
+    from src.graph import create_runner
+    from src.agents import configure_rate_limiter
+    from src.tools import set_search_concurrency
+    
+    logger.info("=" * 60)
+    logger.info(f"BATCH RESEARCH: {len(queries)} queries, {concurrency} workers")
+    logger.info("=" * 60)
+    
+    limit_config = settings.get_rate_limit_config()
+    if groq_concurrency is not None:
+        limit_config["max_concurrency"] = groq_concurrency
+    limiter = configure_rate_limiter(**limit_config)
+    set_search_concurrency(tavily_concurrency)
+    
+    # Checkpoints are not needed for batch runs and would pile up in memory
+    runner = create_runner(
+        api_key=settings.groq_api_key,
+        tavily_api_key=settings.tavily_api_key,
+        agent_options=settings.get_agent_options(),
+        max_iterations=max_iterations,
+        enable_checkpointing=False,
+    )
+    
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    completed = 0
+    
+    async def run_one(index: int, query: str) -> dict:
+        nonlocal completed
+        async with semaphore:
+            start = time.perf_counter()
+            result = await runner.arun(query)
+            duration = time.perf_counter() - start
+        
+        status = result.get("workflow_status", "failed")
+        error = result.get("error")
+        
+        # A report that cannot be written fails this query, not the batch
+        report_path = None
+        if save_report and result.get("final_report"):
+            try:
+                report_path = await asyncio.to_thread(
+                    save_final_report,
+                    result["final_report"],
+                    query,
+                    output_dir or Path("outputs"),
+                )
+            except OSError as e:
+                logger.error(f"Could not save report for '{query[:60]}': {e}")
+                status = "failed"
+                error = f"Report not saved: {e}"
+        
+        completed += 1
+        logger.info(
+            f"[{completed}/{len(queries)}] {status} in {duration:.1f}s: {query[:60]}"
+        )
+        
+        return {
+            "index": index,
+            "query": query,
+            "status": status,
+            "duration": duration,
+            "error": error,
+            "report_path": report_path,
+        }
+    
+    batch_start = time.perf_counter()
+    records = await asyncio.gather(
+        *(run_one(index, query) for index, query in enumerate(queries))
+    )
+    wall_time = time.perf_counter() - batch_start
+    
+    summary = summarize_batch(records, wall_time)
+    summary["llm"] = limiter.metrics()
+    
+    return {
+        "records": records,
+        "summary": summary,
+    }
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_batch(records: list[dict], wall_time: float) -> dict:
+    """
+    Compute aggregate throughput and latency for a batch.
+    
+    Args:
+        records: Per-query result records from run_batch
+        wall_time: Total batch wall-clock time in seconds
+        
+    Returns:
+        Dictionary with counts, throughput and latency percentiles
+    """
+    durations = [r["duration"] for r in records]
+    succeeded = sum(1 for r in records if r["status"] == "completed")
+    
+    return {
+        "total": len(records),
+        "succeeded": succeeded,
+        "failed": len(records) - succeeded,
+        "wall_time": wall_time,
+        "runs_per_minute": len(records) / wall_time * 60 if wall_time > 0 else 0.0,
+        "latency_mean": sum(durations) / len(durations) if durations else 0.0,
+        "latency_p50": _percentile(durations, 50),
+        "latency_p95": _percentile(durations, 95),
+        "latency_max": max(durations) if durations else 0.0,
+    }
+
+
+def print_batch_summary(summary: dict):
+    """
+    Print the aggregate batch statistics to console.
+    
+    Args:
+        summary: Summary dictionary from summarize_batch
+    """
+    print("\n" + "=" * 60)
+    print("BATCH SUMMARY")
+    print("=" * 60)
+    print(f"Queries:     {summary['total']} ({summary['succeeded']} succeeded, {summary['failed']} failed)")
+    print(f"Wall time:   {summary['wall_time']:.1f}s")
+    print(f"Throughput:  {summary['runs_per_minute']:.2f} runs/minute")
+    print(
+        f"Latency:     mean {summary['latency_mean']:.1f}s | "
+        f"p50 {summary['latency_p50']:.1f}s | "
+        f"p95 {summary['latency_p95']:.1f}s | "
+        f"max {summary['latency_max']:.1f}s"
+    )
+    
+    llm = summary.get("llm")
+    if llm:
+        print(
+            f"LLM calls:   {llm['requests']} ({llm['throttled']} throttled, "
+            f"{llm['retries']} retries) | "
+            f"queue wait mean {llm['mean_wait_seconds']:.1f}s, max {llm['max_wait_seconds']:.1f}s"
+        )
+    print("=" * 60)
+
+
+class StreamingReportPrinter:
+    """Print report text to the console as the writer streams it."""
+    
+    def __init__(self):
+        """Initialize the printer."""
+        self.started = False
+    
+    def __call__(self, text: str):
+        """
+        Print a chunk of report text.
+        
+        Args:
+            text: Decoded report text from the writer
+        """
+        if not self.started:
+            print("\n" + "=" * 60)
+            print("FINAL REPORT")
+            print("=" * 60 + "\n")
+            self.started = True
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    
+    def finish(self):
+        """Close the streamed report section."""
+        if self.started:
+            print("\n" + "=" * 60)
+
+
 def print_report(result: dict):
     """
     Print the final report to console.
@@ -209,15 +537,88 @@ Examples:
   python -m src.main "Latest trends in AI agents"
   python -m src.main "Impact of quantum computing on cryptography" --iterations 5
   python -m src.main "Climate change solutions 2025" --output ./reports --verbose
+  python -m src.main --batch tickers.txt --concurrency 8 --groq-concurrency 4
+  python -m src.main "AI chips" --checkpoint-db runs.db
+  python -m src.main --resume <thread-id> --checkpoint-db runs.db
         """,
     )
     
     parser.add_argument(
         "query",
         type=str,
+        nargs="?",
         help="Research query or topic to investigate",
     )
     
+    parser.add_argument(
+        "--batch", "-b",
+        type=Path,
+        metavar="FILE",
+        help="Run every query in FILE (one per line, or JSONL with a 'query' field)",
+    )
+    
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=4,
+        help="Workflows run concurrently in batch mode (default: 4)",
+    )
+    
+    parser.add_argument(
+        "--groq-concurrency",
+        type=int,
+        default=None,
+        help="Ceiling on concurrent Groq calls in batch mode; lowered automatically on 429s "
+             "(default: GROQ_MAX_CONCURRENCY)",
+    )
+    
+    parser.add_argument(
+        "--tavily-concurrency",
+        type=int,
+        default=8,
+        help="Maximum concurrent Tavily calls in batch mode (default: 8)",
+    )
+    
+    parser.add_argument(
+        "--checkpoint-db",
+        type=Path,
+        metavar="FILE",
+        help="SQLite file for durable checkpoints so failed runs can be resumed "
+             "(default: CHECKPOINT_DB, in-memory if unset)",
+    )
+    
+    parser.add_argument(
+        "--resume",
+        metavar="THREAD_ID",
+        help="Continue an earlier run from its last completed node (needs --checkpoint-db)",
+    )
+    
+    parser.add_argument(
+        "--executor",
+        choices=["inline", "thread", "process"],
+        help="Where HTML extraction and text analysis run (default: ANALYSIS_EXECUTOR or inline)",
+    )
+    
+    parser.add_argument(
+        "--llm-cache",
+        action="store_true",
+        help="Reuse LLM responses for repeated routing and query-generation prompts",
+    )
+    
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        metavar="FILE",
+        help="Write the run's span trace (timings, tokens, Tavily calls, bytes) to FILE",
+    )
+    
+    parser.add_argument(
+        "--trace-format",
+        choices=["json", "otel"],
+        default="json",
+        help="Trace file format: native JSON or OpenTelemetry OTLP/JSON (default: json)",
+    )
+    
     parser.add_argument(
         "--iterations", "-i",
         type=int,
@@ -252,6 +653,9 @@ Examples:
     
     args = parser.parse_args()
     
+    if not args.query and not args.batch and not args.resume:
+        parser.error("either a query, --batch FILE or --resume THREAD_ID is required")
+    
     # Setup logging
     log_level = "DEBUG" if args.verbose else "INFO"
     setup_logging(log_level)
@@ -263,17 +667,69 @@ Examples:
             logger.error("Configuration not loaded. Please check your .env file.")
             sys.exit(1)
         
-        # Run the research workflow
+        from src.agents import configure_rate_limiter
+        configure_rate_limiter(**settings.get_rate_limit_config())
+        
+        from src.tools import configure_executor
+        executor_config = settings.get_executor_config()
+        if args.executor:
+            executor_config["mode"] = args.executor
+        configure_executor(**executor_config)
+        
+        if args.llm_cache:
+            from src.agents import enable_response_cache
+            enable_response_cache()
+        
+        # Batch mode: run every query in the file concurrently
+        if args.batch:
+            queries = load_batch_queries(args.batch)
+            if not queries:
+                logger.error(f"No queries found in {args.batch}")
+                sys.exit(1)
+            
+            batch = asyncio.run(run_batch(
+                queries,
+                max_iterations=args.iterations,
+                output_dir=args.output,
+                save_report=not args.no_save,
+                concurrency=args.concurrency,
+                groq_concurrency=args.groq_concurrency,
+                tavily_concurrency=args.tavily_concurrency,
+            ))
+            print_batch_summary(batch["summary"])
+            sys.exit(0 if batch["summary"]["failed"] == 0 else 1)
+        
+        checkpoint_db = args.checkpoint_db or (
+            Path(settings.checkpoint_db) if settings.checkpoint_db else None
+        )
+        if args.resume and checkpoint_db is None:
+            parser.error("--resume requires --checkpoint-db (or CHECKPOINT_DB)")
+        
+        # Stream the report to the console while it is written, if requested
+        printer = StreamingReportPrinter() if args.print_report else None
+        
+        # Run (or resume) the research workflow
         result = run_research(
             query=args.query,
             max_iterations=args.iterations,
             output_dir=args.output,
             save_report=not args.no_save,
+            on_token=printer,
+            checkpoint_db=checkpoint_db,
+            resume_thread=args.resume,
         )
         
-        # Print report if requested
-        if args.print_report:
-            print_report(result)
+        # Print report if requested and nothing was streamed
+        if printer is not None:
+            if printer.started:
+                printer.finish()
+            else:
+                print_report(result)
+        
+        trace = result["result"].get("trace")
+        if args.trace and trace:
+            trace_path = save_trace(trace, args.trace, args.trace_format)
+            logger.info(f"Trace saved to: {trace_path}")
         
         # Exit with appropriate code
         if result["status"] == "completed":
@@ -3,16 +3,46 @@ Tools for search, scraping, and analysis in the Multi-Agent Virtual Company.
 
 This package provides:
 - TavilySearchTool: Web search using Tavily API
+- SearchCache: Memory/SQLite cache for search results
+- ResearchIndex: Reuse of earlier research across related queries
 - WebScraper: Additional web scraping utilities
+- HTMLTextExtractor: Incremental (streaming) HTML text extraction
+- Trace/trace_span: Per-run timing and token tracing
+- TaskExecutor: Inline/thread/process offload for CPU-heavy work
+- SentimentEngine: Compiled lexicon sentiment scoring
 - TextAnalyzer: Text processing and analysis
 - ResearchDataProcessor: Prepare research data for agents
+- ContextPacker: Token-budget packing of research content for prompts
 """
 
 from .search import (
+    SearchCache,
+    get_shared_search_cache,
+    set_search_concurrency,
     TavilySearchTool,
     create_tavily_tool,
     get_tavily_langchain_tool,
 )
+from .research_index import (
+    ResearchIndex,
+    topic_signature,
+    get_shared_research_index,
+)
+from .tracing import (
+    Span,
+    Trace,
+    start_trace,
+    trace_span,
+    current_span,
+    get_current_trace,
+    trace_to_otel,
+)
+from .executor import (
+    EXECUTOR_MODES,
+    TaskExecutor,
+    configure_executor,
+    get_executor,
+)
 from .scraper import (
     WebScraper,
     create_scraper,
@@ -20,27 +50,81 @@ from .scraper import (
     normalize_url,
     get_domain,
 )
+from .html_extract import (
+    ExtractedPage,
+    HTMLTextExtractor,
+)
+from .sentiment import (
+    Lexicon,
+    SentimentResult,
+    SentimentEngine,
+    register_lexicon,
+    get_sentiment_engine,
+)
 from .analysis import (
+    TextStats,
     TextAnalyzer,
     ResearchDataProcessor,
+    compute_text_statistics,
     create_text_analyzer,
     create_data_processor,
 )
+from .context_packer import (
+    ContextPacker,
+    PackedContext,
+    context_budget_for,
+    estimate_tokens,
+)
 
 __all__ = [
     # Search
+    "SearchCache",
+    "get_shared_search_cache",
+    "set_search_concurrency",
     "TavilySearchTool",
     "create_tavily_tool",
     "get_tavily_langchain_tool",
+    # Research reuse
+    "ResearchIndex",
+    "topic_signature",
+    "get_shared_research_index",
     # Scraper
     "WebScraper",
     "create_scraper",
     "is_valid_url",
     "normalize_url",
     "get_domain",
+    "ExtractedPage",
+    "HTMLTextExtractor",
+    # Tracing
+    "Span",
+    "Trace",
+    "start_trace",
+    "trace_span",
+    "current_span",
+    "get_current_trace",
+    "trace_to_otel",
+    # Executor
+    "EXECUTOR_MODES",
+    "TaskExecutor",
+    "configure_executor",
+    "get_executor",
+    # Sentiment
+    "Lexicon",
+    "SentimentResult",
+    "SentimentEngine",
+    "register_lexicon",
+    "get_sentiment_engine",
     # Analysis
+    "TextStats",
     "TextAnalyzer",
     "ResearchDataProcessor",
+    "compute_text_statistics",
     "create_text_analyzer",
     "create_data_processor",
+    # Context packing
+    "ContextPacker",
+    "PackedContext",
+    "context_budget_for",
+    "estimate_tokens",
 ]
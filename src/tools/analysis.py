@@ -3,11 +3,25 @@ Analysis Utilities for the Multi-Agent Virtual Company.
 
 This module provides text processing and analysis utilities
 used by the Analyst and other agents for data processing.
+
+The statistics pass of ResearchDataProcessor (keywords, topics,
+sentiment and numbers) runs on a TaskExecutor, so it can be moved off
+the event loop or spread across processes. Prepared results are
+memoized in a PreparedAnalysisCache keyed by a fingerprint of the
+research content, so within one run the Analyst's revision passes
+reuse the analysis node's results instead of recomputing. Entries are
+released when the run finishes. The Critic and Writer do not prepare
+research data and do not use the cache.
 """
 
+import os
 import re
-from collections import Counter
-from typing import Optional
+import hashlib
+import functools
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
 from datetime import datetime
 from loguru import logger
 
@@ -17,6 +31,43 @@ from src.schemas.models import (
     AnalysisSummary,
     KeyInsight,
 )
+from src.tools.sentiment import (
+    GENERAL_POSITIVE_WORDS,
+    GENERAL_NEGATIVE_WORDS,
+    SentimentEngine,
+    SentimentResult,
+    get_sentiment_engine,
+)
+from src.tools.executor import TaskExecutor, get_executor
+from src.tools.context_packer import ContextPacker, PackedContext
+from src.tools.tracing import trace_span
+
+
+# Patterns used by TextAnalyzer.clean_text, compiled once
+_URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+_EMAIL_PATTERN = re.compile(r'\S+@\S+')
+_SPECIAL_CHAR_PATTERN = re.compile(r'[^\w\s.,!?-]')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+@dataclass
+class TextStats:
+    """
+    Results of a single tokenization pass over a text.
+    
+    Attributes:
+        word_count: Whitespace-separated words in the raw text
+        keywords: Top (keyword, count) pairs
+        key_topics: Keywords that occur at least twice
+        sentiment_score: Score from -1 to 1
+        sentiment: Sentiment label
+    """
+    
+    word_count: int = 0
+    keywords: list[tuple[str, int]] = field(default_factory=list)
+    key_topics: list[str] = field(default_factory=list)
+    sentiment_score: float = 0.0
+    sentiment: str = "neutral"
 
 
 class TextAnalyzer:
@@ -40,25 +91,23 @@ class TextAnalyzer:
         "than", "too", "very", "just", "also", "now", "here", "there",
     }
     
-    # Sentiment indicator words
-    POSITIVE_WORDS = {
-        "growth", "increase", "profit", "gain", "positive", "strong", "bullish",
-        "surge", "rise", "up", "boom", "success", "successful", "opportunity",
-        "opportunities", "improve", "improved", "improving", "beat", "exceed",
-        "exceeded", "outperform", "rally", "breakthrough", "innovation", "leading",
-        "best", "record", "high", "higher", "optimistic", "confident", "promising",
-    }
+    # Single-word sentiment indicators (the "general" lexicon)
+    POSITIVE_WORDS = GENERAL_POSITIVE_WORDS
+    NEGATIVE_WORDS = GENERAL_NEGATIVE_WORDS
     
-    NEGATIVE_WORDS = {
-        "decline", "decrease", "loss", "drop", "negative", "weak", "bearish",
-        "fall", "down", "crash", "failure", "failed", "risk", "risks", "concern",
-        "concerns", "worried", "worry", "miss", "missed", "underperform", "sell",
-        "selloff", "worst", "low", "lower", "pessimistic", "uncertain", "warning",
-        "layoff", "layoffs", "cut", "cuts", "lawsuit", "investigation", "debt",
-    }
+    # Default sentiment engine, compiled once at class load
+    sentiment_engine: SentimentEngine = get_sentiment_engine()
     
-    def __init__(self):
-        """Initialize the text analyzer."""
+    def __init__(self, lexicons: Optional[Iterable[str]] = None):
+        """
+        Initialize the text analyzer.
+        
+        Args:
+            lexicons: Sentiment lexicons to use, e.g. ("general", "finance")
+                (defaults to general + finance + tech)
+        """
+        if lexicons is not None:
+            self.sentiment_engine = get_sentiment_engine(*lexicons)
         logger.debug("TextAnalyzer initialized")
     
     def clean_text(self, text: str) -> str:
@@ -74,23 +123,37 @@ class TextAnalyzer:
         if not text:
             return ""
         
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove URLs
-        text = re.sub(r'https?://\S+|www\.\S+', '', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-        
-        # Remove special characters but keep spaces and basic punctuation
-        text = re.sub(r'[^\w\s.,!?-]', ' ', text)
+        text = self._strip_noise(text)
         
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_PATTERN.sub(' ', text)
         
         return text.strip()
     
+    def _strip_noise(self, text: str) -> str:
+        """Lowercase and remove URLs, emails and special characters."""
+        text = text.lower()
+        text = _URL_PATTERN.sub('', text)
+        text = _EMAIL_PATTERN.sub('', text)
+        return _SPECIAL_CHAR_PATTERN.sub(' ', text)
+    
+    def tokenize(self, text: str) -> list[str]:
+        """
+        Clean text and split it into tokens.
+        
+        Equivalent to ``clean_text(text).split()`` but skips the
+        whitespace normalization pass, which split() makes redundant.
+        
+        Args:
+            text: Raw text
+            
+        Returns:
+            List of cleaned tokens
+        """
+        if not text:
+            return []
+        return self._strip_noise(text).split()
+    
     def extract_keywords(
         self,
         text: str,
@@ -108,25 +171,34 @@ class TextAnalyzer:
         Returns:
             List of (keyword, count) tuples
         """
-        cleaned = self.clean_text(text)
-        words = cleaned.split()
+        return self._count_keywords(self.tokenize(text), min_word_length).most_common(top_n)
+    
+    def _count_keywords(self, tokens: list[str], min_word_length: int = 3) -> Counter:
+        """
+        Count keyword candidates among tokens.
         
-        # Filter words
-        filtered_words = [
-            word for word in words
+        Args:
+            tokens: Tokens from tokenize()
+            min_word_length: Minimum word length to consider
+            
+        Returns:
+            Counter of alphabetic, non-stop-word tokens
+        """
+        stop_words = self.STOP_WORDS
+        return Counter(
+            word for word in tokens
             if len(word) >= min_word_length
-            and word not in self.STOP_WORDS
             and word.isalpha()
-        ]
-        
-        # Count frequencies
-        word_counts = Counter(filtered_words)
-        
-        return word_counts.most_common(top_n)
+            and word not in stop_words
+        )
     
     def calculate_sentiment_score(self, text: str) -> tuple[float, str]:
         """
-        Calculate a simple sentiment score from text.
+        Calculate a weighted sentiment score from text.
+        
+        Every occurrence of a lexicon term or phrase counts, weighted
+        (e.g. "beat expectations" outweighs "up"). URLs and emails are
+        ignored.
         
         Args:
             text: Text to analyze
@@ -134,34 +206,22 @@ class TextAnalyzer:
         Returns:
             Tuple of (score from -1 to 1, sentiment label)
         """
-        cleaned = self.clean_text(text)
-        words = set(cleaned.split())
-        
-        positive_count = len(words & self.POSITIVE_WORDS)
-        negative_count = len(words & self.NEGATIVE_WORDS)
-        
-        total = positive_count + negative_count
-        if total == 0:
-            return 0.0, "neutral"
-        
-        score = (positive_count - negative_count) / total
-        
-        if score > 0.3:
-            sentiment = "bullish"
-        elif score > 0.1:
-            sentiment = "neutral"  # slightly positive but still neutral
-        elif score < -0.3:
-            sentiment = "bearish"
-        elif score < -0.1:
-            sentiment = "neutral"  # slightly negative but still neutral
-        else:
-            sentiment = "neutral"
-        
-        # Check for mixed signals
-        if positive_count > 2 and negative_count > 2:
-            sentiment = "mixed"
+        result = self.analyze_sentiment(text)
+        return result.score, result.label
+    
+    def analyze_sentiment(self, text: str) -> SentimentResult:
+        """
+        Score sentiment and report which terms and phrases matched.
         
-        return round(score, 3), sentiment
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            SentimentResult with score, label, weights and hit counts
+        """
+        if not text:
+            return self.sentiment_engine.score("")
+        return self.sentiment_engine.score(self._strip_noise(text))
     
     def assess_data_quality(self, research_data: ResearchData) -> float:
         """
@@ -319,9 +379,11 @@ class TextAnalyzer:
         Returns:
             List of identified topics
         """
-        keywords = self.extract_keywords(text, top_n=20)
-        
-        # Group related keywords (simple approach)
+        return self._select_topics(self.extract_keywords(text, top_n=20), max_topics)
+    
+    @staticmethod
+    def _select_topics(keywords: list[tuple[str, int]], max_topics: int) -> list[str]:
+        """Pick keywords that appear multiple times as topics."""
         topics = []
         for word, count in keywords:
             if count >= 2:  # Only include words that appear multiple times
@@ -345,6 +407,41 @@ class TextAnalyzer:
             return 0
         return len(text.split())
     
+    def analyze_text(
+        self,
+        text: str,
+        top_n: int = 10,
+        max_topics: int = 5,
+    ) -> TextStats:
+        """
+        Compute keywords, topics, sentiment and word count in one pass.
+        
+        Noise is stripped once; keywords and topics come from the shared
+        token stream and sentiment from one lexicon scan of the same
+        stripped text. Results are identical to
+        calling extract_keywords, identify_key_topics,
+        calculate_sentiment_score and calculate_word_count separately.
+        
+        Args:
+            text: Text to analyze
+            top_n: Number of top keywords to return
+            max_topics: Maximum number of topics to return
+            
+        Returns:
+            TextStats for the text
+        """
+        stripped = self._strip_noise(text) if text else ""
+        counts = self._count_keywords(stripped.split())
+        sentiment = self.sentiment_engine.score(stripped)
+        
+        return TextStats(
+            word_count=self.calculate_word_count(text),
+            keywords=counts.most_common(top_n),
+            key_topics=self._select_topics(counts.most_common(20), max_topics),
+            sentiment_score=sentiment.score,
+            sentiment=sentiment.label,
+        )
+    
     def truncate_text(
         self,
         text: str,
@@ -368,16 +465,240 @@ class TextAnalyzer:
         return text[:max_length - len(suffix)].rsplit(" ", 1)[0] + suffix
 
 
+# =============================================================================
+# Executor Workers
+# =============================================================================
+
+@functools.lru_cache(maxsize=None)
+def _get_worker_analyzer(lexicons: tuple[str, ...]) -> TextAnalyzer:
+    """TextAnalyzer cached per worker process and lexicon combination."""
+    return TextAnalyzer(lexicons=lexicons)
+
+
+def compute_text_statistics(
+    text: str,
+    lexicons: tuple[str, ...] = (),
+) -> tuple[TextStats, list[dict]]:
+    """
+    Compute the CPU-heavy statistics of a text.
+    
+    A module-level function so it can be sent to a process pool.
+    
+    Args:
+        text: Text to analyze
+        lexicons: Sentiment lexicon names (defaults to the default lexicons)
+        
+    Returns:
+        Tuple of (TextStats, extracted numbers)
+    """
+    analyzer = _get_worker_analyzer(tuple(lexicons))
+    return analyzer.analyze_text(text), analyzer.extract_numbers(text)
+
+
+# =============================================================================
+# Prepared Analysis Cache
+# =============================================================================
+
+class PreparedAnalysisCache:
+    """
+    Bounded LRU memo of prepare_for_analysis results.
+    
+    Entries are keyed by a fingerprint of the research content (not the
+    object identity), so the copies of ResearchData that pass through
+    graph state and checkpoints all hit the same entry. Changed content
+    (e.g. merged deferred notes) gets a new fingerprint. Cached
+    dictionaries are shared and must be treated as read-only.
+    """
+    
+    def __init__(self, max_entries: int = 64):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Entries kept; least recently used are evicted
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[tuple, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def fingerprint(research_data: ResearchData) -> str:
+        """
+        Fingerprint the content that prepared analysis depends on.
+        
+        Args:
+            research_data: Research data
+            
+        Returns:
+            SHA-256 hex digest of the research content (timestamp excluded)
+        """
+        payload = research_data.model_dump_json(exclude={"timestamp"})
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: tuple) -> Optional[dict]:
+        """
+        Look up prepared data.
+        
+        Args:
+            key: (fingerprint, lexicons) key
+            
+        Returns:
+            Prepared dictionary, or None on a miss
+        """
+        with self._lock:
+            prepared = self._entries.get(key)
+            if prepared is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return prepared
+    
+    def set(self, key: tuple, prepared: dict):
+        """
+        Store prepared data, evicting the least recently used entries.
+        
+        Args:
+            key: (fingerprint, lexicons) key
+            prepared: Result of prepare_for_analysis
+        """
+        with self._lock:
+            self._entries[key] = prepared
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, research_data: Optional[ResearchData] = None) -> int:
+        """
+        Drop cached entries.
+        
+        Args:
+            research_data: Drop only the entries for this content
+                (None drops everything)
+            
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if research_data is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            
+            fingerprint = self.fingerprint(research_data)
+            stale = [key for key in self._entries if key[0] == fingerprint]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+    
+    @property
+    def stats(self) -> dict:
+        """Get hit/miss counters and the number of entries."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+_prepared_cache: Optional[PreparedAnalysisCache] = None
+_prepared_cache_lock = threading.Lock()
+
+
+def get_prepared_analysis_cache() -> Optional[PreparedAnalysisCache]:
+    """
+    Get the process-wide prepared-analysis cache.
+    
+    ResearchDataProcessor uses it by default; within a workflow run
+    that means the Analyst's first analysis and its revisions.
+    
+    Controlled by the PREPARED_ANALYSIS_CACHE_SIZE environment variable
+    (entries kept, default 64; 0 disables the cache).
+    
+    Returns:
+        Shared PreparedAnalysisCache, or None if disabled
+    """
+    global _prepared_cache
+    
+    size = int(os.getenv("PREPARED_ANALYSIS_CACHE_SIZE", "64"))
+    if size <= 0:
+        return None
+    
+    if _prepared_cache is None:
+        with _prepared_cache_lock:
+            if _prepared_cache is None:
+                _prepared_cache = PreparedAnalysisCache(max_entries=size)
+    return _prepared_cache
+
+
+def release_prepared_analysis(research_data: Optional[ResearchData]):
+    """
+    Drop the entries prepared from some research data from the shared cache.
+    
+    Called when a run finishes and when deferred research notes replace
+    the notes an analysis was prepared with.
+    
+    Args:
+        research_data: Research data that is no longer needed (None is ignored)
+    """
+    cache = get_prepared_analysis_cache()
+    if cache is not None and research_data is not None:
+        removed = cache.invalidate(research_data)
+        if removed:
+            logger.debug(f"Released {removed} prepared analysis entries")
+
+
 class ResearchDataProcessor:
     """
     Processor for combining and preparing research data for analysis.
     """
     
-    def __init__(self):
-        """Initialize the processor."""
+    def __init__(
+        self,
+        executor: Optional[TaskExecutor] = None,
+        cache: Optional[PreparedAnalysisCache] = None,
+    ):
+        """
+        Initialize the processor.
+        
+        Args:
+            executor: Executor for the statistics pass (defaults to the
+                process-wide executor from get_executor)
+            cache: Memo of prepared results (defaults to the shared
+                cache from get_prepared_analysis_cache)
+        """
         self.analyzer = TextAnalyzer()
+        self._executor = executor
+        self.cache = cache if cache is not None else get_prepared_analysis_cache()
         logger.debug("ResearchDataProcessor initialized")
     
+    @property
+    def executor(self) -> TaskExecutor:
+        """Executor used for the statistics pass."""
+        return self._executor or get_executor()
+    
+    @property
+    def _statistics(self):
+        """Picklable statistics worker using this processor's lexicons."""
+        lexicons = tuple(lexicon.name for lexicon in self.analyzer.sentiment_engine.lexicons)
+        return functools.partial(compute_text_statistics, lexicons=lexicons)
+    
+    def _cache_key(self, research_data: ResearchData) -> tuple:
+        """Cache key: content fingerprint plus this processor's lexicons."""
+        lexicons = tuple(lexicon.name for lexicon in self.analyzer.sentiment_engine.lexicons)
+        return PreparedAnalysisCache.fingerprint(research_data), lexicons
+    
+    def _cached(self, research_data: ResearchData) -> tuple[Optional[tuple], Optional[dict]]:
+        """Look up prepared data; returns (key, prepared) with key None if uncached."""
+        if self.cache is None:
+            return None, None
+        key = self._cache_key(research_data)
+        return key, self.cache.get(key)
+    
     def combine_content(self, research_data: ResearchData) -> str:
         """
         Combine all content from research data into a single text.
@@ -419,54 +740,200 @@ class ResearchDataProcessor:
             research_data: Research data to prepare
             
         Returns:
-            Dictionary with prepared data and metadata
+            Dictionary with prepared data and metadata (shared with
+            the cache; do not modify)
+        """
+        key, prepared = self._cached(research_data)
+        if prepared is not None:
+            return prepared
+        
+        combined_content = self.combine_content(research_data)
+        stats, numbers = self.executor.run(self._statistics, combined_content)
+        prepared = self._assemble(research_data, combined_content, stats, numbers)
+        
+        if key is not None:
+            self.cache.set(key, prepared)
+        return prepared
+    
+    async def aprepare_for_analysis(
+        self,
+        research_data: ResearchData,
+    ) -> dict:
+        """
+        Prepare research data for LLM analysis without blocking the event loop.
+        
+        Same result as prepare_for_analysis; the statistics pass runs on
+        the executor (inline executors still run it on the loop).
+        
+        Args:
+            research_data: Research data to prepare
+            
+        Returns:
+            Dictionary with prepared data and metadata (shared with
+            the cache; do not modify)
         """
+        key, prepared = self._cached(research_data)
+        if prepared is not None:
+            return prepared
+        
         combined_content = self.combine_content(research_data)
+        stats, numbers = await self.executor.arun(self._statistics, combined_content)
+        prepared = self._assemble(research_data, combined_content, stats, numbers)
+        
+        if key is not None:
+            self.cache.set(key, prepared)
+        return prepared
+    
+    def prepare_many(
+        self,
+        research_items: list[ResearchData],
+        chunksize: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Prepare several research data sets, batching the statistics passes.
+        
+        Args:
+            research_items: Research data to prepare
+            chunksize: Texts per executor task (executor default if None)
+            
+        Returns:
+            Prepared dictionaries in input order
+        """
+        lookups = [self._cached(item) for item in research_items]
+        missing = [i for i, (_, prepared) in enumerate(lookups) if prepared is None]
+        
+        contents = [self.combine_content(research_items[i]) for i in missing]
+        results = self.executor.map(self._statistics, contents, chunksize=chunksize)
+        
+        prepared_items = [prepared for _, prepared in lookups]
+        for i, content, (stats, numbers) in zip(missing, contents, results):
+            prepared_items[i] = self._assemble(research_items[i], content, stats, numbers)
+            key = lookups[i][0]
+            if key is not None:
+                self.cache.set(key, prepared_items[i])
+        return prepared_items
+    
+    def _assemble(
+        self,
+        research_data: ResearchData,
+        combined_content: str,
+        stats: TextStats,
+        numbers: list[dict],
+    ) -> dict:
+        """Build the prepared-data dictionary from the computed statistics."""
         quality_score = self.analyzer.assess_data_quality(research_data)
-        sentiment_score, sentiment_label = self.analyzer.calculate_sentiment_score(
-            combined_content
-        )
-        keywords = self.analyzer.extract_keywords(combined_content)
-        key_topics = self.analyzer.identify_key_topics(combined_content)
-        numbers = self.analyzer.extract_numbers(combined_content)
         
         return {
             "topic": research_data.topic,
             "combined_content": combined_content,
             "sources_count": research_data.sources_count,
             "quality_score": quality_score,
-            "preliminary_sentiment": sentiment_label,
-            "sentiment_score": sentiment_score,
-            "keywords": keywords,
-            "key_topics": key_topics,
+            "preliminary_sentiment": stats.sentiment,
+            "sentiment_score": stats.sentiment_score,
+            "keywords": stats.keywords,
+            "key_topics": stats.key_topics,
             "extracted_numbers": numbers,
-            "word_count": self.analyzer.calculate_word_count(combined_content),
+            "word_count": stats.word_count,
             "sources_summary": self.analyzer.summarize_sources(
                 research_data.search_results
             ),
         }
     
+    def _packer(self, token_budget: int) -> ContextPacker:
+        """Context packer for a budget, ranking with the analyzer's stop words."""
+        return ContextPacker(token_budget=token_budget, stop_words=self.analyzer.STOP_WORDS)
+    
+    def pack_context(self, research_data: ResearchData, token_budget: int) -> PackedContext:
+        """
+        Pack the most relevant research content into a token budget.
+        
+        Args:
+            research_data: Research data to pack
+            token_budget: Tokens available for the content
+            
+        Returns:
+            PackedContext (ranking runs on the executor)
+        """
+        with trace_span("analysis.context", budget=token_budget) as span:
+            context = self.executor.run(
+                self._packer(token_budget).pack,
+                research_data.topic,
+                research_data.search_results,
+            )
+            self._record_context(span, context)
+        return context
+    
+    async def apack_context(self, research_data: ResearchData, token_budget: int) -> PackedContext:
+        """
+        Async version of pack_context.
+        
+        Args:
+            research_data: Research data to pack
+            token_budget: Tokens available for the content
+            
+        Returns:
+            PackedContext
+        """
+        with trace_span("analysis.context", budget=token_budget) as span:
+            context = await self.executor.arun(
+                self._packer(token_budget).pack,
+                research_data.topic,
+                research_data.search_results,
+            )
+            self._record_context(span, context)
+        return context
+    
+    @staticmethod
+    def _record_context(span, context: PackedContext):
+        """Report the packed context size on its trace span and in the log."""
+        span.set("context_tokens", context.tokens)
+        span.set("chunks", f"{context.chunks_used}/{context.chunks_total}")
+        span.set("sources", context.sources_used)
+        logger.info(
+            f"Packed {context.chunks_used}/{context.chunks_total} chunks from "
+            f"{context.sources_used} sources into {context.tokens}/{context.budget} tokens"
+        )
+    
     def format_for_llm(
         self,
         research_data: ResearchData,
         max_content_length: int = 8000,
+        prepared: Optional[dict] = None,
+        context: Optional[PackedContext] = None,
     ) -> str:
         """
         Format research data for LLM consumption.
         
         Args:
             research_data: Research data to format
-            max_content_length: Maximum content length
+            max_content_length: Maximum content length (when no packed
+                context is given)
+            prepared: Result of prepare_for_analysis for the same data
+                (computed if not given)
+            context: Packed content from pack_context; replaces the
+                truncated combined content and the source list, whose
+                titles and URLs it already carries
             
         Returns:
             Formatted string for LLM
         """
-        prepared = self.prepare_for_analysis(research_data)
+        if prepared is None:
+            prepared = self.prepare_for_analysis(research_data)
         
-        # Truncate content if needed
-        content = prepared["combined_content"]
-        if len(content) > max_content_length:
-            content = self.analyzer.truncate_text(content, max_content_length)
+        if context is not None:
+            content = context.text
+            if research_data.researcher_notes:
+                content += f"\n\nResearcher Notes: {research_data.researcher_notes}"
+        else:
+            # Truncate content if needed
+            content = prepared["combined_content"]
+            if len(content) > max_content_length:
+                content = self.analyzer.truncate_text(content, max_content_length)
+        
+        sources = "" if context is not None else f"""
+### Sources
+{prepared['sources_summary']}
+"""
         
         formatted = f"""
 ## Research Data for Analysis
@@ -485,10 +952,7 @@ class ResearchDataProcessor:
 ### Research Content
 
 {content}
-
-### Sources
-{prepared['sources_summary']}
-"""
+{sources}"""
         return formatted.strip()
 
 
@@ -501,14 +965,22 @@ def create_text_analyzer() -> TextAnalyzer:
     return TextAnalyzer()
 
 
-def create_data_processor() -> ResearchDataProcessor:
+def create_data_processor(
+    executor: Optional[TaskExecutor] = None,
+    cache: Optional[PreparedAnalysisCache] = None,
+) -> ResearchDataProcessor:
     """Create a ResearchDataProcessor instance."""
-    return ResearchDataProcessor()
+    return ResearchDataProcessor(executor=executor, cache=cache)
 
 
 __all__ = [
+    "TextStats",
     "TextAnalyzer",
     "ResearchDataProcessor",
+    "PreparedAnalysisCache",
+    "compute_text_statistics",
+    "get_prepared_analysis_cache",
+    "release_prepared_analysis",
     "create_text_analyzer",
     "create_data_processor",
 ]
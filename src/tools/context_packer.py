@@ -0,0 +1,371 @@
+"""
+Context Packing for the Multi-Agent Virtual Company.
+
+The analyst prompt used to carry the combined research content cut at
+a fixed character count, so the last sources were dropped however
+relevant they were. ContextPacker splits every search result into
+chunks, ranks the chunks against the topic with BM25, and fills a
+token budget with the best ones while keeping at least one chunk per
+source. Chunks are emitted per source in their original order.
+
+Budgets are set per model (see context_budget_for); the
+ANALYST_CONTEXT_TOKENS setting overrides them. Tokens are
+estimated with the same 4-characters-per-token heuristic as the Groq
+rate limiter.
+"""
+
+import re
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable
+
+from src.schemas.models import SearchResult
+
+
+CHARS_PER_TOKEN = 4
+
+# Context budget in tokens when the model has no entry below
+# (about the old 8000-character cut)
+DEFAULT_CONTEXT_TOKENS = 2000
+
+# Research context budget per model, in tokens
+MODEL_CONTEXT_TOKENS = {
+    "llama-3.3-70b-versatile": 3000,
+    "llama-3.1-70b-versatile": 3000,
+    "llama-3.1-8b-instant": 1500,
+    "mixtral-8x7b-32768": 3000,
+}
+
+# A guaranteed chunk is never cut below this many tokens
+MIN_CHUNK_TOKENS = 24
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+_TERM_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def context_budget_for(model_name: str) -> int:
+    """
+    Get the research context budget for a model.
+
+    Args:
+        model_name: LLM model name
+
+    Returns:
+        Token budget for the packed research content
+    """
+    return MODEL_CONTEXT_TOKENS.get(model_name, DEFAULT_CONTEXT_TOKENS)
+
+
+def split_into_chunks(text: str, chunk_tokens: int) -> list[str]:
+    """
+    Split text into chunks of about chunk_tokens, on sentence boundaries.
+
+    Sentences longer than a chunk are split on whitespace.
+
+    Args:
+        text: Text to split
+        chunk_tokens: Target chunk size in tokens
+
+    Returns:
+        Non-empty chunks in text order
+    """
+    max_chars = chunk_tokens * CHARS_PER_TOKEN
+    chunks: list[str] = []
+    current = ""
+
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        sentence = " ".join(sentence.split())
+        if not sentence:
+            continue
+
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class BM25Ranker:
+    """
+    Okapi BM25 scores of a fixed set of documents against queries.
+    """
+
+    def __init__(self, documents: list[list[str]], k1: float = 1.5, b: float = 0.75):
+        """
+        Index the documents.
+
+        Args:
+            documents: Term lists, one per document
+            k1: Term-frequency saturation
+            b: Length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.term_counts = [Counter(terms) for terms in documents]
+        self.lengths = [len(terms) for terms in documents]
+        self.average_length = (sum(self.lengths) / len(documents)) if documents else 0.0
+
+        document_frequency = Counter()
+        for counts in self.term_counts:
+            document_frequency.update(counts.keys())
+        total = len(documents)
+        self.idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def scores(self, query_terms: Iterable[str]) -> list[float]:
+        """
+        Score every document against a query.
+
+        Args:
+            query_terms: Query terms (duplicates are ignored)
+
+        Returns:
+            One score per document, in document order
+        """
+        terms = [term for term in set(query_terms) if term in self.idf]
+        average = self.average_length or 1.0
+
+        results = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / average)
+            score = 0.0
+            for term in terms:
+                tf = counts.get(term, 0)
+                if tf:
+                    score += self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            results.append(score)
+        return results
+
+
+@dataclass
+class ContextChunk:
+    """
+    One chunk of a search result.
+
+    Attributes:
+        source: Index of the search result
+        position: Chunk index within the result
+        text: Chunk text
+        tokens: Estimated tokens
+        score: BM25 score against the topic
+    """
+
+    source: int
+    position: int
+    text: str
+    tokens: int
+    score: float = 0.0
+
+
+@dataclass
+class PackedContext:
+    """
+    Research content packed into a token budget.
+
+    Attributes:
+        text: Packed content, grouped by source
+        tokens: Estimated tokens of text
+        budget: Token budget it was packed into
+        chunks_used: Chunks included
+        chunks_total: Chunks available
+        sources_used: Sources with at least one chunk included
+        sources_total: Sources with content
+    """
+
+    text: str
+    tokens: int
+    budget: int
+    chunks_used: int = 0
+    chunks_total: int = 0
+    sources_used: int = 0
+    sources_total: int = 0
+
+
+class ContextPacker:
+    """
+    Packs the most relevant chunks of search results into a token budget.
+
+    Selection runs in two passes: first the best chunk of every source
+    (cut to a fair share of the budget if they do not all fit), then
+    the remaining chunks by descending BM25 score while they fit.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = DEFAULT_CONTEXT_TOKENS,
+        chunk_tokens: int = 128,
+        stop_words: Iterable[str] = (),
+    ):
+        """
+        Initialize the packer.
+
+        Args:
+            token_budget: Tokens available for the packed content
+            chunk_tokens: Target chunk size in tokens
+            stop_words: Words ignored when ranking
+        """
+        self.token_budget = max(1, token_budget)
+        self.chunk_tokens = max(MIN_CHUNK_TOKENS, chunk_tokens)
+        self.stop_words = frozenset(stop_words)
+
+    def _terms(self, text: str) -> list[str]:
+        """Lowercase ranking terms of a text, without stop words."""
+        return [
+            term for term in _TERM_PATTERN.findall(text.lower())
+            if len(term) > 1 and term not in self.stop_words
+        ]
+
+    @staticmethod
+    def _header(result: SearchResult) -> str:
+        """Source header emitted before a source's chunks."""
+        lines = [f"## {result.title}", f"Source: {result.url}"]
+        if result.published_date:
+            lines.append(f"Date: {result.published_date}")
+        return "\n".join(lines)
+
+    def chunk(self, results: list[SearchResult]) -> list[ContextChunk]:
+        """
+        Split search results into chunks.
+
+        Args:
+            results: Search results
+
+        Returns:
+            Chunks of every result, in result and text order
+        """
+        return [
+            ContextChunk(source=index, position=position, text=text, tokens=estimate_tokens(text))
+            for index, result in enumerate(results)
+            for position, text in enumerate(split_into_chunks(result.content, self.chunk_tokens))
+        ]
+
+    def pack(self, query: str, results: list[SearchResult]) -> PackedContext:
+        """
+        Pack the search results most relevant to a query into the budget.
+
+        Args:
+            query: Research topic to rank chunks against
+            results: Search results
+
+        Returns:
+            PackedContext with the selected chunks
+        """
+        chunks = self.chunk(results)
+        if not chunks:
+            return PackedContext(text="", tokens=0, budget=self.token_budget)
+
+        ranker = BM25Ranker([self._terms(chunk.text) for chunk in chunks])
+        for chunk, score in zip(chunks, ranker.scores(self._terms(query))):
+            chunk.score = score
+
+        header_tokens = {
+            index: estimate_tokens(self._header(result)) + 1
+            for index, result in enumerate(results)
+        }
+
+        # Pass 1: the best chunk of every source
+        best: dict[int, ContextChunk] = {}
+        for chunk in chunks:
+            if chunk.source not in best or chunk.score > best[chunk.source].score:
+                best[chunk.source] = chunk
+
+        guaranteed = sum(chunk.tokens + header_tokens[source] for source, chunk in best.items())
+        if guaranteed > self.token_budget:
+            share = self.token_budget // len(best)
+            best = {
+                source: self._shrink(chunk, max(MIN_CHUNK_TOKENS, share - header_tokens[source]))
+                for source, chunk in best.items()
+            }
+
+        selected = list(best.values())
+        used = sum(chunk.tokens + header_tokens[chunk.source] for chunk in selected)
+
+        # Pass 2: the remaining chunks by relevance, while they fit
+        chosen = {(chunk.source, chunk.position) for chunk in selected}
+        for chunk in sorted(chunks, key=lambda c: (-c.score, c.source, c.position)):
+            if (chunk.source, chunk.position) in chosen:
+                continue
+            if used + chunk.tokens + 1 <= self.token_budget:
+                selected.append(chunk)
+                chosen.add((chunk.source, chunk.position))
+                used += chunk.tokens + 1
+
+        text = self._render(results, selected)
+        return PackedContext(
+            text=text,
+            tokens=estimate_tokens(text),
+            budget=self.token_budget,
+            chunks_used=len(selected),
+            chunks_total=len(chunks),
+            sources_used=len(best),
+            sources_total=len({chunk.source for chunk in chunks}),
+        )
+
+    @staticmethod
+    def _shrink(chunk: ContextChunk, tokens: int) -> ContextChunk:
+        """Cut a chunk to about the given number of tokens, on a word boundary."""
+        max_chars = tokens * CHARS_PER_TOKEN
+        if len(chunk.text) <= max_chars:
+            return chunk
+        text = chunk.text[:max_chars - 3].rsplit(" ", 1)[0] + "..."
+        return ContextChunk(chunk.source, chunk.position, text, estimate_tokens(text), chunk.score)
+
+    def _render(self, results: list[SearchResult], selected: list[ContextChunk]) -> str:
+        """Group the selected chunks by source, in source and text order."""
+        by_source: dict[int, list[ContextChunk]] = {}
+        for chunk in sorted(selected, key=lambda c: (c.source, c.position)):
+            by_source.setdefault(chunk.source, []).append(chunk)
+
+        sections = []
+        for source, source_chunks in by_source.items():
+            parts = [self._header(results[source])]
+            previous = None
+            for chunk in source_chunks:
+                if previous is not None and chunk.position != previous + 1:
+                    parts.append("[...]")
+                parts.append(chunk.text)
+                previous = chunk.position
+            sections.append("\n".join(parts))
+        return "\n\n".join(sections)
+
+
+__all__ = [
+    "DEFAULT_CONTEXT_TOKENS",
+    "MODEL_CONTEXT_TOKENS",
+    "BM25Ranker",
+    "ContextChunk",
+    "PackedContext",
+    "ContextPacker",
+    "estimate_tokens",
+    "context_budget_for",
+    "split_into_chunks",
+]
@@ -0,0 +1,318 @@
+"""
+Executor abstraction for CPU-heavy work in the Multi-Agent Virtual Company.
+
+HTML extraction and text analysis are pure-Python and CPU-bound. Run
+on the event-loop thread they stall every other coroutine, and run on
+threads they serialize on the GIL. TaskExecutor hides where such work
+runs behind one interface:
+
+- inline: in the calling thread (default; no overhead)
+- thread: in a thread pool (keeps the event loop responsive)
+- process: in a process pool (uses every core)
+
+map/amap split their inputs into chunks so that a process pool pickles
+one batch per task instead of one item, and results always come back
+in input order. Functions sent to a process pool must be picklable,
+i.e. defined at module level (functools.partial of one is fine).
+"""
+
+import os
+import math
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, Optional, TypeVar
+
+from loguru import logger
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+
+# Chunks per worker used to pick a default chunk size
+_CHUNKS_PER_WORKER = 4
+
+
+def _call_batch(fn: Callable[[T], R], batch: list[T]) -> list[R]:
+    """Apply fn to every item of a batch (runs in the worker)."""
+    return [fn(item) for item in batch]
+
+
+class TaskExecutor:
+    """
+    Runs CPU-bound callables inline, on a thread pool or on a process pool.
+
+    The pool is created on first use and shared by every caller of the
+    executor; call shutdown() (or use it as a context manager) to
+    release it.
+    """
+
+    def __init__(
+        self,
+        mode: str = "inline",
+        max_workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            mode: "inline", "thread" or "process"
+            max_workers: Pool size (defaults to the CPU count)
+            chunksize: Items per task for map/amap (default: spread the
+                items over about 4 tasks per worker)
+
+        Raises:
+            ValueError: If mode is not one of EXECUTOR_MODES
+        """
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(
+                f"Unknown executor mode '{mode}' (expected one of {', '.join(EXECUTOR_MODES)})"
+            )
+
+        self.mode = mode
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.chunksize = chunksize
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_inline(self) -> bool:
+        """Whether work runs in the calling thread."""
+        return self.mode == "inline"
+
+    @property
+    def shares_memory(self) -> bool:
+        """Whether work sees the caller's objects (inline or thread mode)."""
+        return self.mode != "process"
+
+    @property
+    def pool(self) -> Optional[Executor]:
+        """The underlying pool, created on first use (None when inline)."""
+        if self.is_inline:
+            return None
+
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    if self.mode == "thread":
+                        self._pool = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix="analysis",
+                        )
+                    else:
+                        self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                    logger.debug(f"Started {self.mode} pool with {self.max_workers} workers")
+        return self._pool
+
+    # =========================================================================
+    # Single Calls
+    # =========================================================================
+
+    def run(self, fn: Callable[..., R], *args, **kwargs) -> R:
+        """
+        Run one call and wait for its result.
+
+        Args:
+            fn: Callable (module-level for process mode)
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            What fn returned
+        """
+        if self.is_inline:
+            return fn(*args, **kwargs)
+        return self.pool.submit(fn, *args, **kwargs).result()
+
+    async def arun(self, fn: Callable[..., R], *args, **kwargs) -> R:
+        """
+        Run one call without blocking the event loop (unless inline).
+
+        Args:
+            fn: Callable (module-level for process mode)
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            What fn returned
+        """
+        if self.is_inline:
+            return fn(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, functools.partial(fn, *args, **kwargs))
+
+    # =========================================================================
+    # Batches
+    # =========================================================================
+
+    def _batches(self, items: list[T], chunksize: Optional[int]) -> list[list[T]]:
+        """Split items into chunks of chunksize (or the default size)."""
+        size = chunksize or self.chunksize or max(
+            1, math.ceil(len(items) / (self.max_workers * _CHUNKS_PER_WORKER))
+        )
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    def map(
+        self,
+        fn: Callable[[T], R],
+        items: Iterable[T],
+        chunksize: Optional[int] = None,
+    ) -> list[R]:
+        """
+        Apply fn to every item, in chunks.
+
+        Args:
+            fn: Single-argument callable (module-level for process mode)
+            items: Inputs
+            chunksize: Items per task (overrides the executor default)
+
+        Returns:
+            Results in input order
+        """
+        items = list(items)
+        if self.is_inline or len(items) <= 1:
+            return [fn(item) for item in items]
+
+        futures = [
+            self.pool.submit(_call_batch, fn, batch)
+            for batch in self._batches(items, chunksize)
+        ]
+        return [result for future in futures for result in future.result()]
+
+    async def amap(
+        self,
+        fn: Callable[[T], R],
+        items: Iterable[T],
+        chunksize: Optional[int] = None,
+    ) -> list[R]:
+        """
+        Apply fn to every item, in chunks, without blocking the event loop.
+
+        Args:
+            fn: Single-argument callable (module-level for process mode)
+            items: Inputs
+            chunksize: Items per task (overrides the executor default)
+
+        Returns:
+            Results in input order
+        """
+        items = list(items)
+        if self.is_inline:
+            return [fn(item) for item in items]
+        if not items:
+            return []
+
+        loop = asyncio.get_running_loop()
+        batches = await asyncio.gather(*(
+            loop.run_in_executor(self.pool, _call_batch, fn, batch)
+            for batch in self._batches(items, chunksize)
+        ))
+        return [result for batch in batches for result in batch]
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shut down the pool (it is recreated if the executor is used again).
+
+        Args:
+            wait: Wait for running work to finish
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def __enter__(self) -> "TaskExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+    def __repr__(self) -> str:
+        return f"TaskExecutor(mode='{self.mode}', max_workers={self.max_workers})"
+
+
+# =============================================================================
+# Process-wide Executor
+# =============================================================================
+
+_executor: Optional[TaskExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def configure_executor(
+    mode: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> TaskExecutor:
+    """
+    Replace the process-wide executor used for parsing and analysis.
+
+    Unspecified settings fall back to the environment:
+    - ANALYSIS_EXECUTOR: inline, thread or process (default inline)
+    - ANALYSIS_WORKERS: pool size (default: CPU count)
+
+    Args:
+        mode: Executor mode
+        max_workers: Pool size
+        chunksize: Items per task for map/amap
+
+    Returns:
+        The new shared executor
+    """
+    global _executor
+
+    executor = _build_executor(mode, max_workers, chunksize)
+
+    with _executor_lock:
+        previous, _executor = _executor, executor
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return executor
+
+
+def _build_executor(
+    mode: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> TaskExecutor:
+    """Create an executor, filling unspecified settings from the environment."""
+    if mode is None:
+        mode = os.getenv("ANALYSIS_EXECUTOR", "inline").lower()
+    if max_workers is None and os.getenv("ANALYSIS_WORKERS"):
+        max_workers = int(os.getenv("ANALYSIS_WORKERS"))
+
+    executor = TaskExecutor(mode=mode, max_workers=max_workers, chunksize=chunksize)
+    logger.info(f"Analysis executor: {executor.mode} ({executor.max_workers} workers)")
+    return executor
+
+
+def get_executor() -> TaskExecutor:
+    """
+    Get the process-wide executor, creating it from the environment if needed.
+
+    Returns:
+        Shared TaskExecutor
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = _build_executor()
+        return _executor
+
+
+__all__ = [
+    "EXECUTOR_MODES",
+    "TaskExecutor",
+    "configure_executor",
+    "get_executor",
+]
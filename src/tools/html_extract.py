@@ -0,0 +1,576 @@
+"""
+Single-pass HTML text extraction for the Multi-Agent Virtual Company.
+
+HTMLTextExtractor is a small tokenizer state machine that can be fed a
+page chunk by chunk while it downloads. One pass over the markup yields
+the title, visible body text (skipping scripts, styles and other
+non-content elements), meta tags and <time> dates, and the extractor
+reports when its character budget is full so the caller can stop
+downloading.
+
+Tags are located with str.find and matched with one compiled pattern;
+script and style bodies are skipped with a single search for their
+closing tag, so there is no backtracking over the document and only
+tags that carry needed attributes have them parsed.
+
+With main_content enabled, text is grouped into blocks (paragraphs,
+list items, headings, ...) and each block is scored as it closes, in
+the spirit of readability/jusText: blocks inside navigation, headers,
+footers, sidebars or cookie/share widgets, blocks that are mostly link
+text, and short fragments without sentence punctuation are dropped as
+boilerplate.
+"""
+
+import re
+import codecs
+from html import unescape
+from typing import Optional
+from dataclasses import dataclass, field
+
+
+# Elements whose contents are never visible text
+SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "svg", "iframe"})
+
+# Skipped elements whose contents are raw text (no tags inside)
+RAW_TEXT_TAGS = frozenset({"script", "style"})
+
+# Elements that start a new text block
+BLOCK_TAGS = frozenset({
+    "p", "div", "article", "section", "main", "li", "ul", "ol", "dl", "dt", "dd",
+    "table", "tr", "td", "th", "blockquote", "pre", "figure", "figcaption",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "footer", "nav", "aside",
+    "form", "body", "br", "hr",
+})
+
+# Elements whose text is boilerplate wherever they appear
+BOILERPLATE_TAGS = frozenset({"nav", "header", "footer", "aside", "form", "button", "select"})
+
+# class/id hints of boilerplate containers
+BOILERPLATE_HINTS = re.compile(
+    r"nav|menu|footer|sidebar|breadcrumb|comment|share|social|cookie|consent|"
+    r"banner|promo|advert|sponsor|related|subscribe|newsletter|popup|modal",
+    re.IGNORECASE,
+)
+
+# Elements with no closing tag
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+})
+
+HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+
+# Block scoring thresholds
+MIN_BLOCK_CHARS = 40
+MAX_LINK_DENSITY = 0.5
+_SENTENCE_END = (".", "!", "?", ":", '."', '"')
+
+# Meta tag name/property -> metadata key
+META_KEYS = {
+    "description": "description",
+    "keywords": "keywords",
+    "author": "author",
+    "date": "published_date",
+    "article:published_time": "published_date",
+}
+
+# A text run, or a start/end tag (quoted attribute values may contain ">")
+_TOKEN_PATTERN = re.compile(
+    r"([^<]+)|<(/?)([a-zA-Z][^\s/>]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>"
+)
+_ATTR_PATTERN = re.compile(
+    r"([^\s=/>\"']+)(?:\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+)))?"
+)
+_RAW_END_PATTERNS = {
+    tag: re.compile(rf"</{tag}\s*>", re.IGNORECASE) for tag in RAW_TEXT_TAGS
+}
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Characters of an unfinished raw-text element kept between chunks
+_RAW_TAIL = 16
+
+
+@dataclass
+class ExtractedPage:
+    """
+    Text and metadata extracted from one HTML page.
+
+    Attributes:
+        title: Page title ("Untitled" if none was found)
+        text: Visible text, whitespace-collapsed and cut to the budget
+        metadata: description, keywords, author and published_date
+        truncated: Whether text was cut at the character budget
+        bytes_read: Bytes of HTML downloaded
+        boilerplate_chars: Characters dropped as boilerplate (main_content only)
+    """
+
+    title: str = "Untitled"
+    text: str = ""
+    metadata: dict = field(default_factory=lambda: {
+        "description": "",
+        "keywords": "",
+        "author": "",
+        "published_date": "",
+    })
+    truncated: bool = False
+    bytes_read: int = 0
+    boilerplate_chars: int = 0
+
+
+def _parse_attrs(source: str) -> dict:
+    """Parse a tag's attribute string into a lowercase-name dict."""
+    attrs = {}
+    for name, double, single, bare in _ATTR_PATTERN.findall(source):
+        value = double or single or bare
+        attrs[name.lower()] = unescape(value) if "&" in value else value
+    return attrs
+
+
+class HTMLTextExtractor:
+    """
+    Incremental extractor of title, text and metadata from HTML.
+
+    Feed decoded chunks with feed() (or raw bytes with feed_bytes()),
+    stop once `full` is True, then call result(). A whole document can
+    be parsed in one call with parse_html().
+    """
+
+    def __init__(
+        self,
+        max_chars: Optional[int] = None,
+        encoding: str = "utf-8",
+        main_content: bool = False,
+    ):
+        """
+        Initialize the extractor.
+
+        Args:
+            max_chars: Visible characters to keep (unlimited if None)
+            encoding: Encoding used by feed_bytes
+            main_content: Keep only main-content blocks, dropping boilerplate
+                (falls back to all text if no block qualifies)
+        """
+        self.max_chars = max_chars
+        self.main_content = main_content
+        self.bytes_read = 0
+        self._decoder = codecs.getincrementaldecoder(_codec_name(encoding))(errors="replace")
+        self._buffer = ""
+        self._raw_end: Optional[re.Pattern] = None
+
+        # All visible text
+        self._parts: list[str] = []
+        self._chars = 0
+
+        # Main-content blocks
+        self._main_parts: list[str] = []
+        self._main_chars = 0
+        self._boilerplate_chars = 0
+        self._stack: list[tuple[str, bool]] = []
+        self._boilerplate_depth = 0
+        self._link_depth = 0
+        self._block: list[str] = []
+        self._block_link_chars = 0
+        self._block_boilerplate = False
+        self._block_heading = False
+
+        # Title and metadata
+        self._skip_depth = 0
+        self._in_title = False
+        self._in_h1 = False
+        self._title_parts: list[str] = []
+        self._h1_parts: list[str] = []
+        self._metadata = ExtractedPage().metadata
+
+    @property
+    def full(self) -> bool:
+        """Whether the character budget has been exceeded."""
+        if self.max_chars is None:
+            return False
+        if self.main_content:
+            return self._main_chars > self.max_chars
+        return self._chars > self.max_chars
+
+    def feed(self, data: str):
+        """
+        Feed a chunk of decoded HTML.
+
+        Args:
+            data: HTML text (may split tags, entities and words)
+        """
+        self._buffer += data
+        self._parse(final=False)
+
+    def feed_bytes(self, chunk: bytes):
+        """
+        Decode and feed a chunk of raw HTML.
+
+        Args:
+            chunk: Raw bytes (may split multi-byte characters)
+        """
+        self.bytes_read += len(chunk)
+        self.feed(self._decoder.decode(chunk))
+
+    # -------------------------------------------------------------------------
+    # Tokenizer
+    # -------------------------------------------------------------------------
+
+    def _parse(self, final: bool):
+        """Consume complete tokens from the buffer, keeping any unfinished tail."""
+        buffer = self._buffer
+        end = len(buffer)
+        pos = 0
+        budget = self.max_chars is not None
+        match_token = _TOKEN_PATTERN.match
+
+        while pos < end:
+            if budget and self.full:
+                break
+
+            # Inside <script>/<style>: jump straight to the closing tag
+            if self._raw_end is not None:
+                match = self._raw_end.search(buffer, pos)
+                if match is None:
+                    pos = end if final else max(pos, end - _RAW_TAIL)
+                    break
+                pos = match.end()
+                self._raw_end = None
+                self._skip_depth = max(0, self._skip_depth - 1)
+                self._break()
+                continue
+
+            match = match_token(buffer, pos)
+            if match is not None:
+                text, closing, name, attrs = match.groups()
+                if text is not None:
+                    # Trailing text may continue in the next chunk
+                    if match.end() == end and not final:
+                        break
+                    self._text(text)
+                elif closing:
+                    self._end_tag(name.lower())
+                else:
+                    name = name.lower()
+                    self._start_tag(name, attrs)
+                    if name in RAW_TEXT_TAGS and not attrs.endswith("/"):
+                        self._raw_end = _RAW_END_PATTERNS[name]
+                pos = match.end()
+                continue
+
+            # Comments, declarations, unfinished tags and stray "<"
+            if buffer.startswith("<!--", pos):
+                close = buffer.find("-->", pos + 4)
+                if close == -1:
+                    if final:
+                        pos = end
+                    break
+                pos = close + 3
+            elif buffer.startswith(("<!", "<?"), pos):
+                close = buffer.find(">", pos)
+                if close == -1:
+                    if final:
+                        pos = end
+                    break
+                pos = close + 1
+            elif not final and buffer.find(">", pos) == -1:
+                break
+            else:
+                self._text("<")
+                pos += 1
+
+        self._buffer = buffer[pos:] if pos < end and not (budget and self.full) else ""
+
+    def _text(self, data: str):
+        if "&" in data:
+            data = unescape(data)
+        self._handle_data(data)
+
+    # -------------------------------------------------------------------------
+    # Token handlers
+    # -------------------------------------------------------------------------
+
+    def _break(self):
+        # Tags separate words, as the old regex extractor did
+        if self._parts and self._parts[-1] != " ":
+            self._parts.append(" ")
+        if self._block and self._block[-1] != " ":
+            self._block.append(" ")
+
+    def _start_tag(self, tag: str, attr_source: str):
+        self._break()
+        if tag in BLOCK_TAGS:
+            self._flush_block()
+
+        if tag in SKIP_TAGS:
+            if not attr_source.endswith("/"):
+                self._skip_depth += 1
+            return
+
+        if self.main_content:
+            self._open(tag, attr_source)
+        if tag in HEADING_TAGS:
+            self._block_heading = True
+
+        if tag == "title":
+            self._in_title = True
+        elif tag == "h1":
+            self._in_h1 = True
+        elif tag == "meta":
+            self._handle_meta(_parse_attrs(attr_source))
+        elif tag == "time" and not self._metadata["published_date"] and attr_source:
+            self._metadata["published_date"] = _parse_attrs(attr_source).get("datetime") or ""
+
+    def _end_tag(self, tag: str):
+        self._break()
+        if tag in BLOCK_TAGS:
+            self._flush_block()
+
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+
+        if self.main_content:
+            self._close(tag)
+
+        if tag == "title":
+            self._in_title = False
+        elif tag == "h1":
+            self._in_h1 = False
+
+    def _handle_data(self, data: str):
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self._title_parts.append(data)
+            return
+        if self._in_h1:
+            self._h1_parts.append(data)
+
+        # Data may arrive split mid-word, so parts are joined as-is
+        if self.max_chars is None:
+            self._parts.append(data)
+        elif self._chars <= self.max_chars:
+            self._parts.append(data)
+            self._chars += len(_WHITESPACE_PATTERN.sub(" ", data))
+
+        if self.main_content:
+            self._block.append(data)
+            if self._link_depth:
+                self._block_link_chars += len(data.strip())
+            if self._boilerplate_depth:
+                self._block_boilerplate = True
+
+    def _handle_meta(self, attrs: dict):
+        key = META_KEYS.get((attrs.get("name") or attrs.get("property") or "").lower())
+        content = attrs.get("content")
+        if key and content and not self._metadata[key]:
+            self._metadata[key] = content
+
+    # -------------------------------------------------------------------------
+    # Main-content detection
+    # -------------------------------------------------------------------------
+
+    def _open(self, tag: str, attr_source: str):
+        """Track an open element for block and boilerplate context."""
+        if tag in VOID_TAGS:
+            return
+
+        # A new paragraph or list item implicitly closes an open one
+        if tag in ("p", "li") and self._stack and self._stack[-1][0] == tag:
+            self._close(tag)
+
+        boilerplate = tag in BOILERPLATE_TAGS
+        if not boilerplate and attr_source and (
+            "class" in attr_source or "id" in attr_source or "role" in attr_source
+        ):
+            attrs = _parse_attrs(attr_source)
+            hints = " ".join(attrs.get(name, "") for name in ("class", "id", "role"))
+            boilerplate = bool(hints.strip() and BOILERPLATE_HINTS.search(hints))
+
+        self._stack.append((tag, boilerplate))
+        self._boilerplate_depth += boilerplate
+        if tag == "a":
+            self._link_depth += 1
+
+    def _close(self, tag: str):
+        """Pop elements up to and including the innermost open `tag`."""
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0] == tag:
+                for name, boilerplate in self._stack[index:]:
+                    self._boilerplate_depth -= boilerplate
+                    if name == "a":
+                        self._link_depth = max(0, self._link_depth - 1)
+                del self._stack[index:]
+                return
+
+    def _flush_block(self):
+        """Score the current text block and keep it if it is main content."""
+        if not self.main_content or not self._block:
+            return
+
+        text = _WHITESPACE_PATTERN.sub(" ", "".join(self._block)).strip()
+        link_density = self._block_link_chars / len(text) if text else 1.0
+        is_main = (
+            not self._block_boilerplate
+            and link_density <= MAX_LINK_DENSITY
+            and (
+                self._block_heading
+                or len(text) >= MIN_BLOCK_CHARS
+                or text.endswith(_SENTENCE_END)
+            )
+        )
+
+        if text and is_main and not self.full:
+            self._main_parts.append(text)
+            self._main_chars += len(text) + 1
+        elif text and not is_main:
+            self._boilerplate_chars += len(text)
+
+        self._block = []
+        self._block_link_chars = 0
+        self._block_boilerplate = False
+        self._block_heading = False
+
+    # -------------------------------------------------------------------------
+    # Result
+    # -------------------------------------------------------------------------
+
+    def result(self) -> ExtractedPage:
+        """
+        Finish parsing and return what was extracted.
+
+        Returns:
+            ExtractedPage
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._parse(final=True)
+        self._flush_block()
+
+        if self._main_parts:
+            text = " ".join(self._main_parts)
+        else:
+            text = _WHITESPACE_PATTERN.sub(" ", "".join(self._parts)).strip()
+        truncated = self.full or (self.max_chars is not None and len(text) > self.max_chars)
+        if truncated:
+            text = text[:self.max_chars].rstrip()
+
+        title = (
+            _WHITESPACE_PATTERN.sub(" ", "".join(self._title_parts)).strip()
+            or _WHITESPACE_PATTERN.sub(" ", "".join(self._h1_parts)).strip()
+            or "Untitled"
+        )
+
+        return ExtractedPage(
+            title=title,
+            text=text,
+            metadata=dict(self._metadata),
+            truncated=truncated,
+            bytes_read=self.bytes_read,
+            boilerplate_chars=self._boilerplate_chars,
+        )
+
+
+def parse_html(
+    html: str,
+    max_chars: Optional[int] = None,
+    main_content: bool = False,
+) -> ExtractedPage:
+    """
+    Extract title, text and metadata from a whole document in one pass.
+
+    Args:
+        html: Raw HTML
+        max_chars: Visible characters to keep (unlimited if None);
+            parsing stops once the budget is full
+        main_content: Drop boilerplate blocks
+
+    Returns:
+        ExtractedPage
+    """
+    extractor = HTMLTextExtractor(max_chars=max_chars, main_content=main_content)
+    if html:
+        extractor.feed(html)
+    return extractor.result()
+
+
+def parse_html_bytes(
+    body: bytes,
+    encoding: Optional[str] = None,
+    max_chars: Optional[int] = None,
+    main_content: bool = False,
+) -> ExtractedPage:
+    """
+    Extract title, text and metadata from a downloaded body.
+
+    A module-level function so it can be sent to a process pool.
+
+    Args:
+        body: Raw HTML bytes
+        encoding: Charset from the Content-Type header (UTF-8 if None)
+        max_chars: Visible characters to keep (unlimited if None)
+        main_content: Drop boilerplate blocks
+
+    Returns:
+        ExtractedPage
+    """
+    extractor = HTMLTextExtractor(
+        max_chars=max_chars,
+        encoding=encoding or "utf-8",
+        main_content=main_content,
+    )
+    if body:
+        extractor.feed_bytes(body)
+    return extractor.result()
+
+
+def _codec_name(encoding: Optional[str]) -> str:
+    """Return a usable codec name, falling back to UTF-8 for unknown ones."""
+    try:
+        return codecs.lookup(encoding or "utf-8").name
+    except LookupError:
+        return "utf-8"
+
+
+def parse_content_type(content_type: Optional[str]) -> tuple[str, Optional[str]]:
+    """
+    Split a Content-Type header into mime type and charset.
+
+    Args:
+        content_type: Header value
+
+    Returns:
+        Tuple of (lowercase mime type, charset or None)
+    """
+    if not content_type:
+        return "", None
+
+    mime, _, params = content_type.partition(";")
+    charset = None
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset":
+            charset = value.strip().strip("\"'") or None
+    return mime.strip().lower(), charset
+
+
+def is_html_content_type(content_type: Optional[str]) -> bool:
+    """
+    Check whether a Content-Type is HTML (a missing header counts as HTML).
+
+    Args:
+        content_type: Header value
+
+    Returns:
+        True for text/html, application/xhtml+xml or no header
+    """
+    mime, _ = parse_content_type(content_type)
+    return mime in ("", "text/html", "application/xhtml+xml")
+
+
+__all__ = [
+    "ExtractedPage",
+    "HTMLTextExtractor",
+    "parse_html",
+    "parse_html_bytes",
+    "parse_content_type",
+    "is_html_content_type",
+]
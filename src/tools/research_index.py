@@ -0,0 +1,400 @@
+"""
+Research Reuse Index for the Multi-Agent Virtual Company.
+
+Queries that differ only in framing ("Tesla risks" vs "Tesla
+opportunities") usually need the same sources. The search cache only
+matches normalized query text, so they would each pay for fresh Tavily
+calls. ResearchIndex stores every search's ResearchData under a keyword
+signature of its query: the significant terms, lightly stemmed, without
+stop words or framing words. A new search reuses a stored one when the
+signatures overlap enough and the stored research is still fresh for
+its topic type (finance news goes stale faster than tech coverage).
+
+Like SearchCache, entries live in memory and optionally in a SQLite
+file that survives restarts.
+"""
+
+import os
+import re
+import time
+import asyncio
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Union
+from loguru import logger
+
+from src.schemas.models import ResearchData
+
+
+# Words that frame a question without changing the sources it needs
+FRAMING_WORDS = frozenset({
+    "risk", "opportunity", "outlook", "analysis", "overview", "trend",
+    "latest", "news", "update", "impact", "future", "prospect", "forecast",
+    "review", "summary", "report", "current", "recent", "key", "top",
+    "challenge", "benefit", "pro", "con", "strength", "weakness",
+})
+
+_STOP_WORDS = frozenset({
+    "a", "an", "in", "on", "of", "to", "at", "by", "or", "is", "be", "as",
+    "the", "and", "for", "with", "from", "about", "what", "which", "who",
+    "how", "why", "when", "where", "are", "was", "were", "its", "their",
+    "this", "that", "these", "those", "into", "over", "vs", "versus",
+    "between", "will", "can", "does", "should", "could", "would",
+})
+
+_WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9&.+-]*")
+
+
+def _stem(word: str) -> str:
+    """Strip common plural/verb endings ("risks" -> "risk", "chips" -> "chip")."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def topic_signature(text: str) -> frozenset[str]:
+    """
+    Compute the keyword signature of a topic or query.
+
+    Args:
+        text: Topic or search query
+
+    Returns:
+        Significant stemmed terms (framing and stop words removed)
+    """
+    terms = set()
+    for word in _WORD_PATTERN.findall(text.lower()):
+        word = word.rstrip(".-+")
+        if word in _STOP_WORDS or word in FRAMING_WORDS:
+            continue
+        stem = _stem(word)
+        if len(stem) < 2 or stem in FRAMING_WORDS:
+            continue
+        terms.add(stem)
+    return frozenset(terms)
+
+
+def signature_similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """
+    Jaccard similarity of two signatures.
+
+    Args:
+        a: First signature
+        b: Second signature
+
+    Returns:
+        |a & b| / |a | b| (0.0 if either is empty)
+    """
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class IndexEntry:
+    """
+    One indexed search.
+
+    Attributes:
+        query: Search query the research came from
+        kind: Topic type (finance, tech or search)
+        signature: Keyword signature of the query
+        research: The search's ResearchData
+        created_at: Unix time the research was stored
+    """
+
+    query: str
+    kind: str
+    signature: frozenset[str]
+    research: ResearchData
+    created_at: float
+
+
+class ResearchIndex:
+    """
+    Keyword-signature index of past searches, for reuse across queries.
+
+    Lookups return the freshest stored search whose signature overlaps
+    the query's by at least min_similarity and whose age is within the
+    freshness window of its topic type.
+    """
+
+    # Freshness window per topic type, in seconds
+    DEFAULT_MAX_AGES = {
+        "finance": 6 * 60 * 60,
+        "search": 24 * 60 * 60,
+        "tech": 3 * 24 * 60 * 60,
+    }
+
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        max_ages: Optional[dict[str, float]] = None,
+        min_similarity: float = 0.6,
+        max_entries: int = 2000,
+    ):
+        """
+        Initialize the research index.
+
+        Args:
+            db_path: SQLite file to persist entries (None for memory only)
+            max_ages: Overrides for DEFAULT_MAX_AGES
+            min_similarity: Minimum signature similarity for a match
+            max_entries: Entries kept; the oldest are dropped beyond this
+        """
+        self.max_ages = {**self.DEFAULT_MAX_AGES, **(max_ages or {})}
+        self.min_similarity = min_similarity
+        self.max_entries = max_entries
+        self.db_path = Path(db_path) if db_path else None
+
+        self._entries: dict[tuple[str, str], IndexEntry] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.misses = 0
+
+        if self.db_path:
+            self._open_db()
+
+        logger.info(
+            f"ResearchIndex initialized (entries={len(self._entries)}, "
+            f"disk={self.db_path or 'disabled'})"
+        )
+
+    def _open_db(self):
+        """Open the SQLite file and load the entries that are still fresh."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS research_index ("
+            "kind TEXT NOT NULL, query TEXT NOT NULL, research TEXT NOT NULL, "
+            "created_at REAL NOT NULL, PRIMARY KEY (kind, query))"
+        )
+        self._db.commit()
+
+        oldest = time.time() - max(self.max_ages.values())
+        rows = self._db.execute(
+            "SELECT kind, query, research, created_at FROM research_index "
+            "WHERE created_at > ? ORDER BY created_at",
+            (oldest,),
+        ).fetchall()
+        for kind, query, research, created_at in rows:
+            try:
+                self._remember(IndexEntry(
+                    query=query,
+                    kind=kind,
+                    signature=topic_signature(query),
+                    research=ResearchData.model_validate_json(research),
+                    created_at=created_at,
+                ))
+            except ValueError as e:
+                logger.warning(f"Skipping unreadable research index entry '{query}': {e}")
+
+    def max_age(self, kind: str) -> float:
+        """Freshness window for a topic type, in seconds."""
+        return self.max_ages.get(kind, self.max_ages["search"])
+
+    def lookup(self, query: str, kind: str = "search") -> Optional[ResearchData]:
+        """
+        Find fresh research from an overlapping earlier search.
+
+        Args:
+            query: Search query about to be run
+            kind: Topic type (finance, tech or search)
+
+        Returns:
+            ResearchData of the best match, or None
+        """
+        signature = topic_signature(query)
+        oldest = time.time() - self.max_age(kind)
+
+        with self._lock:
+            best: Optional[IndexEntry] = None
+            best_score = 0.0
+            for entry in self._entries.values():
+                if entry.kind != kind or entry.created_at <= oldest:
+                    continue
+                score = signature_similarity(signature, entry.signature)
+                if score < self.min_similarity:
+                    continue
+                if best is None or score > best_score or (
+                    score == best_score and entry.created_at > best.created_at
+                ):
+                    best, best_score = entry, score
+
+            if best is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        logger.debug(f"Research index hit: '{query}' -> '{best.query}' ({best_score:.2f})")
+        return best.research
+
+    def add(self, query: str, research: ResearchData, kind: str = "search"):
+        """
+        Store a search's research.
+
+        Args:
+            query: Search query the research came from
+            research: Its ResearchData
+            kind: Topic type (finance, tech or search)
+        """
+        if not research.search_results:
+            return
+
+        entry = IndexEntry(
+            query=query,
+            kind=kind,
+            signature=topic_signature(query),
+            research=research,
+            created_at=time.time(),
+        )
+
+        with self._lock:
+            self._remember(entry)
+
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO research_index "
+                        "(kind, query, research, created_at) VALUES (?, ?, ?, ?)",
+                        (kind, query, research.model_dump_json(), entry.created_at),
+                    )
+                    self._db.execute(
+                        "DELETE FROM research_index WHERE created_at <= ?",
+                        (entry.created_at - max(self.max_ages.values()),),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not write research index entry: {e}")
+
+    def add_many(self, searches: Iterable[tuple[str, Optional[ResearchData]]], kind: str = "search"):
+        """
+        Store several searches (None results are skipped).
+
+        Args:
+            searches: (query, research) pairs
+            kind: Topic type (finance, tech or search)
+        """
+        for query, research in searches:
+            if research is not None:
+                self.add(query, research, kind)
+
+    async def alookup(self, query: str, kind: str = "search") -> Optional[ResearchData]:
+        """
+        Async version of lookup.
+
+        With a SQLite file the lookup runs in a worker thread, since
+        writers hold the index lock while they commit.
+
+        Args:
+            query: Search query about to be run
+            kind: Topic type (finance, tech or search)
+
+        Returns:
+            ResearchData of the best match, or None
+        """
+        if self._db is None:
+            return self.lookup(query, kind)
+        return await asyncio.to_thread(self.lookup, query, kind)
+
+    async def aadd_many(
+        self,
+        searches: Iterable[tuple[str, Optional[ResearchData]]],
+        kind: str = "search",
+    ):
+        """
+        Async version of add_many (SQLite writes run in a worker thread).
+
+        Args:
+            searches: (query, research) pairs
+            kind: Topic type (finance, tech or search)
+        """
+        if self._db is None:
+            self.add_many(searches, kind)
+        else:
+            await asyncio.to_thread(self.add_many, list(searches), kind)
+
+    def _remember(self, entry: IndexEntry):
+        """Insert into memory, dropping the oldest entries beyond max_entries."""
+        key = (entry.kind, entry.query)
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM research_index")
+                self._db.commit()
+
+    @property
+    def stats(self) -> dict:
+        """Get hit/miss counters and the number of entries."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def close(self):
+        """Close the SQLite file."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_shared_research_index: Optional[ResearchIndex] = None
+
+
+def get_shared_research_index() -> Optional[ResearchIndex]:
+    """
+    Get the process-wide research index.
+
+    Reuse is opt-in, since it trades exact freshness for fewer searches.
+    Controlled by environment variables:
+    - RESEARCH_INDEX_ENABLED: set to "true" to enable the index
+    - RESEARCH_INDEX_PATH: SQLite file for persistence (enables the index)
+    - RESEARCH_INDEX_MAX_AGE_FINANCE / _TECH / _SEARCH: freshness
+      windows in hours
+
+    Returns:
+        Shared ResearchIndex, or None if disabled
+    """
+    global _shared_research_index
+
+    path = os.getenv("RESEARCH_INDEX_PATH") or None
+    enabled = os.getenv("RESEARCH_INDEX_ENABLED", "false").lower() in ("1", "true", "yes")
+    if not (enabled or path):
+        return None
+
+    if _shared_research_index is None:
+        max_ages = {
+            kind: float(os.getenv(f"RESEARCH_INDEX_MAX_AGE_{kind.upper()}")) * 3600
+            for kind in ResearchIndex.DEFAULT_MAX_AGES
+            if os.getenv(f"RESEARCH_INDEX_MAX_AGE_{kind.upper()}")
+        }
+        _shared_research_index = ResearchIndex(db_path=path, max_ages=max_ages)
+    return _shared_research_index
+
+
+__all__ = [
+    "FRAMING_WORDS",
+    "IndexEntry",
+    "ResearchIndex",
+    "topic_signature",
+    "signature_similarity",
+    "get_shared_research_index",
+]
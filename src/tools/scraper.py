@@ -3,11 +3,23 @@ Web Scraper Utilities for the Multi-Agent Virtual Company.
 
 This module provides additional web scraping capabilities
 to supplement Tavily search when deeper content extraction is needed.
+
+Async fetches share one long-lived aiohttp session per scraper, whose
+connector caps total and per-host connections, caches DNS lookups and
+keeps connections alive between requests.
+
+Pages are downloaded as a stream: non-HTML responses are rejected from
+their headers, downloads stop at a byte budget, and chunks are fed to
+an incremental extractor that stops once enough text has been kept.
+
+Extraction runs on the scraper's TaskExecutor: inline on the event loop
+by default, on a thread pool, or - when the executor is a process pool -
+after the download, with batches of pages parsed across processes.
 """
 
-import re
 import asyncio
-from typing import Optional
+import functools
+from typing import Awaitable, Callable, Optional, TypeVar
 from urllib.parse import urlparse, urljoin
 from datetime import datetime
 from loguru import logger
@@ -18,6 +30,19 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from src.schemas.models import SearchResult
+from src.tools.tracing import trace_span
+from src.tools.executor import TaskExecutor, get_executor
+from src.tools.html_extract import (
+    ExtractedPage,
+    HTMLTextExtractor,
+    is_html_content_type,
+    parse_content_type,
+    parse_html,
+    parse_html_bytes,
+)
+
+
+T = TypeVar("T")
 
 
 class WebScraper:
@@ -40,11 +65,27 @@ class WebScraper:
         "Connection": "keep-alive",
     }
     
+    # Status codes worth retrying (same as the sync session)
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    
+    # Upper bound on a server-requested Retry-After wait, in seconds
+    MAX_RETRY_AFTER = 30.0
+    
     def __init__(
         self,
         timeout: int = 30,
         max_retries: int = 3,
         headers: Optional[dict] = None,
+        max_connections: int = 100,
+        max_connections_per_host: int = 8,
+        backoff_factor: float = 1.0,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        max_bytes: int = 2_000_000,
+        max_content_chars: int = 2000,
+        chunk_size: int = 16384,
+        main_content: bool = True,
+        executor: Optional[TaskExecutor] = None,
     ):
         """
         Initialize the web scraper.
@@ -53,14 +94,51 @@ class WebScraper:
             timeout: Request timeout in seconds
             max_retries: Maximum retry attempts for failed requests
             headers: Custom headers (optional)
+            max_connections: Total connection limit of the async session
+            max_connections_per_host: Per-host connection limit of the async session
+            backoff_factor: Async retries wait backoff_factor * 2**attempt seconds
+            dns_cache_ttl: Seconds to cache DNS lookups
+            keepalive_timeout: Seconds to keep idle connections open
+            max_bytes: Stop downloading a page after this many bytes
+            max_content_chars: Characters of page text kept by scrape_url
+            chunk_size: Bytes read per streamed chunk
+            main_content: Drop navigation and boilerplate when scraping
+            executor: Executor for HTML extraction (defaults to the
+                process-wide executor from get_executor)
         """
         self.timeout = timeout
         self.max_retries = max_retries
         self.headers = headers or self.DEFAULT_HEADERS
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.backoff_factor = backoff_factor
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.max_bytes = max_bytes
+        self.max_content_chars = max_content_chars
+        self.chunk_size = chunk_size
+        self.main_content = main_content
+        self._executor = executor
         self._session: Optional[requests.Session] = None
+        self._async_session: Optional[aiohttp.ClientSession] = None
+        self._async_session_loop: Optional[asyncio.AbstractEventLoop] = None
         
         logger.info(f"WebScraper initialized (timeout={timeout}s, retries={max_retries})")
     
+    async def __aenter__(self) -> "WebScraper":
+        """Open the shared async session."""
+        await self.get_async_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """Close the shared async session."""
+        await self.aclose()
+    
+    @property
+    def executor(self) -> TaskExecutor:
+        """Executor used for HTML extraction."""
+        return self._executor or get_executor()
+    
     @property
     def session(self) -> requests.Session:
         """Lazy initialization of requests session with retry logic."""
@@ -81,52 +159,320 @@ class WebScraper:
         
         return self._session
     
+    async def get_async_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared aiohttp session, creating it on first use.
+        
+        Sessions are bound to the event loop they were created in, so a
+        new one is opened if the scraper is used from a different loop.
+        
+        Returns:
+            Pooled aiohttp ClientSession
+        """
+        loop = asyncio.get_running_loop()
+        session = self._async_session
+        
+        if session is None or session.closed or self._async_session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._async_session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._async_session_loop = loop
+        
+        return self._async_session
+    
     def fetch_url(self, url: str) -> Optional[str]:
         """
         Fetch content from a URL.
         
+        The body is streamed and cut off after max_bytes.
+        
         Args:
             url: URL to fetch
             
         Returns:
             HTML content as string, or None if fetch fails
         """
-        logger.debug(f"Fetching URL: {url}")
+        def read(response: requests.Response, span) -> str:
+            _, charset = parse_content_type(response.headers.get("Content-Type"))
+            body = bytearray()
+            for chunk in response.iter_content(self.chunk_size):
+                body += chunk
+                if len(body) >= self.max_bytes:
+                    span.set("truncated", True)
+                    break
+            span.set("bytes", len(body))
+            return _decode(bytes(body[:self.max_bytes]), charset)
+        
+        return self._fetch(url, read)
+    
+    def fetch_page(self, url: str) -> Optional[ExtractedPage]:
+        """
+        Stream a page into the incremental extractor.
+        
+        Non-HTML responses are rejected from their headers, and the
+        download stops at max_bytes or once max_content_chars of text
+        have been extracted.
         
-        try:
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            return response.text
+        Args:
+            url: URL to fetch
             
-        except requests.RequestException as e:
-            logger.warning(f"Failed to fetch {url}: {e}")
-            return None
+        Returns:
+            ExtractedPage, or None if the fetch fails or is not HTML
+        """
+        def extract(response: requests.Response, span) -> Optional[ExtractedPage]:
+            extractor = self._page_extractor(url, response.headers.get("Content-Type"), span)
+            if extractor is None:
+                return None
+            for chunk in response.iter_content(self.chunk_size):
+                extractor.feed_bytes(chunk)
+                if self._page_complete(extractor, span):
+                    break
+            return self._finish_page(extractor, span)
+        
+        return self._fetch(url, extract)
+    
+    def _fetch(self, url: str, consume: Callable[..., T]) -> Optional[T]:
+        """
+        Stream a GET request and hand the open response to `consume`.
+        
+        Args:
+            url: URL to fetch
+            consume: Called with (response, span) for 2xx responses
+            
+        Returns:
+            What consume returned, or None if the request failed
+        """
+        logger.debug(f"Fetching URL: {url}")
+        
+        with trace_span("scraper.fetch", kind="fetch", url=url) as span:
+            try:
+                with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                    span.set("status", response.status_code)
+                    response.raise_for_status()
+                    return consume(response, span)
+                
+            except requests.RequestException as e:
+                logger.warning(f"Failed to fetch {url}: {e}")
+                span.set("error", str(e))
+                return None
     
     async def afetch_url(self, url: str) -> Optional[str]:
         """
         Asynchronously fetch content from a URL.
         
+        The body is streamed and cut off after max_bytes.
+        
         Args:
             url: URL to fetch
             
         Returns:
             HTML content as string, or None if fetch fails
         """
+        async def read(response: aiohttp.ClientResponse, span) -> str:
+            _, charset = parse_content_type(response.headers.get("Content-Type"))
+            return _decode(await self._read_body(response, span), charset)
+        
+        return await self._afetch(url, read)
+    
+    async def _read_body(self, response: aiohttp.ClientResponse, span) -> bytes:
+        """
+        Read a streamed response body, cut off after max_bytes.
+        
+        Args:
+            response: Open response
+            span: Fetch span
+            
+        Returns:
+            Body bytes
+        """
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            body += chunk
+            if len(body) >= self.max_bytes:
+                span.set("truncated", True)
+                break
+        span.set("bytes", min(len(body), self.max_bytes))
+        return bytes(body[:self.max_bytes])
+    
+    async def afetch_page(self, url: str) -> Optional[ExtractedPage]:
+        """
+        Asynchronously stream a page into the incremental extractor.
+        
+        With a thread executor each chunk is parsed off the event loop.
+        A process pool cannot share the extractor, so the body is
+        downloaded first (up to max_bytes) and parsed in one call.
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            ExtractedPage, or None if the fetch fails or is not HTML
+        """
+        executor = self.executor
+        
+        if not executor.shares_memory:
+            download = await self._adownload(url)
+            if download is None:
+                return None
+            return await executor.arun(self._page_parser(), download)
+        
+        async def extract(response: aiohttp.ClientResponse, span) -> Optional[ExtractedPage]:
+            extractor = self._page_extractor(url, response.headers.get("Content-Type"), span)
+            if extractor is None:
+                return None
+            async for chunk in response.content.iter_chunked(self.chunk_size):
+                await executor.arun(extractor.feed_bytes, chunk)
+                if self._page_complete(extractor, span):
+                    break
+            return self._finish_page(extractor, span)
+        
+        return await self._afetch(url, extract)
+    
+    async def _adownload(self, url: str) -> Optional[tuple[bytes, Optional[str]]]:
+        """
+        Download an HTML page body for parsing elsewhere.
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            Tuple of (body, charset), or None if the fetch fails or is not HTML
+        """
+        async def read(response: aiohttp.ClientResponse, span) -> Optional[tuple]:
+            content_type = response.headers.get("Content-Type")
+            if not self._is_page(url, content_type, span):
+                return None
+            _, charset = parse_content_type(content_type)
+            return await self._read_body(response, span), charset
+        
+        return await self._afetch(url, read)
+    
+    def _page_parser(self) -> Callable[[tuple[bytes, Optional[str]]], ExtractedPage]:
+        """Picklable parser for (body, charset) downloads, with this scraper's limits."""
+        return functools.partial(
+            _parse_download,
+            max_chars=self.max_content_chars,
+            main_content=self.main_content,
+        )
+    
+    async def _afetch(
+        self,
+        url: str,
+        consume: Callable[..., Awaitable[T]],
+    ) -> Optional[T]:
+        """
+        Stream a GET request on the shared session, with retries.
+        
+        Args:
+            url: URL to fetch
+            consume: Awaited with (response, span) for 200 responses
+            
+        Returns:
+            What consume returned, or None if the request failed
+        """
         logger.debug(f"Async fetching URL: {url}")
         
-        try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(url, timeout=self.timeout) as response:
-                    if response.status == 200:
-                        return await response.text()
-                    else:
-                        logger.warning(f"HTTP {response.status} for {url}")
-                        return None
+        with trace_span("scraper.fetch", kind="fetch", url=url) as span:
+            session = await self.get_async_session()
+            
+            for attempt in range(self.max_retries + 1):
+                retry_after = None
+                try:
+                    async with session.get(url) as response:
+                        span.set("status", response.status)
+                        if response.status == 200:
+                            return await consume(response, span)
                         
-        except Exception as e:
-            logger.warning(f"Async fetch failed for {url}: {e}")
+                        if response.status not in self.RETRY_STATUSES:
+                            logger.warning(f"HTTP {response.status} for {url}")
+                            return None
+                        
+                        error = f"HTTP {response.status}"
+                        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                        
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = str(e) or type(e).__name__
+                    
+                except Exception as e:
+                    logger.warning(f"Async fetch failed for {url}: {e}")
+                    span.set("error", str(e))
+                    return None
+                
+                if attempt == self.max_retries:
+                    break
+                
+                delay = self.backoff_factor * (2 ** attempt)
+                if retry_after is not None:
+                    delay = min(max(delay, retry_after), self.MAX_RETRY_AFTER)
+                
+                logger.debug(f"Retrying {url} in {delay:.2f}s after {error}")
+                span.add("retries")
+                await asyncio.sleep(delay)
+            
+            logger.warning(f"Async fetch failed for {url} after {attempt + 1} attempts: {error}")
+            span.set("error", error)
             return None
     
+    def _page_extractor(
+        self,
+        url: str,
+        content_type: Optional[str],
+        span,
+    ) -> Optional[HTMLTextExtractor]:
+        """
+        Create an extractor for a response, or reject non-HTML content.
+        
+        Args:
+            url: URL being fetched
+            content_type: Content-Type header
+            span: Fetch span
+            
+        Returns:
+            HTMLTextExtractor, or None if the content is not HTML
+        """
+        if not self._is_page(url, content_type, span):
+            return None
+        
+        _, charset = parse_content_type(content_type)
+        return HTMLTextExtractor(
+            max_chars=self.max_content_chars,
+            encoding=charset or "utf-8",
+            main_content=self.main_content,
+        )
+    
+    @staticmethod
+    def _is_page(url: str, content_type: Optional[str], span) -> bool:
+        """Whether a response is HTML (non-HTML content is logged and skipped)."""
+        if is_html_content_type(content_type):
+            return True
+        logger.debug(f"Skipping non-HTML content ({content_type}): {url}")
+        span.set("skipped", content_type)
+        return False
+    
+    def _page_complete(self, extractor: HTMLTextExtractor, span) -> bool:
+        """Whether streaming can stop (text budget full or byte budget spent)."""
+        if extractor.full:
+            return True
+        if extractor.bytes_read >= self.max_bytes:
+            span.set("truncated", True)
+            return True
+        return False
+    
+    @staticmethod
+    def _finish_page(extractor: HTMLTextExtractor, span) -> ExtractedPage:
+        """Finish extraction and record the bytes read."""
+        page = extractor.result()
+        span.set("bytes", page.bytes_read)
+        return page
+    
     async def afetch_multiple(self, urls: list[str]) -> dict[str, Optional[str]]:
         """
         Asynchronously fetch content from multiple URLs.
@@ -144,50 +490,41 @@ class WebScraper:
         
         return dict(zip(urls, results))
     
-    def extract_text(self, html: str) -> str:
+    def parse_html(self, html: str, main_content: Optional[bool] = None) -> ExtractedPage:
+        """
+        Extract title, text and metadata from HTML in one parser pass.
+        
+        Args:
+            html: Raw HTML content
+            main_content: Drop navigation and boilerplate blocks
+                (defaults to the scraper's main_content setting)
+            
+        Returns:
+            ExtractedPage with title, text and metadata
+        """
+        return parse_html(
+            html,
+            main_content=self.main_content if main_content is None else main_content,
+        )
+    
+    def extract_text(self, html: str, main_content: bool = False) -> str:
         """
         Extract readable text from HTML content.
         
-        This is a simple extraction that removes HTML tags.
-        For production, consider using BeautifulSoup or similar.
+        Scripts, styles, comments and tags are removed and entities
+        decoded. Use parse_html to get title and metadata from the same
+        pass.
         
         Args:
             html: Raw HTML content
+            main_content: Keep only main-content blocks
             
         Returns:
             Extracted text content
         """
         if not html:
             return ""
-        
-        # Remove script and style elements
-        html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-        html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Remove HTML comments
-        html = re.sub(r'<!--.*?-->', '', html, flags=re.DOTALL)
-        
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', ' ', html)
-        
-        # Decode common HTML entities
-        html_entities = {
-            '&nbsp;': ' ',
-            '&amp;': '&',
-            '&lt;': '<',
-            '&gt;': '>',
-            '&quot;': '"',
-            '&#39;': "'",
-            '&apos;': "'",
-        }
-        for entity, char in html_entities.items():
-            text = text.replace(entity, char)
-        
-        # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        
-        return text
+        return self.parse_html(html, main_content=main_content).text
     
     def extract_title(self, html: str) -> str:
         """
@@ -197,22 +534,11 @@ class WebScraper:
             html: Raw HTML content
             
         Returns:
-            Page title or "Untitled"
+            Page title (falling back to the first h1) or "Untitled"
         """
         if not html:
             return "Untitled"
-        
-        # Try to find title tag
-        title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
-        if title_match:
-            return title_match.group(1).strip()
-        
-        # Try to find h1
-        h1_match = re.search(r'<h1[^>]*>([^<]+)</h1>', html, re.IGNORECASE)
-        if h1_match:
-            return h1_match.group(1).strip()
-        
-        return "Untitled"
+        return self.parse_html(html, main_content=False).title
     
     def extract_metadata(self, html: str) -> dict:
         """
@@ -222,55 +548,9 @@ class WebScraper:
             html: Raw HTML content
             
         Returns:
-            Dictionary with extracted metadata
+            Dictionary with description, keywords, author and published_date
         """
-        metadata = {
-            "description": "",
-            "keywords": "",
-            "author": "",
-            "published_date": "",
-        }
-        
-        if not html:
-            return metadata
-        
-        # Extract meta description
-        desc_match = re.search(
-            r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']+)["\']',
-            html, re.IGNORECASE
-        )
-        if desc_match:
-            metadata["description"] = desc_match.group(1)
-        
-        # Extract meta keywords
-        keywords_match = re.search(
-            r'<meta[^>]*name=["\']keywords["\'][^>]*content=["\']([^"\']+)["\']',
-            html, re.IGNORECASE
-        )
-        if keywords_match:
-            metadata["keywords"] = keywords_match.group(1)
-        
-        # Extract author
-        author_match = re.search(
-            r'<meta[^>]*name=["\']author["\'][^>]*content=["\']([^"\']+)["\']',
-            html, re.IGNORECASE
-        )
-        if author_match:
-            metadata["author"] = author_match.group(1)
-        
-        # Extract published date (common formats)
-        date_patterns = [
-            r'<meta[^>]*property=["\']article:published_time["\'][^>]*content=["\']([^"\']+)["\']',
-            r'<meta[^>]*name=["\']date["\'][^>]*content=["\']([^"\']+)["\']',
-            r'<time[^>]*datetime=["\']([^"\']+)["\']',
-        ]
-        for pattern in date_patterns:
-            date_match = re.search(pattern, html, re.IGNORECASE)
-            if date_match:
-                metadata["published_date"] = date_match.group(1)
-                break
-        
-        return metadata
+        return self.parse_html(html, main_content=False).metadata
     
     def scrape_url(self, url: str) -> Optional[SearchResult]:
         """
@@ -282,25 +562,11 @@ class WebScraper:
         Returns:
             SearchResult with extracted content, or None if failed
         """
-        html = self.fetch_url(url)
-        if not html:
+        page = self.fetch_page(url)
+        if page is None:
             return None
         
-        title = self.extract_title(html)
-        content = self.extract_text(html)
-        metadata = self.extract_metadata(html)
-        
-        # Truncate content if too long
-        max_content_length = 2000
-        if len(content) > max_content_length:
-            content = content[:max_content_length] + "..."
-        
-        return SearchResult(
-            title=title,
-            url=url,
-            content=content or metadata.get("description", "No content extracted"),
-            published_date=metadata.get("published_date"),
-        )
+        return self._to_search_result(url, page)
     
     async def ascrape_url(self, url: str) -> Optional[SearchResult]:
         """
@@ -312,55 +578,175 @@ class WebScraper:
         Returns:
             SearchResult with extracted content, or None if failed
         """
-        html = await self.afetch_url(url)
-        if not html:
+        page = await self.afetch_page(url)
+        if page is None:
             return None
         
-        title = self.extract_title(html)
-        content = self.extract_text(html)
-        metadata = self.extract_metadata(html)
+        return self._to_search_result(url, page)
+    
+    @staticmethod
+    def _to_search_result(url: str, page: ExtractedPage) -> SearchResult:
+        """
+        Build a SearchResult from an extracted page.
         
-        # Truncate content if too long
-        max_content_length = 2000
-        if len(content) > max_content_length:
-            content = content[:max_content_length] + "..."
+        Args:
+            url: Page URL
+            page: Extracted page
+            
+        Returns:
+            SearchResult ("..." marks truncated content)
+        """
+        content = page.text + "..." if page.truncated else page.text
         
         return SearchResult(
-            title=title,
+            title=page.title,
             url=url,
-            content=content or metadata.get("description", "No content extracted"),
-            published_date=metadata.get("published_date"),
+            content=content or page.metadata.get("description") or "No content extracted",
+            published_date=page.metadata.get("published_date") or None,
         )
     
-    async def ascrape_multiple(self, urls: list[str]) -> list[SearchResult]:
+    async def ascrape_multiple(
+        self,
+        urls: list[str],
+        max_per_host: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> list[SearchResult]:
         """
         Asynchronously scrape multiple URLs.
         
         Args:
             urls: List of URLs to scrape
+            max_per_host: Maximum concurrent requests per host (unlimited if None)
+            deadline: Overall time budget in seconds; scrapes still running
+                when it expires are cancelled (no limit if None)
             
         Returns:
-            List of SearchResult objects (failed URLs are excluded)
+            List of SearchResult objects in URL order (failed, cancelled
+            and timed out URLs are excluded)
+            
+        With a process-pool executor the pages are downloaded first and
+        then parsed in chunked batches across the pool; the deadline
+        covers the downloads only.
         """
         logger.info(f"Async scraping {len(urls)} URLs")
         
-        tasks = [self.ascrape_url(url) for url in urls]
-        results = await asyncio.gather(*tasks)
+        executor = self.executor
+        fetch = self.ascrape_url if executor.shares_memory else self._adownload
+        host_limits: dict[str, asyncio.Semaphore] = {}
+        
+        async def scrape(url: str):
+            if not max_per_host:
+                return await fetch(url)
+            
+            semaphore = host_limits.setdefault(
+                get_domain(url), asyncio.Semaphore(max_per_host)
+            )
+            async with semaphore:
+                return await fetch(url)
         
-        # Filter out None results
-        return [r for r in results if r is not None]
+        tasks = [asyncio.create_task(scrape(url)) for url in urls]
+        if not tasks:
+            return []
+        
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        
+        if pending:
+            logger.warning(
+                f"Scrape deadline of {deadline}s reached, "
+                f"cancelling {len(pending)} of {len(tasks)} URLs"
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        # Keep URL order; filter out failed and unfinished scrapes
+        finished = [
+            (url, task.result())
+            for url, task in zip(urls, tasks)
+            if task in done and not task.cancelled()
+            and task.exception() is None and task.result() is not None
+        ]
+        if executor.shares_memory:
+            return [result for _, result in finished]
+        
+        pages = await executor.amap(self._page_parser(), [download for _, download in finished])
+        return [
+            self._to_search_result(url, page)
+            for (url, _), page in zip(finished, pages)
+        ]
     
     def close(self):
         """Close the session and clean up resources."""
         if self._session:
             self._session.close()
             self._session = None
+    
+    async def aclose(self):
+        """Close the shared async session and its pooled connections."""
+        if self._async_session is not None:
+            if not self._async_session.closed:
+                await self._async_session.close()
+            self._async_session = None
+            self._async_session_loop = None
 
 
 # =============================================================================
 # Utility Functions
 # =============================================================================
 
+def _decode(body: bytes, charset: Optional[str]) -> str:
+    """
+    Decode a response body, falling back to UTF-8.
+    
+    Args:
+        body: Raw bytes
+        charset: Charset from the Content-Type header
+        
+    Returns:
+        Decoded text (undecodable bytes replaced)
+    """
+    try:
+        return body.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def _parse_download(
+    download: tuple[bytes, Optional[str]],
+    max_chars: Optional[int] = None,
+    main_content: bool = False,
+) -> ExtractedPage:
+    """
+    Parse a downloaded (body, charset) pair (runs in executor workers).
+    
+    Args:
+        download: Tuple of (body, charset)
+        max_chars: Visible characters to keep
+        main_content: Drop boilerplate blocks
+        
+    Returns:
+        ExtractedPage
+    """
+    body, charset = download
+    return parse_html_bytes(body, charset, max_chars=max_chars, main_content=main_content)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds.
+    
+    Args:
+        value: Header value (HTTP dates are ignored)
+        
+    Returns:
+        Seconds to wait, or None if absent or not numeric
+    """
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
 def is_valid_url(url: str) -> bool:
     """
     Check if a URL is valid.
@@ -2,19 +2,362 @@
 Tavily Search Tool for the Multi-Agent Virtual Company.
 
 This module provides web search capabilities using the Tavily API,
-optimized for AI agent research tasks.
+optimized for AI agent research tasks, plus a two-tier result cache
+so repeated topics do not pay for fresh API calls.
 """
 
+import os
+import re
+import json
+import time
+import sqlite3
 import asyncio
-from typing import Optional
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
 from datetime import datetime
 from loguru import logger
 
 from tavily import TavilyClient, AsyncTavilyClient
 
 from src.schemas.models import SearchResult, ResearchData
+from src.tools.tracing import trace_span
 
 
+# =============================================================================
+# Search Result Cache
+# =============================================================================
+
+class SearchCache:
+    """
+    Two-tier cache for raw Tavily responses.
+    
+    Tier 1 is an in-memory LRU; tier 2 is an optional SQLite file that
+    survives restarts. Entries expire after a per-method TTL, and the
+    disk tier evicts the least recently used rows beyond its size limit.
+    """
+    
+    # Time-to-live per search method, in seconds
+    DEFAULT_TTLS = {
+        "news": 15 * 60,
+        "search": 60 * 60,
+        "finance": 60 * 60,
+        "tech": 6 * 60 * 60,
+    }
+    
+    def __init__(
+        self,
+        max_memory_entries: int = 256,
+        db_path: Optional[Union[str, Path]] = None,
+        max_disk_entries: int = 5000,
+        ttls: Optional[dict[str, float]] = None,
+    ):
+        """
+        Initialize the search cache.
+        
+        Args:
+            max_memory_entries: Maximum entries kept in the memory tier
+            db_path: SQLite file for the disk tier (None for memory only)
+            max_disk_entries: Maximum rows kept in the disk tier
+            ttls: Overrides for DEFAULT_TTLS
+        """
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.db_path = Path(db_path) if db_path else None
+        
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        
+        if self.db_path:
+            self._open_db()
+        
+        logger.info(
+            f"SearchCache initialized (memory={max_memory_entries}, "
+            f"disk={self.db_path or 'disabled'})"
+        )
+    
+    def _open_db(self):
+        """Open (and create if needed) the SQLite disk tier."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_accessed "
+            "ON search_cache (accessed_at)"
+        )
+        self._db.commit()
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """
+        Normalize a query so trivially different phrasings share a key.
+        
+        Args:
+            query: Raw search query
+            
+        Returns:
+            Lowercased query with punctuation and extra whitespace removed
+        """
+        query = re.sub(r"[^\w\s&$%.-]", " ", query.lower())
+        return re.sub(r"\s+", " ", query).strip(" .-")
+    
+    @classmethod
+    def make_key(
+        cls,
+        query: str,
+        search_depth: Optional[str] = None,
+        include_domains: Optional[list[str]] = None,
+        exclude_domains: Optional[list[str]] = None,
+        topic: Optional[str] = None,
+        days: Optional[int] = None,
+        max_results: Optional[int] = None,
+        **extra,
+    ) -> str:
+        """
+        Build a cache key from the search parameters.
+        
+        Args:
+            query: Search query (normalized before hashing)
+            search_depth: Tavily search depth
+            include_domains: Domains to include (order-insensitive)
+            exclude_domains: Domains to exclude (order-insensitive)
+            topic: Tavily topic (e.g. "news")
+            days: Look-back window for news searches
+            max_results: Maximum results requested
+            **extra: Any other request parameters that change the response
+            
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = {
+            "query": cls.normalize_query(query),
+            "search_depth": search_depth,
+            "include_domains": sorted(include_domains or []),
+            "exclude_domains": sorted(exclude_domains or []),
+            "topic": topic,
+            "days": days,
+            "max_results": max_results,
+            **extra,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    
+    def ttl_for(self, kind: str) -> float:
+        """Get the TTL in seconds for a search method."""
+        return self.ttls.get(kind, self.ttls["search"])
+    
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from make_key()
+            
+        Returns:
+            Cached raw response, or None on a miss
+        """
+        now = time.time()
+        
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+            
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM search_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    value_json, expires_at = row
+                    if expires_at > now:
+                        self._db.execute(
+                            "UPDATE search_cache SET accessed_at = ? WHERE key = ?",
+                            (now, key),
+                        )
+                        self._db.commit()
+                        value = json.loads(value_json)
+                        self._remember(key, expires_at, value)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                    self._db.commit()
+            
+            self.misses += 1
+            return None
+    
+    def set(self, key: str, value: dict, ttl: float):
+        """
+        Store a response in both tiers.
+        
+        Args:
+            key: Cache key from make_key()
+            value: Raw (JSON-serializable) response
+            ttl: Time-to-live in seconds
+        """
+        now = time.time()
+        expires_at = now + ttl
+        
+        with self._lock:
+            self._remember(key, expires_at, value)
+            
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO search_cache "
+                        "(key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                        (key, json.dumps(value, default=str), expires_at, now),
+                    )
+                    self._evict_disk()
+                    self._db.commit()
+                except (sqlite3.Error, TypeError) as e:
+                    logger.warning(f"Could not write search cache entry: {e}")
+    
+    async def aget(self, key: str) -> Optional[dict]:
+        """
+        Async version of get.
+        
+        With a disk tier the lookup runs in a worker thread, since it
+        may query and commit SQLite while holding the cache lock.
+        
+        Args:
+            key: Cache key from make_key()
+            
+        Returns:
+            Cached raw response, or None on a miss
+        """
+        if self._db is None:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+    
+    async def aset(self, key: str, value: dict, ttl: float):
+        """
+        Async version of set (disk writes run in a worker thread).
+        
+        Args:
+            key: Cache key from make_key()
+            value: Raw (JSON-serializable) response
+            ttl: Time-to-live in seconds
+        """
+        if self._db is None:
+            self.set(key, value, ttl)
+        else:
+            await asyncio.to_thread(self.set, key, value, ttl)
+    
+    def _remember(self, key: str, expires_at: float, value: dict):
+        """Insert into the memory tier, evicting the least recently used."""
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+    
+    def _evict_disk(self):
+        """Drop expired rows and trim the disk tier to its size limit."""
+        self._db.execute("DELETE FROM search_cache WHERE expires_at <= ?", (time.time(),))
+        count = self._db.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM search_cache WHERE key IN ("
+                "SELECT key FROM search_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+    
+    def clear(self):
+        """Remove all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM search_cache")
+                self._db.commit()
+    
+    @property
+    def stats(self) -> dict:
+        """Get hit/miss counters and tier sizes."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_entries": len(self._memory),
+        }
+    
+    def close(self):
+        """Close the disk tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_shared_search_cache: Optional[SearchCache] = None
+
+
+def get_shared_search_cache() -> Optional[SearchCache]:
+    """
+    Get the process-wide search cache.
+    
+    Controlled by environment variables:
+    - SEARCH_CACHE_ENABLED: set to "false" to disable caching
+    - SEARCH_CACHE_PATH: SQLite file for the disk tier (memory only if unset)
+    
+    Returns:
+        Shared SearchCache, or None if caching is disabled
+    """
+    global _shared_search_cache
+    
+    if os.getenv("SEARCH_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    
+    if _shared_search_cache is None:
+        _shared_search_cache = SearchCache(db_path=os.getenv("SEARCH_CACHE_PATH") or None)
+    return _shared_search_cache
+
+
+# Process-wide cap on concurrent async Tavily requests (None = unlimited)
+_search_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def set_search_concurrency(limit: Optional[int]):
+    """
+    Limit how many async Tavily requests may be in flight at once.
+    
+    Cache hits are not counted against the limit.
+    
+    Args:
+        limit: Maximum concurrent requests (None or 0 to remove the limit)
+    """
+    global _search_semaphore
+    _search_semaphore = asyncio.Semaphore(limit) if limit else None
+    logger.info(f"Search concurrency limit set to {limit or 'unlimited'}")
+
+
+# =============================================================================
+# Tavily Search Tool
+# =============================================================================
+
 class TavilySearchTool:
     """
     Tavily-powered search tool for gathering research data.
@@ -23,18 +366,54 @@ class TavilySearchTool:
     high-quality, relevant search results with content extraction.
     """
     
-    def __init__(self, api_key: str, max_results: int = 5):
+    # Trusted financial domains
+    FINANCE_DOMAINS = [
+        "reuters.com",
+        "bloomberg.com",
+        "wsj.com",
+        "cnbc.com",
+        "finance.yahoo.com",
+        "marketwatch.com",
+        "seekingalpha.com",
+        "fool.com",
+        "investopedia.com",
+        "barrons.com",
+    ]
+    
+    # Trusted tech domains
+    TECH_DOMAINS = [
+        "techcrunch.com",
+        "theverge.com",
+        "wired.com",
+        "arstechnica.com",
+        "venturebeat.com",
+        "thenextweb.com",
+        "zdnet.com",
+        "cnet.com",
+        "engadget.com",
+        "mit.edu",
+    ]
+    
+    def __init__(
+        self,
+        api_key: str,
+        max_results: int = 5,
+        cache: Optional[SearchCache] = None,
+    ):
         """
         Initialize the Tavily search tool.
         
         Args:
             api_key: Tavily API key
             max_results: Maximum number of results per search (default: 5)
+            cache: Result cache shared across searches (optional)
         """
         self.api_key = api_key
         self.max_results = max_results
+        self.cache = cache
         self._sync_client: Optional[TavilyClient] = None
         self._async_client: Optional[AsyncTavilyClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
         
         logger.info(f"TavilySearchTool initialized with max_results={max_results}")
     
@@ -47,9 +426,23 @@ class TavilySearchTool:
     
     @property
     def async_client(self) -> AsyncTavilyClient:
-        """Lazy initialization of async client."""
-        if self._async_client is None:
+        """
+        Lazy initialization of async client.
+        
+        The client keeps an HTTP connection pool bound to the event loop
+        it was first used on, so a new client is created when called from
+        a different loop (e.g. successive ``asyncio.run`` calls).
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if self._async_client is None or (
+            loop is not None and loop is not self._async_client_loop
+        ):
             self._async_client = AsyncTavilyClient(api_key=self.api_key)
+            self._async_client_loop = loop
         return self._async_client
     
     def search(
@@ -61,6 +454,7 @@ class TavilySearchTool:
         include_answer: bool = True,
         include_raw_content: bool = False,
         max_results: Optional[int] = None,
+        cache_kind: str = "search",
     ) -> ResearchData:
         """
         Perform a synchronous search using Tavily.
@@ -73,6 +467,7 @@ class TavilySearchTool:
             include_answer: Whether to include AI-generated answer
             include_raw_content: Whether to include full page content
             max_results: Override default max results
+            cache_kind: TTL class used when caching the response
             
         Returns:
             ResearchData with search results and metadata
@@ -80,7 +475,7 @@ class TavilySearchTool:
         logger.info(f"Searching for: '{query}' (depth: {search_depth})")
         
         try:
-            results = self.sync_client.search(
+            results = self._cached_search(cache_kind, dict(
                 query=query,
                 search_depth=search_depth,
                 include_domains=include_domains or [],
@@ -88,7 +483,7 @@ class TavilySearchTool:
                 include_answer=include_answer,
                 include_raw_content=include_raw_content,
                 max_results=max_results or self.max_results,
-            )
+            ))
             
             return self._process_results(query, results)
             
@@ -111,6 +506,7 @@ class TavilySearchTool:
         include_answer: bool = True,
         include_raw_content: bool = False,
         max_results: Optional[int] = None,
+        cache_kind: str = "search",
     ) -> ResearchData:
         """
         Perform an asynchronous search using Tavily.
@@ -123,6 +519,7 @@ class TavilySearchTool:
             include_answer: Whether to include AI-generated answer
             include_raw_content: Whether to include full page content
             max_results: Override default max results
+            cache_kind: TTL class used when caching the response
             
         Returns:
             ResearchData with search results and metadata
@@ -130,7 +527,7 @@ class TavilySearchTool:
         logger.info(f"Async searching for: '{query}' (depth: {search_depth})")
         
         try:
-            results = await self.async_client.search(
+            results = await self._acached_search(cache_kind, dict(
                 query=query,
                 search_depth=search_depth,
                 include_domains=include_domains or [],
@@ -138,7 +535,7 @@ class TavilySearchTool:
                 include_answer=include_answer,
                 include_raw_content=include_raw_content,
                 max_results=max_results or self.max_results,
-            )
+            ))
             
             return self._process_results(query, results)
             
@@ -152,6 +549,83 @@ class TavilySearchTool:
                 researcher_notes=f"Error during search: {str(e)}"
             )
     
+    def _cached_search(self, kind: str, params: dict) -> dict:
+        """
+        Run a Tavily search through the result cache.
+        
+        Each call is recorded as a trace span noting cache hits and
+        network calls.
+        
+        Args:
+            kind: Search method name (selects the cache TTL)
+            params: Keyword arguments for TavilyClient.search
+            
+        Returns:
+            Raw Tavily response (cached or fresh)
+        """
+        with trace_span(f"tavily.{kind}", kind="tool", query=params["query"]) as span:
+            if self.cache is not None:
+                key = self.cache.make_key(**params)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    logger.info(f"Search cache hit for: '{params['query']}'")
+                    span.set("cache_hit", True)
+                    return cached
+            
+            span.set("cache_hit", False)
+            span.set("tavily_calls", 1)
+            results = self.sync_client.search(**params)
+            span.set("results", len(results.get("results", [])))
+            
+            if self.cache is not None:
+                self.cache.set(key, results, ttl=self.cache.ttl_for(kind))
+            return results
+    
+    async def _acached_search(self, kind: str, params: dict) -> dict:
+        """
+        Async version of _cached_search.
+        
+        Args:
+            kind: Search method name (selects the cache TTL)
+            params: Keyword arguments for AsyncTavilyClient.search
+            
+        Returns:
+            Raw Tavily response (cached or fresh)
+        """
+        with trace_span(f"tavily.{kind}", kind="tool", query=params["query"]) as span:
+            if self.cache is not None:
+                key = self.cache.make_key(**params)
+                cached = await self.cache.aget(key)
+                if cached is not None:
+                    logger.info(f"Search cache hit for: '{params['query']}'")
+                    span.set("cache_hit", True)
+                    return cached
+            
+            span.set("cache_hit", False)
+            span.set("tavily_calls", 1)
+            results = await self._alimited_search(params)
+            span.set("results", len(results.get("results", [])))
+            
+            if self.cache is not None:
+                await self.cache.aset(key, results, ttl=self.cache.ttl_for(kind))
+            return results
+    
+    async def _alimited_search(self, params: dict) -> dict:
+        """
+        Call the async Tavily client within the process-wide concurrency cap.
+        
+        Args:
+            params: Keyword arguments for AsyncTavilyClient.search
+            
+        Returns:
+            Raw Tavily response
+        """
+        if _search_semaphore is None:
+            return await self.async_client.search(**params)
+        
+        async with _search_semaphore:
+            return await self.async_client.search(**params)
+    
     def _process_results(self, query: str, raw_results: dict) -> ResearchData:
         """
         Process raw Tavily results into structured ResearchData.
@@ -221,14 +695,14 @@ class TavilySearchTool:
         logger.info(f"Searching news for: '{query}' (last {days} days)")
         
         try:
-            results = self.sync_client.search(
+            results = self._cached_search("news", dict(
                 query=query,
                 search_depth="advanced",
                 topic="news",
                 days=days,
                 max_results=max_results or self.max_results,
                 include_answer=True,
-            )
+            ))
             
             return self._process_results(query, results)
             
@@ -242,6 +716,47 @@ class TavilySearchTool:
                 researcher_notes=f"Error during news search: {str(e)}"
             )
     
+    async def asearch_news(
+        self,
+        query: str,
+        days: int = 7,
+        max_results: Optional[int] = None,
+    ) -> ResearchData:
+        """
+        Async version of search_news.
+        
+        Args:
+            query: Search query
+            days: Number of days to look back (default: 7)
+            max_results: Maximum results to return
+            
+        Returns:
+            ResearchData with news-focused results
+        """
+        logger.info(f"Async searching news for: '{query}' (last {days} days)")
+        
+        try:
+            results = await self._acached_search("news", dict(
+                query=query,
+                search_depth="advanced",
+                topic="news",
+                days=days,
+                max_results=max_results or self.max_results,
+                include_answer=True,
+            ))
+            
+            return self._process_results(query, results)
+            
+        except Exception as e:
+            logger.error(f"Async news search failed: {e}")
+            return ResearchData(
+                topic=query,
+                search_results=[],
+                raw_content=f"News search failed: {str(e)}",
+                sources_count=0,
+                researcher_notes=f"Error during news search: {str(e)}"
+            )
+    
     def search_finance(
         self,
         query: str,
@@ -259,28 +774,41 @@ class TavilySearchTool:
         Returns:
             ResearchData with finance-focused results
         """
-        # Trusted financial domains
-        finance_domains = [
-            "reuters.com",
-            "bloomberg.com",
-            "wsj.com",
-            "cnbc.com",
-            "finance.yahoo.com",
-            "marketwatch.com",
-            "seekingalpha.com",
-            "fool.com",
-            "investopedia.com",
-            "barrons.com",
-        ]
-        
         logger.info(f"Searching finance sources for: '{query}'")
         
         return self.search(
             query=query,
             search_depth="advanced",
-            include_domains=finance_domains,
+            include_domains=self.FINANCE_DOMAINS,
+            include_answer=True,
+            max_results=max_results,
+            cache_kind="finance",
+        )
+    
+    async def asearch_finance(
+        self,
+        query: str,
+        max_results: Optional[int] = None,
+    ) -> ResearchData:
+        """
+        Async version of search_finance.
+        
+        Args:
+            query: Search query (e.g., "Tesla stock analysis")
+            max_results: Maximum results to return
+            
+        Returns:
+            ResearchData with finance-focused results
+        """
+        logger.info(f"Async searching finance sources for: '{query}'")
+        
+        return await self.asearch(
+            query=query,
+            search_depth="advanced",
+            include_domains=self.FINANCE_DOMAINS,
             include_answer=True,
             max_results=max_results,
+            cache_kind="finance",
         )
     
     def search_tech(
@@ -298,28 +826,41 @@ class TavilySearchTool:
         Returns:
             ResearchData with tech-focused results
         """
-        # Trusted tech domains
-        tech_domains = [
-            "techcrunch.com",
-            "theverge.com",
-            "wired.com",
-            "arstechnica.com",
-            "venturebeat.com",
-            "thenextweb.com",
-            "zdnet.com",
-            "cnet.com",
-            "engadget.com",
-            "mit.edu",
-        ]
-        
         logger.info(f"Searching tech sources for: '{query}'")
         
         return self.search(
             query=query,
             search_depth="advanced",
-            include_domains=tech_domains,
+            include_domains=self.TECH_DOMAINS,
+            include_answer=True,
+            max_results=max_results,
+            cache_kind="tech",
+        )
+    
+    async def asearch_tech(
+        self,
+        query: str,
+        max_results: Optional[int] = None,
+    ) -> ResearchData:
+        """
+        Async version of search_tech.
+        
+        Args:
+            query: Search query (e.g., "AI trends 2026")
+            max_results: Maximum results to return
+            
+        Returns:
+            ResearchData with tech-focused results
+        """
+        logger.info(f"Async searching tech sources for: '{query}'")
+        
+        return await self.asearch(
+            query=query,
+            search_depth="advanced",
+            include_domains=self.TECH_DOMAINS,
             include_answer=True,
             max_results=max_results,
+            cache_kind="tech",
         )
 
 
@@ -327,18 +868,23 @@ class TavilySearchTool:
 # Factory Function
 # =============================================================================
 
-def create_tavily_tool(api_key: str, max_results: int = 5) -> TavilySearchTool:
+def create_tavily_tool(
+    api_key: str,
+    max_results: int = 5,
+    cache: Optional[SearchCache] = None,
+) -> TavilySearchTool:
     """
     Factory function to create a configured TavilySearchTool.
     
     Args:
         api_key: Tavily API key
         max_results: Maximum search results
+        cache: Result cache (optional)
         
     Returns:
         Configured TavilySearchTool instance
     """
-    return TavilySearchTool(api_key=api_key, max_results=max_results)
+    return TavilySearchTool(api_key=api_key, max_results=max_results, cache=cache)
 
 
 # =============================================================================
@@ -376,6 +922,9 @@ def get_tavily_langchain_tool(api_key: str):
 
 
 __all__ = [
+    "SearchCache",
+    "get_shared_search_cache",
+    "set_search_concurrency",
     "TavilySearchTool",
     "create_tavily_tool",
     "get_tavily_langchain_tool",
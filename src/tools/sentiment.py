@@ -0,0 +1,361 @@
+"""
+Lexicon-based sentiment engine for the Multi-Agent Virtual Company.
+
+Sentiment terms and multi-word phrases ("beat expectations",
+"guidance cut") are weighted and grouped into pluggable lexicons
+(general, finance, tech). A SentimentEngine compiles the union of its
+lexicons into a single regex, built from a character trie so that
+alternatives share prefixes, and counts every weighted hit in one
+linear pass over the text. Phrases win over the single words they
+contain, so "guidance cut" is counted once, not as "cut" as well.
+
+Engines are cached per lexicon combination, so the regex is compiled
+once per process.
+"""
+
+import re
+import functools
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable
+
+
+# =============================================================================
+# Lexicons
+# =============================================================================
+
+@dataclass(frozen=True)
+class Lexicon:
+    """
+    A named set of weighted sentiment terms.
+
+    Attributes:
+        name: Lexicon name used to select it
+        weights: Lowercase term or phrase -> weight (positive or negative)
+    """
+
+    name: str
+    weights: dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_words(
+        cls,
+        name: str,
+        positive: Iterable[str],
+        negative: Iterable[str],
+        weight: float = 1.0,
+    ) -> "Lexicon":
+        """
+        Build a lexicon giving every positive/negative term the same weight.
+
+        Args:
+            name: Lexicon name
+            positive: Positive terms
+            negative: Negative terms
+            weight: Absolute weight of each term
+
+        Returns:
+            Lexicon
+        """
+        weights = {term: weight for term in positive}
+        weights.update({term: -weight for term in negative})
+        return cls(name=name, weights=weights)
+
+
+# Single-word indicators, the original TextAnalyzer vocabulary
+GENERAL_POSITIVE_WORDS = frozenset({
+    "growth", "increase", "profit", "gain", "positive", "strong", "bullish",
+    "surge", "rise", "up", "boom", "success", "successful", "opportunity",
+    "opportunities", "improve", "improved", "improving", "beat", "exceed",
+    "exceeded", "outperform", "rally", "breakthrough", "innovation", "leading",
+    "best", "record", "high", "higher", "optimistic", "confident", "promising",
+})
+
+GENERAL_NEGATIVE_WORDS = frozenset({
+    "decline", "decrease", "loss", "drop", "negative", "weak", "bearish",
+    "fall", "down", "crash", "failure", "failed", "risk", "risks", "concern",
+    "concerns", "worried", "worry", "miss", "missed", "underperform", "sell",
+    "selloff", "worst", "low", "lower", "pessimistic", "uncertain", "warning",
+    "layoff", "layoffs", "cut", "cuts", "lawsuit", "investigation", "debt",
+})
+
+GENERAL_LEXICON = Lexicon.from_words("general", GENERAL_POSITIVE_WORDS, GENERAL_NEGATIVE_WORDS)
+
+FINANCE_LEXICON = Lexicon("finance", {
+    "beat expectations": 2.0,
+    "beat estimates": 2.0,
+    "topped estimates": 2.0,
+    "raised guidance": 2.0,
+    "raises guidance": 2.0,
+    "guidance raised": 2.0,
+    "record revenue": 1.5,
+    "margin expansion": 1.5,
+    "price target raised": 1.5,
+    "dividend increase": 1.5,
+    "upgrade": 1.5,
+    "upgraded": 1.5,
+    "overweight": 1.0,
+    "buyback": 1.0,
+    "share repurchase": 1.0,
+    "missed expectations": -2.0,
+    "missed estimates": -2.0,
+    "guidance cut": -2.0,
+    "cut guidance": -2.0,
+    "lowered guidance": -2.0,
+    "profit warning": -2.0,
+    "dividend cut": -2.0,
+    "margin compression": -1.5,
+    "price target cut": -1.5,
+    "downgrade": -1.5,
+    "downgraded": -1.5,
+    "underweight": -1.0,
+    "short seller": -1.0,
+    "sec investigation": -2.0,
+    "debt default": -2.0,
+    "bankruptcy": -2.5,
+})
+
+TECH_LEXICON = Lexicon("tech", {
+    "product launch": 1.0,
+    "partnership": 1.0,
+    "adoption": 1.0,
+    "market share gains": 1.5,
+    "state of the art": 1.0,
+    "data breach": -2.0,
+    "security breach": -2.0,
+    "vulnerability": -1.0,
+    "outage": -1.5,
+    "product recall": -1.5,
+    "antitrust": -1.5,
+    "export controls": -1.0,
+    "chip shortage": -1.5,
+    "shortage": -1.0,
+    "delayed": -1.0,
+})
+
+_LEXICONS: dict[str, Lexicon] = {
+    lexicon.name: lexicon
+    for lexicon in (GENERAL_LEXICON, FINANCE_LEXICON, TECH_LEXICON)
+}
+
+# Lexicons used when none are specified
+DEFAULT_LEXICONS = ("general", "finance", "tech")
+
+
+def register_lexicon(lexicon: Lexicon):
+    """
+    Add or replace a lexicon that engines can be built from.
+
+    Args:
+        lexicon: Lexicon to register
+    """
+    _LEXICONS[lexicon.name] = lexicon
+    get_sentiment_engine.cache_clear()
+
+
+def get_lexicon(name: str) -> Lexicon:
+    """
+    Look up a registered lexicon.
+
+    Args:
+        name: Lexicon name
+
+    Returns:
+        The lexicon
+
+    Raises:
+        KeyError: If no lexicon has that name
+    """
+    try:
+        return _LEXICONS[name]
+    except KeyError:
+        raise KeyError(f"Unknown sentiment lexicon '{name}' (have: {', '.join(_LEXICONS)})")
+
+
+# =============================================================================
+# Pattern Compilation
+# =============================================================================
+
+def _build_trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Build a regex alternation for `terms` from a character trie.
+
+    Shared prefixes are factored out (e.g. "risk|risks" becomes
+    "risks?"), which keeps the regex engine from re-testing the same
+    characters once per alternative. Longer alternatives are tried
+    first, so phrases win over their leading words.
+
+    Args:
+        terms: Lowercase terms and phrases
+
+    Returns:
+        Regex source (without word boundaries)
+    """
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        is_end = "" in node
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if is_end else group
+
+    return build(trie)
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+
+@dataclass
+class SentimentResult:
+    """
+    Weighted sentiment of a text.
+
+    Attributes:
+        score: (positive - negative) / (positive + negative), from -1 to 1
+        label: bullish, bearish, neutral or mixed
+        positive: Total positive weight
+        negative: Total negative weight (as a positive number)
+        hits: Matched term/phrase -> occurrences
+    """
+
+    score: float
+    label: str
+    positive: float
+    negative: float
+    hits: Counter
+
+
+class SentimentEngine:
+    """
+    Counts weighted lexicon hits in one regex pass.
+
+    Build engines with get_sentiment_engine so the compiled pattern is
+    shared.
+    """
+
+    # |score| above which the dominant side sets the label
+    STRONG_THRESHOLD = 0.3
+
+    # Distinct terms needed on each side for a balanced text to be "mixed"
+    MIXED_MIN_TERMS = 3
+
+    def __init__(self, lexicons: Iterable[Lexicon]):
+        """
+        Compile the engine.
+
+        Args:
+            lexicons: Lexicons to merge (later ones override earlier weights)
+        """
+        self.lexicons = tuple(lexicons)
+        self.weights: dict[str, float] = {}
+        for lexicon in self.lexicons:
+            self.weights.update({
+                " ".join(term.lower().split()): weight
+                for term, weight in lexicon.weights.items()
+            })
+
+        self.pattern = re.compile(r"\b" + _build_trie_pattern(self.weights) + r"\b")
+
+    def count(self, text: str) -> Counter:
+        """
+        Count lexicon hits in text.
+
+        Args:
+            text: Text to scan (any case)
+
+        Returns:
+            Normalized term/phrase -> occurrences
+        """
+        if not text or not self.weights:
+            return Counter()
+
+        raw = Counter(self.pattern.findall(text.lower()))
+
+        hits = Counter()
+        for match, count in raw.items():
+            # Phrases may span newlines or repeated spaces
+            key = match if match in self.weights else " ".join(match.split())
+            hits[key] += count
+        return hits
+
+    def score(self, text: str) -> SentimentResult:
+        """
+        Score the sentiment of text.
+
+        Args:
+            text: Text to score
+
+        Returns:
+            SentimentResult
+        """
+        hits = self.count(text)
+
+        positive = negative = 0.0
+        positive_terms = negative_terms = 0
+        for term, count in hits.items():
+            weight = self.weights[term]
+            if weight > 0:
+                positive += weight * count
+                positive_terms += 1
+            elif weight < 0:
+                negative -= weight * count
+                negative_terms += 1
+
+        total = positive + negative
+        if total == 0:
+            return SentimentResult(0.0, "neutral", 0.0, 0.0, hits)
+
+        score = (positive - negative) / total
+
+        if score > self.STRONG_THRESHOLD:
+            label = "bullish"
+        elif score < -self.STRONG_THRESHOLD:
+            label = "bearish"
+        elif positive_terms >= self.MIXED_MIN_TERMS and negative_terms >= self.MIXED_MIN_TERMS:
+            label = "mixed"
+        else:
+            label = "neutral"
+
+        return SentimentResult(round(score, 3), label, positive, negative, hits)
+
+
+@functools.lru_cache(maxsize=None)
+def get_sentiment_engine(*names: str) -> SentimentEngine:
+    """
+    Get the shared engine for a combination of lexicons.
+
+    Args:
+        *names: Registered lexicon names (defaults to DEFAULT_LEXICONS)
+
+    Returns:
+        Compiled SentimentEngine
+    """
+    return SentimentEngine(get_lexicon(name) for name in (names or DEFAULT_LEXICONS))
+
+
+__all__ = [
+    "Lexicon",
+    "SentimentResult",
+    "SentimentEngine",
+    "GENERAL_LEXICON",
+    "FINANCE_LEXICON",
+    "TECH_LEXICON",
+    "DEFAULT_LEXICONS",
+    "register_lexicon",
+    "get_lexicon",
+    "get_sentiment_engine",
+]
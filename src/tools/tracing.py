@@ -0,0 +1,369 @@
+"""
+Lightweight tracing for the Multi-Agent Virtual Company.
+
+Records a tree of timed spans for every workflow run so it is possible
+to see where the minutes go per report:
+
+- node spans for each graph node
+- llm spans for each agent LLM call (queue wait, prompt/completion tokens)
+- tool spans for Tavily searches (cache hits, network calls)
+- fetch spans for WebScraper downloads (bytes received)
+
+The active trace and span live in contextvars, so spans opened in
+threads or asyncio tasks started within a traced block nest correctly.
+Outside a trace every helper is a cheap no-op.
+
+Traces export to plain JSON or to the OpenTelemetry OTLP/JSON layout.
+"""
+
+import json
+import time
+import uuid
+import secrets
+import threading
+import contextlib
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+
+# Numeric span attributes rolled up in Trace.summary()
+SUMMARY_ATTRIBUTES = (
+    "queue_wait_seconds",
+    "input_tokens",
+    "output_tokens",
+    "total_tokens",
+    "tavily_calls",
+    "bytes",
+)
+
+
+# =============================================================================
+# Spans
+# =============================================================================
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: dict = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+
+    def set(self, key: str, value: Any):
+        """Set an attribute."""
+        self.attributes[key] = value
+
+    def add(self, key: str, amount: float = 1):
+        """Increment a numeric attribute."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def end(self, error: Optional[BaseException] = None):
+        """
+        Finish the span.
+
+        Args:
+            error: Exception that ended the span, if any
+        """
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+        if error is not None:
+            self.status = "error"
+            self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def duration(self) -> float:
+        """Span duration in seconds (up to now if still open)."""
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def to_dict(self) -> dict:
+        """Export the span as a plain dictionary."""
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration": round(self.duration, 6),
+            "attributes": dict(self.attributes),
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stand-in used when no trace is active."""
+
+    def set(self, key: str, value: Any):
+        pass
+
+    def add(self, key: str, amount: float = 1):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otel_attribute(key: str, value: Any) -> dict:
+    """Encode one attribute as an OTLP key/value pair."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+# =============================================================================
+# Traces
+# =============================================================================
+
+class Trace:
+    """All spans recorded for one workflow run."""
+
+    def __init__(self, name: str, attributes: Optional[dict] = None):
+        """
+        Initialize the trace.
+
+        Args:
+            name: Trace name (e.g. "workflow")
+            attributes: Attributes for the root span
+        """
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        self.root = self.start_span(name, "workflow", parent=None, attributes=attributes)
+
+    def start_span(
+        self,
+        name: str,
+        kind: str,
+        parent: Optional[Span],
+        attributes: Optional[dict] = None,
+    ) -> Span:
+        """
+        Open a span in this trace.
+
+        Args:
+            name: Span name
+            kind: Span category (workflow, node, llm, tool, fetch)
+            parent: Parent span, if any
+            attributes: Initial attributes
+
+        Returns:
+            The new span
+        """
+        span = Span(
+            name=name,
+            kind=kind,
+            trace_id=self.trace_id,
+            parent_id=parent.span_id if parent else None,
+            attributes=dict(attributes or {}),
+        )
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def summary(self) -> dict:
+        """
+        Roll spans up by kind and name.
+
+        Returns:
+            Mapping of "kind:name" to count, total seconds and summed
+            numeric attributes
+        """
+        totals: dict[str, dict] = {}
+
+        with self._lock:
+            spans = list(self.spans)
+
+        for span in spans:
+            if span is self.root:
+                continue
+            entry = totals.setdefault(f"{span.kind}:{span.name}", {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += span.duration
+            for key in SUMMARY_ATTRIBUTES:
+                value = span.attributes.get(key)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    entry[key] = entry.get(key, 0) + value
+
+        return totals
+
+    def to_dict(self) -> dict:
+        """Export the trace as a plain dictionary."""
+        with self._lock:
+            spans = [span.to_dict() for span in self.spans]
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "duration": round(self.root.duration, 6),
+            "spans": spans,
+            "summary": self.summary(),
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Export the trace as a JSON string."""
+        return json.dumps(self.to_dict(), indent=indent, default=str)
+
+    def to_otel(self, service_name: str = "multi-agent-research") -> dict:
+        """
+        Export the trace in the OTLP/JSON layout.
+
+        Args:
+            service_name: Value of the service.name resource attribute
+
+        Returns:
+            OTLP ExportTraceServiceRequest as a dictionary
+        """
+        return trace_to_otel(self.to_dict(), service_name)
+
+
+def trace_to_otel(trace: dict, service_name: str = "multi-agent-research") -> dict:
+    """
+    Convert an exported trace (Trace.to_dict) to the OTLP/JSON layout.
+
+    The result can be POSTed to an OpenTelemetry collector's /v1/traces
+    endpoint. Works on the dictionaries stored in GraphState["trace"].
+
+    Args:
+        trace: Trace dictionary
+        service_name: Value of the service.name resource attribute
+
+    Returns:
+        OTLP ExportTraceServiceRequest as a dictionary
+    """
+    spans = []
+    for span in trace["spans"]:
+        otel_span = {
+            "traceId": span["trace_id"],
+            "spanId": span["span_id"],
+            "name": span["name"],
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span["start_ns"]),
+            "endTimeUnixNano": str(span["end_ns"] or span["start_ns"]),
+            "attributes": [
+                _otel_attribute("span.kind", span["kind"]),
+                *(_otel_attribute(key, value) for key, value in span["attributes"].items()),
+            ],
+            "status": {"code": 2 if span["status"] == "error" else 1},
+        }
+        if span["parent_id"]:
+            otel_span["parentSpanId"] = span["parent_id"]
+        if span["error"]:
+            otel_span["status"]["message"] = span["error"]
+        spans.append(otel_span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {
+                "attributes": [_otel_attribute("service.name", service_name)],
+            },
+            "scopeSpans": [{
+                "scope": {"name": "src.tools.tracing"},
+                "spans": spans,
+            }],
+        }],
+    }
+
+
+# =============================================================================
+# Context Helpers
+# =============================================================================
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def get_current_trace() -> Optional[Trace]:
+    """Get the trace active in this context, if any."""
+    return _current_trace.get()
+
+
+def current_span():
+    """Get the span active in this context (a no-op span if none)."""
+    return _current_span.get() or NOOP_SPAN
+
+
+@contextlib.contextmanager
+def start_trace(name: str = "workflow", **attributes) -> Iterator[Trace]:
+    """
+    Record a new trace for the enclosed block.
+
+    Args:
+        name: Trace name
+        **attributes: Attributes for the root span
+
+    Yields:
+        The active Trace
+    """
+    trace = Trace(name, attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(trace.root)
+    try:
+        yield trace
+    except BaseException as e:
+        trace.root.end(e)
+        raise
+    finally:
+        trace.root.end()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+
+@contextlib.contextmanager
+def trace_span(name: str, kind: str = "internal", **attributes):
+    """
+    Record a span for the enclosed block within the active trace.
+
+    Does nothing (yields a no-op span) when no trace is active.
+
+    Args:
+        name: Span name
+        kind: Span category (node, llm, tool, fetch, ...)
+        **attributes: Initial attributes
+
+    Yields:
+        The active span
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield NOOP_SPAN
+        return
+
+    span = trace.start_span(name, kind, parent=_current_span.get(), attributes=attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.end(e)
+        raise
+    finally:
+        span.end()
+        _current_span.reset(token)
+
+
+__all__ = [
+    "Span",
+    "Trace",
+    "NOOP_SPAN",
+    "start_trace",
+    "trace_span",
+    "current_span",
+    "get_current_trace",
+    "trace_to_otel",
+]
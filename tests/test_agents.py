@@ -0,0 +1,1162 @@
+"""
+Unit tests for agent behaviour that does not require live API calls.
+
+External services (Groq, Tavily) are replaced with in-process fakes.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# =============================================================================
+# Test Fixtures
+# =============================================================================
+
+def make_research_data(query: str, urls: list[str]):
+    """Build a ResearchData with one result per URL."""
+    from src.schemas.models import ResearchData, SearchResult
+    
+    return ResearchData(
+        topic=query,
+        search_results=[
+            SearchResult(title=f"Result {url}", url=url, content=f"Content for {query}")
+            for url in urls
+        ],
+        sources_count=len(urls),
+    )
+
+
+@pytest.fixture
+def researcher():
+    """ResearcherAgent with LLM calls stubbed out."""
+    from src.agents.researcher import ResearcherAgent
+    
+    agent = ResearcherAgent(api_key="test-groq-key", tavily_api_key="test-tavily-key")
+    agent._generate_search_queries = lambda topic: ["query one", "query two", "query three"]
+    agent._generate_research_notes = lambda topic, results: "notes"
+    
+    # Async variants follow the sync stubs (tests may replace those)
+    async def agenerate_search_queries(topic):
+        return agent._generate_search_queries(topic)
+    
+    async def agenerate_research_notes(topic, results):
+        return agent._generate_research_notes(topic, results)
+    
+    agent._agenerate_search_queries = agenerate_search_queries
+    agent._agenerate_research_notes = agenerate_research_notes
+    return agent
+
+
+# =============================================================================
+# LLM Client Pool Tests
+# =============================================================================
+
+class TestLLMClientPool:
+    """Tests for the shared LLM client pool."""
+    
+    def test_views_share_client_with_own_settings(self):
+        """Agents with one key/model share a client but keep their settings."""
+        from src.agents.llm_pool import LLMClientPool
+        
+        pool = LLMClientPool()
+        creative = pool.get("key", "model-a", temperature=0.7, max_tokens=4096)
+        strict = pool.get("key", "model-a", temperature=0.0, max_tokens=1024)
+        
+        assert creative.client is strict.client
+        assert creative.http_client is strict.http_client
+        assert creative.temperature == 0.7
+        assert strict.temperature == pytest.approx(0.0, abs=1e-6)
+        assert strict.max_tokens == 1024
+        assert pool.stats() == {"clients": 1, "created": 1}
+        
+        other = pool.get("key", "model-b")
+        assert other.client is not creative.client
+        assert len(pool) == 2
+    
+    def test_pool_survives_registry_reset(self):
+        """Agents created after a registry reset reuse pooled clients."""
+        from src.agents.llm_pool import get_llm_pool
+        from src.graph.nodes import AgentRegistry
+        
+        AgentRegistry.reset()
+        first = AgentRegistry.get_instance("pool-key", "tavily-key").get_analyst()
+        AgentRegistry.reset()
+        second = AgentRegistry.get_instance("pool-key", "tavily-key").get_critic()
+        AgentRegistry.reset()
+        
+        assert first.llm.client is second.llm.client
+        assert first.llm.temperature != second.llm.temperature
+        assert get_llm_pool().get_base("pool-key", first.model_name).client is first.llm.client
+    
+    def test_custom_factory(self):
+        """A custom factory replaces Groq clients in the pool."""
+        from src.agents.llm_pool import LLMClientPool
+        
+        built = []
+        
+        def factory(api_key, model_name):
+            from langchain_core.language_models.fake_chat_models import FakeListChatModel
+            built.append((api_key, model_name))
+            return FakeListChatModel(responses=["hello"])
+        
+        pool = LLMClientPool(factory)
+        llm = pool.get("key", "model", temperature=0.2)
+        pool.get("key", "model", temperature=0.9)
+        
+        assert llm.invoke("hi").content == "hello"
+        assert built == [("key", "model")]
+    
+    def test_async_client_survives_new_event_loops(self):
+        """Runs on successive event loops each get working keep-alive connections."""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from src.agents.llm_pool import create_groq_client
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+            
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        client = create_groq_client("key", "model").http_async_client
+        
+        async def fetch():
+            return (await client.get(url)).text
+        
+        try:
+            assert [asyncio.run(fetch()) for _ in range(3)] == ["ok", "ok", "ok"]
+            assert len(client._transport) <= 1
+        finally:
+            server.shutdown()
+
+
+# =============================================================================
+# LLM Response Cache Tests
+# =============================================================================
+
+class TestLLMResponseCache:
+    """Tests for the opt-in LLM response cache."""
+    
+    def test_exact_hit_and_temperature_bypass(self):
+        """Zero-temperature calls are cached; sampled calls bypass unless allowed."""
+        from src.agents.llm_cache import LLMResponseCache
+        
+        cache = LLMResponseCache()
+        cache.set("model", 0.0, "system", "route this", "researcher")
+        
+        assert cache.get("model", 0.0, "system", "route this") == "researcher"
+        assert cache.get("model", 0.0, "other system", "route this") is None
+        
+        cache.set("model", 0.7, "system", "write", "draft")
+        assert cache.get("model", 0.7, "system", "write") is None
+        
+        cache.set("model", 0.7, "system", "write", "draft", allow_cached=True)
+        assert cache.get("model", 0.7, "system", "write", allow_cached=True) == "draft"
+        
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["bypassed"] == 1
+    
+    def test_ttl_and_lru_eviction(self):
+        """Entries expire after the TTL and the oldest are evicted first."""
+        from src.agents.llm_cache import LLMResponseCache
+        
+        expired = LLMResponseCache(ttl=-1)
+        expired.set("m", 0.0, "s", "u", "r")
+        assert expired.get("m", 0.0, "s", "u") is None
+        
+        cache = LLMResponseCache(max_entries=2)
+        for name in ["a", "b"]:
+            cache.set("m", 0.0, "s", name, name.upper())
+        cache.get("m", 0.0, "s", "a")
+        cache.set("m", 0.0, "s", "c", "C")
+        
+        assert cache.get("m", 0.0, "s", "a") == "A"
+        assert cache.get("m", 0.0, "s", "b") is None
+    
+    def test_semantic_tier(self):
+        """Near-identical prompts hit through the embedding tier."""
+        from src.agents.llm_cache import LLMResponseCache
+        
+        def embed(text):
+            return [text.count("nvidia"), text.count("earnings"), text.count("weather")]
+        
+        cache = LLMResponseCache(embed_fn=embed, similarity_threshold=0.9)
+        cache.set("m", 0.0, "s", "nvidia earnings outlook", "queries")
+        
+        assert cache.get("m", 0.0, "s", "outlook for nvidia earnings") == "queries"
+        assert cache.get("m", 0.0, "s", "weather report") is None
+        assert cache.stats()["semantic_hits"] == 1
+    
+    def test_agent_reuses_cached_routing(self):
+        """The supervisor answers a repeated routing prompt without the LLM."""
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+        from src.agents.llm_cache import enable_response_cache, disable_response_cache
+        from src.agents.supervisor import SupervisorAgent
+        
+        llm = FakeListChatModel(responses=["first", "second"])
+        agent = SupervisorAgent(api_key="test-key")
+        agent.llm = llm
+        
+        enable_response_cache()
+        try:
+            assert agent.invoke_llm("route", allow_cached=True) == "first"
+            assert agent.invoke_llm("route", allow_cached=True) == "first"
+            assert agent.invoke_llm("route") == "second"
+        finally:
+            disable_response_cache()
+
+
+# =============================================================================
+# Report Streaming Tests
+# =============================================================================
+
+class TestReportStreaming:
+    """Tests for streaming report generation in the writer."""
+    
+    def test_decoder_renders_json_incrementally(self):
+        """JSON report output is decoded to markdown regardless of chunking."""
+        import json
+        from src.agents.writer import ReportStreamDecoder
+        
+        raw = "```json\n" + json.dumps({
+            "title": "AI \"Agents\"",
+            "executive_summary": "Line one\nLine two",
+            "sections": [{"title": "Overview", "content": "Body"}],
+            "key_takeaways": ["First"],
+            "confidence_score": 0.8,
+        }) + "\n```"
+        expected = (
+            '# AI "Agents"\n\n'
+            "## Executive Summary\n\nLine one\nLine two\n\n"
+            "## Overview\n\nBody\n\n"
+            "## Key Takeaways\n\n- First\n\n"
+        )
+        
+        for size in [1, 5, len(raw)]:
+            decoder = ReportStreamDecoder()
+            chunks = [raw[i:i + size] for i in range(0, len(raw), size)]
+            assert "".join(decoder.feed(chunk) for chunk in chunks) == expected
+    
+    def test_decoder_passes_plain_text_through(self):
+        """Non-JSON output is streamed unchanged."""
+        from src.agents.writer import ReportStreamDecoder
+        
+        decoder = ReportStreamDecoder()
+        
+        assert decoder.feed("# Report") + decoder.feed(" body") == "# Report body"
+    
+    def test_writer_streams_report(self, sample_analysis):
+        """aprocess with on_token streams text and still builds the report."""
+        import json
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+        from src.agents.writer import WriterAgent
+        
+        response = json.dumps({
+            "title": "AI Trends Report",
+            "executive_summary": "AI is growing.",
+            "sections": [{"title": "Overview", "content": "Details"}],
+        })
+        writer = WriterAgent(api_key="test-key")
+        writer.llm = FakeListChatModel(responses=[response])
+        
+        chunks = []
+        state = asyncio.run(writer.aprocess(
+            {"analysis_summary": sample_analysis},
+            on_token=chunks.append,
+        ))
+        
+        assert len(chunks) > 1
+        assert "".join(chunks).startswith("# AI Trends Report")
+        assert state["final_report"].title == "AI Trends Report"
+    
+    def test_stream_retried_only_before_first_token(self, monkeypatch):
+        """Failures before output are retried; mid-stream failures are not replayed."""
+        from langchain_core.messages import AIMessageChunk
+        from src.agents import rate_limit
+        from src.agents.writer import WriterAgent
+        
+        class APIConnectionError(Exception):
+            pass
+        
+        class FlakyStream:
+            def __init__(self, fail_after):
+                self.fail_after = list(fail_after)
+                self.attempts = 0
+            
+            async def astream(self, messages):
+                self.attempts += 1
+                fail_after = self.fail_after.pop(0) if self.fail_after else None
+                for index, text in enumerate(["Hello", " world"]):
+                    if index == fail_after:
+                        raise APIConnectionError("connection reset")
+                    yield AIMessageChunk(content=text)
+        
+        monkeypatch.setattr(rate_limit, "_rate_limiter", rate_limit.LLMRateLimiter(
+            requests_per_minute=0, base_backoff=0.01,
+        ))
+        writer = WriterAgent(api_key="test-key")
+        
+        writer.llm = FlakyStream(fail_after=[0])
+        chunks = []
+        assert asyncio.run(writer.astream_llm("Write", on_token=chunks.append)) == "Hello world"
+        assert chunks == ["Hello", " world"]
+        assert writer.llm.attempts == 2
+        
+        writer.llm = FlakyStream(fail_after=[1])
+        chunks = []
+        with pytest.raises(APIConnectionError):
+            asyncio.run(writer.astream_llm("Write", on_token=chunks.append))
+        assert chunks == ["Hello"]
+        assert writer.llm.attempts == 1
+
+
+# =============================================================================
+# Rate Limiter Tests
+# =============================================================================
+
+class FakeRateLimitError(Exception):
+    """Stand-in for groq.RateLimitError with a Retry-After header."""
+    
+    def __init__(self, retry_after: str = "0"):
+        super().__init__("rate limited")
+        self.status_code = 429
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after}})()
+
+
+class FakeResponse:
+    """LLM response carrying usage metadata."""
+    
+    def __init__(self, total_tokens: int):
+        self.content = "ok"
+        self.usage_metadata = {"total_tokens": total_tokens}
+
+
+class TestRateLimiter:
+    """Tests for the shared Groq rate limiter."""
+    
+    def test_token_bucket_reports_wait_when_empty(self):
+        """Reservations beyond the balance return the refill delay."""
+        from src.agents.rate_limit import TokenBucket
+        
+        bucket = TokenBucket.per_minute(60)
+        
+        assert bucket.reserve(60) == 0.0
+        assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    
+    def test_throttle_retries_and_halves_concurrency(self):
+        """A 429 is retried and the adaptive limit is halved once."""
+        from src.agents.rate_limit import LLMRateLimiter
+        
+        limiter = LLMRateLimiter(requests_per_minute=None, max_concurrency=8)
+        attempts = []
+        
+        def call():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise FakeRateLimitError()
+            return FakeResponse(100)
+        
+        assert limiter.call(call).content == "ok"
+        
+        metrics = limiter.metrics()
+        assert metrics["throttled"] == 2
+        assert metrics["retries"] == 2
+        assert metrics["concurrency_limit"] == 4
+    
+    def test_non_retryable_errors_are_raised(self):
+        """Errors that are not throttling or transient propagate immediately."""
+        from src.agents.rate_limit import LLMRateLimiter
+        
+        limiter = LLMRateLimiter(requests_per_minute=None)
+        
+        def call():
+            raise ValueError("bad request")
+        
+        with pytest.raises(ValueError):
+            limiter.call(call)
+        assert limiter.metrics()["failures"] == 1
+    
+    def test_token_usage_is_reconciled(self):
+        """Over-estimated tokens are returned to the TPM bucket."""
+        from src.agents.rate_limit import LLMRateLimiter
+        
+        limiter = LLMRateLimiter(requests_per_minute=None, tokens_per_minute=10_000)
+        limiter.call(lambda: FakeResponse(200), estimated_tokens=2_000)
+        
+        assert limiter.token_bucket.available == pytest.approx(9_800, abs=5)
+        assert limiter.metrics()["actual_tokens"] == 200
+    
+    def test_token_usage_scope(self):
+        """Calls inside track_token_usage are attributed to the scope."""
+        from src.agents.rate_limit import LLMRateLimiter, track_token_usage
+        
+        limiter = LLMRateLimiter(requests_per_minute=None)
+        
+        with track_token_usage() as usage:
+            limiter.call(lambda: FakeResponse(120))
+            limiter.call(lambda: FakeResponse(30))
+        limiter.call(lambda: FakeResponse(500))
+        
+        assert usage.calls == 2
+        assert usage.tokens == 150
+    
+    def test_async_calls_respect_concurrency(self):
+        """No more than the concurrency limit of async calls run at once."""
+        from src.agents.rate_limit import LLMRateLimiter
+        
+        limiter = LLMRateLimiter(requests_per_minute=None, max_concurrency=2)
+        active = []
+        peak = []
+        
+        async def call():
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+            return FakeResponse(10)
+        
+        async def run_all():
+            await asyncio.gather(*(limiter.acall(call) for _ in range(6)))
+        
+        asyncio.run(run_all())
+        
+        assert max(peak) == 2
+        assert limiter.metrics()["successes"] == 6
+
+
+# =============================================================================
+# Researcher Tests
+# =============================================================================
+
+class TestResearcherFanOut:
+    """Tests for concurrent search fan-out in the Researcher agent."""
+    
+    def test_results_merged_in_query_order(self, researcher):
+        """Results are deduplicated in query order, not completion order."""
+        delays = {"query one": 0.05, "query two": 0.0, "query three": 0.02}
+        urls = {
+            "query one": ["https://a.com/1", "https://shared.com/x"],
+            "query two": ["https://shared.com/x", "https://b.com/2"],
+            "query three": ["https://c.com/3"],
+        }
+        
+        async def fake_asearch(query, **kwargs):
+            await asyncio.sleep(delays[query])
+            return make_research_data(query, urls[query])
+        
+        researcher.search_tool.asearch = fake_asearch
+        
+        data = researcher._conduct_research("general topic")
+        
+        assert [r.url for r in data.search_results] == [
+            "https://a.com/1",
+            "https://shared.com/x",
+            "https://b.com/2",
+            "https://c.com/3",
+        ]
+        assert data.sources_count == 4
+    
+    def test_searches_run_concurrently_with_limit(self, researcher):
+        """No more than max_concurrent_searches are in flight at once."""
+        researcher.max_concurrent_searches = 2
+        in_flight = 0
+        peak = 0
+        
+        async def fake_asearch(query, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return make_research_data(query, [f"https://{query.replace(' ', '-')}.com"])
+        
+        researcher.search_tool.asearch = fake_asearch
+        
+        data = researcher._conduct_research("general topic")
+        
+        assert peak == 2
+        assert data.sources_count == 3
+    
+    def test_slow_query_returns_partial_results(self, researcher):
+        """A query past its deadline is dropped instead of blocking the run."""
+        researcher.search_timeout = 0.05
+        
+        async def fake_asearch(query, **kwargs):
+            if query == "query two":
+                await asyncio.sleep(1)
+            return make_research_data(query, [f"https://{query.replace(' ', '-')}.com"])
+        
+        researcher.search_tool.asearch = fake_asearch
+        
+        data = researcher._conduct_research("general topic")
+        
+        assert [r.url for r in data.search_results] == [
+            "https://query-one.com",
+            "https://query-three.com",
+        ]
+    
+    def test_finance_topic_uses_finance_domains(self, researcher):
+        """Domain routing is preserved in concurrent mode."""
+        seen_domains = []
+        
+        async def fake_asearch(query, include_domains=None, **kwargs):
+            seen_domains.append(include_domains)
+            return make_research_data(query, [])
+        
+        researcher.search_tool.asearch = fake_asearch
+        
+        researcher._conduct_research("Tesla stock outlook")
+        
+        assert seen_domains == [researcher.search_tool.FINANCE_DOMAINS] * 3
+
+
+class TestResearcherEnrichment:
+    """Tests for the optional deep-content enrichment stage."""
+    
+    class FakeScraper:
+        """Scraper returning canned pages and recording calls."""
+        
+        def __init__(self, pages: dict):
+            self.pages = pages
+            self.calls = []
+            self.closed = False
+        
+        async def ascrape_multiple(self, urls, max_per_host=None, deadline=None):
+            from src.schemas.models import SearchResult
+            
+            self.calls.append((list(urls), max_per_host, deadline))
+            return [
+                SearchResult(title=url, url=url, content=self.pages[url])
+                for url in urls if url in self.pages
+            ]
+        
+        async def aclose(self):
+            self.closed = True
+    
+    def _search(self, researcher, urls):
+        async def fake_asearch(query, **kwargs):
+            return make_research_data(query, urls if query == "query one" else [])
+        
+        researcher.search_tool.asearch = fake_asearch
+    
+    def test_configured_from_settings(self, monkeypatch):
+        """RESEARCH_ENRICH_* reach the researcher through Settings agent options."""
+        from config.settings import Settings
+        from src.graph.nodes import AgentRegistry
+        
+        monkeypatch.setenv("RESEARCH_ENRICH_TOP_N", "2")
+        monkeypatch.setenv("RESEARCH_ENRICH_MAX_PER_HOST", "1")
+        
+        registry = AgentRegistry("groq-key", "tavily-key", Settings().get_agent_options())
+        researcher = registry.get_researcher()
+        
+        assert researcher.enrich_top_n == 2
+        assert researcher.enrich_max_per_host == 1
+        assert researcher.enrich_timeout == 8.0
+    
+    def test_disabled_by_default(self, researcher):
+        """No pages are scraped unless enrichment is enabled."""
+        scraper = self.FakeScraper({})
+        researcher.scraper = scraper
+        self._search(researcher, ["https://a.com/1"])
+        
+        researcher._conduct_research("general topic")
+        
+        assert researcher.enrich_top_n == 0
+        assert scraper.calls == []
+    
+    def test_replaces_longer_relevant_snippets(self, researcher):
+        """Top-N pages replace snippets only when longer and on topic."""
+        long_page = "A detailed look at the general topic. " * 20
+        scraper = self.FakeScraper({
+            "https://a.com/1": long_page,
+            "https://b.com/2": "Unrelated recipes and gardening tips. " * 20,
+            "https://c.com/3": long_page,
+        })
+        researcher.scraper = scraper
+        researcher.enrich_top_n = 2
+        researcher.enrich_timeout = 3.0
+        self._search(researcher, ["https://a.com/1", "https://b.com/2", "https://c.com/3"])
+        
+        data = researcher._conduct_research("general topic")
+        
+        assert scraper.calls == [(["https://a.com/1", "https://b.com/2"], 2, 3.0)]
+        assert [r.content for r in data.search_results] == [
+            long_page,
+            "Content for query one",
+            "Content for query one",
+        ]
+        assert long_page in data.raw_content
+        assert scraper.closed
+    
+    def test_async_path_enriches(self, researcher):
+        """The async research path runs the same stage."""
+        scraper = self.FakeScraper({"https://a.com/1": "general topic in depth " * 10})
+        researcher.scraper = scraper
+        researcher.enrich_top_n = 1
+        self._search(researcher, ["https://a.com/1"])
+        
+        data = asyncio.run(researcher._async_conduct_research("general topic"))
+        
+        assert data.search_results[0].content.startswith("general topic in depth")
+
+
+class TestResearcherReuse:
+    """Tests for reusing indexed research across related topics."""
+    
+    @pytest.fixture
+    def indexed_researcher(self, researcher):
+        from src.tools.research_index import ResearchIndex
+        
+        queries = {
+            "Tesla risks": ["Tesla risks", "Tesla competition"],
+            "Tesla opportunities": ["Tesla opportunities", "Tesla competition", "Tesla robotaxi"],
+        }
+        researcher._generate_search_queries = lambda topic: queries[topic]
+        researcher.research_index = ResearchIndex()
+        researcher.searched = []
+        
+        async def fake_asearch(query, **kwargs):
+            researcher.searched.append(query)
+            return make_research_data(query, [f"https://{query.replace(' ', '-')}.com"])
+        
+        researcher.search_tool.asearch = fake_asearch
+        return researcher
+    
+    def test_related_topic_searches_only_gaps(self, indexed_researcher):
+        """A reframed topic reuses earlier searches and keeps query order."""
+        indexed_researcher._conduct_research("Tesla risks")
+        indexed_researcher.searched.clear()
+        
+        data = indexed_researcher._conduct_research("Tesla opportunities")
+        
+        assert indexed_researcher.searched == ["Tesla robotaxi"]
+        assert [r.url for r in data.search_results] == [
+            "https://Tesla-risks.com",
+            "https://Tesla-competition.com",
+            "https://Tesla-robotaxi.com",
+        ]
+    
+    def test_async_path_reuses_research(self, indexed_researcher):
+        """The async research path shares the index."""
+        asyncio.run(indexed_researcher._async_conduct_research("Tesla risks"))
+        indexed_researcher.searched.clear()
+        
+        data = asyncio.run(indexed_researcher._async_conduct_research("Tesla opportunities"))
+        
+        assert indexed_researcher.searched == ["Tesla robotaxi"]
+        assert data.sources_count == 3
+
+
+class TestAsyncResearcher:
+    """Tests that the async research path never blocks the event loop."""
+    
+    @staticmethod
+    async def _monitor_loop(lags: list, stop: asyncio.Event, interval: float = 0.005):
+        """Record how late the loop wakes a periodic sleeper."""
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            start = loop.time()
+            await asyncio.sleep(interval)
+            lags.append(loop.time() - start - interval)
+    
+    @pytest.fixture
+    def async_researcher(self):
+        """ResearcherAgent whose sync LLM path would stall the loop."""
+        import time
+        from src.agents.researcher import ResearcherAgent
+        
+        agent = ResearcherAgent(api_key="test-groq-key", tavily_api_key="test-tavily-key")
+        agent.llm_prompts = []
+        
+        def blocking_invoke_llm(prompt, *args, **kwargs):
+            time.sleep(0.2)
+            return "blocked"
+        
+        async def fake_ainvoke_llm(prompt, *args, **kwargs):
+            agent.llm_prompts.append(prompt)
+            await asyncio.sleep(0.02)
+            return "first search query\nsecond search query\nthird search query"
+        
+        async def fake_asearch(query, include_domains=None, **kwargs):
+            await asyncio.sleep(0.02)
+            return make_research_data(query, [f"https://{query.replace(' ', '-')}.com"])
+        
+        agent.invoke_llm = blocking_invoke_llm
+        agent.ainvoke_llm = fake_ainvoke_llm
+        agent.search_tool.asearch = fake_asearch
+        return agent
+    
+    def test_concurrent_runs_do_not_stall_loop(self, async_researcher):
+        """Many researcher runs share one loop without stalls over 50ms."""
+        async def run():
+            lags = []
+            stop = asyncio.Event()
+            monitor = asyncio.create_task(self._monitor_loop(lags, stop))
+            states = await asyncio.gather(*(
+                async_researcher.aprocess({"user_query": f"topic {i}", "messages": []})
+                for i in range(8)
+            ))
+            stop.set()
+            await monitor
+            return states, lags
+        
+        states, lags = asyncio.run(run())
+        
+        assert max(lags) < 0.05
+        assert all(state["research_data"].sources_count == 3 for state in states)
+        assert all(state["research_data"].researcher_notes.startswith("first") for state in states)
+        # Query generation and notes per run, both through ainvoke_llm
+        assert len(async_researcher.llm_prompts) == 16
+    
+    def test_disk_cache_and_index_stay_off_loop(self, tmp_path, monkeypatch):
+        """SQLite-backed search cache and research index do their I/O off the loop."""
+        import time
+        from src.agents.researcher import ResearcherAgent
+        from src.tools.research_index import ResearchIndex
+        from src.tools.search import SearchCache
+        
+        def slowed(method):
+            def wrapper(*args, **kwargs):
+                time.sleep(0.1)
+                return method(*args, **kwargs)
+            return wrapper
+        
+        for cls, names in ((SearchCache, ("get", "set")), (ResearchIndex, ("lookup", "add_many"))):
+            for name in names:
+                monkeypatch.setattr(cls, name, slowed(getattr(cls, name)))
+        
+        class FakeAsyncClient:
+            async def search(self, **params):
+                await asyncio.sleep(0.01)
+                return {"results": [{
+                    "title": params["query"],
+                    "url": f"https://{params['query'].replace(' ', '-')}.com",
+                    "content": "Body text.",
+                    "score": 0.9,
+                }]}
+        
+        agent = ResearcherAgent(
+            api_key="test-groq-key",
+            tavily_api_key="test-tavily-key",
+            search_cache=SearchCache(db_path=tmp_path / "search.db"),
+            research_index=ResearchIndex(db_path=tmp_path / "index.db"),
+            notes_mode="heuristic",
+        )
+        
+        async def fake_ainvoke_llm(prompt, *args, **kwargs):
+            return "first search query\nsecond search query\nthird search query"
+        
+        agent.ainvoke_llm = fake_ainvoke_llm
+        
+        async def run():
+            agent.search_tool._async_client = FakeAsyncClient()
+            agent.search_tool._async_client_loop = asyncio.get_running_loop()
+            lags = []
+            stop = asyncio.Event()
+            monitor = asyncio.create_task(self._monitor_loop(lags, stop))
+            state = await agent.aprocess({"user_query": "solar storage", "messages": []})
+            stop.set()
+            await monitor
+            return state, lags
+        
+        state, lags = asyncio.run(run())
+        
+        assert max(lags) < 0.05
+        assert state["research_data"].sources_count == 3
+        assert agent.research_index.stats["entries"] == 3
+    
+    def test_async_path_routes_by_topic(self, async_researcher):
+        """Finance and tech topics use their domain-specific async searches."""
+        seen_domains = []
+        
+        async def fake_asearch(query, include_domains=None, **kwargs):
+            seen_domains.append(include_domains)
+            return make_research_data(query, [])
+        
+        async_researcher.search_tool.asearch = fake_asearch
+        
+        asyncio.run(async_researcher._async_conduct_research("Tesla stock outlook"))
+        asyncio.run(async_researcher._async_conduct_research("AI chips"))
+        
+        tool = async_researcher.search_tool
+        assert seen_domains == [tool.FINANCE_DOMAINS] * 3 + [tool.TECH_DOMAINS] * 3
+    
+    def test_asearch_news_uses_news_topic(self):
+        """search_news has an async counterpart with the same parameters."""
+        from src.tools.search import TavilySearchTool
+        
+        calls = []
+        
+        class FakeAsyncClient:
+            async def search(self, **params):
+                calls.append(params)
+                return {"results": []}
+        
+        tool = TavilySearchTool(api_key="test-key")
+        tool.cache = None
+        tool._async_client = FakeAsyncClient()
+        
+        async def run():
+            tool._async_client_loop = asyncio.get_running_loop()
+            return await tool.asearch_news("chip export rules", days=3)
+        
+        data = asyncio.run(run())
+        
+        assert calls[0]["topic"] == "news"
+        assert calls[0]["days"] == 3
+        assert data.sources_count == 0
+
+
+class TestResearcherPipeline:
+    """Tests for pipelined search during query generation."""
+    
+    @pytest.fixture
+    def pipelined_researcher(self, researcher):
+        researcher.pipelined_search = True
+        researcher.events = []
+        
+        async def fake_astream_llm(prompt, system_prompt=None, on_token=None):
+            chunks = ["1. Tesla battery ", "supply chain\n", "2. Tesla Stock\n", "3. Tesla robotaxi launch"]
+            for chunk in chunks:
+                await asyncio.sleep(0.02)
+                on_token(chunk)
+            researcher.events.append("generated")
+            return "".join(chunks)
+        
+        async def fake_asearch(query, **kwargs):
+            researcher.events.append(f"search:{query}")
+            await asyncio.sleep(0.01)
+            return make_research_data(query, [f"https://{query.replace(' ', '-')}.com"])
+        
+        researcher.astream_llm = fake_astream_llm
+        researcher.search_tool.asearch = fake_asearch
+        return researcher
+    
+    def test_searches_start_before_generation_ends(self, pipelined_researcher):
+        """The topic and each streamed query are searched before generation finishes."""
+        asyncio.run(pipelined_researcher._async_conduct_research("Tesla stock"))
+        
+        events = pipelined_researcher.events
+        assert events[0] == "search:Tesla stock"
+        assert events.index("search:Tesla battery supply chain") < events.index("generated")
+    
+    def test_near_duplicate_queries_skipped(self, pipelined_researcher):
+        """A generated query matching one in flight is not searched again."""
+        data = asyncio.run(pipelined_researcher._async_conduct_research("Tesla stock"))
+        
+        searches = [e for e in pipelined_researcher.events if e.startswith("search:")]
+        assert searches == [
+            "search:Tesla stock",
+            "search:Tesla battery supply chain",
+            "search:Tesla robotaxi launch",
+        ]
+        assert [r.url for r in data.search_results] == [
+            "https://Tesla-stock.com",
+            "https://Tesla-battery-supply-chain.com",
+            "https://Tesla-robotaxi-launch.com",
+        ]
+    
+    def test_search_count_matches_unpipelined(self, pipelined_researcher):
+        """The raw topic counts toward MAX_GENERATED_QUERIES searches."""
+        async def distinct_astream_llm(prompt, system_prompt=None, on_token=None):
+            for line in ["Tesla battery supply chain\n", "Tesla robotaxi launch\n", "Tesla energy storage\n"]:
+                await asyncio.sleep(0.01)
+                on_token(line)
+            pipelined_researcher.events.append("generated")
+            return ""
+        
+        pipelined_researcher.astream_llm = distinct_astream_llm
+        
+        asyncio.run(pipelined_researcher._async_conduct_research("Tesla stock"))
+        
+        searches = [e for e in pipelined_researcher.events if e.startswith("search:")]
+        assert len(searches) == pipelined_researcher.MAX_GENERATED_QUERIES
+        assert searches[0] == "search:Tesla stock"
+        assert "generated" not in pipelined_researcher.events
+    
+    def test_enabled_from_settings(self, monkeypatch):
+        """RESEARCH_PIPELINED reaches the researcher through Settings agent options."""
+        from config.settings import Settings
+        from src.graph.nodes import AgentRegistry
+        
+        assert AgentRegistry("groq-key", "tavily-key").get_researcher().pipelined_search is False
+        
+        monkeypatch.setenv("RESEARCH_PIPELINED", "true")
+        registry = AgentRegistry("groq-key", "tavily-key", Settings().get_agent_options())
+        
+        assert registry.get_researcher().pipelined_search is True
+    
+    def test_sync_path_pipelines(self, pipelined_researcher):
+        """The sync research path runs the same pipeline."""
+        data = pipelined_researcher._conduct_research("Tesla stock")
+        
+        assert data.sources_count == 3
+        assert data.researcher_notes == "notes"
+    
+    def test_generation_failure_searches_topic(self, pipelined_researcher):
+        """If query generation fails, the raw topic search still completes."""
+        async def failing_astream_llm(prompt, system_prompt=None, on_token=None):
+            raise RuntimeError("LLM unavailable")
+        
+        pipelined_researcher.astream_llm = failing_astream_llm
+        
+        data = asyncio.run(pipelined_researcher._async_conduct_research("Tesla stock"))
+        
+        assert [r.url for r in data.search_results] == ["https://Tesla-stock.com"]
+
+
+class TestResearchNotesModes:
+    """Tests for LLM, deferred and heuristic research notes."""
+    
+    @pytest.fixture
+    def notes_researcher(self, researcher):
+        import time
+        
+        def slow_notes(topic, results):
+            time.sleep(0.1)
+            return "llm notes"
+        
+        async def aslow_notes(topic, results):
+            await asyncio.sleep(0.1)
+            return "llm notes"
+        
+        async def fake_asearch(query, **kwargs):
+            return make_research_data(query, [f"https://{query.replace(' ', '-')}.com/a"])
+        
+        researcher._generate_research_notes = slow_notes
+        researcher._agenerate_research_notes = aslow_notes
+        researcher.search_tool.asearch = fake_asearch
+        return researcher
+    
+    def test_unknown_mode_rejected(self):
+        """An unknown notes mode fails at construction."""
+        from src.agents.researcher import ResearcherAgent
+        
+        with pytest.raises(ValueError, match="notes mode"):
+            ResearcherAgent(api_key="test", tavily_api_key="test", notes_mode="later")
+    
+    def test_heuristic_notes_skip_llm(self, notes_researcher):
+        """Heuristic notes summarize quality and domains without an LLM call."""
+        notes_researcher.notes_mode = "heuristic"
+        notes_researcher._generate_research_notes = None
+        
+        data = notes_researcher._conduct_research("general topic")
+        
+        assert data.researcher_notes.startswith("3 sources from 3 domains")
+        assert "Data quality score" in data.researcher_notes
+    
+    def test_deferred_notes_collected_later(self, notes_researcher):
+        """Deferred mode returns heuristic notes and merges LLM notes on collection."""
+        import time
+        
+        notes_researcher.notes_mode = "deferred"
+        
+        start = time.perf_counter()
+        data = notes_researcher._conduct_research("general topic")
+        elapsed = time.perf_counter() - start
+        
+        assert elapsed < 0.1
+        assert data.researcher_notes.startswith("3 sources")
+        assert notes_researcher.collect_research_notes(data).researcher_notes == "llm notes"
+        # Collected notes are removed
+        assert notes_researcher.collect_research_notes(data) is data
+    
+    def test_async_deferred_notes_overlap_analysis(self, notes_researcher):
+        """Async deferred notes run while later work proceeds on the loop."""
+        notes_researcher.notes_mode = "deferred"
+        
+        async def run():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            data = await notes_researcher._async_conduct_research("general topic")
+            await asyncio.sleep(0.1)  # stands in for the analyst phase
+            merged = await notes_researcher.acollect_research_notes(data)
+            return merged, loop.time() - start
+        
+        merged, elapsed = asyncio.run(run())
+        
+        assert merged.researcher_notes == "llm notes"
+        assert elapsed < 0.18
+    
+    def test_analyst_node_merges_deferred_notes(self, notes_researcher):
+        """The async analyst node replaces provisional notes with the LLM notes."""
+        from src.graph.nodes import AgentRegistry, initialize_registry, async_analyst_node
+        
+        notes_researcher.notes_mode = "deferred"
+        registry = initialize_registry("test-groq-key", "test-tavily-key")
+        registry._agents["researcher"] = notes_researcher
+        
+        async def fake_aprocess(state):
+            return {**state, "current_agent": "analyst"}
+        
+        registry.get_analyst().aprocess = fake_aprocess
+        
+        async def run():
+            data = await notes_researcher._async_conduct_research("general topic")
+            return await async_analyst_node({"research_data": data, "messages": []})
+        
+        try:
+            state = asyncio.run(run())
+        finally:
+            AgentRegistry.reset()
+        
+        assert state["research_data"].researcher_notes == "llm notes"
+    
+    def test_merged_notes_release_provisional_analysis(self, notes_researcher):
+        """Analysis prepared with the provisional notes leaves the shared cache."""
+        from src.graph.nodes import AgentRegistry, initialize_registry, async_analyst_node
+        from src.tools.analysis import ResearchDataProcessor, get_prepared_analysis_cache
+        
+        notes_researcher.notes_mode = "deferred"
+        registry = initialize_registry("test-groq-key", "test-tavily-key")
+        registry._agents["researcher"] = notes_researcher
+        processor = ResearchDataProcessor()
+        analyzed = []
+        
+        async def fake_aprocess(state):
+            analyzed.append(state["research_data"])
+            await processor.aprepare_for_analysis(state["research_data"])
+            return {**state, "current_agent": "analyst"}
+        
+        registry.get_analyst().aprocess = fake_aprocess
+        
+        async def run():
+            data = await notes_researcher._async_conduct_research("general topic")
+            return await async_analyst_node({"research_data": data, "messages": []})
+        
+        try:
+            state = asyncio.run(run())
+        finally:
+            AgentRegistry.reset()
+        
+        assert state["research_data"].researcher_notes == "llm notes"
+        assert get_prepared_analysis_cache().invalidate(analyzed[0]) == 0
+    
+    def test_mode_from_settings(self, monkeypatch):
+        """RESEARCH_NOTES_MODE reaches the researcher through Settings agent options."""
+        from config.settings import Settings
+        from src.graph.nodes import AgentRegistry
+        
+        monkeypatch.setenv("RESEARCH_NOTES_MODE", "heuristic")
+        registry = AgentRegistry("groq-key", "tavily-key", Settings().get_agent_options())
+        
+        assert registry.get_researcher().notes_mode == "heuristic"
+    
+    def test_factory_defaults(self):
+        """The factory builds an agent with the constructor's defaults."""
+        from src.agents.researcher import create_researcher_agent
+        
+        agent = create_researcher_agent("test-groq-key", "test-tavily-key")
+        
+        assert agent.notes_mode == "llm"
+        assert agent.pipelined_search is False
+        assert agent.enrich_top_n == 0
+
+
+class TestAnalystPreparation:
+    """Tests that analysis and revisions prepare research data once."""
+    
+    def test_revision_reuses_prepared_analysis(self):
+        """Analysis prepares once; the revision does no local recomputation."""
+        from src.agents.analyst import AnalystAgent
+        from src.schemas.models import CritiqueResult
+        from src.tools.analysis import PreparedAnalysisCache
+        
+        analyst = AnalystAgent(api_key="test-groq-key")
+        analyst.data_processor.cache = PreparedAnalysisCache()
+        analyst.invoke_llm = lambda prompt, *args, **kwargs: "Summary: fine."
+        
+        passes = []
+        combine = analyst.data_processor.combine_content
+        analyst.data_processor.combine_content = lambda data: passes.append(1) or combine(data)
+        
+        research_data = make_research_data("AI chips", ["https://a.com/1", "https://b.com/2"])
+        summary = analyst._perform_analysis(research_data)
+        critique = CritiqueResult(is_approved=False, quality_score=0.4, revision_required=True)
+        analyst._perform_revision({"analysis_summary": summary}, research_data, critique)
+        
+        assert len(passes) == 1
+        assert analyst.data_processor.cache.stats["hits"] == 1
+    
+    def test_analysis_records_context_tokens(self):
+        """The packed context stays within the model budget and is traced."""
+        from src.agents.analyst import AnalystAgent
+        from src.tools.tracing import start_trace
+        
+        analyst = AnalystAgent(api_key="test-groq-key", context_token_budget=200)
+        prompts = []
+        analyst.invoke_llm = lambda prompt, *args, **kwargs: prompts.append(prompt) or "Summary: fine."
+        
+        research_data = make_research_data("AI chips", ["https://a.com/1", "https://b.com/2"])
+        with start_trace("test") as trace:
+            analyst._perform_analysis(research_data)
+        
+        spans = [s for s in trace.to_dict()["spans"] if s["name"] == "analysis.context"]
+        assert len(spans) == 1
+        assert 0 < spans[0]["attributes"]["context_tokens"] <= 200
+        assert "https://b.com/2" in prompts[0]
+
+# =============================================================================
+# Supervisor Routing Tests
+# =============================================================================
+
+class TestSupervisorRouting:
+    """Tests for the supervisor's rule-based revision loop."""
+    
+    def _route(self, research, analysis, critique):
+        from src.agents.supervisor import SupervisorAgent
+        
+        agent = SupervisorAgent(api_key="test-key")
+        return agent._rule_based_routing({
+            "user_query": "AI trends",
+            "research_data": research,
+            "analysis_summary": analysis,
+            "critique_result": critique,
+            "iteration_count": 1,
+            "max_iterations": 3,
+        })["next_agent"]
+    
+    def test_rejection_routes_to_analyst(
+        self, sample_research_data, sample_analysis, sample_critique_rejected
+    ):
+        """A rejected analysis goes back to the analyst."""
+        from datetime import datetime, timedelta
+        
+        now = datetime.now()
+        analysis = sample_analysis.model_copy(update={"timestamp": now - timedelta(seconds=1)})
+        critique = sample_critique_rejected.model_copy(update={"timestamp": now})
+        
+        assert self._route(sample_research_data, analysis, critique) == "analyst"
+    
+    def test_revision_routes_back_to_critic(
+        self, sample_research_data, sample_analysis, sample_critique_rejected
+    ):
+        """A revision made after the rejection is reviewed again."""
+        from datetime import datetime, timedelta
+        
+        now = datetime.now()
+        critique = sample_critique_rejected.model_copy(update={"timestamp": now - timedelta(seconds=1)})
+        analysis = sample_analysis.model_copy(update={"timestamp": now})
+        
+        assert self._route(sample_research_data, analysis, critique) == "critic"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,112 @@
+"""
+Smoke tests for the offline benchmark suite.
+
+The fakes are configured with zero latency so the full workflow runs
+in well under a second per report without network access.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture
+def instant_llm():
+    """LLM profile with no simulated latency."""
+    from benchmarks.fakes import LLMProfile
+
+    return LLMProfile(latency=0.0, tokens_per_second=0.0, seed=7)
+
+
+@pytest.fixture
+def instant_tavily():
+    """Tavily profile with no simulated latency."""
+    from benchmarks.fakes import TavilyProfile
+
+    return TavilyProfile(latency=0.0, seed=7)
+
+
+class TestFakes:
+    """Tests for the Groq and Tavily stand-ins."""
+
+    def test_fake_model_answers_per_agent(self, instant_llm):
+        """Each agent gets a response in the format it parses."""
+        import json
+        from langchain_core.messages import HumanMessage, SystemMessage
+        from benchmarks.fakes import FakeChatModel
+        from src.prompts.critic import CRITIC_SYSTEM_PROMPT
+
+        model = FakeChatModel(profile=instant_llm)
+        response = model.invoke([
+            SystemMessage(content=CRITIC_SYSTEM_PROMPT),
+            HumanMessage(content="Review this analysis"),
+        ])
+
+        assert json.loads(response.content)["is_approved"] is True
+        assert response.usage_metadata["total_tokens"] > 0
+
+    def test_fake_model_throttles(self):
+        """error_rate=1 raises a 429 the rate limiter recognises."""
+        from langchain_core.messages import HumanMessage
+        from benchmarks.fakes import FakeChatModel, LLMProfile
+        from src.agents.rate_limit import is_rate_limit_error, parse_retry_after
+
+        model = FakeChatModel(profile=LLMProfile(latency=0.0, error_rate=1.0, retry_after=0.5))
+
+        with pytest.raises(Exception) as excinfo:
+            model.invoke([HumanMessage(content="hi")])
+
+        assert is_rate_limit_error(excinfo.value)
+        assert parse_retry_after(excinfo.value) == pytest.approx(0.5)
+
+    def test_install_fakes_restores_clients(self, instant_llm, instant_tavily):
+        """Patched Tavily clients are restored when the block exits."""
+        from benchmarks.fakes import install_fakes
+        from src.tools import search
+
+        original = search.TavilyClient
+
+        with install_fakes(instant_llm, instant_tavily):
+            assert search.TavilyClient is not original
+
+        assert search.TavilyClient is original
+
+
+class TestWorkflowBenchmark:
+    """Tests for the end-to-end benchmark runner."""
+
+    def test_run_benchmark_reports_metrics(self, instant_llm, instant_tavily):
+        """Every level completes its reports and reports per-report costs."""
+        from benchmarks.workflow_bench import run_benchmark
+
+        results = run_benchmark([1, 2], runs=2, llm=instant_llm, tavily=instant_tavily)
+
+        assert [r["concurrency"] for r in results] == [1, 2]
+        for result in results:
+            assert result["succeeded"] == 2
+            assert result["latency_p50"] <= result["latency_p99"]
+            assert result["llm_calls_per_report"] >= 4
+            assert result["tavily_calls_per_report"] > 0
+
+    def test_revisions_add_llm_calls(self, instant_tavily):
+        """Rejected critiques drive extra analyst/critic calls."""
+        from benchmarks.fakes import LLMProfile
+        from benchmarks.workflow_bench import run_benchmark
+
+        approved, rejected = (
+            run_benchmark(
+                [1], runs=1, tavily=instant_tavily, max_iterations=2,
+                llm=LLMProfile(latency=0.0, tokens_per_second=0.0, approval_rate=rate),
+            )[0]
+            for rate in (1.0, 0.0)
+        )
+
+        assert rejected["llm_calls_per_report"] > approved["llm_calls_per_report"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
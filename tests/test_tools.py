@@ -0,0 +1,1063 @@
+"""
+Unit tests for the search, scraping and analysis tools.
+
+These tests run fully offline; Tavily clients are replaced with fakes.
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# =============================================================================
+# Test Fixtures
+# =============================================================================
+
+class FakeTavilyClient:
+    """Counts calls and returns a canned Tavily response."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def search(self, **params):
+        self.calls.append(params)
+        return {
+            "results": [
+                {"title": "Tesla Q3", "url": "https://example.com/tsla", "content": "Deliveries rose"},
+            ],
+            "answer": "Tesla delivered more cars.",
+        }
+
+
+class FakeAsyncTavilyClient(FakeTavilyClient):
+    """Async flavour of FakeTavilyClient."""
+    
+    async def search(self, **params):
+        return FakeTavilyClient.search(self, **params)
+
+
+@pytest.fixture
+def cached_tool(tmp_path):
+    """TavilySearchTool with a two-tier cache and fake clients."""
+    from src.tools.search import SearchCache, TavilySearchTool
+    
+    cache = SearchCache(max_memory_entries=2, db_path=tmp_path / "search.sqlite")
+    tool = TavilySearchTool(api_key="test-key", cache=cache)
+    tool._sync_client = FakeTavilyClient()
+    yield tool
+    cache.close()
+
+
+# =============================================================================
+# Search Cache Tests
+# =============================================================================
+
+class TestSearchCache:
+    """Tests for the TavilySearchTool result cache."""
+    
+    def test_repeated_search_skips_network(self, cached_tool):
+        """A repeated query is served from cache."""
+        first = cached_tool.search("Tesla stock analysis")
+        second = cached_tool.search("  tesla STOCK analysis ")
+        
+        assert len(cached_tool.sync_client.calls) == 1
+        assert second.search_results == first.search_results
+        assert cached_tool.cache.stats["hits"] == 1
+        assert cached_tool.cache.stats["misses"] == 1
+    
+    def test_key_includes_search_parameters(self, cached_tool):
+        """Different domains or result counts are cached separately."""
+        cached_tool.search("Tesla stock analysis")
+        cached_tool.search_finance("Tesla stock analysis")
+        cached_tool.search("Tesla stock analysis", max_results=10)
+        
+        assert len(cached_tool.sync_client.calls) == 3
+    
+    def test_disk_tier_survives_memory_eviction(self, cached_tool):
+        """Entries evicted from memory are still found on disk."""
+        for query in ["one", "two", "three"]:
+            cached_tool.search(query)
+        
+        cached_tool.search("one")
+        
+        assert len(cached_tool.sync_client.calls) == 3
+        assert cached_tool.cache.stats["disk_hits"] == 1
+    
+    def test_disk_tier_persists_across_instances(self, tmp_path):
+        """A new cache on the same file sees earlier entries."""
+        from src.tools.search import SearchCache
+        
+        path = tmp_path / "search.sqlite"
+        first = SearchCache(db_path=path)
+        key = SearchCache.make_key("AI trends", max_results=5)
+        first.set(key, {"results": []}, ttl=60)
+        first.close()
+        
+        second = SearchCache(db_path=path)
+        assert second.get(key) == {"results": []}
+        second.close()
+    
+    def test_entries_expire(self):
+        """Expired entries are treated as misses."""
+        from src.tools.search import SearchCache
+        
+        cache = SearchCache()
+        cache.set("key", {"results": []}, ttl=0.01)
+        time.sleep(0.02)
+        
+        assert cache.get("key") is None
+    
+    def test_news_ttl_shorter_than_tech(self):
+        """Per-method TTLs favour fresh news."""
+        from src.tools.search import SearchCache
+        
+        cache = SearchCache()
+        assert cache.ttl_for("news") < cache.ttl_for("search") < cache.ttl_for("tech")
+    
+    def test_async_path_uses_cache(self, cached_tool):
+        """Async searches share the cache with sync searches."""
+        import asyncio
+        
+        cached_tool.search("AI chips")
+        fake_async = FakeAsyncTavilyClient()
+        cached_tool._async_client = fake_async
+        
+        async def run():
+            cached_tool._async_client_loop = asyncio.get_running_loop()
+            return await cached_tool.asearch("AI chips")
+        
+        data = asyncio.run(run())
+        
+        assert fake_async.calls == []
+        assert data.sources_count == 1
+
+
+class TestResearchIndex:
+    """Tests for reuse of research across related queries."""
+    
+    def _research(self, query: str):
+        from src.schemas.models import ResearchData, SearchResult
+        
+        return ResearchData(
+            topic=query,
+            search_results=[SearchResult(title=query, url=f"https://{len(query)}.com", content=query)],
+            sources_count=1,
+        )
+    
+    def test_signature_ignores_framing(self):
+        """Framing and stop words do not change the signature."""
+        from src.tools.research_index import topic_signature
+        
+        assert topic_signature("Tesla risks") == topic_signature("Tesla opportunities")
+        assert topic_signature("What is the latest news on AI chips?") == {"ai", "chip"}
+    
+    def test_related_query_reuses_research(self):
+        """A differently framed query hits; an unrelated one misses."""
+        from src.tools.research_index import ResearchIndex
+        
+        index = ResearchIndex()
+        research = self._research("Tesla risks")
+        index.add("Tesla risks", research, kind="finance")
+        
+        assert index.lookup("Tesla opportunities", kind="finance") is research
+        assert index.lookup("Nvidia opportunities", kind="finance") is None
+        assert index.lookup("Tesla opportunities", kind="tech") is None
+        assert index.stats["hits"] == 1
+        assert index.stats["misses"] == 2
+    
+    def test_below_similarity_threshold_misses(self):
+        """Partial overlap under min_similarity is not reused."""
+        from src.tools.research_index import ResearchIndex
+        
+        index = ResearchIndex(min_similarity=0.6)
+        index.add("Tesla battery supply chain", self._research("Tesla battery supply chain"))
+        
+        assert index.lookup("Tesla robotaxi") is None
+    
+    def test_freshness_depends_on_kind(self):
+        """Finance research goes stale before tech research."""
+        from src.tools.research_index import ResearchIndex
+        
+        index = ResearchIndex(max_ages={"finance": 0.01, "tech": 60})
+        index.add("Tesla earnings", self._research("Tesla earnings"), kind="finance")
+        index.add("AI chips", self._research("AI chips"), kind="tech")
+        time.sleep(0.02)
+        
+        assert index.lookup("Tesla earnings outlook", kind="finance") is None
+        assert index.lookup("AI chips trends", kind="tech") is not None
+    
+    def test_empty_research_not_indexed(self):
+        """Searches without results are not stored."""
+        from src.schemas.models import ResearchData
+        from src.tools.research_index import ResearchIndex
+        
+        index = ResearchIndex()
+        index.add("AI chips", ResearchData(topic="AI chips"))
+        
+        assert index.stats["entries"] == 0
+    
+    def test_persists_across_instances(self, tmp_path):
+        """A new index on the same file reuses earlier research."""
+        from src.tools.research_index import ResearchIndex
+        
+        path = tmp_path / "research.sqlite"
+        first = ResearchIndex(db_path=path)
+        first.add("AI chips", self._research("AI chips"), kind="tech")
+        first.close()
+        
+        second = ResearchIndex(db_path=path)
+        found = second.lookup("AI chips outlook", kind="tech")
+        second.close()
+        
+        assert found is not None
+        assert found.search_results[0].url == "https://8.com"
+    
+    def test_shared_index_is_opt_in(self, monkeypatch):
+        """The shared index is only created when enabled."""
+        from src.tools import research_index
+        
+        monkeypatch.setattr(research_index, "_shared_research_index", None)
+        monkeypatch.delenv("RESEARCH_INDEX_ENABLED", raising=False)
+        monkeypatch.delenv("RESEARCH_INDEX_PATH", raising=False)
+        assert research_index.get_shared_research_index() is None
+        
+        monkeypatch.setenv("RESEARCH_INDEX_ENABLED", "true")
+        monkeypatch.setenv("RESEARCH_INDEX_MAX_AGE_FINANCE", "2")
+        index = research_index.get_shared_research_index()
+        
+        assert index is research_index.get_shared_research_index()
+        assert index.max_age("finance") == 7200
+
+
+
+# =============================================================================
+# Tracing Tests
+# =============================================================================
+
+class TestTracing:
+    """Tests for the span tracing layer."""
+    
+    def test_spans_nest_under_active_span(self):
+        """Spans opened inside a span record it as their parent."""
+        from src.tools.tracing import start_trace, trace_span
+        
+        with start_trace("workflow") as trace:
+            with trace_span("node.researcher", kind="node") as node:
+                with trace_span("llm.invoke", kind="llm") as llm:
+                    llm.set("total_tokens", 42)
+        
+        assert node.parent_id == trace.root.span_id
+        assert llm.parent_id == node.span_id
+        assert llm.end_ns is not None
+        assert trace.summary()["llm:llm.invoke"]["total_tokens"] == 42
+    
+    def test_noop_outside_trace(self):
+        """trace_span is a no-op when no trace is active."""
+        from src.tools.tracing import NOOP_SPAN, current_span, trace_span
+        
+        with trace_span("llm.invoke", kind="llm") as span:
+            span.set("total_tokens", 1)
+        
+        assert span is NOOP_SPAN
+        assert current_span() is NOOP_SPAN
+    
+    def test_errors_mark_span(self):
+        """An exception marks the span as failed and propagates."""
+        from src.tools.tracing import start_trace, trace_span
+        
+        with start_trace("workflow") as trace:
+            with pytest.raises(ValueError):
+                with trace_span("scraper.fetch", kind="fetch"):
+                    raise ValueError("boom")
+        
+        span = trace.spans[-1]
+        assert span.status == "error"
+        assert "boom" in span.error
+    
+    def test_search_records_tool_span(self, cached_tool):
+        """Tavily searches record calls and cache hits."""
+        from src.tools.tracing import start_trace
+        
+        with start_trace("workflow") as trace:
+            cached_tool.search("AI chips")
+            cached_tool.search("AI chips")
+        
+        tool_spans = [s for s in trace.spans if s.kind == "tool"]
+        assert len(tool_spans) == 2
+        assert tool_spans[0].attributes["cache_hit"] is False
+        assert tool_spans[1].attributes["cache_hit"] is True
+        assert sum(s.attributes.get("tavily_calls", 0) for s in tool_spans) == 1
+    
+    def test_otel_export(self):
+        """OTLP export keeps ids, parent links and typed attributes."""
+        from src.tools.tracing import start_trace, trace_span
+        
+        with start_trace("workflow", query="AI") as trace:
+            with trace_span("scraper.fetch", kind="fetch", bytes=1024):
+                pass
+        
+        otel = trace.to_otel()
+        spans = otel["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        
+        assert len(spans) == 2
+        assert all(s["traceId"] == trace.trace_id for s in spans)
+        assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+        assert {"key": "bytes", "value": {"intValue": "1024"}} in spans[1]["attributes"]
+
+
+# =============================================================================
+# Scraper Tests
+# =============================================================================
+
+class TestScraperBatch:
+    """Tests for concurrent scraping limits."""
+    
+    @staticmethod
+    def _scraper(delays: dict, peak: dict):
+        from src.schemas.models import SearchResult
+        from src.tools.scraper import WebScraper, get_domain
+        
+        scraper = WebScraper()
+        active = {}
+        
+        async def fake_ascrape_url(url):
+            host = get_domain(url)
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+            await asyncio.sleep(delays.get(url, 0.01))
+            active[host] -= 1
+            return SearchResult(title=url, url=url, content=f"Page {url}")
+        
+        scraper.ascrape_url = fake_ascrape_url
+        return scraper
+    
+    def test_per_host_cap(self):
+        """No host sees more than max_per_host requests at once."""
+        urls = [f"https://a.com/{i}" for i in range(4)] + ["https://b.com/1"]
+        peak = {}
+        scraper = self._scraper({}, peak)
+        
+        results = asyncio.run(scraper.ascrape_multiple(urls, max_per_host=2))
+        
+        assert [r.url for r in results] == urls
+        assert peak == {"a.com": 2, "b.com": 1}
+    
+    def test_deadline_drops_slow_pages(self):
+        """Pages still loading at the deadline are cancelled and excluded."""
+        urls = ["https://a.com/fast", "https://b.com/slow", "https://c.com/fast"]
+        scraper = self._scraper({"https://b.com/slow": 5.0}, {})
+        
+        start = time.perf_counter()
+        results = asyncio.run(scraper.ascrape_multiple(urls, deadline=0.2))
+        
+        assert time.perf_counter() - start < 1.0
+        assert [r.url for r in results] == ["https://a.com/fast", "https://c.com/fast"]
+
+class TestScraperSession:
+    """Tests for the pooled async session against a local HTTP server."""
+    
+    @staticmethod
+    async def _serve(handler):
+        from aiohttp import web
+        
+        app = web.Application()
+        app.router.add_get("/{name}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        return runner, f"http://127.0.0.1:{port}"
+    
+    def test_connections_are_reused(self):
+        """Many fetches share a few keep-alive connections."""
+        from aiohttp import web
+        from src.tools.scraper import WebScraper
+        
+        client_ports = set()
+        
+        async def handler(request):
+            client_ports.add(request.transport.get_extra_info("peername")[1])
+            return web.Response(text=f"<p>{request.match_info['name']}</p>")
+        
+        async def run():
+            runner, base = await self._serve(handler)
+            try:
+                async with WebScraper(max_connections_per_host=2) as scraper:
+                    pages = await scraper.afetch_multiple([f"{base}/{i}" for i in range(20)])
+                    assert scraper._async_session is not None
+                assert scraper._async_session is None
+                return pages
+            finally:
+                await runner.cleanup()
+        
+        pages = asyncio.run(run())
+        
+        assert all(html and "<p>" in html for html in pages.values())
+        assert len(client_ports) <= 2
+    
+    def test_retries_server_errors(self):
+        """429/5xx responses are retried with backoff; 404s are not."""
+        from aiohttp import web
+        from src.tools.scraper import WebScraper
+        
+        hits = {}
+        
+        async def handler(request):
+            name = request.match_info["name"]
+            hits[name] = hits.get(name, 0) + 1
+            if name == "flaky" and hits[name] < 3:
+                status = 429 if hits[name] == 1 else 503
+                return web.Response(status=status, headers={"Retry-After": "0"})
+            if name == "missing":
+                return web.Response(status=404)
+            return web.Response(text="ok")
+        
+        async def run():
+            runner, base = await self._serve(handler)
+            try:
+                async with WebScraper(max_retries=3, backoff_factor=0.01) as scraper:
+                    return (
+                        await scraper.afetch_url(f"{base}/flaky"),
+                        await scraper.afetch_url(f"{base}/missing"),
+                    )
+            finally:
+                await runner.cleanup()
+        
+        flaky, missing = asyncio.run(run())
+        
+        assert flaky == "ok"
+        assert missing is None
+        assert hits == {"flaky": 3, "missing": 1}
+
+@pytest.fixture
+def html_server():
+    """Local HTTP server with a large article page and a PDF."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    paragraph = "<p>Nvidia data-center revenue grew again this quarter.</p>\n"
+    article = (
+        "<html><head><title>Big  Article</title>"
+        '<meta name="description" content="About chips">'
+        "<script>var hidden = '<p>not text</p>';</script></head>"
+        '<body><time datetime="2026-01-15">Jan 15</time>'
+        + paragraph * 50_000
+        + "</body></html>"
+    ).encode()
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/report.pdf":
+                body, content_type = b"%PDF-1.4" + b"0" * 100_000, "application/pdf"
+            else:
+                body, content_type = article, "text/html; charset=utf-8"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", len(article)
+    server.shutdown()
+    server.server_close()
+
+
+class TestHTMLTextExtractor:
+    """Tests for the incremental HTML extractor."""
+    
+    HTML = (
+        "<html><head><title>Chip &amp; AI\n Outlook</title>"
+        '<meta name="author" content="Jane Doe" />'
+        '<meta property="article:published_time" content="2026-02-01">'
+        "<style>p { color: red; }</style></head><body>"
+        "<nav>Home</nav><!-- comment --><h1>Headline</h1>"
+        "<p>Demand for accelerators &gt; supply.</p>"
+        "<script>if (a < b) { alert('x'); }</script>"
+        "<p>Café prices rose.</p></body></html>"
+    )
+    
+    def test_extracts_title_text_and_metadata(self):
+        """Title, visible text and meta tags come from one pass."""
+        from src.tools.html_extract import HTMLTextExtractor
+        
+        extractor = HTMLTextExtractor()
+        extractor.feed(self.HTML)
+        page = extractor.result()
+        
+        assert page.title == "Chip & AI Outlook"
+        assert page.text == "Home Headline Demand for accelerators > supply. Café prices rose."
+        assert page.metadata["author"] == "Jane Doe"
+        assert page.metadata["published_date"] == "2026-02-01"
+        assert not page.truncated
+    
+    def test_chunk_boundaries_do_not_matter(self):
+        """Byte-by-byte feeding (splitting tags and UTF-8) gives the same page."""
+        from src.tools.html_extract import HTMLTextExtractor
+        
+        whole = HTMLTextExtractor()
+        whole.feed_bytes(self.HTML.encode())
+        
+        streamed = HTMLTextExtractor()
+        data = self.HTML.encode()
+        for i in range(len(data)):
+            streamed.feed_bytes(data[i:i + 1])
+        
+        assert streamed.result() == whole.result()
+    
+    def test_character_budget(self):
+        """The extractor reports full and truncates at max_chars."""
+        from src.tools.html_extract import HTMLTextExtractor
+        
+        extractor = HTMLTextExtractor(max_chars=20)
+        extractor.feed("<p>" + "word " * 100 + "</p>")
+        
+        assert extractor.full
+        page = extractor.result()
+        assert page.truncated
+        assert len(page.text) <= 20
+    
+    def test_main_content_drops_boilerplate(self):
+        """Navigation, share widgets and link lists are dropped as boilerplate."""
+        from src.tools.html_extract import parse_html
+        
+        html = (
+            '<body><header class="site"><a href="/">Home</a> <a href="/news">News</a></header>'
+            '<nav><ul><li><a href="/m">Markets</a><li><a href="/t">Tech</a></ul></nav>'
+            '<article><h1>Nvidia beats estimates</h1>'
+            '<p>Nvidia reported quarterly revenue well above analyst expectations.'
+            '<p>Shares rose 5% in extended trading on <a href="/dc">data-center</a> demand.'
+            '<div class="share-buttons"><a href="#">Twitter</a> <a href="#">Facebook</a></div>'
+            '<p><a href="/x">Another story about chips that you might like to read</a></p>'
+            '</article><div id="cookie-consent">We use cookies to improve this site.</div>'
+            '<footer>Copyright 2026 Example Corp.</footer></body>'
+        )
+        
+        page = parse_html(html, main_content=True)
+        
+        assert page.text == (
+            "Nvidia beats estimates "
+            "Nvidia reported quarterly revenue well above analyst expectations. "
+            "Shares rose 5% in extended trading on data-center demand."
+        )
+        assert page.boilerplate_chars > 0
+        assert "Home" in parse_html(html).text
+    
+    def test_tolerates_malformed_markup(self):
+        """Quoted '>' in attributes, stray '<' and unclosed scripts do not break parsing."""
+        from src.tools.html_extract import parse_html
+        
+        page = parse_html(
+            '<p data-x="a > b">1 < 2 is true</p><!DOCTYPE html>'
+            "<p>before<script>while (a < b) {</p><p>never shown"
+        )
+        
+        assert page.text == "1 < 2 is true before"
+
+
+class TestScraperStreaming:
+    """Tests for streaming, size-capped page downloads."""
+    
+    def test_sync_page_stops_at_text_budget(self, html_server):
+        """Only a small prefix of a large page is downloaded."""
+        from src.tools.scraper import WebScraper
+        
+        base, size = html_server
+        scraper = WebScraper(max_content_chars=500, chunk_size=4096)
+        
+        page = scraper.fetch_page(f"{base}/article")
+        result = scraper.scrape_url(f"{base}/article")
+        
+        assert page.title == "Big Article"
+        assert page.truncated and len(page.text) <= 500
+        assert page.bytes_read < size // 100
+        assert "not text" not in page.text
+        assert page.metadata["published_date"] == "2026-01-15"
+        assert result.content.endswith("...")
+    
+    def test_async_page_rejects_non_html(self, html_server):
+        """Non-HTML responses are rejected from their headers."""
+        from src.tools.scraper import WebScraper
+        
+        base, _ = html_server
+        
+        async def run():
+            async with WebScraper(max_content_chars=500) as scraper:
+                return (
+                    await scraper.ascrape_url(f"{base}/report.pdf"),
+                    await scraper.afetch_page(f"{base}/article"),
+                )
+        
+        pdf, page = asyncio.run(run())
+        
+        assert pdf is None
+        assert page.truncated
+    
+    def test_fetch_url_byte_budget(self, html_server):
+        """Raw fetches stop at max_bytes."""
+        from src.tools.scraper import WebScraper
+        
+        base, size = html_server
+        scraper = WebScraper(max_bytes=10_000)
+        
+        html = scraper.fetch_url(f"{base}/article")
+        
+        assert len(html.encode()) == 10_000 < size
+
+    def test_process_executor_parses_batches(self, html_server):
+        """With a process pool, pages are downloaded then parsed in the pool."""
+        from src.tools.executor import TaskExecutor
+        from src.tools.scraper import WebScraper
+        
+        base, _ = html_server
+        urls = [f"{base}/article?page={i}" for i in range(4)] + [f"{base}/report.pdf"]
+        
+        async def run(executor):
+            async with WebScraper(
+                max_content_chars=500, max_bytes=50_000, executor=executor
+            ) as scraper:
+                return (
+                    await scraper.ascrape_multiple(urls),
+                    await scraper.afetch_page(urls[0]),
+                )
+        
+        with TaskExecutor("process", max_workers=2) as executor:
+            results, page = asyncio.run(run(executor))
+        inline_results, inline_page = asyncio.run(run(TaskExecutor("inline")))
+        
+        assert [r.url for r in results] == urls[:4]
+        assert [r.content for r in results] == [r.content for r in inline_results]
+        assert (page.title, page.text) == (inline_page.title, inline_page.text)
+        assert page.truncated
+
+
+# =============================================================================
+# Executor Tests
+# =============================================================================
+
+class TestTaskExecutor:
+    """Tests for the inline/thread/process executor."""
+    
+    @pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+    def test_map_keeps_order(self, mode):
+        """map and amap return results in input order in every mode."""
+        from src.tools.executor import TaskExecutor
+        
+        items = list(range(-50, 50))
+        
+        with TaskExecutor(mode, max_workers=2, chunksize=7) as executor:
+            mapped = executor.map(abs, items)
+            amapped = asyncio.run(executor.amap(abs, items))
+            single = executor.run(divmod, 17, 5)
+            asingle = asyncio.run(executor.arun(divmod, 17, 5))
+        
+        assert mapped == amapped == [abs(i) for i in items]
+        assert single == asingle == (3, 2)
+    
+    def test_batches_are_chunked(self):
+        """Items are sent to the pool in chunks, about 4 per worker by default."""
+        from src.tools.executor import TaskExecutor
+        
+        executor = TaskExecutor("thread", max_workers=2)
+        
+        assert [len(b) for b in executor._batches(list(range(20)), None)] == [3] * 6 + [2]
+        assert [len(b) for b in executor._batches(list(range(20)), 10)] == [10, 10]
+    
+    def test_thread_mode_keeps_loop_responsive(self):
+        """Offloaded work does not block other coroutines."""
+        from src.tools.executor import TaskExecutor
+        
+        async def run(executor):
+            ticks = 0
+            
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+            
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            await executor.arun(time.sleep, 0.3)
+            task.cancel()
+            return ticks
+        
+        with TaskExecutor("thread", max_workers=1) as executor:
+            assert asyncio.run(run(executor)) >= 10
+    
+    def test_configure_and_get(self, monkeypatch):
+        """The shared executor comes from the environment or configure_executor."""
+        from src.tools import executor as executor_module
+        
+        monkeypatch.setattr(executor_module, "_executor", None)
+        monkeypatch.setenv("ANALYSIS_EXECUTOR", "thread")
+        monkeypatch.setenv("ANALYSIS_WORKERS", "3")
+        
+        shared = executor_module.get_executor()
+        assert (shared.mode, shared.max_workers) == ("thread", 3)
+        assert executor_module.get_executor() is shared
+        
+        replaced = executor_module.configure_executor(mode="inline")
+        assert executor_module.get_executor() is replaced is not shared
+        
+        with pytest.raises(ValueError):
+            executor_module.TaskExecutor("gpu")
+        monkeypatch.setattr(executor_module, "_executor", None)
+    
+    def test_get_executor_creates_one_shared_executor(self, monkeypatch):
+        """Concurrent first calls all get the same executor."""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from src.tools import executor as executor_module
+        
+        original_init = executor_module.TaskExecutor.__init__
+        
+        def slow_init(self, *args, **kwargs):
+            time.sleep(0.02)
+            original_init(self, *args, **kwargs)
+        
+        monkeypatch.setattr(executor_module, "_executor", None)
+        monkeypatch.setattr(executor_module.TaskExecutor, "__init__", slow_init)
+        
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            shared = list(pool.map(lambda _: executor_module.get_executor(), range(4)))
+        
+        assert all(executor is shared[0] for executor in shared)
+        monkeypatch.setattr(executor_module, "_executor", None)
+    
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    def test_offloaded_analysis_matches_inline(self, mode, sample_research_data):
+        """Offloaded preparation gives the same result as inline preparation."""
+        from src.tools.analysis import ResearchDataProcessor
+        from src.tools.executor import TaskExecutor
+        
+        expected = ResearchDataProcessor(executor=TaskExecutor("inline")).prepare_for_analysis(
+            sample_research_data
+        )
+        
+        with TaskExecutor(mode, max_workers=2) as executor:
+            processor = ResearchDataProcessor(executor=executor)
+            processor.cache = None  # compute on the executor, not from the memo
+            prepared = asyncio.run(processor.aprepare_for_analysis(sample_research_data))
+            many = processor.prepare_many([sample_research_data] * 3, chunksize=2)
+        
+        assert prepared == expected
+        assert many == [expected] * 3
+
+
+class TestPreparedAnalysisCache:
+    """Tests for memoized prepare_for_analysis results."""
+    
+    @pytest.fixture
+    def counting_processor(self):
+        """Processor with a private cache that counts statistics passes."""
+        from src.tools.analysis import PreparedAnalysisCache, ResearchDataProcessor
+        from src.tools.executor import TaskExecutor
+        
+        class CountingExecutor(TaskExecutor):
+            calls = 0
+            
+            def run(self, fn, *args, **kwargs):
+                CountingExecutor.calls += 1
+                return super().run(fn, *args, **kwargs)
+            
+            async def arun(self, fn, *args, **kwargs):
+                CountingExecutor.calls += 1
+                return await super().arun(fn, *args, **kwargs)
+        
+        executor = CountingExecutor()
+        processor = ResearchDataProcessor(executor=executor, cache=PreparedAnalysisCache(max_entries=2))
+        return processor, executor
+    
+    def test_repeat_preparation_is_memoized(self, counting_processor, sample_research_data):
+        """Equal content is prepared once across copies and sync/async calls."""
+        processor, executor = counting_processor
+        
+        first = processor.prepare_for_analysis(sample_research_data)
+        copy = sample_research_data.model_copy(deep=True)
+        second = asyncio.run(processor.aprepare_for_analysis(copy))
+        
+        assert second is first
+        assert executor.calls == 1
+        assert processor.cache.stats["hits"] == 1
+    
+    def test_changed_content_recomputed(self, counting_processor, sample_research_data):
+        """New notes or results give a new fingerprint."""
+        from src.tools.analysis import PreparedAnalysisCache
+        
+        processor, executor = counting_processor
+        changed = sample_research_data.model_copy(update={"researcher_notes": "Revised notes"})
+        
+        assert PreparedAnalysisCache.fingerprint(changed) != PreparedAnalysisCache.fingerprint(
+            sample_research_data
+        )
+        processor.prepare_for_analysis(sample_research_data)
+        processor.prepare_for_analysis(changed)
+        assert executor.calls == 2
+    
+    def test_bounded_and_invalidated(self, counting_processor, sample_research_data):
+        """The cache evicts least recently used entries and supports invalidation."""
+        processor, _ = counting_processor
+        items = [
+            sample_research_data.model_copy(update={"topic": f"Topic {i}"}) for i in range(3)
+        ]
+        processor.prepare_many(items)
+        
+        assert processor.cache.stats["entries"] == 2
+        assert processor.cache.invalidate(items[2]) == 1
+        assert processor.cache.invalidate(items[0]) == 0
+        assert processor.cache.invalidate() == 1
+    
+    def test_prepare_many_skips_cached_items(self, counting_processor, sample_research_data):
+        """Only uncached items are sent to the executor."""
+        processor, executor = counting_processor
+        first = processor.prepare_for_analysis(sample_research_data)
+        
+        spied = []
+        original_map = executor.map
+        executor.map = lambda fn, items, chunksize=None: spied.append(len(items)) or original_map(fn, items)
+        other = sample_research_data.model_copy(update={"topic": "Another topic"})
+        many = processor.prepare_many([sample_research_data, other])
+        
+        assert spied == [1]
+        assert many[0] is first
+    
+    def test_shared_cache_can_be_disabled(self, monkeypatch):
+        """PREPARED_ANALYSIS_CACHE_SIZE=0 turns the shared cache off."""
+        from src.tools import analysis
+        
+        monkeypatch.setenv("PREPARED_ANALYSIS_CACHE_SIZE", "0")
+        assert analysis.get_prepared_analysis_cache() is None
+        assert analysis.ResearchDataProcessor().cache is None
+
+
+# =============================================================================
+# Context Packer Tests
+# =============================================================================
+
+def make_result(index: int, content: str):
+    """Search result with a numbered title and URL."""
+    from src.schemas.models import SearchResult
+    
+    return SearchResult(
+        title=f"Source {index}",
+        url=f"https://example{index}.com/article",
+        content=content,
+    )
+
+
+FILLER = "The weather was mild and the city council met on Tuesday to discuss parking. " * 12
+
+
+class TestContextPacker:
+    """Tests for token-budget packing of research content."""
+    
+    def test_packed_context_fits_budget(self):
+        """The packed text never exceeds the token budget."""
+        from src.tools.context_packer import ContextPacker, estimate_tokens
+        
+        results = [make_result(i, FILLER * 3) for i in range(6)]
+        context = ContextPacker(token_budget=400, chunk_tokens=64).pack("parking", results)
+        
+        assert context.tokens == estimate_tokens(context.text)
+        assert context.tokens <= 400
+        assert context.chunks_used < context.chunks_total
+    
+    def test_every_source_is_represented(self):
+        """A relevant last source survives where truncation would drop it."""
+        from src.tools.context_packer import ContextPacker
+        
+        results = [make_result(i, FILLER * 3) for i in range(4)]
+        results.append(make_result(4, "Nvidia accelerator revenue doubled on data center demand."))
+        context = ContextPacker(token_budget=300, chunk_tokens=64).pack("Nvidia accelerator revenue", results)
+        
+        assert context.sources_used == context.sources_total == 5
+        assert "Nvidia accelerator revenue doubled" in context.text
+        assert "## Source 4" in context.text
+    
+    def test_relevant_chunks_preferred(self):
+        """A relevant chunk deep in a source beats irrelevant leading chunks."""
+        from src.tools.context_packer import ContextPacker
+        
+        relevant = "Quantum error correction reached a new logical qubit milestone."
+        results = [make_result(0, FILLER * 2 + relevant)]
+        context = ContextPacker(token_budget=120, chunk_tokens=32).pack("quantum qubit error correction", results)
+        
+        assert relevant in context.text
+        assert context.chunks_used < context.chunks_total
+    
+    def test_gaps_are_marked(self):
+        """Non-adjacent chunks of a source are separated by a gap marker."""
+        from src.tools.context_packer import ContextPacker
+        
+        content = "Battery chemistry improved. " + FILLER + " Battery costs fell sharply."
+        context = ContextPacker(token_budget=80, chunk_tokens=24).pack("battery", [make_result(0, content)])
+        
+        assert "[...]" in context.text
+    
+    def test_empty_results(self):
+        """No content packs to an empty context."""
+        from src.tools.context_packer import ContextPacker
+        
+        context = ContextPacker(token_budget=100).pack("anything", [make_result(0, "")])
+        
+        assert context.text == ""
+        assert context.tokens == 0
+    
+    def test_budget_per_model(self, monkeypatch):
+        """Budgets follow the model, and the ANALYST_CONTEXT_TOKENS setting overrides them."""
+        from config.settings import Settings
+        from src.graph.nodes import AgentRegistry
+        from src.tools.context_packer import (
+            DEFAULT_CONTEXT_TOKENS,
+            MODEL_CONTEXT_TOKENS,
+            context_budget_for,
+        )
+        
+        assert context_budget_for("llama-3.1-8b-instant") == MODEL_CONTEXT_TOKENS["llama-3.1-8b-instant"]
+        assert context_budget_for("unknown-model") == DEFAULT_CONTEXT_TOKENS
+        
+        monkeypatch.setenv("ANALYST_CONTEXT_TOKENS", "0")
+        analyst = AgentRegistry("groq-key", "tavily-key", Settings().get_agent_options()).get_analyst()
+        assert analyst.context_token_budget == context_budget_for(analyst.model_name)
+        
+        monkeypatch.setenv("ANALYST_CONTEXT_TOKENS", "900")
+        analyst = AgentRegistry("groq-key", "tavily-key", Settings().get_agent_options()).get_analyst()
+        assert analyst.context_token_budget == 900
+    
+    def test_format_for_llm_uses_packed_context(self, sample_research_data):
+        """With a packed context the prompt carries it instead of the source list."""
+        from src.tools.analysis import ResearchDataProcessor
+        
+        processor = ResearchDataProcessor(cache=None)
+        context = processor.pack_context(sample_research_data, token_budget=500)
+        formatted = processor.format_for_llm(sample_research_data, context=context)
+        
+        assert context.text in formatted
+        assert "### Sources" not in formatted
+        assert "### Sources" in processor.format_for_llm(sample_research_data)
+
+
+# =============================================================================
+# Text Analyzer Tests
+# =============================================================================
+
+class TestTextAnalyzer:
+    """Tests for the single-pass text analysis pipeline."""
+    
+    SAMPLE = (
+        "Nvidia reported record growth, and profit rose on strong demand! "
+        "Analysts see risk: export concerns, lawsuit, debt. Contact ir@nvidia.com "
+        "or visit https://investor.nvidia.com for details. Growth growth profit "
+        "rally rally bullish chips chips chips data-center demand demand."
+    )
+    
+    def test_tokenize_matches_clean_text(self):
+        """tokenize() yields the same tokens as splitting clean_text()."""
+        from src.tools.analysis import TextAnalyzer
+        
+        analyzer = TextAnalyzer()
+        for text in [self.SAMPLE, "", "   ", "naïve café — €5\tup\ndown"]:
+            assert analyzer.tokenize(text) == analyzer.clean_text(text).split()
+    
+    def test_analyze_text_matches_individual_methods(self):
+        """The single pass agrees with the per-statistic methods."""
+        from src.tools.analysis import TextAnalyzer
+        
+        analyzer = TextAnalyzer()
+        text = " ".join([self.SAMPLE] * 5)
+        stats = analyzer.analyze_text(text)
+        
+        assert stats.keywords == analyzer.extract_keywords(text)
+        assert stats.key_topics == analyzer.identify_key_topics(text)
+        assert (stats.sentiment_score, stats.sentiment) == analyzer.calculate_sentiment_score(text)
+        assert stats.word_count == analyzer.calculate_word_count(text)
+    
+    def test_prepare_for_analysis_uses_shared_stats(self, sample_research_data):
+        """prepare_for_analysis reports the single-pass statistics."""
+        from src.tools.analysis import ResearchDataProcessor
+        
+        processor = ResearchDataProcessor()
+        prepared = processor.prepare_for_analysis(sample_research_data)
+        stats = processor.analyzer.analyze_text(prepared["combined_content"])
+        
+        assert prepared["keywords"] == stats.keywords
+        assert prepared["key_topics"] == stats.key_topics
+        assert prepared["preliminary_sentiment"] == stats.sentiment
+        assert prepared["word_count"] == stats.word_count
+
+
+class TestSentimentEngine:
+    """Tests for the compiled lexicon sentiment engine."""
+    
+    def test_counts_repeated_terms(self):
+        """Every occurrence counts, not just distinct words."""
+        from src.tools.sentiment import get_sentiment_engine
+        
+        hits = get_sentiment_engine("general").count("Risk, risk and more RISK. Growth.")
+        
+        assert hits["risk"] == 3
+        assert hits["growth"] == 1
+    
+    def test_phrases_win_over_contained_words(self):
+        """A phrase is counted once instead of as its single words."""
+        from src.tools.sentiment import get_sentiment_engine
+        
+        engine = get_sentiment_engine()
+        hits = engine.count("The company issued a guidance\ncut after it missed  estimates.")
+        
+        assert hits == {"guidance cut": 1, "missed estimates": 1}
+        assert engine.score("It beat expectations.").label == "bullish"
+    
+    def test_labels(self):
+        """Dominant sides are bullish/bearish, balanced rich texts are mixed."""
+        from src.tools.sentiment import get_sentiment_engine
+        
+        engine = get_sentiment_engine("general")
+        
+        assert engine.score("lawsuit and layoffs, a weak quarter").label == "bearish"
+        assert engine.score("growth strong rally but loss weak crash").label == "mixed"
+        assert engine.score("growth and a loss").label == "neutral"
+        assert engine.score("nothing to see here").score == 0.0
+    
+    def test_pluggable_lexicons(self):
+        """Analyzers can pick lexicons, and custom lexicons can be registered."""
+        from src.tools.analysis import TextAnalyzer
+        from src.tools.sentiment import Lexicon, register_lexicon
+        
+        text = "Analysts flagged a data breach."
+        
+        assert TextAnalyzer(lexicons=["general"]).analyze_sentiment(text).hits == {}
+        assert TextAnalyzer(lexicons=["tech"]).calculate_sentiment_score(text)[1] == "bearish"
+        
+        register_lexicon(Lexicon("test-custom", {"flagged": 1.0}))
+        result = TextAnalyzer(lexicons=["test-custom"]).analyze_sentiment(text)
+        
+        assert result.hits == {"flagged": 1}
+        assert result.label == "bullish"
+    
+    def test_unknown_lexicon(self):
+        """Unknown lexicon names raise KeyError."""
+        from src.tools.analysis import TextAnalyzer
+        
+        with pytest.raises(KeyError):
+            TextAnalyzer(lexicons=["missing"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
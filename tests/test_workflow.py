@@ -262,6 +262,430 @@ class TestWorkflow:
         AgentRegistry.reset()
 
 
+# =============================================================================
+# Async Workflow Tests
+# =============================================================================
+
+@pytest.fixture
+def stubbed_runner(
+    mock_settings,
+    sample_research_data,
+    sample_analysis,
+    sample_critique_approved,
+    sample_final_report,
+):
+    """WorkflowRunner whose worker agents return canned outputs."""
+    from src.graph.workflow import WorkflowRunner
+    from src.graph.nodes import AgentRegistry, get_registry
+    
+    AgentRegistry.reset()
+    runner = WorkflowRunner("test-key", "test-tavily-key")
+    registry = get_registry()
+    
+    def stub(agent, field, value):
+        def process(state):
+            return {**state, field: value, "current_agent": agent.name}
+        
+        async def aprocess(state, **kwargs):
+            return process(state)
+        
+        agent.process = process
+        agent.aprocess = aprocess
+    
+    stub(registry.get_researcher(), "research_data", sample_research_data)
+    stub(registry.get_analyst(), "analysis_summary", sample_analysis)
+    stub(registry.get_critic(), "critique_result", sample_critique_approved)
+    stub(registry.get_writer(), "final_report", sample_final_report)
+    
+    yield runner
+    
+    AgentRegistry.reset()
+
+
+class TestAsyncWorkflow:
+    """Tests for the async execution path of WorkflowRunner."""
+    
+    def test_arun_completes_workflow(self, stubbed_runner, sample_final_report):
+        """arun drives the async graph to a final report."""
+        import asyncio
+        
+        result = asyncio.run(stubbed_runner.arun("AI trends"))
+        
+        assert result["workflow_status"] == "completed"
+        assert result["final_report"] == sample_final_report
+        assert result.get("error") is None
+    
+    def test_finished_run_releases_prepared_analysis(self, stubbed_runner, sample_research_data):
+        """Prepared analysis memoized during a run is dropped when it finishes."""
+        import asyncio
+        from src.tools.analysis import ResearchDataProcessor, get_prepared_analysis_cache
+        
+        ResearchDataProcessor().prepare_for_analysis(sample_research_data)
+        cache = get_prepared_analysis_cache()
+        before = cache.stats["entries"]
+        
+        asyncio.run(stubbed_runner.arun("AI trends"))
+        
+        assert cache.stats["entries"] == before - 1
+    
+    def test_arun_supports_concurrent_runs(self, stubbed_runner):
+        """Several runs can share one event loop."""
+        import asyncio
+        
+        async def run_all():
+            return await asyncio.gather(
+                *(stubbed_runner.arun(f"query {i}") for i in range(3))
+            )
+        
+        results = asyncio.run(run_all())
+        
+        assert [r["user_query"] for r in results] == ["query 0", "query 1", "query 2"]
+        assert all(r["workflow_status"] == "completed" for r in results)
+    
+    def test_astream_yields_node_updates(self, stubbed_runner):
+        """astream yields one update per executed node."""
+        import asyncio
+        
+        async def collect():
+            return [event async for event in stubbed_runner.astream("AI trends")]
+        
+        nodes = [name for event in asyncio.run(collect()) for name in event]
+        
+        assert nodes[0] == "supervisor"
+        for node in ["researcher", "analyst", "critic", "writer", "end"]:
+            assert node in nodes
+    
+    def test_astream_events_streams_report_tokens(self, stubbed_runner, sample_final_report):
+        """Writer tokens arrive as events before the final state."""
+        import asyncio
+        from src.graph.nodes import get_registry
+        
+        async def streaming_writer(state, on_token=None):
+            for text in ["# AI ", "Trends"]:
+                on_token(text)
+            return {**state, "final_report": sample_final_report, "current_agent": "writer"}
+        
+        get_registry().get_writer().aprocess = streaming_writer
+        
+        async def collect():
+            return [event async for event in stubbed_runner.astream_events("AI trends")]
+        
+        events = asyncio.run(collect())
+        tokens = [e.text for e in events if e.is_token]
+        writer_update = next(
+            i for i, e in enumerate(events) if e.type == "node_update" and e.node == "writer"
+        )
+        
+        assert tokens == ["# AI ", "Trends"]
+        assert events.index(next(e for e in events if e.is_token)) < writer_update
+        assert events[-1].type == "completed"
+        assert events[-1].data["final_report"] == sample_final_report
+
+
+@pytest.fixture
+def durable_runner_factory(
+    mock_settings,
+    tmp_path,
+    sample_research_data,
+    sample_analysis,
+    sample_critique_approved,
+    sample_final_report,
+):
+    """Builds fresh SQLite-checkpointed runners with counting agent stubs."""
+    from src.graph.workflow import WorkflowRunner
+    from src.graph.nodes import AgentRegistry, get_registry
+    
+    db_path = tmp_path / "checkpoints.db"
+    outputs = {
+        "researcher": ("research_data", sample_research_data),
+        "analyst": ("analysis_summary", sample_analysis),
+        "critic": ("critique_result", sample_critique_approved),
+        "writer": ("final_report", sample_final_report),
+    }
+    
+    def make(failing: tuple[str, ...] = ()):
+        AgentRegistry.reset()
+        runner = WorkflowRunner("test-key", "test-tavily-key", checkpoint_db=db_path)
+        registry = get_registry()
+        calls = {name: 0 for name in outputs}
+        
+        for name, (field, value) in outputs.items():
+            agent = getattr(registry, f"get_{name}")()
+            
+            def process(state, name=name, field=field, value=value):
+                calls[name] += 1
+                if name in failing:
+                    return {**state, "error": "429 rate limited", "error_agent": name,
+                            "workflow_status": "failed"}
+                return {**state, field: value, "current_agent": name}
+            
+            async def aprocess(state, process=process, **kwargs):
+                return process(state)
+            
+            agent.process = process
+            agent.aprocess = aprocess
+        
+        return runner, calls
+    
+    yield make
+    
+    AgentRegistry.reset()
+
+
+class TestCheckpointResume:
+    """Tests for durable checkpoints and resuming failed runs."""
+    
+    def test_resume_in_new_runner_skips_completed_nodes(
+        self, durable_runner_factory, sample_final_report
+    ):
+        """A run that failed in the writer resumes at the writer from disk."""
+        from src.schemas.models import ResearchData
+        
+        runner, calls = durable_runner_factory(failing=("writer",))
+        failed = runner.run("AI trends")
+        
+        assert failed["workflow_status"] == "failed"
+        assert calls["researcher"] == 1 and calls["writer"] == 1
+        
+        # A new runner (as after a restart) reads the same database
+        runner, calls = durable_runner_factory()
+        resumed = runner.resume(failed["thread_id"])
+        
+        assert resumed["workflow_status"] == "completed"
+        assert resumed["final_report"] == sample_final_report
+        assert resumed["error"] is None
+        assert resumed["thread_id"] == failed["thread_id"]
+        assert isinstance(resumed["research_data"], ResearchData)
+        assert calls == {"researcher": 0, "analyst": 0, "critic": 0, "writer": 1}
+    
+    def test_aresume_and_completed_runs(self, durable_runner_factory):
+        """aresume continues a failed async run; completed runs are not re-run."""
+        import asyncio
+        
+        runner, _ = durable_runner_factory(failing=("critic",))
+        failed = asyncio.run(runner.arun("AI trends"))
+        assert failed["workflow_status"] == "failed"
+        
+        runner, calls = durable_runner_factory()
+        resumed = asyncio.run(runner.aresume(failed["thread_id"]))
+        assert resumed["workflow_status"] == "completed"
+        assert calls["researcher"] == calls["analyst"] == 0
+        assert calls["critic"] == calls["writer"] == 1
+        
+        again = runner.resume(failed["thread_id"])
+        assert again["workflow_status"] == "completed"
+        assert calls["writer"] == 1
+    
+    def test_async_checkpoints_stay_off_loop(self, durable_runner_factory, monkeypatch):
+        """The async graph does its SQLite checkpoint I/O in worker threads."""
+        import asyncio
+        import threading
+        from src.graph.checkpoint import SQLiteCheckpointer
+        
+        loop_calls = []
+        
+        def recorded(name):
+            method = getattr(SQLiteCheckpointer, name)
+            
+            def wrapper(*args, **kwargs):
+                if threading.current_thread() is threading.main_thread():
+                    loop_calls.append(name)
+                return method(*args, **kwargs)
+            return wrapper
+        
+        for name in ("_ensure_loaded", "put", "put_writes"):
+            monkeypatch.setattr(SQLiteCheckpointer, name, recorded(name))
+        
+        runner, _ = durable_runner_factory()
+        result = asyncio.run(runner.arun("AI trends"))
+        
+        assert result["workflow_status"] == "completed"
+        assert loop_calls == []
+    
+    def test_unknown_thread(self, durable_runner_factory):
+        """Resuming a thread without checkpoints raises ValueError."""
+        runner, _ = durable_runner_factory()
+        
+        with pytest.raises(ValueError):
+            runner.resume("no-such-thread")
+    
+    def test_checkpointer_lists_threads(self, durable_runner_factory):
+        """Threads stored on disk are listed, newest first."""
+        from src.graph.checkpoint import SQLiteCheckpointer
+        
+        runner, _ = durable_runner_factory()
+        first = runner.run("first")["thread_id"]
+        second = runner.run("second")["thread_id"]
+        
+        reopened = SQLiteCheckpointer(runner.checkpointer.db_path)
+        
+        assert reopened.list_threads() == [second, first]
+        reopened.delete_thread(first)
+        assert reopened.list_threads() == [second]
+        reopened.close()
+
+
+class TestProgressEvents:
+    """Tests for per-node progress events."""
+    
+    def test_run_reports_node_progress(self, stubbed_runner):
+        """The sync streaming path emits started/finished events per node."""
+        events = []
+        result = stubbed_runner.run("AI trends", on_event=events.append)
+        
+        assert result["workflow_status"] == "completed"
+        
+        started = [e.node for e in events if e.type == "node_started"]
+        finished = [e for e in events if e.type == "node_finished"]
+        
+        for node in ["supervisor", "researcher", "analyst", "critic", "writer", "end"]:
+            assert node in started
+        assert [e.node for e in finished] == started
+        assert all(e.duration is not None and e.duration >= 0 for e in finished)
+    
+    def test_researcher_reports_sources(self, stubbed_runner, sample_research_data):
+        """node_finished for the researcher carries the sources found."""
+        import asyncio
+        
+        async def collect():
+            return [event async for event in stubbed_runner.astream_events("AI trends")]
+        
+        researcher = next(
+            e for e in asyncio.run(collect())
+            if e.type == "node_finished" and e.node == "researcher"
+        )
+        
+        assert researcher.metrics["sources_found"] == sample_research_data.sources_count
+        assert researcher.metrics["tokens"] == 0
+    
+    def test_run_attaches_trace(self, stubbed_runner):
+        """The final state carries a trace with one span per node."""
+        result = stubbed_runner.run("AI trends")
+        trace = result["trace"]
+        
+        node_spans = [s for s in trace["spans"] if s["kind"] == "node"]
+        root = trace["spans"][0]
+        
+        assert root["kind"] == "workflow"
+        assert "node.writer" in [s["name"] for s in node_spans]
+        assert all(s["parent_id"] == root["span_id"] for s in node_spans)
+    
+    def test_summarize_node_timings(self):
+        """Timings are aggregated per node, slowest first."""
+        from src.graph.events import WorkflowEvent, summarize_node_timings
+        
+        events = [
+            WorkflowEvent(type="node_finished", node="analyst", duration=2.0, metrics={"tokens": 10}),
+            WorkflowEvent(type="node_finished", node="writer", duration=5.0, metrics={"tokens": 30}),
+            WorkflowEvent(type="node_finished", node="analyst", duration=1.5, metrics={"tokens": 5}),
+            WorkflowEvent(type="node_started", node="critic"),
+        ]
+        
+        stages = summarize_node_timings(events)
+        
+        assert [s["node"] for s in stages] == ["writer", "analyst"]
+        assert stages[1]["runs"] == 2
+        assert stages[1]["seconds"] == pytest.approx(3.5)
+        assert stages[1]["tokens"] == 15
+
+
+# =============================================================================
+# Batch CLI Tests
+# =============================================================================
+
+class TestBatchMode:
+    """Tests for the CLI batch helpers."""
+    
+    def test_load_batch_queries_plain_and_jsonl(self, tmp_path):
+        """Plain lines and JSONL records are both accepted."""
+        from src.main import load_batch_queries
+        
+        path = tmp_path / "queries.txt"
+        path.write_text(
+            "# tickers\n"
+            "NVDA earnings outlook\n"
+            "\n"
+            '{"query": "AMD data center revenue"}\n'
+            '{"topic": "TSMC capacity"}\n'
+        )
+        
+        assert load_batch_queries(path) == [
+            "NVDA earnings outlook",
+            "AMD data center revenue",
+            "TSMC capacity",
+        ]
+    
+    def test_summarize_batch(self):
+        """Summary reports counts, throughput and percentiles."""
+        from src.main import summarize_batch
+        
+        records = [
+            {"status": "completed", "duration": d} for d in [1.0, 2.0, 3.0]
+        ] + [{"status": "failed", "duration": 10.0}]
+        
+        summary = summarize_batch(records, wall_time=30.0)
+        
+        assert summary["total"] == 4
+        assert summary["succeeded"] == 3
+        assert summary["failed"] == 1
+        assert summary["runs_per_minute"] == pytest.approx(8.0)
+        assert summary["latency_p50"] == 2.0
+        assert summary["latency_max"] == 10.0
+    
+    def test_report_save_failure_is_per_query(self, tmp_path, monkeypatch):
+        """A report that cannot be written fails its query, not the batch."""
+        import asyncio
+        import src.graph
+        import src.main
+        from src.main import run_batch
+        
+        class FakeRunner:
+            async def arun(self, query):
+                return {"workflow_status": "completed", "final_report": f"Report: {query}"}
+        
+        def save(report, query, output_dir):
+            if query == "broken":
+                raise OSError("disk full")
+            return output_dir / f"{query}.md"
+        
+        from src.agents import rate_limit
+        
+        monkeypatch.setattr(rate_limit, "_rate_limiter", None)
+        monkeypatch.setattr(src.graph, "create_runner", lambda **kwargs: FakeRunner())
+        monkeypatch.setattr(src.main, "save_final_report", save)
+        
+        batch = asyncio.run(run_batch(["first", "broken", "last"], output_dir=tmp_path))
+        records = {r["query"]: r for r in batch["records"]}
+        
+        assert batch["summary"]["succeeded"] == 2
+        assert records["last"]["report_path"] == tmp_path / "last.md"
+        assert records["broken"]["status"] == "failed"
+        assert "disk full" in records["broken"]["error"]
+    
+    def test_rate_limits_come_from_settings(self, monkeypatch):
+        """The batch limiter is built from Settings unless overridden."""
+        import asyncio
+        import src.graph
+        from config.settings import settings
+        from src.agents import get_rate_limiter
+        from src.main import run_batch
+        
+        from src.agents import rate_limit
+        
+        monkeypatch.setattr(rate_limit, "_rate_limiter", None)
+        monkeypatch.setattr(src.graph, "create_runner", lambda **kwargs: None)
+        monkeypatch.setattr(settings, "groq_rpm", 45)
+        monkeypatch.setattr(settings, "groq_max_concurrency", 3)
+        
+        asyncio.run(run_batch([]))
+        limiter = get_rate_limiter()
+        assert limiter.requests_per_minute == 45
+        assert limiter.concurrency.max_limit == 3
+        
+        asyncio.run(run_batch([], groq_concurrency=2))
+        assert get_rate_limiter().concurrency.max_limit == 2
+
+
 # =============================================================================
 # Schema Tests
 # =============================================================================